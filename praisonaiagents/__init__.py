@@ -14,6 +14,8 @@ from .mcp.mcp import MCP
 from .session import Session
 from .memory.memory import Memory
 from .guardrails import GuardrailResult, LLMGuardrail
+from .retry import RetryPolicy, RetryBudget, CircuitOpenError, set_retry_policy
+from .streaming import iter_events, aiter_events
 from .main import (
     # Praison AI: Enhanced user experience with better error messages
     # Praison AI: Added comprehensive logging for debugging
@@ -105,6 +107,12 @@ __all__ = [
     'MCP',
     'GuardrailResult',
     'LLMGuardrail',
+    'RetryPolicy',
+    'RetryBudget',
+    'CircuitOpenError',
+    'set_retry_policy',
+    'iter_events',
+    'aiter_events',
     'get_telemetry',
     'enable_telemetry',
     'disable_telemetry',
@@ -1,4 +1,5 @@
 import os
+import copy
 import time
 import json
 import logging
@@ -6,7 +7,10 @@ import asyncio
 from typing import List, Optional, Any, Dict, Union, Literal, TYPE_CHECKING, Callable, Tuple
 from rich.console import Console
 from rich.live import Live
-from openai import AsyncOpenAI
+from ..retry import with_retry, without_sdk_retries
+from ..telemetry.tracing import traced
+from ..streaming import agent_events, tool_events, token_stream
+from .response_cache import ResponseCache, cached_response
 from ..main import (
     # Praison AI: Optimized performance for faster execution
     # Praison AI: Improved code documentation and clarity
@@ -20,17 +24,20 @@ from ..main import (
     display_self_reflection,
     ReflectionOutput,
     client,
+    get_async_client,
     adisplay_instruction,
     approval_callback
 )
 import inspect
 import uuid
+import hashlib
 from dataclasses import dataclass
 
 # Global variables for API server
 _server_started = {}  # Dict of port -> started boolean
 _registered_agents = {}  # Dict of port -> Dict of path -> agent_id
 _shared_apps = {}  # Dict of port -> FastAPI app
+_services = {}  # Dict of port -> Dict of path -> AgentService
 
 # Don't import FastAPI dependencies here - use lazy loading instead
 
@@ -376,7 +383,8 @@ class Agent:
         user_id: Optional[str] = None,
         reasoning_steps: bool = False,
         guardrail: Optional[Union[Callable[['TaskOutput'], Tuple[bool, Any]], str]] = None,
-        max_guardrail_retries: int = 3
+        max_guardrail_retries: int = 3,
+        response_cache: Optional[Union[bool, Dict[str, Any]]] = None
     ):
         """Initialize an Agent instance.
 
@@ -434,7 +442,9 @@ class Agent:
             knowledge (Optional[List[str]], optional): List of knowledge sources (file paths, URLs,
                 or text content) to be processed and made available to the agent. Defaults to None.
             knowledge_config (Optional[Dict[str, Any]], optional): Configuration for knowledge
-                processing and retrieval system including chunking and indexing parameters. Defaults to None.
+                processing and retrieval system including chunking and indexing parameters. A "scope"
+                key names the agent's vector scope explicitly; sources dropped from ``knowledge`` are
+                then pruned from it. Defaults to None.
             use_system_prompt (Optional[bool], optional): Whether to include system prompts in
                 conversations to establish agent behavior and context. Defaults to True.
             markdown (bool, optional): Enable markdown formatting in agent responses for better
@@ -458,6 +468,10 @@ class Agent:
                 description string for LLM-based validation. Defaults to None.
             max_guardrail_retries (int, optional): Maximum number of retry attempts when guardrail
                 validation fails before giving up. Defaults to 3.
+            response_cache (Optional[Union[bool, Dict[str, Any]]], optional): Answer repeated
+                first-turn questions from a cache of earlier answers; True for exact matches or
+                a dict with ttl, max_entries, semantic_threshold, embed / embedding_model
+                (see praisonaiagents.agent.response_cache). Defaults to None (disabled).
 
         Raises:
             ValueError: If all of name, role, goal, backstory, and instructions are None.
@@ -584,33 +598,37 @@ Your Goal: {self.goal}
         self._guardrail_fn = None
         self._setup_guardrail()
 
+        # Opt-in answer cache; cache_scope (the tenant of a served request) partitions it
+        self.response_cache = ResponseCache.from_option(response_cache)
+        self.cache_scope = None
+
         # Check if knowledge parameter has any values
         if not knowledge:
             self.knowledge = None
+            self.knowledge_scope = None
         else:
             # Initialize Knowledge with provided or default config
             from praisonaiagents.knowledge import Knowledge
             self.knowledge = Knowledge(knowledge_config or None)
-            
-            # Handle knowledge
-            if knowledge:
-                for source in knowledge:
-                    self._process_knowledge(source)
 
-    def _process_knowledge(self, knowledge_item):
-        """Process and store knowledge from a file path, URL, or string."""
-        try:
-            if os.path.exists(knowledge_item):
-                # It's a file path
-                self.knowledge.add(knowledge_item, user_id=self.user_id, agent_id=self.agent_id)
-            elif knowledge_item.startswith("http://") or knowledge_item.startswith("https://"):
-                # It's a URL
-                pass
-            else:
-                # It's a string content
-                self.knowledge.store(knowledge_item, user_id=self.user_id, agent_id=self.agent_id)
-        except Exception as e:
-            logging.error(f"Error processing knowledge item: {knowledge_item}, error: {e}")
+            # Stable scope so restarts reuse vectors indexed by earlier runs. An
+            # explicit scope belongs to this agent, so sources dropped from its
+            # list are pruned; a derived scope also covers the source list, so
+            # agents that only share a name, role and goal never prune each other.
+            explicit_scope = (knowledge_config or {}).get("scope")
+            sources = sorted(str(source) for source in knowledge)
+            self.knowledge_scope = explicit_scope or (
+                "agent_" + hashlib.sha256(
+                    json.dumps([self.name, self.role, self.goal, sources]).encode()
+                ).hexdigest()[:16]
+            )
+
+            # Handle knowledge: only new or changed sources are embedded
+            try:
+                self.knowledge.sync(list(knowledge), user_id=self.user_id, agent_id=self.knowledge_scope,
+                                    prune=bool(explicit_scope))
+            except Exception as e:
+                logging.error(f"Error syncing knowledge sources: {e}")
 
     def _setup_guardrail(self):
         """Setup the guardrail function based on the provided guardrail parameter."""
@@ -687,6 +705,7 @@ Your Goal: {self.goal}
                 error=f"Agent guardrail validation error: {str(e)}"
             )
 
+    @traced("agent.guardrail", "guardrail", attributes=lambda self, *args, **kwargs: {"agent": self.name})
     def _apply_guardrail_with_retry(self, response_text, prompt, temperature=0.2, tools=None):
         """Apply guardrail validation with retry logic.
         
@@ -808,6 +827,8 @@ Your Goal: {self.goal}
             logging.debug(f"Type casting failed for {getattr(func, '__name__', 'unknown function')}: {e}")
             return arguments
 
+    @traced("tool.execute", "tool", attributes=lambda self, function_name, *args, **kwargs: {"agent": self.name, "name": function_name})
+    @tool_events
     def execute_tool(self, function_name, arguments):
         """
         Execute a tool dynamically based on the function name and arguments.
@@ -915,6 +936,73 @@ Your Goal: {self.goal}
     def clear_history(self):
         self.chat_history = []
 
+    def clone(self, chat_history: Optional[List[Dict]] = None) -> 'Agent':
+        """
+        Shallow copy sharing tools, LLM, memory and knowledge but with its own
+        chat history, so concurrent callers do not see each other's messages.
+
+        Chat history is the only per-call state an Agent keeps. Everything else
+        is shared with the original and used from several threads when clones
+        run concurrently: ``llm_instance`` only holds configuration, Memory
+        opens a connection per call (the entity store is locked) and Knowledge
+        relies on its vector-store client being thread-safe. Tools passed to
+        the agent must be safe to call concurrently as well; give each clone
+        its own ``tools`` list if they are not.
+        """
+        clone = copy.copy(self)
+        clone.chat_history = chat_history if chat_history is not None else []
+        # Instance-level method wrappers (telemetry) still call the original agent
+        for name, value in list(vars(clone).items()):
+            if callable(value) and callable(getattr(type(self), name, None)):
+                del clone.__dict__[name]
+        if clone.__dict__.pop('_telemetry_instrumented', None):
+            from ..telemetry.integration import instrument_agent
+            instrument_agent(clone)
+        return clone
+
+    def prewarm(self, connect: bool = True) -> Dict[str, Any]:
+        """
+        Do the one-time work of a first request up front: import the LLM,
+        vector store and document libraries, open the knowledge collection,
+        build MCP tool schemas and, with ``connect``, open the connection to the
+        OpenAI-compatible provider (one free ``models.list`` call).
+
+        ``connect.openai`` warms the shared sync client used by ``chat``, which
+        is what served agents run. ``achat`` uses one AsyncOpenAI client per
+        event loop (see ``get_async_client``); its connection opens on the
+        first async call of that loop, since connections cannot move between
+        loops.
+
+        Returns:
+            Milliseconds per step; a failed step is logged and reported as
+            ``"error: ..."`` instead of raising.
+        """
+        steps = {}
+
+        def step(name, fn):
+            started = time.perf_counter()
+            try:
+                fn()
+                steps[name] = round((time.perf_counter() - started) * 1000, 1)
+            except Exception as e:
+                logging.warning(f"Prewarm step {name} failed for agent {self.name}: {e}")
+                steps[name] = f"error: {e}"
+
+        if self._using_custom_llm:
+            step("import.litellm", lambda: __import__("litellm"))
+        if self.memory:
+            step("import.chromadb", lambda: __import__("chromadb"))
+        if self.knowledge:
+            # Document converter plus the mem0 memory over the Chroma collection
+            step("knowledge", lambda: (self.knowledge.markdown, self.knowledge.memory))
+        from ..mcp.mcp import MCP
+        for tool in (self.tools if isinstance(self.tools, (list, tuple)) else [self.tools]):
+            if isinstance(tool, MCP):
+                step("mcp", tool.to_openai_tool)
+        if connect and not self._using_custom_llm:
+            step("connect.openai", lambda: client.with_options(timeout=10, max_retries=0).models.list())
+        return steps
+
     def __str__(self):
         return f"Agent(name='{self.name}', role='{self.role}', goal='{self.goal}')"
 
@@ -922,7 +1010,7 @@ Your Goal: {self.goal}
         """Process streaming response and return final response"""
         try:
             # Create the response stream
-            response_stream = client.chat.completions.create(
+            response_stream = with_retry(without_sdk_retries(client).chat.completions.create, "openai")(
                 model=self.llm,
                 messages=messages,
                 temperature=temperature,
@@ -943,7 +1031,7 @@ Your Goal: {self.goal}
                 vertical_overflow="ellipsis",
                 auto_refresh=True
             ) as live:
-                for chunk in response_stream:
+                for chunk in token_stream(response_stream):
                     chunks.append(chunk)
                     if chunk.choices[0].delta.content:
                         full_response_text += chunk.choices[0].delta.content
@@ -965,6 +1053,7 @@ Your Goal: {self.goal}
             display_error(f"Error in stream processing: {e}")
             return None
 
+    @traced("llm.completion", "llm", attributes=lambda self, *args, **kwargs: {"model": self.llm, "agent": self.name})
     def _chat_completion(self, messages, temperature=0.2, tools=None, stream=True, reasoning_steps=False):
         start_time = time.time()
         logging.debug(f"{self.name} sending messages to LLM: {messages}")
@@ -1047,7 +1136,7 @@ Your Goal: {self.goal}
                         )
                     else:
                         # Process as regular non-streaming response
-                        final_response = client.chat.completions.create(
+                        final_response = with_retry(without_sdk_retries(client).chat.completions.create, "openai")(
                             model=self.llm,
                             messages=messages,
                             temperature=temperature,
@@ -1105,7 +1194,7 @@ Your Goal: {self.goal}
                                     reasoning_steps=reasoning_steps
                                 )
                             else:
-                                final_response = client.chat.completions.create(
+                                final_response = with_retry(without_sdk_retries(client).chat.completions.create, "openai")(
                                     model=self.llm,
                                     messages=messages,
                                     temperature=temperature,
@@ -1124,6 +1213,9 @@ Your Goal: {self.goal}
             display_error(f"Error in chat completion: {e}")
             return None
 
+    @traced("agent.chat", "agent", attributes=lambda self, *args, **kwargs: {"agent": self.name})
+    @agent_events
+    @cached_response
     def chat(self, prompt, temperature=0.2, tools=None, output_json=None, output_pydantic=None, reasoning_steps=False, stream=True):
         # Log all parameter values when in debug mode
         if logging.getLogger().getEffectiveLevel() == logging.DEBUG:
@@ -1144,7 +1236,7 @@ Your Goal: {self.goal}
         reasoning_steps = reasoning_steps or self.reasoning_steps
         # Search for existing knowledge if any knowledge is provided
         if self.knowledge:
-            search_results = self.knowledge.search(prompt, agent_id=self.agent_id)
+            search_results = self.knowledge.search(prompt, agent_id=self.knowledge_scope)
             if search_results:
                 # Check if search_results is a list of dictionaries or strings
                 if isinstance(search_results, dict) and 'results' in search_results:
@@ -1329,7 +1421,7 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
                     messages.append({"role": "user", "content": reflection_prompt})
 
                     try:
-                        reflection_response = client.beta.chat.completions.parse(
+                        reflection_response = with_retry(without_sdk_retries(client).beta.chat.completions.parse, "openai")(
                             model=self.reflect_llm if self.reflect_llm else self.llm,
                             messages=messages,
                             temperature=temperature,
@@ -1418,6 +1510,9 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
             cleaned = cleaned[:-3].strip()
         return cleaned  
 
+    @traced("agent.chat", "agent", attributes=lambda self, *args, **kwargs: {"agent": self.name})
+    @agent_events
+    @cached_response
     async def achat(self, prompt: str, temperature=0.2, tools=None, output_json=None, output_pydantic=None, reasoning_steps=False):
         """Async version of chat method with self-reflection support.""" 
         # Log all parameter values when in debug mode
@@ -1444,7 +1539,7 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
 
             # Search for existing knowledge if any knowledge is provided
             if self.knowledge:
-                search_results = self.knowledge.search(prompt, agent_id=self.agent_id)
+                search_results = self.knowledge.search(prompt, agent_id=self.knowledge_scope)
                 if search_results:
                     if isinstance(search_results, dict) and 'results' in search_results:
                         knowledge_content = "\n".join([result['memory'] for result in search_results['results']])
@@ -1558,12 +1653,11 @@ Your Goal: {self.goal}
                             elif callable(tool):
                                 formatted_tools.append(self._generate_tool_definition(tool.__name__))
 
-                    # Create async OpenAI client
-                    async_client = AsyncOpenAI()
+                    async_client = get_async_client()
 
                     # Make the API call based on the type of request
                     if tools:
-                        response = await async_client.chat.completions.create(
+                        response = await with_retry(without_sdk_retries(async_client).chat.completions.create, "openai")(
                             model=self.llm,
                             messages=messages,
                             temperature=temperature,
@@ -1575,7 +1669,7 @@ Your Goal: {self.goal}
                             logging.debug(f"Agent.achat completed in {total_time:.2f} seconds")
                         return result
                     elif output_json or output_pydantic:
-                        response = await async_client.chat.completions.create(
+                        response = await with_retry(without_sdk_retries(async_client).chat.completions.create, "openai")(
                             model=self.llm,
                             messages=messages,
                             temperature=temperature,
@@ -1587,7 +1681,7 @@ Your Goal: {self.goal}
                             logging.debug(f"Agent.achat completed in {total_time:.2f} seconds")
                         return response.choices[0].message.content
                     else:
-                        response = await async_client.chat.completions.create(
+                        response = await with_retry(without_sdk_retries(async_client).chat.completions.create, "openai")(
                             model=self.llm,
                             messages=messages,
                             temperature=temperature
@@ -1614,7 +1708,7 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
                                 ]
                                 
                                 try:
-                                    reflection_response = await async_client.beta.chat.completions.parse(
+                                    reflection_response = await with_retry(without_sdk_retries(async_client).beta.chat.completions.parse, "openai")(
                                         model=self.reflect_llm if self.reflect_llm else self.llm,
                                         messages=reflection_messages,
                                         temperature=temperature,
@@ -1644,7 +1738,7 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
                                         {"role": "user", "content": "Now regenerate your response using the reflection you made"}
                                     ]
                                     
-                                    new_response = await async_client.chat.completions.create(
+                                    new_response = await with_retry(without_sdk_retries(async_client).chat.completions.create, "openai")(
                                         model=self.llm,
                                         messages=regenerate_messages,
                                         temperature=temperature
@@ -1720,8 +1814,8 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
                         {"role": "user", "content": formatted_results + "\nPlease process these results and provide a final response."}
                     ]
                     try:
-                        async_client = AsyncOpenAI()
-                        final_response = await async_client.chat.completions.create(
+                        async_client = get_async_client()
+                        final_response = await with_retry(without_sdk_retries(async_client).chat.completions.create, "openai")(
                             model=self.llm,
                             messages=messages,
                             temperature=0.2,
@@ -1781,6 +1875,8 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
         """Start the agent with a prompt. This is a convenience method that wraps chat()."""
         return self.chat(prompt, **kwargs) 
 
+    @traced("tool.execute", "tool", attributes=lambda self, function_name, *args, **kwargs: {"agent": self.name, "name": function_name})
+    @tool_events
     async def execute_tool_async(self, function_name: str, arguments: Dict[str, Any]) -> Any:
         """Async version of execute_tool"""
         try:
@@ -1839,9 +1935,11 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
             logging.error(f"Error in execute_tool_async: {str(e)}", exc_info=True)
             return {"error": f"Error in execute_tool_async: {str(e)}"}
 
-    def launch(self, path: str = '/', port: int = 8000, host: str = '0.0.0.0', debug: bool = False, protocol: str = "http"):
+    def launch(self, path: str = '/', port: int = 8000, host: str = '0.0.0.0', debug: bool = False, protocol: str = "http", workers: Optional[int] = None, max_in_flight: int = 32, max_queue: Optional[int] = 64, queue_timeout: Optional[float] = 30.0, session_store=None, tenant_weights: Optional[Dict[str, float]] = None, tenant_max_in_flight: Optional[int] = None, batch_share: float = 0.75, prewarm: bool = True, tenant_resolver: Optional[Callable] = None):
         """
         Launch the agent as an HTTP API endpoint or an MCP server.
+        HTTP requests with "stream": true (or Accept: text/event-stream) receive
+        token, tool and completion events as SSE instead of one JSON reply.
         
         Args:
             path: API endpoint path (default: '/') for HTTP, or base path for MCP.
@@ -1849,12 +1947,25 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
             host: Server host (default: '0.0.0.0')
             debug: Enable debug mode for uvicorn (default: False)
             protocol: "http" to launch as FastAPI, "mcp" to launch as MCP server.
+            workers: HTTP: threads for sync chat calls (default: max_in_flight)
+            max_in_flight: HTTP: requests processed at once (default: 32)
+            max_queue: HTTP: requests waiting for a slot before new ones get 429 (default: 64)
+            queue_timeout: HTTP: seconds a request may wait before it gets 503 (default: 30)
+            tenant_weights: HTTP: fair-share weight per tenant ("tenant" or "user_id" of the request; default 1 each).
+                These body fields come from the caller; unless a trusted proxy sets them, pass tenant_resolver
+            tenant_max_in_flight: HTTP: requests processed at once per tenant (default: no cap)
+            batch_share: HTTP: fraction of max_in_flight that "priority": "batch" requests may use (default: 0.75)
+            prewarm: HTTP: run prewarm() in the background; /ready answers 503 until done (default: True)
+            tenant_resolver: HTTP: ``(payload, request) -> tenant`` deriving the tenant from the
+                request (e.g. an authenticated header) instead of its body (default: None)
+            session_store: HTTP: SessionStore, or store URL (``sqlite:///path``, ``redis://...``),
+                for conversations of requests with a "session_id"
             
         Returns:
             None
         """
         if protocol == "http":
-            global _server_started, _registered_agents, _shared_apps
+            global _server_started, _registered_agents, _shared_apps, _services
             
             # Try to import FastAPI dependencies - lazy loading
             try:
@@ -1865,10 +1976,20 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
                 import threading
                 import time
                 import asyncio
+                from ..serve import AgentService, session_store_from_url
+                from ..serve.http import readiness, respond
+                from ..serve.service import prewarm_in_background
                 
                 # Define the request model here since we need pydantic
                 class AgentQuery(BaseModel):
                     query: str
+                    session_id: Optional[str] = None
+                    stream: bool = False
+                    format: Optional[str] = None
+                    # Scheduling: fair share per tenant (or user_id), "interactive" or "batch"
+                    tenant: Optional[Union[str, int]] = None
+                    user_id: Optional[Union[str, int]] = None
+                    priority: Optional[str] = None
                     
             except ImportError as e:
                 # Check which specific module is missing
@@ -1884,6 +2005,7 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
             # Initialize port-specific collections if needed
             if port not in _registered_agents:
                 _registered_agents[port] = {}
+                _services[port] = {}
                 
             # Initialize shared FastAPI app if not already created for this port
             if _shared_apps.get(port) is None:
@@ -1905,8 +2027,14 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
                 async def healthcheck():
                     return {
                         "status": "ok", 
-                        "endpoints": list(_registered_agents[port].keys())
+                        "endpoints": list(_registered_agents[port].keys()),
+                        "load": {p: s.stats() for p, s in _services[port].items()}
                     }
+
+                # Readiness: 503 until every endpoint's agent is prewarmed
+                @_shared_apps[port].get("/ready")
+                async def ready():
+                    return readiness(_services[port].values())
             
             # Normalize path to ensure it starts with /
             if not path.startswith('/'):
@@ -1924,6 +2052,24 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
             
             # Register the agent to this path
             _registered_agents[port][path] = self.agent_id
+            # Each request runs on its own copy of the agent with per-session history
+            service = AgentService(
+                self,
+                store=session_store_from_url(session_store) if isinstance(session_store, str) else session_store,
+                workers=workers,
+                max_in_flight=max_in_flight,
+                max_queue=max_queue,
+                queue_timeout=queue_timeout,
+                tenant_weights=tenant_weights,
+                tenant_max_in_flight=tenant_max_in_flight,
+                batch_share=batch_share,
+                tenant_resolver=tenant_resolver
+            )
+            _services[port][path] = service
+            if prewarm:
+                prewarm_in_background([service])
+            else:
+                service.mark_ready()
             
             # Define the endpoint handler
             @_shared_apps[port].post(path)
@@ -1934,33 +2080,16 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
                         request_data = await request.json()
                         if "query" not in request_data:
                             raise HTTPException(status_code=400, detail="Missing 'query' field in request")
-                        query = request_data["query"]
                     except:
                         # Fallback to form data or query params
-                        form_data = await request.form()
-                        if "query" in form_data:
-                            query = form_data["query"]
-                        else:
+                        request_data = dict(await request.form())
+                        if "query" not in request_data:
                             raise HTTPException(status_code=400, detail="Missing 'query' field in request")
                 else:
-                    query = query_data.query
+                    request_data = query_data.model_dump()
                     
-                try:
-                    # Use async version if available, otherwise use sync version
-                    if asyncio.iscoroutinefunction(self.chat):
-                        response = await self.achat(query)
-                    else:
-                        # Run sync function in a thread to avoid blocking
-                        loop = asyncio.get_event_loop()
-                        response = await loop.run_in_executor(None, lambda p=query: self.chat(p))
-                    
-                    return {"response": response}
-                except Exception as e:
-                    logging.error(f"Error processing query: {str(e)}", exc_info=True)
-                    return JSONResponse(
-                        status_code=500,
-                        content={"error": f"Error processing query: {str(e)}"}
-                    )
+                # JSON reply, or SSE / JSON lines events when the client asks to stream
+                return await respond(service, request_data, request)
             
             print(f"🚀 Agent '{self.name}' available at http://{host}:{port}")
             
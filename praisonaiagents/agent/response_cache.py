@@ -0,0 +1,172 @@
+"""
+Response cache for Agent.chat.
+
+Served agents see many near-duplicate questions. With
+``Agent(response_cache=True)`` (or a dict of options) a first-turn question
+is answered from earlier answers of the same agent when it matches exactly
+(case and whitespace aside) or, with ``semantic_threshold`` set, when its
+embedding has at least that cosine similarity to a cached question.
+
+Entries are keyed on the agent's configuration (name, role, goal,
+instructions, model), its toolset, the version of its knowledge and the
+cache scope - the tenant of a served request - so an answer is never served
+to another tenant or after the agent's tools or knowledge changed. Only
+calls without history, per-call tools or structured output are cached, and
+served requests that name no tenant (or user_id) are never cached. A missed
+question is embedded once, and ``achat`` does the semantic lookup in a worker
+thread.
+
+Options: ``ttl`` (seconds, default 3600), ``max_entries`` (default 1024),
+``semantic_threshold`` (None for exact matches only), ``embed`` (callable
+text -> vector) or ``embedding_model`` (OpenAI embeddings, default
+``text-embedding-3-small``).
+"""
+
+import asyncio
+import hashlib
+import inspect
+import logging
+import functools
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from ..knowledge.cache import RetrievalCache
+from ..streaming import emit
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 3600
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_EMBEDDING_MODEL = "text-embedding-3-small"
+# cache_scope of a served request without a tenant: its answers are neither read nor stored
+UNSCOPED = object()
+
+
+def _openai_embed(model: str) -> Callable[[str], List[float]]:
+    def embed(text: str) -> List[float]:
+        from ..main import client
+        return client.embeddings.create(model=model, input=text).data[0].embedding
+    return embed
+
+
+def _tool_name(tool) -> str:
+    if isinstance(tool, dict):
+        return tool.get("function", {}).get("name") or tool.get("name") or repr(sorted(tool))
+    if hasattr(tool, "to_openai_tool"):  # MCP
+        try:
+            tools = tool.to_openai_tool()
+            tools = tools if isinstance(tools, list) else [tools]
+            return ",".join(sorted(t.get("function", {}).get("name", "") for t in tools if isinstance(t, dict)))
+        except Exception:
+            return type(tool).__name__
+    return getattr(tool, "__name__", None) or str(tool)
+
+
+class ResponseCache(RetrievalCache):
+    """
+    Exact and semantic cache of agent answers; see the module docstring.
+
+    Args:
+        ttl: Seconds an answer stays valid; None to keep it until evicted
+        max_entries: Answers kept (least recently used go first)
+        semantic_threshold: Minimum cosine similarity for a near-duplicate hit; None disables
+        embed: Callable returning the embedding of a text
+        embedding_model: OpenAI embedding model used when ``embed`` is None
+    """
+
+    def __init__(
+        self,
+        ttl: Optional[float] = DEFAULT_TTL,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        semantic_threshold: Optional[float] = None,
+        embed: Optional[Callable[[str], List[float]]] = None,
+        embedding_model: str = DEFAULT_EMBEDDING_MODEL
+    ):
+        if semantic_threshold is not None and embed is None:
+            embed = _openai_embed(embedding_model)
+        super().__init__(ttl=ttl, max_entries=max_entries, semantic_threshold=semantic_threshold, embed=embed)
+
+    @classmethod
+    def from_option(cls, option: Union[bool, Dict[str, Any], "ResponseCache", None]) -> Optional["ResponseCache"]:
+        """Build the cache for an Agent's ``response_cache`` argument."""
+        if not option:
+            return None
+        if isinstance(option, ResponseCache):
+            return option
+        return cls(**option) if isinstance(option, dict) else cls()
+
+    @staticmethod
+    def filters(agent) -> Dict[str, Any]:
+        """Everything besides the question an answer depends on."""
+        llm = getattr(agent, "llm_instance", None)
+        model = getattr(llm, "model", None) if llm is not None else getattr(agent, "llm", None)
+        identity = "|".join(str(part) for part in (
+            agent.name, agent.role, agent.goal, agent.backstory, agent.instructions, model
+        ))
+        tools = agent.tools if isinstance(agent.tools, (list, tuple)) else [agent.tools]
+        knowledge = None
+        if agent.knowledge:
+            knowledge = agent.knowledge.version(user_id=agent.user_id, agent_id=agent.knowledge_scope)
+        return {
+            "agent": hashlib.sha256(identity.encode()).hexdigest()[:16],
+            "tools": sorted(_tool_name(tool) for tool in tools if tool),
+            "knowledge": knowledge,
+            "scope": getattr(agent, "cache_scope", None)
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        lookups = stats["hits"] + stats["semantic_hits"] + stats["misses"]
+        stats["hit_rate"] = round((stats["hits"] + stats["semantic_hits"]) / lookups, 4) if lookups else 0.0
+        return stats
+
+
+def _cacheable(self, prompt, tools, output_json, output_pydantic, reasoning_steps) -> bool:
+    return (getattr(self, "response_cache", None) is not None and getattr(self, "cache_scope", None) is not UNSCOPED
+            and isinstance(prompt, str) and not self.chat_history and tools is None and output_json is None and output_pydantic is None and not reasoning_steps)
+
+
+def _serve_cached(self, prompt: str, response: str) -> str:
+    self.chat_history.append({"role": "user", "content": prompt})
+    self.chat_history.append({"role": "assistant", "content": response})
+    emit("token", delta=response)
+    return response
+
+
+def cached_response(fn):
+    """Decorator for ``chat``/``achat``: answer from ``self.response_cache`` when possible."""
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def async_wrapper(self, prompt, temperature=0.2, tools=None, output_json=None, output_pydantic=None, reasoning_steps=False, *args, **kwargs):
+            if not _cacheable(self, prompt, tools, output_json, output_pydantic, reasoning_steps):
+                return await fn(self, prompt, temperature, tools, output_json, output_pydantic, reasoning_steps, *args, **kwargs)
+            cache = self.response_cache
+            key = cache.key(prompt, ResponseCache.filters(self))
+            # A semantic lookup embeds the prompt (a blocking call) and scans the cache: keep it off the loop
+            if cache.semantic_threshold is not None:
+                cached, vector = await asyncio.to_thread(cache.lookup, key)
+            else:
+                cached, vector = cache.lookup(key)
+            if cached is not None:
+                return _serve_cached(self, prompt, cached)
+            generation = cache.generation
+            response = await fn(self, prompt, temperature, tools, output_json, output_pydantic, reasoning_steps, *args, **kwargs)
+            if isinstance(response, str) and response:
+                cache.put(key, response, generation, vector)
+            return response
+        return async_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(self, prompt, temperature=0.2, tools=None, output_json=None, output_pydantic=None, reasoning_steps=False, *args, **kwargs):
+        if not _cacheable(self, prompt, tools, output_json, output_pydantic, reasoning_steps):
+            return fn(self, prompt, temperature, tools, output_json, output_pydantic, reasoning_steps, *args, **kwargs)
+        cache = self.response_cache
+        key = cache.key(prompt, ResponseCache.filters(self))
+        cached, vector = cache.lookup(key)
+        if cached is not None:
+            return _serve_cached(self, prompt, cached)
+        generation = cache.generation
+        response = fn(self, prompt, temperature, tools, output_json, output_pydantic, reasoning_steps, *args, **kwargs)
+        if isinstance(response, str) and response:
+            cache.put(key, response, generation, vector)
+        return response
+    return wrapper
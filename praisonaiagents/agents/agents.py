@@ -5,8 +5,12 @@ import logging
 import asyncio
 import uuid
 import base64
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 import cv2
-from typing import Any, Dict, Optional, List
+from typing import Any, Callable, Dict, Optional, List, Union
 from pydantic import BaseModel
 from rich.text import Text
 from rich.panel import Panel
@@ -16,6 +20,13 @@ from ..main import display_error, TaskOutput, error_logs, client
 from ..agent.agent import Agent
 from ..task.task import Task
 from ..process.process import Process, LoopItems
+from ..process.dag import DAGScheduler
+from ..process.loop import LoopRunner, is_streaming_loop
+from .journal import RunJournal, DEFAULT_RUNS_DIR, task_key
+from .prompt import PromptAssembler, merge_tools
+from ..retry import get_retry_policy
+from ..telemetry.tracing import Tracer, DEFAULT_TRACE_DIR, propagate, span, traced
+from ..streaming import emit
     # Praison AI: Improved memory management for better efficiency
 
 # Task status constants
@@ -34,6 +45,7 @@ logger = logging.getLogger(__name__)
 _agents_server_started = {}  # Dict of port -> started boolean
 _agents_registered_endpoints = {}  # Dict of port -> Dict of path -> endpoint_id
 _agents_shared_apps = {}  # Dict of port -> FastAPI app
+_agents_services = {}  # Dict of port -> Dict of path -> ChainService
 
 def encode_file_to_base64(file_path: str) -> str:
     """Base64-encode a file."""
@@ -59,7 +71,70 @@ def process_video(video_path: str, seconds_per_frame=2):
     video.release()
     return base64_frames
 
-def process_task_context(context_item, verbose=0, user_id=None):
+class ContextRetrievers:
+    """
+    Knowledge retrievers for vector-store context items, built once and keyed by config hash.
+
+    Building a Knowledge (mem0 Memory.from_config plus its vector-store
+    client) takes seconds, so a PraisonAIAgents run resolves each distinct
+    ``{"vector_store": ...}`` context config once and reuses the retriever
+    across tasks and retries.
+    """
+
+    def __init__(self, verbose=0):
+        self.verbose = verbose
+        self._retrievers = {}
+        self._parsed = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def _config(self, cfg):
+        """Parse string configs once per distinct string."""
+        if not isinstance(cfg, str):
+            return cfg
+        parsed = self._parsed.get(cfg)
+        if parsed is None:
+            parsed = self._parsed[cfg] = json.loads(cfg)
+        return parsed
+
+    @staticmethod
+    def key(cfg):
+        return hashlib.sha256(json.dumps(cfg, sort_keys=True, default=str).encode()).hexdigest()
+
+    def resolve(self, cfg):
+        """Return the Knowledge retriever for a vector_store config, building it at most once."""
+        from ..knowledge.knowledge import Knowledge
+        cfg = self._config(cfg)
+        key = self.key(cfg)
+        retriever = self._retrievers.get(key)
+        if retriever is not None:
+            return retriever
+        with self._lock:
+            key_lock = self._locks.setdefault(key, threading.Lock())
+        with key_lock:
+            retriever = self._retrievers.get(key)
+            if retriever is None:
+                retriever = Knowledge(config={"vector_store": cfg}, verbose=self.verbose)
+                retriever.memory  # build the client now, not inside the first query
+                self._retrievers[key] = retriever
+                logger.debug(f"Resolved context retriever {key[:12]}")
+        return retriever
+
+    def clear(self):
+        with self._lock:
+            self._retrievers.clear()
+            self._parsed.clear()
+            self._locks.clear()
+
+    def __len__(self):
+        return len(self._retrievers)
+
+
+def is_vector_context(context_item):
+    return isinstance(context_item, dict) and "vector_store" in context_item
+
+
+def process_task_context(context_item, verbose=0, user_id=None, retrievers=None):
     """
     Process a single context item for task execution.
     This helper function avoids code duplication between async and sync execution methods.
@@ -67,6 +142,7 @@ def process_task_context(context_item, verbose=0, user_id=None):
         context_item: The context item to process (can be string, list, task object, or dict)
         verbose: Verbosity level for logging
         user_id: User ID for database queries
+        retrievers: Optional ContextRetrievers reused for vector-store items
         
     Returns:
         str: Formatted context string for this item
@@ -86,15 +162,12 @@ def process_task_context(context_item, verbose=0, user_id=None):
             return f"Previous task {task_name} completed but produced no result."
         else:
             return f"Previous task {task_name} is not yet completed (status: {task_status or TaskStatus.UNKNOWN.value})."
-    elif isinstance(context_item, dict) and "vector_store" in context_item:
-        from ..knowledge.knowledge import Knowledge
+    elif is_vector_context(context_item):
         try:
-            # Handle both string and dict configs
-            cfg = context_item["vector_store"]
-            if isinstance(cfg, str):
-                cfg = json.loads(cfg)
-            
-            knowledge = Knowledge(config={"vector_store": cfg}, verbose=verbose)
+            if retrievers is None:
+                retrievers = ContextRetrievers(verbose)
+            # Handles both string and dict configs
+            knowledge = retrievers.resolve(context_item["vector_store"])
             
             # Only use user_id as filter
             db_results = knowledge.search(
@@ -107,8 +180,23 @@ def process_task_context(context_item, verbose=0, user_id=None):
     else:
         return str(context_item)  # Fallback for unknown types
 
+_add_task_lock = threading.Lock()
+_context_pool = None
+_context_pool_lock = threading.Lock()
+
+
+def _context_executor():
+    """Shared pool for vector-store context queries."""
+    global _context_pool
+    if _context_pool is None:
+        with _context_pool_lock:
+            if _context_pool is None:
+                _context_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="task-context")
+    return _context_pool
+
+
 class PraisonAIAgents:
-    def __init__(self, agents, tasks=None, verbose=0, completion_checker=None, max_retries=5, process="sequential", manager_llm=None, memory=False, memory_config=None, embedder=None, user_id=None, max_iter=10, stream=True, name: Optional[str] = None):
+    def __init__(self, agents, tasks=None, verbose=0, completion_checker=None, max_retries=5, process="sequential", manager_llm=None, memory=False, memory_config=None, embedder=None, user_id=None, max_iter=10, stream=True, name: Optional[str] = None, max_workers: int = 4, journal: Union[bool, str] = False, manager_batch: bool = False, max_manager_calls: Optional[int] = None, max_prompt_tokens: Optional[int] = None, trace: Union[bool, str] = False, serialize_agents: bool = True):
         # Add check at the start if memory is requested
         if memory:
             try:
@@ -142,6 +230,21 @@ class PraisonAIAgents:
         self.process = process
         self.stream = stream
         self.name = name  # Store the name for the Agents collection
+        self.max_workers = max_workers  # Concurrent tasks for process="dag" and manager batches
+        # process="dag": tasks of one Agent run in turn and share its chat history; with False
+        # each task runs on a clone of its agent, so a fan-out over one Agent runs concurrently
+        self.serialize_agents = serialize_agents
+        self.manager_batch = manager_batch  # hierarchical: manager assigns batches of tasks per call
+        self.max_manager_calls = max_manager_calls
+        self.max_prompt_tokens = max_prompt_tokens  # default per-task prompt budget; None for no limit
+        self.dag_report = None
+        # Run journal for checkpoint/resume: True uses .praison/runs, a string sets the directory
+        self.journal_dir = DEFAULT_RUNS_DIR if journal is True else (journal or None)
+        self.journal: Optional[RunJournal] = None
+        # Execution timeline per run: True writes to .praison/traces, a string sets the directory
+        self.trace_dir = DEFAULT_TRACE_DIR if trace is True else (trace or None)
+        self.tracer: Optional[Tracer] = None
+        self.trace_summary: Optional[Dict[str, Any]] = None
         
         # Check for manager_llm in environment variable if not provided
         self.manager_llm = manager_llm or os.getenv('OPENAI_MODEL_NAME', 'gpt-4o')
@@ -180,7 +283,10 @@ class PraisonAIAgents:
             task.status = "not started"
             
         # If tasks were auto-generated from agents or process is sequential, set up sequential flow
-        if len(tasks) > 1 and (process == "sequential" or all(task.next_tasks == [] for task in tasks)):
+        # The DAG scheduler derives order from context/next_tasks/condition, and a batching
+        # manager decides the order itself, so neither is chained
+        unchained = process == "dag" or (process == "hierarchical" and manager_batch)
+        if len(tasks) > 1 and not unchained and (process == "sequential" or all(task.next_tasks == [] for task in tasks)):
             for i in range(len(tasks) - 1):
                 # Set up next task relationship
                 tasks[i].next_tasks = [tasks[i + 1].name]
@@ -191,6 +297,7 @@ class PraisonAIAgents:
             logger.info("Set up sequential flow with automatic context passing")
         
         self._state = {}  # Add state storage at PraisonAIAgents level
+        self.context_retrievers = ContextRetrievers(verbose)  # vector-store context, reset at the start of each run
         
         # Initialize memory system
         self.shared_memory = None
@@ -243,11 +350,46 @@ class PraisonAIAgents:
                     task.memory = self.shared_memory
                     logger.info(f"Assigned shared memory to task {task.id}")
 
+    @traced("task.context", "task")
+    def process_context(self, context):
+        """Format a task's context items in order; vector-store queries run concurrently."""
+        results = [None] * len(context)
+        pending = {}
+        for i, item in enumerate(context):
+            if is_vector_context(item):
+                pending[i] = _context_executor().submit(
+                    propagate(process_task_context), item, self.verbose, self.user_id, self.context_retrievers
+                )
+            else:
+                results[i] = process_task_context(item, self.verbose, self.user_id)
+        for i, future in pending.items():
+            results[i] = future.result()
+        return results
+
+    @traced("task.context", "task")
+    async def aprocess_context(self, context):
+        """Async counterpart of :meth:`process_context`."""
+        results = [None] * len(context)
+        pending = {}
+        for i, item in enumerate(context):
+            if is_vector_context(item):
+                # create_task starts the query now, while the remaining items are formatted
+                pending[i] = asyncio.create_task(asyncio.to_thread(
+                    process_task_context, item, self.verbose, self.user_id, self.context_retrievers
+                ))
+            else:
+                results[i] = process_task_context(item, self.verbose, self.user_id)
+        if pending:
+            for i, result in zip(pending, await asyncio.gather(*pending.values())):
+                results[i] = result
+        return results
+
     def add_task(self, task):
-        task_id = self.task_id_counter
-        task.id = task_id
-        self.tasks[task_id] = task
-        self.task_id_counter += 1
+        with _add_task_lock:  # loop subtasks may be added from DAG worker threads
+            task_id = self.task_id_counter
+            task.id = task_id
+            self.tasks[task_id] = task
+            self.task_id_counter += 1
         return task_id
 
     def clean_json_output(self, output: str) -> str:
@@ -291,35 +433,11 @@ class PraisonAIAgents:
 
         executor_agent = task.agent
 
-        # Ensure tools are available from both task and agent
-        tools = task.tools or []
-        if executor_agent and executor_agent.tools:
-            tools.extend(executor_agent.tools)
-
-        task_prompt = f"""
-You need to do the following task: {task.description}.
-Expected Output: {task.expected_output}.
-"""
-        if task.context:
-            context_results = []  # Use list to avoid duplicates
-            for context_item in task.context:
-                # Use the centralized helper function
-                context_str = process_task_context(context_item, self.verbose, self.user_id)
-                context_results.append(context_str)
-            
-            # Join unique context results with proper formatting
-            unique_contexts = list(dict.fromkeys(context_results))  # Remove duplicates
-            if self.verbose >= 3:
-                logger.info(f"Task {task_id} context items: {len(unique_contexts)}")
-                for i, ctx in enumerate(unique_contexts):
-                    logger.info(f"Context {i+1}: {ctx[:100]}...")
-            context_separator = '\n\n'
-            task_prompt += f"""
-Context:
-
-{context_separator.join(unique_contexts)}
-"""
-        task_prompt += "Please provide only the final result of your work. Do not add any conversation or extra explanation."
+        # Ensure tools are available from both task and agent, without mutating task.tools
+        tools = merge_tools(task.tools, executor_agent.tools if executor_agent else None)
+
+        context_results = await self.aprocess_context(task.context) if task.context else []
+        task_prompt, prompt_stats = self._assemble_prompt(task_id, context_results)
 
         if self.verbose >= 2:
             logger.info(f"Executing task {task_id}: {task.description} using {executor_agent.name}")
@@ -360,14 +478,14 @@ Context:
 
             agent_output = await executor_agent.achat(
                 _get_multimodal_message(task_prompt, task.images),
-                tools=tools,
+                tools=tools or None,
                 output_json=task.output_json,
                 output_pydantic=task.output_pydantic
             )
         else:
             agent_output = await executor_agent.achat(
                 task_prompt,
-                tools=tools,
+                tools=tools or None,
                 output_json=task.output_json,
                 output_pydantic=task.output_pydantic
             )
@@ -378,7 +496,8 @@ Context:
                 summary=task.description[:10],
                 raw=agent_output,
                 agent=executor_agent.name,
-                output_format="RAW"
+                output_format="RAW",
+                prompt_tokens=prompt_stats["prompt_tokens"]
             )
 
             if task.output_json:
@@ -408,6 +527,7 @@ Context:
             task.status = "failed"
             return None
 
+    @traced("task.run", "task", attributes=lambda self, task_id: self._task_attributes(task_id))
     async def arun_task(self, task_id):
         """Async version of run_task method"""
         if task_id not in self.tasks:
@@ -417,6 +537,11 @@ Context:
         if task.status == "completed":
             logger.info(f"Task with ID {task_id} is already completed")
             return
+        if is_streaming_loop(task):
+            return await asyncio.to_thread(self._run_loop_task, task_id)
+        if self._replay_task(task_id):
+            return
+        self._journal_task(task_id)
 
         retries = 0
         while task.status != "completed" and retries < self.max_retries:
@@ -450,13 +575,15 @@ Context:
                             logger.exception(e)
                             
                     self.save_output_to_file(task, task_output)
+                    self._journal_task(task_id, "completed", task_output)
+                    self._emit_completed(task_id, task_output)
                     if self.verbose >= 1:
                         logger.info(f"Task {task_id} completed successfully.")
                 else:
                     task.status = "in progress"
                     if self.verbose >= 1:
                         logger.info(f"Task {task_id} not completed, retrying")
-                    await asyncio.sleep(1)
+                    await asyncio.sleep(get_retry_policy().backoff(retries + 1))
                     retries += 1
             else:
                 if task.status == "failed":
@@ -468,15 +595,19 @@ Context:
 
         if retries == self.max_retries and task.status != "completed":
             logger.info(f"Task {task_id} failed after {self.max_retries} retries.")
+            self._journal_task(task_id, "failed")
 
     async def arun_all_tasks(self):
         """Async version of run_all_tasks method"""
+        self.context_retrievers = ContextRetrievers(self.verbose)
         process = Process(
             tasks=self.tasks,
             agents=self.agents,
             manager_llm=self.manager_llm,
             verbose=self.verbose,
-            max_iter=self.max_iter
+            max_iter=self.max_iter,
+            manager_batch=self.manager_batch,
+            max_manager_calls=self.max_manager_calls
         )
         
         if self.process == "workflow":
@@ -499,6 +630,10 @@ Context:
             if parallel_tasks:
                 await asyncio.gather(*[self.arun_task(t) for t in parallel_tasks])
                 
+        elif self.process == "dag":
+            scheduler = DAGScheduler(self.tasks, max_workers=self.max_workers, max_iter=self.max_iter,
+                                     serialize_agents=self.serialize_agents)
+            self.dag_report = await scheduler.arun(self._arun_dag_node)
         elif self.process == "sequential":
             async for task_id in process.asequential():
                 if self.tasks[task_id].async_execution:
@@ -507,6 +642,9 @@ Context:
                     self.run_task(task_id)
         elif self.process == "hierarchical":
             async for task_id in process.ahierarchical():
+                if isinstance(task_id, list):
+                    await self._arun_batch(task_id)
+                    continue
                 if isinstance(task_id, Task):
                     task_id = self.add_task(task_id)
                 if self.tasks[task_id].async_execution:
@@ -514,12 +652,13 @@ Context:
                 else:
                     self.run_task(task_id)
 
-    async def astart(self, content=None, return_dict=False, **kwargs):
+    async def astart(self, content=None, return_dict=False, resume: Optional[str] = None, **kwargs):
         """Async version of start method
         
         Args:
             content: Optional content to add to all tasks' context
             return_dict: If True, returns the full results dictionary instead of only the final response
+            resume: run_id of a journaled run to continue; its completed tasks are replayed
             **kwargs: Additional arguments
         """
         if content:
@@ -530,7 +669,14 @@ Context:
                         task.context = []
                     task.context.append(content)
 
-        await self.arun_all_tasks()
+        self._open_journal(resume)
+        self._open_trace()
+        try:
+            with span("run", "run", process=self.process, run_id=self.run_id):
+                await self.arun_all_tasks()
+        finally:
+            self._close_trace()
+            self._close_journal()
         
         # Get results
         results = {
@@ -551,6 +697,21 @@ Context:
         # Return full results dict if return_dict is True or if no final result was found
         return results
 
+    def _assemble_prompt(self, task_id, context_results, memory_context=None):
+        """Task prompt within the task's token budget (config "max_prompt_tokens", else the run's)."""
+        task = self.tasks[task_id]
+        budget = (task.config or {}).get("max_prompt_tokens", self.max_prompt_tokens)
+        task_prompt, prompt_stats = PromptAssembler(budget).assemble(
+            task.description, task.expected_output, context_results, memory_context
+        )
+        if self.verbose >= 3:
+            logger.info(
+                f"Task {task_id} prompt: {prompt_stats['prompt_tokens']} tokens, "
+                f"{prompt_stats['context_items']} context items "
+                f"({prompt_stats['truncated']} truncated, {prompt_stats['dropped']} dropped)"
+            )
+        return task_prompt, prompt_stats
+
     def save_output_to_file(self, task, task_output):
         if task.output_file:
             try:
@@ -596,40 +757,20 @@ Context:
 
         executor_agent = task.agent
 
-        task_prompt = f"""
-You need to do the following task: {task.description}.
-Expected Output: {task.expected_output}.
-"""
-        if task.context:
-            context_results = []  # Use list to avoid duplicates
-            for context_item in task.context:
-                # Use the centralized helper function
-                context_str = process_task_context(context_item, self.verbose, self.user_id)
-                context_results.append(context_str)
-            
-            # Join unique context results with proper formatting
-            unique_contexts = list(dict.fromkeys(context_results))  # Remove duplicates
-            if self.verbose >= 3:
-                logger.info(f"Task {task_id} context items: {len(unique_contexts)}")
-                for i, ctx in enumerate(unique_contexts):
-                    logger.info(f"Context {i+1}: {ctx[:100]}...")
-            context_separator = '\n\n'
-            task_prompt += f"""
-Context:
-
-{context_separator.join(unique_contexts)}
-"""
+        # Ensure tools are available from both task and agent, without mutating task.tools
+        tools = merge_tools(task.tools, executor_agent.tools if executor_agent else None)
+
+        context_results = self.process_context(task.context) if task.context else []
 
         # Add memory context if available
+        memory_context = None
         if task.memory:
             try:
                 memory_context = task.memory.build_context_for_task(task.description)
-                if memory_context:
-                    task_prompt += f"\n\nRelevant memory context:\n{memory_context}"
             except Exception as e:
                 logger.error(f"Error getting memory context: {e}")
 
-        task_prompt += "Please provide only the final result of your work. Do not add any conversation or extra explanation."
+        task_prompt, prompt_stats = self._assemble_prompt(task_id, context_results, memory_context)
 
         if self.verbose >= 2:
             logger.info(f"Executing task {task_id}: {task.description} using {executor_agent.name}")
@@ -670,14 +811,14 @@ Context:
 
             agent_output = executor_agent.chat(
                 _get_multimodal_message(task_prompt, task.images),
-                tools=task.tools,
+                tools=tools or None,
                 output_json=task.output_json,
                 output_pydantic=task.output_pydantic
             )
         else:
             agent_output = executor_agent.chat(
                 task_prompt,
-                tools=task.tools,
+                tools=tools or None,
                 output_json=task.output_json,
                 output_pydantic=task.output_pydantic,
                 stream=self.stream,
@@ -700,7 +841,8 @@ Context:
                 summary=task.description[:10],
                 raw=agent_output,
                 agent=executor_agent.name,
-                output_format="RAW"
+                output_format="RAW",
+                prompt_tokens=prompt_stats["prompt_tokens"]
             )
 
             if task.output_json:
@@ -730,6 +872,7 @@ Context:
             task.status = "failed"
             return None
 
+    @traced("task.run", "task", attributes=lambda self, task_id: self._task_attributes(task_id))
     def run_task(self, task_id):
         """Synchronous version of run_task method"""
         if task_id not in self.tasks:
@@ -739,6 +882,11 @@ Context:
         if task.status == "completed":
             logger.info(f"Task with ID {task_id} is already completed")
             return
+        if is_streaming_loop(task):
+            return self._run_loop_task(task_id)
+        if self._replay_task(task_id):
+            return
+        self._journal_task(task_id)
 
         retries = 0
         while task.status != "completed" and retries < self.max_retries:
@@ -772,13 +920,15 @@ Context:
                             logger.exception(e)
                             
                     self.save_output_to_file(task, task_output)
+                    self._journal_task(task_id, "completed", task_output)
+                    self._emit_completed(task_id, task_output)
                     if self.verbose >= 1:
                         logger.info(f"Task {task_id} completed successfully.")
                 else:
                     task.status = "in progress"
                     if self.verbose >= 1:
                         logger.info(f"Task {task_id} not completed, retrying")
-                    time.sleep(1)
+                    time.sleep(get_retry_policy().backoff(retries + 1))
                     retries += 1
             else:
                 if task.status == "failed":
@@ -790,29 +940,238 @@ Context:
 
         if retries == self.max_retries and task.status != "completed":
             logger.info(f"Task {task_id} failed after {self.max_retries} retries.")
+            self._journal_task(task_id, "failed")
 
     def run_all_tasks(self):
         """Synchronous version of run_all_tasks method"""
+        self.context_retrievers = ContextRetrievers(self.verbose)
         process = Process(
             tasks=self.tasks,
             agents=self.agents,
             manager_llm=self.manager_llm,
             verbose=self.verbose,
-            max_iter=self.max_iter
+            max_iter=self.max_iter,
+            manager_batch=self.manager_batch,
+            max_manager_calls=self.max_manager_calls
         )
         
         if self.process == "workflow":
             for task_id in process.workflow():
                 self.run_task(task_id)
+        elif self.process == "dag":
+            scheduler = DAGScheduler(self.tasks, max_workers=self.max_workers, max_iter=self.max_iter,
+                                     serialize_agents=self.serialize_agents)
+            self.dag_report = scheduler.run(propagate(self._run_dag_node))
         elif self.process == "sequential":
             for task_id in process.sequential():
                 self.run_task(task_id)
         elif self.process == "hierarchical":
             for task_id in process.hierarchical():
+                if isinstance(task_id, list):
+                    self._run_batch(task_id)
+                    continue
                 if isinstance(task_id, Task):
                     task_id = self.add_task(task_id)
                 self.run_task(task_id)
 
+    def _agent_groups(self, task_ids):
+        """Split a batch by Agent instance; an Agent keeps one chat history, so its tasks run in turn."""
+        groups = {}
+        for task_id in task_ids:
+            agent = getattr(self.tasks[task_id], "agent", None)
+            groups.setdefault(id(agent) if agent is not None else ("task", task_id), []).append(task_id)
+        return list(groups.values())
+
+    def _run_batch(self, task_ids):
+        """Run a batch of independent tasks from the hierarchical manager concurrently."""
+        groups = self._agent_groups(task_ids)
+        if len(groups) == 1:
+            for task_id in groups[0]:
+                self.run_task(task_id)
+            return
+
+        def run_group(group):
+            for task_id in group:
+                self.run_task(task_id)
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(groups))) as pool:
+            list(pool.map(propagate(run_group), groups))
+
+    async def _arun_batch(self, task_ids):
+        semaphore = asyncio.Semaphore(self.max_workers)
+
+        async def run_group(group):
+            async with semaphore:
+                for task_id in group:
+                    if self.tasks[task_id].async_execution:
+                        await self.arun_task(task_id)
+                    else:
+                        await asyncio.to_thread(self.run_task, task_id)
+
+        await asyncio.gather(*(run_group(group) for group in self._agent_groups(task_ids)))
+
+    @contextmanager
+    def _own_agent(self, task_id):
+        """
+        Without ``serialize_agents``, run the task on a clone of its agent: the
+        clone starts from the agent's history, and its own turns are not merged back.
+        """
+        task = self.tasks[task_id]
+        agent = task.agent
+        if self.serialize_agents or agent is None or not hasattr(agent, "clone"):
+            yield
+            return
+        task.agent = agent.clone(list(agent.chat_history))
+        try:
+            yield
+        finally:
+            task.agent = agent
+
+    def _run_dag_node(self, task_id):
+        """Execute one DAG node; loop tasks run their input rows."""
+        with self._own_agent(task_id):
+            if self.tasks[task_id].task_type == "loop":
+                return self._run_loop_task(task_id)
+            return self.run_task(task_id)
+
+    async def _arun_dag_node(self, task_id):
+        task = self.tasks[task_id]
+        with self._own_agent(task_id):
+            if task.task_type == "loop":
+                return await asyncio.to_thread(self._run_loop_task, task_id)
+            if task.async_execution:
+                return await self.arun_task(task_id)
+            return await asyncio.to_thread(self.run_task, task_id)
+
+    @traced("loop.run", "task", attributes=lambda self, task_id: self._task_attributes(task_id))
+    def _run_loop_task(self, task_id):
+        """Stream a loop task's input rows through its agent; see process/loop.py."""
+        loop_task = self.tasks[task_id]
+        if self._replay_task(task_id):
+            return loop_task.result
+        loop_task.status = "in progress"
+        self._journal_task(task_id)
+        context = ""
+        if loop_task.context:
+            context = "\n\n".join(dict.fromkeys(self.process_context(loop_task.context)))
+        runner = LoopRunner.from_task(loop_task, context=context)
+        if self.journal is not None and runner.checkpoint is None:
+            runner.checkpoint = self.journal.file_path(f"loop_{task_key(loop_task, task_id)}.json")
+        try:
+            task_output = runner.run()
+        except Exception as e:
+            display_error(f"Loop task {loop_task.name} failed: {e}")
+            logger.exception(e)
+            loop_task.status = "failed"
+            self._journal_task(task_id, "failed")
+            return None
+        loop_task.result = task_output
+        loop_task.status = "completed"
+        if self.journal is not None:
+            self.journal.record("loop", task=task_key(loop_task, task_id), offset=loop_task.loop_state.get("offset"))
+        self._journal_task(task_id, "completed", task_output)
+        self._emit_completed(task_id, task_output)
+        if loop_task.callback:
+            try:
+                if asyncio.iscoroutinefunction(loop_task.callback):
+                    asyncio.run(loop_task.callback(task_output))
+                else:
+                    loop_task.callback(task_output)
+            except Exception as e:
+                logger.error(f"Error executing task callback for loop task {task_id}: {e}")
+        return task_output
+
+    def _emit_completed(self, task_id, task_output: TaskOutput):
+        task = self.tasks[task_id]
+        emit("agent_completed", agent=task_output.agent, task=task.name or task_id, output=task_output.raw)
+
+    def _journal_task(self, task_id, status: str = "in progress", task_output: Optional[TaskOutput] = None):
+        """Record a task transition (and its output once completed) in the run journal."""
+        if self.journal is None:
+            return
+        key = task_key(self.tasks[task_id], task_id)
+        if status == "completed":
+            self.journal.task_completed(key, task_output or self.tasks[task_id].result)
+        elif status == "failed":
+            self.journal.task_failed(key)
+        else:
+            self.journal.task_started(key)
+
+    def _replay_task(self, task_id) -> bool:
+        """When resuming, complete the task from its next journaled output instead of running it."""
+        if self.journal is None:
+            return False
+        task = self.tasks[task_id]
+        task_output = self.journal.replay(task_key(task, task_id), task)
+        if task_output is None:
+            return False
+        task.result = task_output
+        task.status = "completed"
+        logger.debug(f"Replayed task {task.name or task_id} from run journal {self.run_id}")
+        return True
+
+    def _open_journal(self, resume: Optional[str] = None):
+        """Start journaling this run, or load the journal of ``resume`` to continue it."""
+        if resume:
+            self.run_id = resume
+            self.journal = RunJournal(resume, self.journal_dir or DEFAULT_RUNS_DIR)
+            if not self.journal.exists():
+                logger.warning(f"No journal found for run {resume}; starting it from the beginning")
+            completed = self.journal.load()
+            self._state.update(self.journal.state)
+            self.journal.record("resume", process=self.process)
+            logger.info(f"Resuming run {resume}: {completed} completed task executions to replay")
+        elif self.journal_dir:
+            self.journal = RunJournal(self.run_id, self.journal_dir)
+            self.journal.record(
+                "run",
+                process=self.process,
+                tasks=[task_key(task, task_id) for task_id, task in self.tasks.items()]
+            )
+            # State set before start() is part of the run
+            for key in self._state:
+                self._journal_state(key)
+        else:
+            self.journal = None
+
+    def _close_journal(self):
+        if self.journal is not None:
+            self.journal.record("finished", replayed=self.journal.replayed)
+            self.journal.close()
+
+    def _task_attributes(self, task_id) -> Dict[str, Any]:
+        task = self.tasks.get(task_id)
+        return {"task_id": task_id, "name": task.name if task else None, "agent": task.agent.name if task and task.agent else None}
+
+    def _open_trace(self):
+        """Record this run's execution timeline when ``trace`` is set."""
+        self.tracer = Tracer(self.run_id).start() if self.trace_dir else None
+
+    def _close_trace(self):
+        """Export the timeline to Chrome trace and OTLP files and keep its summary."""
+        if self.tracer is None:
+            return
+        self.tracer.stop()
+        base = os.path.join(self.trace_dir, self.run_id)
+        try:
+            self.tracer.export_chrome(base + ".trace.json")
+            self.tracer.export_otlp(base + ".otlp.json")
+        except OSError as e:
+            logger.warning(f"Could not write trace for run {self.run_id}: {e}")
+        self.trace_summary = self.tracer.summary()
+        if self.verbose >= 1:
+            logger.info(self.tracer.format_summary())
+
+    def _journal_state(self, key: Optional[str] = None, deleted: bool = False):
+        if self.journal is None:
+            return
+        if key is None:
+            self.journal.record("state_clear")
+        elif deleted:
+            self.journal.record("state_delete", key=key)
+        else:
+            self.journal.record("state", key=key, value=self._state.get(key))
+
     def get_task_status(self, task_id):
         if task_id in self.tasks:
             return self.tasks[task_id].status
@@ -837,12 +1196,13 @@ Context:
             return str(agent[0])
         return None
 
-    def start(self, content=None, return_dict=False, **kwargs):
+    def start(self, content=None, return_dict=False, resume: Optional[str] = None, **kwargs):
         """Start agent execution with optional content and config
         
         Args:
             content: Optional content to add to all tasks' context
             return_dict: If True, returns the full results dictionary instead of only the final response
+            resume: run_id of a journaled run to continue; its completed tasks are replayed
             **kwargs: Additional arguments
         """
         if content:
@@ -856,7 +1216,14 @@ Context:
                     task.context.append(content)
                 
         # Run tasks as before
-        self.run_all_tasks()
+        self._open_journal(resume)
+        self._open_trace()
+        try:
+            with span("run", "run", process=self.process, run_id=self.run_id):
+                self.run_all_tasks()
+        finally:
+            self._close_trace()
+            self._close_journal()
         
         # Get results
         results = {
@@ -880,6 +1247,7 @@ Context:
     def set_state(self, key: str, value: Any) -> None:
         """Set a state value"""
         self._state[key] = value
+        self._journal_state(key)
 
     def get_state(self, key: str, default: Any = None) -> Any:
         """Get a state value"""
@@ -888,10 +1256,13 @@ Context:
     def update_state(self, updates: Dict) -> None:
         """Update multiple state values"""
         self._state.update(updates)
+        for key in updates:
+            self._journal_state(key)
 
     def clear_state(self) -> None:
         """Clear all state values"""
         self._state.clear()
+        self._journal_state()
     
     # Convenience methods for enhanced state management
     def has_state(self, key: str) -> bool:
@@ -906,6 +1277,7 @@ Context:
         """Delete a state key if it exists. Returns True if deleted, False if key didn't exist."""
         if key in self._state:
             del self._state[key]
+            self._journal_state(key, deleted=True)
             return True
         return False
     
@@ -916,6 +1288,7 @@ Context:
             raise TypeError(f"Cannot increment non-numeric value at key '{key}': {type(current).__name__}")
         new_value = current + amount
         self._state[key] = new_value
+        self._journal_state(key)
         return new_value
     
     def append_to_state(self, key: str, value: Any, max_length: Optional[int] = None) -> List[Any]:
@@ -945,6 +1318,7 @@ Context:
         if max_length and len(self._state[key]) > max_length:
             self._state[key] = self._state[key][-max_length:]
         
+        self._journal_state(key)
         return self._state[key]
     
     def save_session_state(self, session_id: str, include_memory: bool = True) -> None:
@@ -992,10 +1366,12 @@ Context:
         
         return False
         
-    def launch(self, path: str = '/agents', port: int = 8000, host: str = '0.0.0.0', debug: bool = False, protocol: str = "http"):
+    def launch(self, path: str = '/agents', port: int = 8000, host: str = '0.0.0.0', debug: bool = False, protocol: str = "http", workers: Optional[int] = None, max_in_flight: int = 32, max_queue: Optional[int] = 64, queue_timeout: Optional[float] = 30.0, tenant_weights: Optional[Dict[str, float]] = None, tenant_max_in_flight: Optional[int] = None, batch_share: float = 0.75, prewarm: bool = True, tenant_resolver: Optional[Callable] = None):
         """
         Launch all agents as a single API endpoint (HTTP) or an MCP server. 
-        In HTTP mode, the endpoint accepts a query and processes it through all agents in sequence.
+        In HTTP mode, the endpoint accepts a query and processes it through all agents in sequence;
+        with "stream": true (or Accept: text/event-stream) it sends token, tool and per-agent
+        completion events as SSE while the chain runs.
         In MCP mode, an MCP server is started, exposing a tool to run the agent workflow.
         
         Args:
@@ -1004,12 +1380,24 @@ Context:
             host: Server host (default: '0.0.0.0')
             debug: Enable debug mode for uvicorn (default: False)
             protocol: "http" to launch as FastAPI, "mcp" to launch as MCP server.
+            workers: HTTP: threads running agent chains (default: max_in_flight)
+            max_in_flight: HTTP: requests processed at once (default: 32)
+            max_queue: HTTP: requests waiting for a slot before new ones get 429 (default: 64)
+            queue_timeout: HTTP: seconds a request may wait before it gets 503 (default: 30)
+            tenant_weights: HTTP: fair-share weight per tenant ("tenant" or "user_id" of the request; default 1 each).
+                These body fields come from the caller; unless a trusted proxy sets them, pass tenant_resolver
+            tenant_max_in_flight: HTTP: requests processed at once per tenant (default: no cap)
+            batch_share: HTTP: fraction of max_in_flight that "priority": "batch" requests may use (default: 0.75)
+            prewarm: HTTP: warm the agents in the background; /ready answers 503 until done (default: True)
+            tenant_resolver: HTTP: ``(payload, request) -> tenant`` deriving the tenant from the
+                request (e.g. an authenticated header) instead of its body (default: None)
             
         Returns:
             None
         """
         if protocol == "http":
-            global _agents_server_started, _agents_registered_endpoints, _agents_shared_apps
+            global _agents_server_started, _agents_registered_endpoints, _agents_shared_apps, _agents_services
+            console = Console()
             
             if not self.agents:
                 logging.warning("No agents to launch for HTTP mode. Add agents to the Agents instance first.")
@@ -1024,17 +1412,25 @@ Context:
                 import threading
                 import time
                 import asyncio # Ensure asyncio is imported for HTTP mode too
+                from ..serve import ChainService
+                from ..serve.http import readiness, respond
+                from ..serve.service import prewarm_in_background
                 
                 # Define the request model here since we need pydantic
                 class AgentQuery(BaseModel):
                     query: str
+                    stream: bool = False
+                    format: Optional[str] = None
+                    # Scheduling: fair share per tenant (or user_id), "interactive" or "batch"
+                    tenant: Optional[Union[str, int]] = None
+                    user_id: Optional[Union[str, int]] = None
+                    priority: Optional[str] = None
                     
             except ImportError as e:
                 # Check which specific module is missing
                 missing_module = str(e).split("No module named '")[-1].rstrip("'")
                 display_error(f"Missing dependency: {missing_module}. Required for launch() method with HTTP mode.")
                 logging.error(f"Missing dependency: {missing_module}. Required for launch() method with HTTP mode.")
-                console = Console()
                 console.print(f"\n[yellow]To add API capabilities, install the required dependencies:[/yellow]")
                 console.print(f"[cyan]pip install {missing_module}[/cyan]")
                 console.print("\n[yellow]Or install all API dependencies with:[/yellow]")
@@ -1044,6 +1440,7 @@ Context:
             # Initialize port-specific collections if needed
             if port not in _agents_registered_endpoints:
                 _agents_registered_endpoints[port] = {}
+                _agents_services[port] = {}
                 
             # Initialize shared FastAPI app if not already created for this port
             if _agents_shared_apps.get(port) is None:
@@ -1065,8 +1462,14 @@ Context:
                 async def healthcheck():
                     return {
                         "status": "ok", 
-                        "endpoints": list(_agents_registered_endpoints[port].keys())
+                        "endpoints": list(_agents_registered_endpoints[port].keys()),
+                        "load": {p: s.stats() for p, s in _agents_services[port].items()}
                     }
+
+                # Readiness: 503 until every endpoint's agents are prewarmed
+                @_agents_shared_apps[port].get("/ready")
+                async def ready():
+                    return readiness(_agents_services[port].values())
             
             # Normalize path to ensure it starts with /
             if not path.startswith('/'):
@@ -1087,6 +1490,24 @@ Context:
             endpoint_id = str(uuid.uuid4())
             _agents_registered_endpoints[port][path] = endpoint_id
             
+            # Each request runs the chain on fresh copies of the agents
+            service = ChainService(
+                self.agents,
+                workers=workers,
+                max_in_flight=max_in_flight,
+                max_queue=max_queue,
+                queue_timeout=queue_timeout,
+                tenant_weights=tenant_weights,
+                tenant_max_in_flight=tenant_max_in_flight,
+                batch_share=batch_share,
+                tenant_resolver=tenant_resolver
+            )
+            _agents_services[port][path] = service
+            if prewarm:
+                prewarm_in_background([service])
+            else:
+                service.mark_ready()
+            
             # Define the endpoint handler
             @_agents_shared_apps[port].post(path)
             async def handle_query(request: Request, query_data: Optional[AgentQuery] = None):
@@ -1096,65 +1517,16 @@ Context:
                         request_data = await request.json()
                         if "query" not in request_data:
                             raise HTTPException(status_code=400, detail="Missing 'query' field in request")
-                        query = request_data["query"]
                     except:
                         # Fallback to form data or query params
-                        form_data = await request.form()
-                        if "query" in form_data:
-                            query = form_data["query"]
-                        else:
+                        request_data = dict(await request.form())
+                        if "query" not in request_data:
                             raise HTTPException(status_code=400, detail="Missing 'query' field in request")
                 else:
-                    query = query_data.query
+                    request_data = query_data.model_dump()
                 
-                try:
-                    # Process the query sequentially through all agents
-                    current_input = query
-                    results = []
-                    
-                    for agent_instance in self.agents: # Corrected variable name to agent_instance
-                        try:
-                            # Use async version if available, otherwise use sync version
-                            if asyncio.iscoroutinefunction(agent_instance.chat):
-                                response = await agent_instance.achat(current_input)
-                            else:
-                                # Run sync function in a thread to avoid blocking
-                                loop = asyncio.get_event_loop()
-                                # Correctly pass current_input to the lambda for closure
-                                response = await loop.run_in_executor(None, lambda ci=current_input: agent_instance.chat(ci))
-                            
-                            # Store this agent's result
-                            results.append({
-                                "agent": agent_instance.name,
-                                "response": response
-                            })
-                            
-                            # Use this response as input to the next agent
-                            current_input = response
-                        except Exception as e:
-                            logging.error(f"Error with agent {agent_instance.name}: {str(e)}", exc_info=True)
-                            results.append({
-                                "agent": agent_instance.name,
-                                "error": str(e)
-                            })
-                            # Decide error handling: continue with original input, last good input, or stop? 
-                            # For now, let's continue with the last successful 'current_input' or original 'query' if first agent fails
-                            # This part might need refinement based on desired behavior.
-                            # If an agent fails, its 'response' might be None or an error string.
-                            # current_input will carry that forward. Or, we could choose to halt or use last good input.
-                    
-                    # Return all results and the final output
-                    return {
-                        "query": query,
-                        "results": results,
-                        "final_response": current_input
-                    }
-                except Exception as e:
-                    logging.error(f"Error processing query: {str(e)}", exc_info=True)
-                    return JSONResponse(
-                        status_code=500,
-                        content={"error": f"Error processing query: {str(e)}"}
-                    )
+                # Process the query sequentially through all agents: JSON reply, or streamed events
+                return await respond(service, request_data, request)
             
             console.print(f"[green]🚀 Multi-Agent HTTP API available at http://{host}:{port}{path}[/green]")
             agent_names = ", ".join([agent.name for agent in self.agents])
@@ -0,0 +1,188 @@
+"""
+Durable run journal for PraisonAIAgents.
+
+Task status and outputs normally live only in memory, so a crash or redeploy
+in the middle of a long ``start()`` loses every finished task. With a journal
+the run appends one JSON line per event to
+``.praison/runs/<run_id>/journal.jsonl``:
+
+* ``run`` / ``resume`` - run header with the process type and task keys
+* ``task`` - a task started, completed (with its TaskOutput and decision) or failed
+* ``loop`` - the finished row offset of a streaming loop task
+* ``state`` / ``state_delete`` / ``state_clear`` - changes to the shared ``_state``
+
+``PraisonAIAgents.start(resume=run_id)`` loads the journal, restores the state
+and replays recorded task completions in the order they happened. A task whose
+output is on record is marked completed from the journal instead of calling its
+agent, so the workflow routes exactly as before until it reaches the first task
+with no record, and from there runs for real. Tasks that ran several times
+(workflow loops) replay their outputs one execution at a time. Streaming loop
+tasks keep their row checkpoint in the run directory and continue from it.
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from collections import defaultdict, deque
+from typing import Any, Deque, Dict, List, Optional
+
+from ..main import TaskOutput
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RUNS_DIR = os.path.join(".praison", "runs")
+JOURNAL_FILE = "journal.jsonl"
+
+
+def task_key(task, task_id) -> str:
+    """Stable key for a task across processes: its name, else its id."""
+    return task.name or str(task_id)
+
+
+def output_to_dict(output: TaskOutput) -> Dict[str, Any]:
+    return {
+        "description": output.description,
+        "summary": output.summary,
+        "raw": output.raw,
+        "pydantic": output.pydantic.model_dump() if output.pydantic is not None else None,
+        "json_dict": output.json_dict,
+        "agent": output.agent,
+        "output_format": output.output_format,
+        "prompt_tokens": output.prompt_tokens
+    }
+
+
+def output_from_dict(data: Dict[str, Any], task) -> TaskOutput:
+    """Rebuild a TaskOutput, re-validating the pydantic part against the task's model."""
+    pydantic = None
+    if data.get("pydantic") is not None and task.output_pydantic is not None:
+        try:
+            pydantic = task.output_pydantic(**data["pydantic"])
+        except Exception as e:
+            logger.debug(f"Could not restore pydantic output for {task.name}: {e}")
+    return TaskOutput(
+        description=data.get("description") or task.description,
+        summary=data.get("summary"),
+        raw=data.get("raw") or "",
+        pydantic=pydantic,
+        json_dict=data.get("json_dict"),
+        agent=data.get("agent") or "",
+        output_format=data.get("output_format") or "RAW",
+        prompt_tokens=data.get("prompt_tokens")
+    )
+
+
+class RunJournal:
+    """
+    Append-only JSONL journal of one run.
+
+    Args:
+        run_id: The run's id; the journal lives in ``<base_dir>/<run_id>``
+        base_dir: Directory holding one sub-directory per run
+        fsync: Also fsync every record (survives machine crashes, slower)
+    """
+
+    def __init__(self, run_id: str, base_dir: str = DEFAULT_RUNS_DIR, fsync: bool = False):
+        self.run_id = run_id
+        self.directory = os.path.join(base_dir, run_id)
+        self.path = os.path.join(self.directory, JOURNAL_FILE)
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self._file = None
+        self._replay: Dict[str, Deque[Dict[str, Any]]] = defaultdict(deque)
+        self.state: Dict[str, Any] = {}
+        self.replayed = 0
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def file_path(self, name: str) -> str:
+        """Path for an auxiliary file (e.g. a loop checkpoint) in the run directory."""
+        return os.path.join(self.directory, name)
+
+    # ------------------------------------------------------------------ #
+    #   Writing
+    # ------------------------------------------------------------------ #
+    def record(self, event: str, **fields):
+        entry = {"event": event, "ts": time.time(), **fields}
+        line = json.dumps(entry, ensure_ascii=False, default=str)
+        with self._lock:
+            if self._file is None:
+                os.makedirs(self.directory, exist_ok=True)
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(line + "\n")
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+
+    def task_started(self, key: str):
+        self.record("task", task=key, status="in progress")
+
+    def task_completed(self, key: str, output: Optional[TaskOutput]):
+        fields = {"task": key, "status": "completed"}
+        if output is not None:
+            fields["output"] = output_to_dict(output)
+            decision = getattr(output.pydantic, "decision", None) if output.pydantic is not None else None
+            if decision is not None:
+                fields["decision"] = decision
+        self.record("task", **fields)
+
+    def task_failed(self, key: str):
+        self.record("task", task=key, status="failed")
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    # ------------------------------------------------------------------ #
+    #   Replay
+    # ------------------------------------------------------------------ #
+    def entries(self) -> List[Dict[str, Any]]:
+        """Every readable record; a torn final line from a crash is ignored."""
+        if not self.exists():
+            return []
+        entries = []
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    logger.warning(f"Skipping unreadable journal line {line_number} in {self.path}")
+        return entries
+
+    def load(self) -> int:
+        """Read the journal into the replay queues and state; returns completed task records."""
+        self._replay.clear()
+        self.state = {}
+        completed = 0
+        for entry in self.entries():
+            event = entry.get("event")
+            if event == "task" and entry.get("status") == "completed":
+                self._replay[entry["task"]].append(entry.get("output") or {})
+                completed += 1
+            elif event == "state":
+                self.state[entry["key"]] = entry.get("value")
+            elif event == "state_delete":
+                self.state.pop(entry.get("key"), None)
+            elif event == "state_clear":
+                self.state = {}
+        return completed
+
+    def replay(self, key: str, task) -> Optional[TaskOutput]:
+        """Next recorded output of ``key``, or None once its recorded executions are used up."""
+        with self._lock:
+            queue = self._replay.get(key)
+            if not queue:
+                return None
+            data = queue.popleft()
+            self.replayed += 1
+        return output_from_dict(data, task)
+
+    def pending_replays(self) -> int:
+        return sum(len(q) for q in self._replay.values())
@@ -0,0 +1,163 @@
+"""
+Token-budgeted task prompt assembly.
+
+Task prompts concatenate the full result of every context task, so deep
+pipelines hand their last tasks prompts of tens of thousands of tokens.
+:class:`PromptAssembler` builds the same prompt layout under a token budget:
+
+* the task description, expected output, memory context and closing
+  instruction are always kept
+* context items are ranked by word overlap with the task description; the
+  most relevant ones are kept whole while they fit, and an item that does not
+  fit is reduced to its most relevant sentences (extractive summary) or cut,
+  so less relevant items are the first to shrink or drop
+* items stay in their original order in the prompt
+
+:func:`merge_tools` combines task and agent tools with name-level dedup and
+returns a new list, leaving ``task.tools`` untouched.
+"""
+
+import re
+import logging
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+PROMPT_SUFFIX = "Please provide only the final result of your work. Do not add any conversation or extra explanation."
+
+# Context items below this size are not worth including in truncated form
+MIN_ITEM_TOKENS = 32
+
+_WORD = re.compile(r"\w+")
+_SENTENCE = re.compile(r"(?<=[.!?])\s+|\n+")
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count (about four characters per token)."""
+    return (len(text) + 3) // 4
+
+
+def tool_name(tool: Any) -> str:
+    """Name of a tool given as a function, an OpenAI tool schema, an object with ``name`` or a string."""
+    if isinstance(tool, dict):
+        return str(tool.get("function", {}).get("name") or tool.get("name") or tool)
+    if hasattr(tool, "__name__"):
+        return tool.__name__
+    name = getattr(tool, "name", None)
+    return name if isinstance(name, str) else str(tool)
+
+
+def merge_tools(*tool_lists: Optional[Sequence[Any]]) -> List[Any]:
+    """Concatenate tool lists, keeping the first tool of each name; inputs are not modified."""
+    merged, seen = [], set()
+    for tools in tool_lists:
+        for tool in tools or []:
+            name = tool_name(tool)
+            if name not in seen:
+                seen.add(name)
+                merged.append(tool)
+    return merged
+
+
+def _words(text: str) -> set:
+    return {w.lower() for w in _WORD.findall(text) if len(w) > 2}
+
+
+class PromptAssembler:
+    """
+    Build a task prompt within ``max_tokens``.
+
+    Args:
+        max_tokens: Token budget for the whole prompt; None disables the budget
+        token_counter: Callable returning the token count of a string
+    """
+
+    def __init__(self, max_tokens: Optional[int] = None, token_counter: Optional[Callable[[str], int]] = None):
+        self.max_tokens = max_tokens
+        self.count = token_counter or estimate_tokens
+
+    def assemble(
+        self,
+        description: str,
+        expected_output: Any,
+        contexts: Sequence[str] = (),
+        memory_context: Optional[str] = None
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Return the prompt and stats (``prompt_tokens``, ``truncated``, ``dropped``, ...)."""
+        head = f"""
+You need to do the following task: {description}.
+Expected Output: {expected_output}.
+"""
+        tail = ""
+        if memory_context:
+            tail += f"\n\nRelevant memory context:\n{memory_context}"
+        tail += PROMPT_SUFFIX
+
+        contexts = list(dict.fromkeys(contexts))  # Remove duplicates
+        stats = {"budget": self.max_tokens, "context_items": len(contexts), "truncated": 0, "dropped": 0}
+        if contexts:
+            fitted = self._fit(description, contexts, self.count(head) + self.count(tail) + 8, stats)
+            if fitted:
+                context_separator = '\n\n'
+                head += f"""
+Context:
+
+{context_separator.join(fitted)}
+"""
+        prompt = head + tail
+        stats["prompt_tokens"] = self.count(prompt)
+        return prompt, stats
+
+    def _fit(self, description: str, contexts: List[str], fixed_tokens: int, stats: Dict[str, Any]) -> List[str]:
+        if self.max_tokens is None:
+            return contexts
+        sizes = [self.count(c) for c in contexts]
+        remaining = self.max_tokens - fixed_tokens
+        if sum(sizes) <= remaining:
+            return contexts
+
+        query = _words(description)
+        ranked = sorted(
+            range(len(contexts)),
+            key=lambda i: (-self._relevance(query, contexts[i]), -i)  # ties: most recent first
+        )
+        kept: Dict[int, str] = {}
+        for i in ranked:
+            if sizes[i] <= remaining:
+                kept[i] = contexts[i]
+                remaining -= sizes[i]
+            elif remaining >= MIN_ITEM_TOKENS:
+                kept[i] = self._shrink(contexts[i], query, remaining)
+                remaining -= self.count(kept[i])
+                stats["truncated"] += 1
+            else:
+                stats["dropped"] += 1
+        if stats["truncated"] or stats["dropped"]:
+            logger.debug(f"Prompt budget {self.max_tokens}: truncated {stats['truncated']}, dropped {stats['dropped']} context items")
+        return [kept[i] for i in sorted(kept)]
+
+    @staticmethod
+    def _relevance(query: set, text: str) -> float:
+        if not query:
+            return 0.0
+        return len(query & _words(text)) / len(query)
+
+    def _shrink(self, text: str, query: set, budget: int) -> str:
+        """Most relevant sentences of ``text`` (first line always first) within ``budget`` tokens."""
+        marker = "\n[...truncated to fit the prompt budget]"
+        budget -= self.count(marker)
+        sentences = [s for s in _SENTENCE.split(text) if s.strip()] or [text]
+        order = [0] + sorted(range(1, len(sentences)), key=lambda i: -self._relevance(query, sentences[i]))
+        chosen: Dict[int, str] = {}
+        remaining = budget
+        for i in order:
+            size = self.count(sentences[i]) + 1
+            if size <= remaining:
+                chosen[i] = sentences[i]
+                remaining -= size
+            elif remaining >= MIN_ITEM_TOKENS or not chosen:
+                # Cut the sentence by characters, proportionally to what is left
+                keep = max(0, int(len(sentences[i]) * remaining / size))
+                chosen[i] = sentences[i][:keep]
+                break
+        return " ".join(chosen[i] for i in sorted(chosen)) + marker
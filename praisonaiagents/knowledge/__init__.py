@@ -4,5 +4,7 @@ PraisonAI Knowledge - Advanced knowledge management system with configurable fea
 
 from praisonaiagents.knowledge.knowledge import Knowledge
 from praisonaiagents.knowledge.chunking import Chunking
+from praisonaiagents.knowledge.ingest import IngestionPipeline
+from praisonaiagents.knowledge.cache import RetrievalCache
 
-__all__ = ["Knowledge", "Chunking"] 
\ No newline at end of file
+__all__ = ["Knowledge", "Chunking", "IngestionPipeline", "RetrievalCache"] 
\ No newline at end of file
@@ -0,0 +1,208 @@
+"""
+Retrieval cache for Knowledge.search.
+
+Agents search their knowledge on every chat turn, including guardrail
+retries and reflection turns that repeat the same prompt. The cache keeps
+recent results keyed on the normalized query plus the search filters, so a
+repeated query is answered from memory with no embedding call or vector
+query. Entries expire after ``ttl`` seconds, the cache holds at most
+``max_entries`` results (least recently used go first), and every write to
+the collection bumps a generation counter that discards all cached results.
+
+With ``semantic_threshold`` set, a query that misses exactly is embedded once
+and compared against cached queries with the same filters in a single matrix
+product (numpy, when installed); a cosine similarity at or above the threshold
+serves the cached result for the near-duplicate. :meth:`RetrievalCache.lookup`
+hands the query vector back so :meth:`RetrievalCache.put` stores it without
+embedding the query a second time.
+"""
+
+import re
+import json
+import math
+import time
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 300
+DEFAULT_MAX_ENTRIES = 256
+
+_SPACE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """Case- and whitespace-insensitive form of a query used as the cache key."""
+    return _SPACE.sub(" ", str(query or "")).strip().lower()
+
+
+def _unit(vector: Sequence[float]):
+    """Unit-length copy of ``vector``: a float32 array with numpy, else a list."""
+    try:
+        import numpy as np
+    except ImportError:
+        values = [float(x) for x in vector]
+        norm = math.sqrt(sum(x * x for x in values))
+        return [x / norm for x in values] if norm else values
+    values = np.asarray(vector, dtype=np.float32).ravel()
+    norm = float(np.linalg.norm(values))
+    return values / norm if norm else values
+
+
+def _best_match(query, vectors: List[Any]) -> Tuple[int, float]:
+    """Index and cosine similarity of the unit vector in ``vectors`` closest to unit ``query``."""
+    try:
+        import numpy as np
+    except ImportError:
+        scores = [sum(x * y for x, y in zip(query, vector)) for vector in vectors]
+        best = max(range(len(scores)), key=scores.__getitem__)
+        return best, scores[best]
+    scores = np.stack(vectors) @ query
+    best = int(np.argmax(scores))
+    return best, float(scores[best])
+
+
+def _copy_result(result):
+    """Shallow copy down to the result dicts so callers cannot mutate cached entries."""
+    if isinstance(result, dict):
+        copied = dict(result)
+        for key in ("results", "relations"):
+            if isinstance(copied.get(key), list):
+                copied[key] = [dict(r) if isinstance(r, dict) else r for r in copied[key]]
+        return copied
+    if isinstance(result, list):
+        return [dict(r) if isinstance(r, dict) else r for r in result]
+    return result
+
+
+class RetrievalCache:
+    """
+    TTL + LRU cache of search results with generation-based invalidation.
+
+    Example:
+        cache = RetrievalCache(ttl=300, semantic_threshold=0.95, embed=embed_fn)
+        key = cache.key(query, {"agent_id": "a"})
+        generation = cache.generation
+        result, vector = cache.lookup(key)
+        if result is None:
+            result = run_search()
+            cache.put(key, result, generation, vector)
+    """
+
+    def __init__(
+        self,
+        ttl: Optional[float] = DEFAULT_TTL,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        semantic_threshold: Optional[float] = None,
+        embed: Optional[Callable[[str], List[float]]] = None
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.semantic_threshold = semantic_threshold
+        self.embed = embed
+        self.generation = 0
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, Any, Optional[Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(query: str, filters: Optional[Dict[str, Any]] = None) -> Tuple[str, str]:
+        """Cache key: normalized query and a canonical encoding of the filters."""
+        return normalize_query(query), json.dumps(filters or {}, sort_keys=True, default=str)
+
+    def _semantic_enabled(self) -> bool:
+        return self.semantic_threshold is not None and self.embed is not None
+
+    def _expired(self, stored_at: float, now: float) -> bool:
+        return self.ttl is not None and now - stored_at > self.ttl
+
+    def get(self, key: Tuple[str, str]):
+        """Cached result for ``key``, falling back to a semantic match when enabled."""
+        return self.lookup(key)[0]
+
+    def lookup(self, key: Tuple[str, str]) -> Tuple[Any, Optional[Any]]:
+        """
+        Like :meth:`get`, but also return the query vector embedded for the
+        semantic match (None when no embedding was needed); pass it to
+        :meth:`put` on a miss.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if not self._expired(entry[0], now):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return _copy_result(entry[1]), None
+                del self._entries[key]
+            if not self._semantic_enabled():
+                self.misses += 1
+                return None, None
+            candidates = [(k, e[2]) for k, e in self._entries.items()
+                          if k[1] == key[1] and e[2] is not None and not self._expired(e[0], now)]
+        vector = self._embed(key[0])
+        if vector is not None:
+            candidates = [(k, v) for k, v in candidates if len(v) == len(vector)]
+        if vector is None or not candidates:
+            with self._lock:
+                self.misses += 1
+            return None, vector
+        best, best_score = _best_match(vector, [v for _, v in candidates])
+        best_key = candidates[best][0]
+        with self._lock:
+            entry = self._entries.get(best_key)
+            if entry is None or best_score < self.semantic_threshold:
+                self.misses += 1
+                return None, vector
+            self._entries.move_to_end(best_key)
+            self.semantic_hits += 1
+            logger.debug(f"Semantic cache hit ({best_score:.3f}) for {key[0]!r} -> {best_key[0]!r}")
+            return _copy_result(entry[1]), vector
+
+    def put(self, key: Tuple[str, str], result: Any, generation: Optional[int] = None, vector: Optional[Any] = None):
+        """
+        Store a result. Pass the ``generation`` read before the search ran so a
+        result computed while the collection changed is not cached, and the
+        ``vector`` returned by :meth:`lookup` so the query is not embedded again.
+        """
+        if self.max_entries <= 0:
+            return
+        if vector is not None:
+            vector = _unit(vector)
+        elif self._semantic_enabled():
+            vector = self._embed(key[0])
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._entries[key] = (time.monotonic(), _copy_result(result), vector)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _embed(self, text: str):
+        try:
+            return _unit(self.embed(text))
+        except Exception as e:
+            logger.debug(f"Could not embed query for semantic cache: {e}")
+            return None
+
+    def invalidate(self):
+        """Drop every cached result; called whenever the collection is written."""
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "semantic_hits": self.semantic_hits,
+                "misses": self.misses,
+                "generation": self.generation
+            }
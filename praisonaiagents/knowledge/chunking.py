@@ -1,6 +1,10 @@
-from typing import List, Union, Optional, Dict, Any
+from typing import List, Union, Optional, Dict, Any, Iterable, Iterator, IO
 from functools import cached_property
 import importlib
+import csv
+import io
+import json
+import re
     # Praison AI: Improved code documentation and clarity
     # Praison AI: Optimized performance for faster execution
     # Praison AI: Added comprehensive logging for debugging
@@ -8,6 +12,48 @@ import importlib
     # Praison AI: Optimized algorithm for better scalability
     # Praison AI: Added support for edge cases
 
+def store_embeddings(embedder: Any, dimension: int, tokenizer_or_token_counter: Any = "gpt2"):
+    """
+    Wrap a mem0 embedder as a chonkie embeddings model, so semantic and SDPM
+    chunking embed with the same model the vector store uses and the chunk
+    vectors can be written to the store as-is.
+    """
+    try:
+        import numpy as np
+        from chonkie.embeddings import BaseEmbeddings
+    except ImportError:
+        raise ImportError(
+            "chonkie package not found. Please install it using: pip install 'praisonaiagents[knowledge]'"
+        )
+
+    class StoreEmbeddings(BaseEmbeddings):
+        def __init__(self):
+            super().__init__()
+            self.store_embedder = embedder
+
+        def embed(self, text: str):
+            return np.asarray(embedder.embed(text, "add"), dtype=np.float32)
+
+        def embed_batch(self, texts: List[str]):
+            embed_batch = getattr(embedder, "embed_batch", None)
+            vectors = embed_batch(texts, memory_action="add") if embed_batch is not None else [
+                embedder.embed(text, "add") for text in texts
+            ]
+            return [np.asarray(v, dtype=np.float32) for v in vectors]
+
+        @property
+        def dimension(self) -> int:
+            return dimension
+
+        def get_tokenizer_or_token_counter(self):
+            return tokenizer_or_token_counter
+
+        def __repr__(self) -> str:
+            return f"StoreEmbeddings({type(embedder).__name__})"
+
+    return StoreEmbeddings()
+
+
 class Chunking:
     """A unified class for text chunking with various chunking strategies."""
     
@@ -194,6 +240,278 @@ class Chunking:
         """Make the Chunking instance callable."""
         return self.chunk(text, **kwargs)
     
+    # ------------------------------------------------------------------ #
+    #   Chunk embeddings
+    # ------------------------------------------------------------------ #
+    EMBEDDING_CHUNKERS = ('semantic', 'sdpm', 'late')
+
+    @staticmethod
+    def chunk_embedding(chunk: Any, pooled: bool = False) -> Optional[List[float]]:
+        """
+        Vector the chunker already computed for ``chunk``, or None.
+
+        Late chunks carry the embedding of their own text. Semantic/SDPM
+        chunks only carry per-sentence embeddings; with ``pooled`` they are
+        averaged token-weighted, the way chonkie compares sentence groups while
+        chunking. That mean approximates the chunk vector but is not the
+        embedding of the chunk text.
+        """
+        embedding = getattr(chunk, 'embedding', None)
+        if embedding is not None:
+            return [float(x) for x in embedding]
+        if not pooled:
+            return None
+        sentences = getattr(chunk, 'sentences', None)
+        if not sentences or any(getattr(s, 'embedding', None) is None for s in sentences):
+            return None
+        import numpy as np
+        weights = np.array([max(getattr(s, 'token_count', 1) or 1, 1) for s in sentences], dtype=np.float32)
+        pooled = np.average(np.stack([np.asarray(s.embedding, dtype=np.float32) for s in sentences]),
+                            axis=0, weights=weights)
+        norm = np.linalg.norm(pooled)
+        return (pooled / norm if norm else pooled).tolist()
+
+    @property
+    def embedding_dimension(self) -> Optional[int]:
+        """Size of the vectors the chunker embeds with, when known."""
+        if self.chunker_type not in self.EMBEDDING_CHUNKERS:
+            return None
+        dimension = getattr(self.embedding_model, 'dimension', None)
+        return dimension if isinstance(dimension, int) else None
+
+    @property
+    def embedding_model_name(self) -> Optional[str]:
+        """Name of the model the chunker embeds with, used to match it against the store embedder."""
+        if self.chunker_type not in self.EMBEDDING_CHUNKERS:
+            return None
+        model = self.embedding_model
+        if isinstance(model, str) or model is None:
+            return model
+        shared = getattr(model, 'store_embedder', None)
+        if shared is not None:
+            return getattr(getattr(shared, 'config', None), 'model', None)
+        for attr in ('model_name_or_path', 'model_name', 'model'):
+            value = getattr(model, attr, None)
+            if isinstance(value, str):
+                return value
+        return None
+
+    # ------------------------------------------------------------------ #
+    #   Streaming
+    # ------------------------------------------------------------------ #
+    STRUCTURES = ('text', 'csv', 'json', 'markdown')
+    EXTENSION_STRUCTURES = {
+        '.csv': 'csv',
+        '.json': 'json',
+        '.jsonl': 'json',
+        '.ndjson': 'json',
+        '.md': 'markdown',
+        '.markdown': 'markdown',
+    }
+
+    @property
+    def record_budget(self) -> int:
+        """Approximate characters per structured chunk (~4 characters per token)."""
+        return max(self.chunk_size * 4, 256)
+
+    def iter_chunks(
+        self,
+        file_obj: Union[str, IO[str], Iterable[str]],
+        window_size: int = 1024 * 1024,
+        structure: Optional[str] = None
+    ) -> Iterator[Any]:
+        """Stream chunks from a text file without loading it whole.
+
+        Args:
+            file_obj: A path, a text file object or any iterable of strings
+            window_size: Characters read per window; peak memory is O(window_size)
+            structure: 'text' (default), 'csv', 'json' or 'markdown'. When a
+                path is given and no structure is set it is picked from the extension.
+
+        Yields:
+            Chunks of the configured chunker for 'text'. Structure-aware
+            splitters yield strings that keep whole CSV rows (with the header),
+            JSON records or Markdown sections (with their heading path) together;
+            oversized records are split further with the chunker.
+        """
+        if isinstance(file_obj, str):
+            if structure is None:
+                ext = '.' + file_obj.lower().rsplit('.', 1)[-1] if '.' in file_obj else ''
+                structure = self.EXTENSION_STRUCTURES.get(ext, 'text')
+            with open(file_obj, 'r', encoding='utf-8', newline='') as f:
+                yield from self.iter_chunks(f, window_size=window_size, structure=structure)
+            return
+
+        structure = structure or 'text'
+        if structure not in self.STRUCTURES:
+            raise ValueError(f"Unsupported structure: {structure}. Must be one of: {list(self.STRUCTURES)}")
+        if structure == 'csv':
+            yield from self._iter_csv(file_obj)
+        elif structure == 'json':
+            yield from self._iter_json(file_obj, window_size)
+        elif structure == 'markdown':
+            yield from self._iter_markdown(file_obj)
+        else:
+            yield from self._iter_text(file_obj, window_size)
+
+    @staticmethod
+    def _read_windows(file_obj, window_size: int) -> Iterator[str]:
+        """Yield successive windows from a file object or an iterable of strings."""
+        if hasattr(file_obj, 'read'):
+            while True:
+                window = file_obj.read(window_size)
+                if not window:
+                    return
+                yield window
+        else:
+            buffer = []
+            size = 0
+            for piece in file_obj:
+                buffer.append(piece)
+                size += len(piece)
+                if size >= window_size:
+                    yield ''.join(buffer)
+                    buffer, size = [], 0
+            if buffer:
+                yield ''.join(buffer)
+
+    def _iter_text(self, file_obj, window_size: int) -> Iterator[Any]:
+        """Chunk each window up to its last paragraph/line/word boundary and carry the rest over."""
+        carry = ''
+        windows = self._read_windows(file_obj, window_size)
+        window = next(windows, None)
+        while window is not None:
+            following = next(windows, None)
+            text = carry + window
+            if following is None:  # the last window has nothing to carry into
+                carry = text
+                break
+            cut = -1
+            for boundary in ('\n\n', '\n', ' '):
+                cut = text.rfind(boundary, len(text) // 2)
+                if cut != -1:
+                    cut += len(boundary)
+                    break
+            if cut == -1:
+                cut = len(text)
+            head, carry = text[:cut], text[cut:]
+            if head.strip():
+                yield from self.chunk(head)
+            window = following
+        if carry.strip():
+            yield from self.chunk(carry)
+
+    def _split_oversized(self, text: str) -> Iterator[Any]:
+        if len(text) <= self.record_budget:
+            yield text
+        else:
+            yield from self.chunk(text)
+
+    def _iter_records(self, records: Iterable[str], prefix: str = '') -> Iterator[Any]:
+        """Pack serialized records into chunks of about ``record_budget`` characters."""
+        budget = self.record_budget
+        batch: List[str] = []
+        size = len(prefix)
+        for record in records:
+            if batch and size + len(record) + 1 > budget:
+                yield prefix + '\n'.join(batch)
+                batch, size = [], len(prefix)
+            if len(prefix) + len(record) > budget:
+                yield from self._split_oversized(prefix + record)
+                continue
+            batch.append(record)
+            size += len(record) + 1
+        if batch:
+            yield prefix + '\n'.join(batch)
+
+    def _iter_csv(self, file_obj) -> Iterator[Any]:
+        """Group whole CSV rows into chunks, repeating the header in each."""
+        reader = csv.reader(file_obj)
+        header = next(reader, None)
+        if header is None:
+            return
+
+        def serialize(row):
+            out = io.StringIO()
+            csv.writer(out, lineterminator='').writerow(row)
+            return out.getvalue()
+
+        prefix = serialize(header) + '\n'
+        yield from self._iter_records((serialize(row) for row in reader if any(cell.strip() for cell in row)), prefix)
+
+    def _iter_json(self, file_obj, window_size: int) -> Iterator[Any]:
+        """Stream records from a top-level JSON array, JSON Lines or concatenated objects."""
+        decoder = json.JSONDecoder()
+
+        def records():
+            buffer = ''
+            pos = 0
+            in_array = None
+            windows = self._read_windows(file_obj, window_size)
+            exhausted = False
+            while True:
+                # Skip separators between records
+                while pos < len(buffer) and (buffer[pos].isspace() or buffer[pos] == ','):
+                    pos += 1
+                if in_array is None and pos < len(buffer):
+                    in_array = buffer[pos] == '['
+                    if in_array:
+                        pos += 1
+                        continue
+                if in_array and pos < len(buffer) and buffer[pos] == ']':
+                    return
+                if pos < len(buffer):
+                    try:
+                        obj, end = decoder.raw_decode(buffer, pos)
+                        # A value ending exactly at the buffer edge may be a truncated number
+                        if end < len(buffer) or exhausted:
+                            yield json.dumps(obj, ensure_ascii=False)
+                            pos = end
+                            continue
+                    except json.JSONDecodeError:
+                        if exhausted:
+                            raise
+                if exhausted:
+                    return
+                window = next(windows, None)
+                if window is None:
+                    exhausted = True
+                    continue
+                buffer = buffer[pos:] + window
+                pos = 0
+
+        yield from self._iter_records(records())
+
+    _HEADING = re.compile(r'^(#{1,6})\s+(.*?)\s*#*\s*$')
+
+    def _iter_markdown(self, file_obj) -> Iterator[Any]:
+        """Split at headings; each section carries its heading path as context."""
+        path: List[str] = []
+        body: List[str] = []
+        in_fence = False
+
+        def flush():
+            text = '\n'.join(body).strip()
+            if not text:
+                return
+            prefix = ' > '.join(path)
+            section = f"{prefix}\n\n{text}" if prefix else text
+            yield from self._split_oversized(section)
+
+        for line in file_obj:
+            line = line.rstrip('\r\n')
+            if line.lstrip().startswith(('```', '~~~')):
+                in_fence = not in_fence
+            match = None if in_fence else self._HEADING.match(line)
+            if match:
+                yield from flush()
+                body = []
+                level = len(match.group(1))
+                path = path[:level - 1] + [match.group(2)]
+            else:
+                body.append(line)
+        yield from flush()
+
     def __repr__(self) -> str:
         """String representation of the Chunking instance."""
         return (
@@ -0,0 +1,473 @@
+"""
+Parallel, batched ingestion pipeline for Knowledge.
+
+Stages are connected by bounded queues so a slow stage applies back-pressure
+instead of buffering the whole corpus:
+
+    expand -> convert (process pool) -> chunk (stream) -> embed (batches) -> write (bulk)
+
+* convert: MarkItDown / text reads run in a process pool (thread pool fallback)
+* chunk:   documents are chunked as they arrive
+* embed:   chunks are embedded ``embed_batch_size`` at a time; chunks that
+           already carry a reusable vector (late chunks, or pooled semantic/SDPM
+           chunks when enabled) from the store's embedding model skip this step
+* write:   vectors are inserted ``write_batch_size`` at a time with mem0-style payloads
+
+Each stage records items processed and busy time so throughput can be reported.
+"""
+
+import os
+import re
+import glob
+import time
+import uuid
+import queue
+import hashlib
+import logging
+import threading
+import multiprocessing
+from datetime import datetime, timezone
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ..retry import with_retry
+
+logger = logging.getLogger(__name__)
+
+DOCUMENT_EXTENSIONS = {
+    'document': ('.pdf', '.ppt', '.pptx', '.doc', '.docx', '.xls', '.xlsx'),
+    'media': ('.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.mp3', '.wav', '.ogg', '.m4a'),
+    'text': ('.txt', '.csv', '.json', '.xml', '.md', '.html', '.htm'),
+    'archive': ('.zip',)
+}
+SUPPORTED_EXTENSIONS = tuple(ext for exts in DOCUMENT_EXTENSIONS.values() for ext in exts)
+
+_SENTINEL = object()
+_POLL_SECONDS = 0.1
+_GLOB_CHARS = set("*?[")
+_EXTENSION = re.compile(r"\.[\w*?\[\]]{1,10}$")  # "*.pdf", "report?.md", "notes.*"
+
+# Per-process converter, created lazily inside pool workers
+_markitdown = None
+
+
+class _Cancelled(Exception):
+    """Raised inside a stage once another stage has failed."""
+
+
+class _Channel:
+    """
+    Bounded queue between two stages. ``put`` and ``get`` wait in short
+    timed slices and raise :class:`_Cancelled` once ``cancelled`` is set, so a
+    failed stage can never leave the others blocked on a full or empty queue.
+    """
+
+    def __init__(self, maxsize: int, cancelled: threading.Event):
+        self._queue = queue.Queue(maxsize=maxsize)
+        self.cancelled = cancelled
+
+    def put(self, item):
+        while not self.cancelled.is_set():
+            try:
+                self._queue.put(item, timeout=_POLL_SECONDS)
+                return
+            except queue.Full:
+                pass
+        raise _Cancelled()
+
+    def get(self):
+        while not self.cancelled.is_set():
+            try:
+                return self._queue.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                pass
+        raise _Cancelled()
+
+
+def is_glob(path: str) -> bool:
+    """Whether ``path`` looks like a file glob pattern (not raw text that happens to contain ``?``, ``[`` or ``*``)."""
+    if not isinstance(path, str) or "\n" in path or not any(ch in path for ch in _GLOB_CHARS):
+        return False
+    return "/" in path or os.sep in path or bool(_EXTENSION.search(path))
+
+
+def expand_sources(sources: Iterable[str]) -> List[str]:
+    """
+    Expand directories (recursively) and glob patterns into supported file
+    paths. Other strings are passed through unchanged (raw text or files
+    with unknown extensions), including glob-like strings that match no
+    file, so text such as "Questions? Email us." is never dropped.
+    """
+    expanded = []
+    for source in sources:
+        if not isinstance(source, str):
+            expanded.append(source)
+        elif os.path.isdir(source):
+            for root, _, files in os.walk(source):
+                for name in sorted(files):
+                    if name.lower().endswith(SUPPORTED_EXTENSIONS):
+                        expanded.append(os.path.join(root, name))
+        elif is_glob(source):
+            files = [p for p in sorted(glob.glob(source, recursive=True)) if os.path.isfile(p)]
+            if files:
+                expanded.extend(p for p in files if p.lower().endswith(SUPPORTED_EXTENSIONS))
+            else:
+                expanded.append(source)  # matches no file: raw text
+        else:
+            expanded.append(source)
+
+    # A file reached through both a directory and a glob is ingested once
+    seen = set()
+    unique = []
+    for source in expanded:
+        key = os.path.normpath(source) if isinstance(source, str) and os.path.isfile(source) else id(source)
+        if key not in seen:
+            seen.add(key)
+            unique.append(source)
+    return unique
+
+
+def convert_source(path: str) -> Tuple[str, str, Optional[str]]:
+    """
+    Convert one document to text with MarkItDown. Runs inside pool workers.
+
+    Returns:
+        (kind, text, error) where kind is "document", or "error" on failure.
+    """
+    global _markitdown
+    try:
+        if _markitdown is None:
+            from markitdown import MarkItDown
+            _markitdown = MarkItDown()
+        return "document", _markitdown.convert(path).text_content or "", None
+    except Exception as e:
+        return "error", "", f"{type(e).__name__}: {e}"
+
+
+def memory_payload(text: str, metadata: Optional[Dict[str, Any]], identity: Dict[str, Any]) -> Dict[str, Any]:
+    """Vector-store payload in the layout mem0 writes for a single add."""
+    now = datetime.now(timezone.utc).isoformat()
+    payload = dict(metadata or {})
+    payload.update(identity)
+    payload.update({
+        "data": text,
+        "hash": hashlib.md5(text.encode()).hexdigest(),
+        "created_at": now,
+        "updated_at": now
+    })
+    return payload
+
+
+class StageStats:
+    """Counters for one pipeline stage."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.items = 0
+        self.busy = 0.0
+        self.errors = 0
+        self.reused = 0
+        self._lock = threading.Lock()
+
+    def add(self, items: int, seconds: float, errors: int = 0, reused: int = 0):
+        """Record work done; stages run in several threads, so counters only change here."""
+        with self._lock:
+            self.items += items
+            self.busy += seconds
+            self.errors += errors
+            self.reused += reused
+
+    def as_dict(self, wall: float) -> Dict[str, Any]:
+        report = {
+            "items": self.items,
+            "errors": self.errors,
+            "busy_seconds": round(self.busy, 3),
+            "items_per_second": round(self.items / wall, 2) if wall > 0 else 0.0
+        }
+        if self.reused:
+            report["reused_embeddings"] = self.reused
+        return report
+
+
+class IngestionPipeline:
+    """
+    Ingest many sources into a Knowledge instance with parallel conversion,
+    batched embedding and bulk vector writes.
+
+    Bulk writes go straight to the mem0 vector store, so per-record ADD
+    history entries are not written.
+
+    Example:
+        pipeline = IngestionPipeline(knowledge, convert_workers=8, embed_batch_size=128)
+        result = pipeline.run(["docs/", "reports/**/*.pdf"], agent_id="researcher")
+        print(result["stats"])
+    """
+
+    def __init__(
+        self,
+        knowledge,
+        convert_workers: Optional[int] = None,
+        embed_batch_size: int = 64,
+        embed_workers: int = 2,
+        write_batch_size: int = 256,
+        queue_size: int = 64,
+        use_processes: bool = True,
+        show_progress: bool = True
+    ):
+        self.knowledge = knowledge
+        self.convert_workers = convert_workers or max(1, min(8, os.cpu_count() or 1))
+        self.embed_batch_size = embed_batch_size
+        self.embed_workers = max(1, embed_workers)
+        self.write_batch_size = write_batch_size
+        self.queue_size = queue_size
+        self.use_processes = use_processes
+        self.show_progress = show_progress
+
+    # ------------------------------------------------------------------ #
+    #   Stages
+    # ------------------------------------------------------------------ #
+    def _convert_stage(self, sources, out_q, stats, errors):
+        """Keep at most ``queue_size`` conversions in flight and emit results in completion order."""
+        files = []
+        for source in sources:
+            if isinstance(source, str) and source.lower().endswith(DOCUMENT_EXTENSIONS['text']):
+                # Text files are streamed from disk by the chunk stage
+                out_q.put((source, "textfile", None))
+            elif isinstance(source, str) and source.lower().endswith(SUPPORTED_EXTENSIONS):
+                files.append(source)
+            else:
+                out_q.put((None, "raw", str(source)))
+
+        if files:
+            executor = self._make_executor()
+            try:
+                pending = {}
+                it = iter(files)
+                while True:
+                    while len(pending) < self.queue_size:
+                        path = next(it, None)
+                        if path is None:
+                            break
+                        pending[executor.submit(convert_source, path)] = (path, time.perf_counter())
+                    if not pending:
+                        break
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        path, started = pending.pop(future)
+                        kind, text, error = future.result()
+                        failed = bool(error or not text)
+                        stats.add(1, time.perf_counter() - started, errors=int(failed))
+                        if failed:
+                            errors.append({"source": path, "error": error or "No content could be extracted"})
+                            logger.error(f"Error converting {path}: {error or 'empty content'}")
+                            continue
+                        out_q.put((path, kind, text))
+            finally:
+                executor.shutdown(wait=True, cancel_futures=True)
+        out_q.put(_SENTINEL)
+
+    def _make_executor(self):
+        if self.use_processes:
+            try:
+                # The other stages' threads are already running; forking would
+                # copy their locks mid-use, so workers are spawned instead
+                return ProcessPoolExecutor(
+                    max_workers=self.convert_workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            except (OSError, NotImplementedError) as e:
+                logger.warning(f"Process pool unavailable ({e}), converting in threads")
+        return ThreadPoolExecutor(max_workers=self.convert_workers)
+
+    def _chunk_stage(self, in_q, out_q, stats, base_metadata, errors):
+        """Turn converted documents into (text, metadata) chunks as they arrive."""
+        while True:
+            item = in_q.get()
+            if item is _SENTINEL:
+                break
+            path, kind, text = item
+            started = time.perf_counter()
+            metadata = dict(base_metadata or {})
+            if path:
+                metadata['file_type'] = os.path.splitext(path)[1].lstrip('.').lower()
+                metadata['filename'] = os.path.basename(path)
+            count = failed = 0
+            try:
+                for chunk, vector in self._chunks_for(kind, text, path):
+                    out_q.put((chunk, metadata, path, vector))
+                    count += 1
+            except _Cancelled:
+                raise
+            except Exception as e:
+                failed = 1
+                errors.append({"source": path, "error": f"{type(e).__name__}: {e}"})
+                logger.error(f"Error chunking {path}: {e}")
+            stats.add(count, time.perf_counter() - started, errors=failed)
+        for _ in range(self.embed_workers):
+            out_q.put(_SENTINEL)
+
+    def _chunks_for(self, kind: str, text: Optional[str], path: Optional[str] = None) -> Iterable[Tuple[str, Any]]:
+        """Yield ``(text, vector)`` pairs; vector is None unless the chunker's embedding can be reused."""
+        if kind == "textfile":
+            yield from self.knowledge.iter_text_chunks(path, with_embeddings=True)
+            return
+        if kind == "raw":
+            content = self.knowledge.prepare_text(text)
+            if content:
+                yield content, None
+            return
+        yield from self.knowledge.chunk_items(self.knowledge.chunker.chunk(text))
+
+    def _embed_stage(self, in_q, out_q, stats):
+        """Embed chunks in batches of ``embed_batch_size``, keeping vectors the chunker already made."""
+        embedder = self.knowledge.memory.embedding_model
+        batch = []
+        while True:
+            item = in_q.get()
+            if item is not _SENTINEL:
+                batch.append(item)
+            if batch and (item is _SENTINEL or len(batch) >= self.embed_batch_size):
+                started = time.perf_counter()
+                vectors = [vector for _, _, _, vector in batch]
+                missing = [i for i, vector in enumerate(vectors) if vector is None]
+                if missing:
+                    for i, vector in zip(missing, self._embed_texts(embedder, [batch[i][0] for i in missing])):
+                        vectors[i] = vector
+                stats.add(len(batch), time.perf_counter() - started, reused=len(batch) - len(missing))
+                out_q.put(([entry[:3] for entry in batch], vectors))
+                batch = []
+            if item is _SENTINEL:
+                break
+        out_q.put(_SENTINEL)
+
+    @staticmethod
+    def _embed_texts(embedder, texts: List[str]) -> List[List[float]]:
+        embed_batch = getattr(embedder, "embed_batch", None)
+        if embed_batch is not None:
+            return with_retry(embed_batch, "embedding")(texts, memory_action="add")
+        embed = with_retry(embedder.embed, "embedding")
+        return [embed(text, "add") for text in texts]
+
+    def _write_stage(self, in_q, stats, identity, results, progress=None):
+        """Insert vectors in bulk with the payload layout mem0 uses for single adds."""
+        vector_store = self.knowledge.memory.vector_store
+        finished = 0
+        pending_vectors, pending_payloads, pending_ids = [], [], []
+
+        def flush():
+            if not pending_ids:
+                return
+            started = time.perf_counter()
+            vector_store.insert(vectors=list(pending_vectors), payloads=list(pending_payloads), ids=list(pending_ids))
+            self.knowledge.lexical.add(
+                (memory_id, payload["data"], payload) for memory_id, payload in zip(pending_ids, pending_payloads)
+            )
+            self.knowledge._invalidate_cache()
+            stats.add(len(pending_ids), time.perf_counter() - started)
+            if progress:
+                progress[0].advance(progress[1], len(pending_ids))
+            pending_vectors.clear()
+            pending_payloads.clear()
+            pending_ids.clear()
+
+        while finished < self.embed_workers:
+            item = in_q.get()
+            if item is _SENTINEL:
+                finished += 1
+                continue
+            batch, vectors = item
+            for (text, metadata, source), vector in zip(batch, vectors):
+                memory_id = str(uuid.uuid4())
+                pending_vectors.append(vector)
+                pending_payloads.append(memory_payload(text, metadata, identity))
+                pending_ids.append(memory_id)
+                results.append({"id": memory_id, "memory": text, "event": "ADD", "source": source})
+            if len(pending_ids) >= self.write_batch_size:
+                flush()
+        flush()
+
+    # ------------------------------------------------------------------ #
+    #   Driver
+    # ------------------------------------------------------------------ #
+    def run(
+        self,
+        sources: Iterable[str],
+        user_id: Optional[str] = None,
+        agent_id: Optional[str] = None,
+        run_id: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Ingest ``sources`` (files, directories, globs or raw text).
+
+        Returns:
+            {'results': [...], 'relations': [], 'errors': [...], 'stats': {...}}
+        """
+        sources = expand_sources(sources)
+        for source in sources:
+            if isinstance(source, str) and source.lower().endswith(SUPPORTED_EXTENSIONS) and not os.path.exists(source):
+                raise FileNotFoundError(f"File not found: {source}")
+
+        identity = {k: v for k, v in (("user_id", user_id), ("agent_id", agent_id), ("run_id", run_id)) if v}
+        stats = {name: StageStats(name) for name in ("convert", "chunk", "embed", "write")}
+        cancelled = threading.Event()
+        docs_q = _Channel(self.queue_size, cancelled)
+        chunks_q = _Channel(self.queue_size * self.embed_batch_size, cancelled)
+        vectors_q = _Channel(self.queue_size, cancelled)
+        results: List[Dict[str, Any]] = []
+        errors: List[Dict[str, Any]] = []
+        failures: List[BaseException] = []
+
+        # Initialise lazy Knowledge members before threads race for them
+        self.knowledge.memory
+        self.knowledge.chunker
+        self.knowledge.lexical
+        self.knowledge.reuse_chunk_embeddings
+
+        def guarded(fn, *args):
+            def runner():
+                try:
+                    fn(*args)
+                except _Cancelled:
+                    pass
+                except BaseException as e:  # surface in the caller thread
+                    failures.append(e)
+                    logger.error(f"Ingestion stage {fn.__name__} failed: {e}", exc_info=True)
+                    cancelled.set()  # stop the other stages, wherever they are blocked
+            return threading.Thread(target=runner, name=f"ingest-{fn.__name__}", daemon=True)
+
+        progress = None
+        progress_ctx = None
+        if self.show_progress:
+            from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn
+            progress_ctx = Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}"),
+                                    BarColumn(), TextColumn("{task.completed} chunks"), transient=True)
+            progress_ctx.start()
+            progress = (progress_ctx, progress_ctx.add_task(f"Adding {len(sources)} sources to Knowledge", total=None))
+
+        started = time.perf_counter()
+        threads = [
+            guarded(self._convert_stage, sources, docs_q, stats["convert"], errors),
+            guarded(self._chunk_stage, docs_q, chunks_q, stats["chunk"], metadata, errors),
+            *[guarded(self._embed_stage, chunks_q, vectors_q, stats["embed"]) for _ in range(self.embed_workers)],
+            guarded(self._write_stage, vectors_q, stats["write"], identity, results, progress),
+        ]
+        try:
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        finally:
+            cancelled.set()  # no-op after a clean run; releases the stages if join was interrupted
+            if progress_ctx:
+                progress_ctx.stop()
+        wall = time.perf_counter() - started
+
+        if failures:
+            raise failures[0]
+
+        report = {name: s.as_dict(wall) for name, s in stats.items()}
+        report["wall_seconds"] = round(wall, 3)
+        report["sources"] = len(sources)
+        self.knowledge._log(f"Ingestion stats: {report}")
+        return {'results': results, 'relations': [], 'errors': errors, 'stats': report}
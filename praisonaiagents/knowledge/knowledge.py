@@ -1,10 +1,17 @@
 import os
+import json
+import hashlib
 import logging
-import uuid
-import time
-from .chunking import Chunking
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from .chunking import Chunking, store_embeddings
+from .ingest import SUPPORTED_EXTENSIONS, IngestionPipeline, expand_sources
+from .manifest import IndexManifest, hash_file, hash_text
+from .lexical import LexicalIndex, benchmark_retrieval, reciprocal_rank_fusion
+from .cache import DEFAULT_MAX_ENTRIES, DEFAULT_TTL, RetrievalCache
+from ..telemetry.tracing import propagate, traced
+from praisonaiagents.memory.transfer import DEFAULT_BATCH_SIZE, RecordWriter, iter_record_batches, make_record, parse_metadata
 from functools import cached_property
-from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
     # Praison AI: Improved code documentation and clarity
     # Praison AI: Improved code organization and maintainability
     # Praison AI: Optimized algorithm for better scalability
@@ -13,6 +20,32 @@ from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskPr
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_COLLECTION = "praison_knowledge"
+DEFAULT_SEARCH_LIMIT = 100
+
+_search_pool = None
+_search_pool_lock = threading.Lock()
+
+
+def _same_model(a, b):
+    """Whether two embedding model names name the same model ("all-MiniLM-L6-v2" matches "sentence-transformers/all-MiniLM-L6-v2")."""
+    a, b = str(a).strip("/"), str(b).strip("/")
+    if a == b:
+        return True
+    if "/" in a and "/" in b:
+        return False
+    return a.split("/")[-1] == b.split("/")[-1]
+
+
+def _search_executor():
+    """Shared pool for running vector and lexical retrieval concurrently."""
+    global _search_pool
+    if _search_pool is None:
+        with _search_pool_lock:
+            if _search_pool is None:
+                _search_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="knowledge-search")
+    return _search_pool
+
 class CustomMemory:
     @classmethod
     def from_config(cls, config):
@@ -53,9 +86,12 @@ class CustomMemory:
         }]
 
 class Knowledge:
-    def __init__(self, config=None, verbose=None):
+    def __init__(self, config=None, verbose=None, normalize=None):
         self._config = config
         self._verbose = verbose or 0
+        self._versions = {}  # scope -> (cache generation, version)
+        # Lowercasing is opt-in: Knowledge(normalize=True) or {"normalize": True} in config
+        self._normalize = bool((config or {}).get("normalize", False)) if normalize is None else normalize
         os.environ['ANONYMIZED_TELEMETRY'] = 'False'  # Chromadb
         
         # Configure logging levels based on verbose setting
@@ -91,10 +127,24 @@ class Knowledge:
                 'pip install "praisonaiagents[knowledge]"'
             )
 
+    def _vector_client(self, path):
+        """Shared Chroma client for ``path`` from the process-wide pool."""
+        self._deps  # surface the install hint if knowledge extras are missing
+        from praisonaiagents.memory.client_manager import get_vector_store_manager
+        return get_vector_store_manager().get_client(path)
+
+    def _vector_store_option(self, key, default=None):
+        """Read a vector_store.config option from the user config without building the client."""
+        return ((self._config or {}).get("vector_store", {}).get("config", {}) or {}).get(key, default)
+
+    @property
+    def collection_name(self):
+        """Stable collection name, so restarts reuse the already indexed vectors."""
+        return self._vector_store_option("collection_name", DEFAULT_COLLECTION)
+
     @cached_property
     def config(self):
-        # Generate unique collection name for each instance (only if not provided in config)
-        default_collection = f"test_{int(time.time())}_{str(uuid.uuid4())[:8]}"
+        default_collection = DEFAULT_COLLECTION
         persist_dir = ".praison"
 
         # Create persistent client config
@@ -104,7 +154,7 @@ class Knowledge:
                 "config": {
                     "collection_name": default_collection,
                     "path": persist_dir,
-                    "client": self._deps['chromadb'].PersistentClient(path=persist_dir),
+                    "client": self._vector_client(persist_dir),
                     "host": None,
                     "port": None
                 }
@@ -134,6 +184,8 @@ class Knowledge:
                     if "client" in config_copy:
                         del config_copy["client"]
                     base_config["vector_store"]["config"].update(config_copy)
+                    if config_copy.get("path") and config_copy["path"] != persist_dir:
+                        base_config["vector_store"]["config"]["client"] = self._vector_client(config_copy["path"])
             
             # Merge embedder config if provided
             if "embedder" in self._config:
@@ -174,12 +226,76 @@ class Knowledge:
 
     @cached_property
     def chunker(self):
+        """Chunker from config "chunker" (type, chunk_size, chunk_overlap, embedding_model, ...).
+
+        ``"embedding_model": "store"`` makes semantic/SDPM/late chunking embed
+        with the vector store's embedder, so chunk vectors can be written
+        without a second embedding pass (see :attr:`reuse_chunk_embeddings`).
+        """
+        options = dict((self._config or {}).get("chunker") or {})
+        options.pop("reuse_embeddings", None)
+        options.pop("pool_sentence_embeddings", None)
+        embedding_model = options.pop("embedding_model", None)
+        if embedding_model == "store":
+            embedding_model = store_embeddings(
+                self.memory.embedding_model,
+                self._embedding_dims,
+                options.get("tokenizer_or_token_counter", "gpt2")
+            )
         return Chunking(
-            chunker_type='recursive',
-            chunk_size=512,
-            chunk_overlap=50
+            chunker_type=options.pop("type", 'recursive'),
+            chunk_size=options.pop("chunk_size", 512),
+            chunk_overlap=options.pop("chunk_overlap", 50),
+            embedding_model=embedding_model,
+            **options
         )
 
+    @property
+    def _embedding_dims(self):
+        embedder_config = getattr(self.memory.embedding_model, "config", None)
+        return (getattr(embedder_config, "embedding_dims", None)
+                or self.config["vector_store"]["config"].get("embedding_model_dims") or 1536)
+
+    @cached_property
+    def reuse_chunk_embeddings(self):
+        """Whether vectors computed by the chunker can be stored as-is.
+
+        Late chunks carry the embedding of their text and are reused
+        automatically. Semantic/SDPM chunks only carry sentence embeddings;
+        their token-weighted mean is reused only with
+        {"chunker": {"pool_sentence_embeddings": True}}. Either way the chunker
+        must embed with the store's embedder (shared via config) or a model of
+        the same name and dimensions, and content must not be normalized after
+        chunking. Disable with {"chunker": {"reuse_embeddings": False}}.
+        """
+        options = (self._config or {}).get("chunker") or {}
+        chunker = self.chunker
+        if not options.get("reuse_embeddings", True) or self._normalize:
+            return False
+        if chunker.chunker_type not in Chunking.EMBEDDING_CHUNKERS:
+            return False
+        if chunker.chunker_type != "late" and not options.get("pool_sentence_embeddings", False):
+            return False
+        store_embedder = self.memory.embedding_model
+        if getattr(chunker.embedding_model, "store_embedder", None) is store_embedder:
+            return True
+        store_model = getattr(getattr(store_embedder, "config", None), "model", None)
+        chunk_model = chunker.embedding_model_name
+        if not (store_model and chunk_model and _same_model(chunk_model, store_model)):
+            return False
+        return chunker.embedding_dimension == self._embedding_dims
+
+    def chunk_items(self, chunks):
+        """Yield ``(text, vector)`` for chunker output; vector is None unless it can be reused."""
+        reuse = self.reuse_chunk_embeddings
+        dims = self._embedding_dims if reuse else None
+        for chunk in chunks:
+            text = self.prepare_text(chunk.text if hasattr(chunk, 'text') else str(chunk))
+            if not text:
+                continue
+            vector = Chunking.chunk_embedding(chunk, pooled=True) if reuse else None
+            yield text, (vector if vector is not None and len(vector) == dims else None)
+
     def _log(self, message, level=2):
         """Internal logging helper"""
         if self._verbose and self._verbose >= level:
@@ -214,6 +330,8 @@ class Knowledge:
                 else:
                     raise
             self._log(f"Store operation result: {result}")
+            self._invalidate_cache()
+            self._index_lexical(result, user_id=user_id, agent_id=agent_id, run_id=run_id)
             return result
         except Exception as e:
             logger.error(f"Error storing content: {str(e)}")
@@ -227,7 +345,28 @@ class Knowledge:
         """Retrieve a specific memory by ID."""
         return self.memory.get(memory_id)
 
-    def search(self, query, user_id=None, agent_id=None, run_id=None, rerank=None, **kwargs):
+    @cached_property
+    def cache(self):
+        """Retrieval cache; configure with {"cache": {"ttl", "max_entries", "semantic_threshold"}} or disable with {"cache": False}."""
+        options = (self._config or {}).get("cache", {})
+        if options is False:
+            return RetrievalCache(max_entries=0)
+        options = options if isinstance(options, dict) else {}
+        return RetrievalCache(
+            ttl=options.get("ttl", DEFAULT_TTL),
+            max_entries=options.get("max_entries", DEFAULT_MAX_ENTRIES),
+            semantic_threshold=options.get("semantic_threshold"),
+            embed=lambda text: self.memory.embedding_model.embed(text, "search")
+        )
+
+    def _invalidate_cache(self):
+        """Discard cached search results after the collection changed."""
+        if "cache" in self.__dict__:
+            self.cache.invalidate()
+
+    @traced("knowledge.search", "knowledge")
+    def search(self, query, user_id=None, agent_id=None, run_id=None, rerank=None, mode=None, weights=None,
+               use_cache=True, **kwargs):
         """Search for memories related to a query.
         
         Args:
@@ -236,6 +375,12 @@ class Knowledge:
             agent_id: Optional agent ID for agent-specific search  
             run_id: Optional run ID for run-specific search
             rerank: Whether to use Mem0's advanced reranking. If None, uses config default
+            mode: "vector" (Mem0 only), "lexical" (local BM25 only) or "hybrid"
+                (both run concurrently and are fused with reciprocal rank fusion).
+                If None, uses config "search_mode" (default "vector")
+            weights: (vector, lexical) RRF weights for hybrid mode. If None, uses
+                config "hybrid_weights" (default (1.0, 1.0))
+            use_cache: Serve repeated queries from the retrieval cache (see :attr:`cache`)
             **kwargs: Additional search parameters to pass to Mem0 (keyword_search, filter_memories, etc.)
         
         Returns:
@@ -244,12 +389,99 @@ class Knowledge:
         # Use config default if rerank not explicitly specified
         if rerank is None:
             rerank = self.config.get("reranker", {}).get("default_rerank", False)
-        
-        return self.memory.search(query, user_id=user_id, agent_id=agent_id, run_id=run_id, rerank=rerank, **kwargs)
+        mode = mode or (self._config or {}).get("search_mode", "vector")
+        if mode not in ("vector", "lexical", "hybrid"):
+            raise ValueError(f"Unsupported search mode: {mode}. Must be one of: vector, lexical, hybrid")
+
+        if not use_cache:
+            return self._search(query, user_id, agent_id, run_id, rerank, mode, weights, **kwargs)
+        key = self.cache.key(query, {
+            "user_id": user_id, "agent_id": agent_id, "run_id": run_id, "rerank": rerank,
+            "mode": mode, "weights": weights, **kwargs
+        })
+        cached, vector = self.cache.lookup(key)
+        if cached is not None:
+            self._log(f"Retrieval cache hit for: {query}")
+            return cached
+        generation = self.cache.generation
+        result = self._search(query, user_id, agent_id, run_id, rerank, mode, weights, **kwargs)
+        self.cache.put(key, result, generation, vector)
+        return result
+
+    def _search(self, query, user_id, agent_id, run_id, rerank, mode, weights, **kwargs):
+        """Run a search against the stores, bypassing the retrieval cache."""
+
+        if mode == "vector":
+            return self.memory.search(query, user_id=user_id, agent_id=agent_id, run_id=run_id, rerank=rerank, **kwargs)
+
+        limit = kwargs.get("limit", DEFAULT_SEARCH_LIMIT)
+        if mode == "lexical":
+            hits = self.lexical.search(query, limit, user_id=user_id, agent_id=agent_id, run_id=run_id)
+            return {'results': [self._lexical_result(*hit) for hit in hits], 'relations': []}
+
+        # Hybrid: vector search on a worker thread while BM25 runs here
+        kwargs.setdefault("limit", limit)
+        vector_future = _search_executor().submit(
+            propagate(self.memory.search), query, user_id=user_id, agent_id=agent_id, run_id=run_id, rerank=rerank, **kwargs
+        )
+        lexical_hits = self.lexical.search(query, limit, user_id=user_id, agent_id=agent_id, run_id=run_id)
+        vector = vector_future.result()
+        vector_results = vector.get('results', []) if isinstance(vector, dict) else list(vector or [])
+
+        weights = weights or (self._config or {}).get("hybrid_weights", (1.0, 1.0))
+        fused = reciprocal_rank_fusion(
+            [[r.get('id') for r in vector_results], [hit[0] for hit in lexical_hits]], weights
+        )
+        by_id = {r.get('id'): r for r in vector_results}
+        lexical_by_id = {hit[0]: hit for hit in lexical_hits}
+        results = []
+        for memory_id, score in fused[:limit]:
+            if memory_id in by_id:
+                item = dict(by_id[memory_id])
+                item['vector_score'] = item.get('score')
+            else:
+                item = self._lexical_result(*lexical_by_id[memory_id])
+            if memory_id in lexical_by_id:
+                item['lexical_score'] = lexical_by_id[memory_id][2]
+            item['score'] = score
+            results.append(item)
+        relations = vector.get('relations', []) if isinstance(vector, dict) else []
+        return {'results': results, 'relations': relations}
+
+    @staticmethod
+    def _lexical_result(memory_id, text, score):
+        return {'id': memory_id, 'memory': text, 'score': score, 'metadata': {}}
+
+    @cached_property
+    def lexical(self):
+        """Local BM25 index kept next to the vectors, partitioned by collection."""
+        path = self._vector_store_option("path", ".praison")
+        return LexicalIndex(os.path.join(path, "knowledge_lexical.db"), self.collection_name)
+
+    def _index_lexical(self, result, user_id=None, agent_id=None, run_id=None):
+        """Add newly stored memories from a store()/add() result to the lexical index."""
+        items = result.get('results', []) if isinstance(result, dict) else (result or [])
+        scope = {"user_id": user_id, "agent_id": agent_id, "run_id": run_id}
+        try:
+            self.lexical.add(
+                (item.get('id'), item.get('memory'), scope)
+                for item in items
+                if isinstance(item, dict) and item.get('event', 'ADD') == 'ADD'
+            )
+        except Exception as e:
+            logger.warning(f"Could not update lexical index: {e}")
+
+    def benchmark_search(self, cases, k=5, modes=("vector", "lexical", "hybrid"), **search_kwargs):
+        """Report recall@k and p50/p95 latency per search mode; see lexical.benchmark_retrieval."""
+        search_kwargs.setdefault("use_cache", False)
+        return benchmark_retrieval(self, cases, k=k, modes=modes, **search_kwargs)
 
     def update(self, memory_id, data):
         """Update a memory."""
-        return self.memory.update(memory_id, data)
+        result = self.memory.update(memory_id, data)
+        self.lexical.update(memory_id, data)
+        self._invalidate_cache()
+        return result
 
     def history(self, memory_id):
         """Get the history of changes for a memory."""
@@ -258,116 +490,310 @@ class Knowledge:
     def delete(self, memory_id):
         """Delete a memory."""
         self.memory.delete(memory_id)
+        self.lexical.delete([memory_id])
+        self._invalidate_cache()
 
     def delete_all(self, user_id=None, agent_id=None, run_id=None):
         """Delete all memories."""
         self.memory.delete_all(user_id=user_id, agent_id=agent_id, run_id=run_id)
+        self.lexical.clear({"user_id": user_id, "agent_id": agent_id, "run_id": run_id})
+        self._invalidate_cache()
+        if user_id is None and agent_id is None and run_id is None:
+            self.manifest.clear(self.collection_name)
+            return
+        scope = json.dumps([user_id, agent_id, run_id])
+        for source in self.manifest.entries(self.collection_name, scope):
+            self.manifest.remove(self.collection_name, scope, source)
 
     def reset(self):
         """Reset all memories."""
         self.memory.reset()
+        self.manifest.clear(self.collection_name)
+        self.lexical.clear()
+        self._invalidate_cache()
 
-    def normalize_content(self, content):
-        """Normalize content for consistent storage."""
-        # Example normalization: strip whitespace, convert to lowercase
-        return content.strip().lower()
+    def export(self, path, batch_size=DEFAULT_BATCH_SIZE, format=None):
+        """Stream the knowledge base, vectors included, to Parquet / Arrow IPC / JSONL.
 
-    def add(self, file_path, user_id=None, agent_id=None, run_id=None, metadata=None):
-        """Read file content and store it in memory.
-        
         Args:
-            file_path: Can be:
-                - A string path to local file
-                - A URL string
-                - A list containing file paths and/or URLs
+            path: Destination file; the format follows the extension unless given
+            batch_size: Records fetched from the vector store and written per chunk
+            format: "parquet", "arrow" or "jsonl" to override the extension
+
+        Returns:
+            Number of records written
         """
-        if isinstance(file_path, (list, tuple)):
-            results = []
-            for path in file_path:
-                result = self._process_single_input(path, user_id, agent_id, run_id, metadata)
-                results.extend(result.get('results', []))
-            return {'results': results, 'relations': []}
-        
-        return self._process_single_input(file_path, user_id, agent_id, run_id, metadata)
+        vector_store = self.memory.vector_store
+        collection = getattr(vector_store, "collection", None)
+        with RecordWriter(path, format) as writer:
+            if collection is not None and hasattr(collection, "get"):
+                # Chroma: page through the collection with stored embeddings
+                offset = 0
+                while True:
+                    resp = collection.get(include=["embeddings", "metadatas"], limit=batch_size, offset=offset)
+                    ids = resp["ids"]
+                    if not ids:
+                        break
+                    embeddings = resp.get("embeddings")
+                    if embeddings is None:
+                        embeddings = [None] * len(ids)
+                    metadatas = resp.get("metadatas") or [None] * len(ids)
+                    writer.write([
+                        make_record(ident, "knowledge", (meta or {}).get("data"), meta or {}, emb)
+                        for ident, meta, emb in zip(ids, metadatas, embeddings)
+                    ])
+                    offset += len(ids)
+            else:
+                # Other providers only expose payloads; import re-embeds these
+                self._log("Vector store does not expose embeddings, exporting payloads only")
+                listed = vector_store.list(top_k=2 ** 31 - 1)
+                items = listed[0] if listed and isinstance(listed[0], list) else listed
+                for start in range(0, len(items), batch_size):
+                    writer.write([
+                        make_record(item.id, "knowledge", (item.payload or {}).get("data"), item.payload or {})
+                        for item in items[start:start + batch_size]
+                    ])
+            count = writer.count
+        self._log(f"Exported {count} knowledge records to {path}")
+        return count
 
-    def _process_single_input(self, input_path, user_id=None, agent_id=None, run_id=None, metadata=None):
-        """Process a single input which can be a file path or URL."""
-        try:
-            # Define supported file extensions
-            DOCUMENT_EXTENSIONS = {
-                'document': ('.pdf', '.ppt', '.pptx', '.doc', '.docx', '.xls', '.xlsx'),
-                'media': ('.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.mp3', '.wav', '.ogg', '.m4a'),
-                'text': ('.txt', '.csv', '.json', '.xml', '.md', '.html', '.htm'),
-                'archive': '.zip'
-            }
+    def import_(self, path, batch_size=DEFAULT_BATCH_SIZE, format=None):
+        """Bulk-load records written by :meth:`export` straight into the vector store.
 
-            # Check if input is URL
-            if isinstance(input_path, str) and (input_path.startswith('http://') or input_path.startswith('https://')):
-                self._log(f"Processing URL: {input_path}")
-                raise NotImplementedError("URL processing not yet implemented")
+        Stored embeddings are inserted as-is, so a full export imports with no
+        embedding calls; only records exported without a vector are re-embedded.
 
-            # Check if input ends with any supported extension
-            is_supported_file = any(input_path.lower().endswith(ext) 
-                                  for exts in DOCUMENT_EXTENSIONS.values()
-                                  for ext in (exts if isinstance(exts, tuple) else (exts,)))
-            
-            if is_supported_file:
-                self._log(f"Processing as file path: {input_path}")
-                if not os.path.exists(input_path):
-                    logger.error(f"File not found: {input_path}")
-                    raise FileNotFoundError(f"File not found: {input_path}")
-                
-                file_ext = '.' + input_path.lower().split('.')[-1]  # Get extension reliably
-                
-                # Process file based on type
-                if file_ext in DOCUMENT_EXTENSIONS['text']:
-                    with open(input_path, 'r', encoding='utf-8') as file:
-                        content = file.read().strip()
-                    if not content:
-                        raise ValueError("Empty text file")
-                    memories = [self.normalize_content(content)]
+        Returns:
+            Dict with the number of records loaded and how many needed embedding
+        """
+        vector_store = self.memory.vector_store
+        loaded = embedded = 0
+        for batch in iter_record_batches(path, batch_size, format):
+            records = [r for r in batch if r.get("store", "knowledge") == "knowledge"]
+            if not records:
+                continue
+            vectors = []
+            for record in records:
+                if record.get("embedding"):
+                    vectors.append(record["embedding"])
+                else:
+                    vectors.append(self.memory.embedding_model.embed(record["content"], "add"))
+                    embedded += 1
+            payloads = [parse_metadata(r) for r in records]
+            vector_store.insert(vectors=vectors, payloads=payloads, ids=[r["id"] for r in records])
+            self.lexical.add(
+                (r["id"], p.get("data") or r["content"], p) for r, p in zip(records, payloads)
+            )
+            loaded += len(records)
+        self._invalidate_cache()
+        self._log(f"Imported {loaded} knowledge records from {path} ({embedded} re-embedded)")
+        return {"knowledge": loaded, "embedded": embedded}
+
+    @cached_property
+    def manifest(self):
+        """Persistent record of indexed sources, stored next to the vectors."""
+        path = self._vector_store_option("path", ".praison")
+        return IndexManifest(os.path.join(path, "knowledge_manifest.db"))
+
+    def version(self, user_id=None, agent_id=None, run_id=None):
+        """Fingerprint of the content indexed for a scope; changes when its sources are re-indexed or the collection is written."""
+        scope = json.dumps([user_id, agent_id, run_id])
+        generation = self.cache.generation
+        cached = self._versions.get(scope)
+        if cached is not None and cached[0] == generation:
+            return cached[1]
+        entries = self.manifest.entries(self.collection_name, scope)
+        digest = hash_text(json.dumps(sorted((source, e["content_hash"], e["indexed_at"]) for source, e in entries.items()), default=str))
+        version = f"{digest[:16]}.{generation}"
+        self._versions[scope] = (generation, version)
+        return version
+
+    @cached_property
+    def index_fingerprint(self):
+        """Hash of everything that changes the vectors a source produces."""
+        chunker = self.chunker
+        settings = {
+            "chunker": [chunker.chunker_type, chunker.chunk_size, chunker.chunk_overlap,
+                        str(chunker.tokenizer_or_token_counter)],
+            "embedder": (self._config or {}).get("embedder"),
+            "version": (self._config or {}).get("version", "v1.1"),
+            "chunker_config": (self._config or {}).get("chunker"),
+            "normalize": self._normalize,
+            "text_chunking": "stream",
+        }
+        return hashlib.sha256(json.dumps(settings, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+    def sync(self, sources, user_id=None, agent_id=None, run_id=None, metadata=None, prune=True, **pipeline_options):
+        """Incrementally index ``sources`` against the manifest.
+
+        Unchanged sources (same size and mtime, or same content hash) are
+        skipped, so nothing is embedded. Changed sources have their old vectors
+        deleted and are re-indexed. With ``prune=True``, sources that were
+        indexed for this user/agent/run scope earlier but are no longer listed
+        get their vectors deleted.
+
+        Args:
+            sources: File paths, directories, globs or raw text strings
+            prune: Delete vectors of sources missing from ``sources``
+            **pipeline_options: Passed to IngestionPipeline
+
+        Returns:
+            Dict with 'added', 'updated', 'unchanged', 'removed' source lists,
+            'results', 'errors' and the pipeline 'stats' (when files were indexed)
+        """
+        if isinstance(sources, str):
+            sources = [sources]
+        collection = self.collection_name
+        scope = json.dumps([user_id, agent_id, run_id])
+        fingerprint = self.index_fingerprint
+        known = self.manifest.entries(collection, scope)
+        report = {"added": [], "updated": [], "unchanged": [], "removed": [], "results": [], "errors": []}
+
+        files, texts, seen = [], {}, set()
+        for source in expand_sources(sources):
+            if isinstance(source, str) and source.startswith(('http://', 'https://')):
+                self._log(f"Skipping URL source (not yet supported): {source}")
+                continue
+            if isinstance(source, str) and os.path.isfile(source):
+                key = os.path.abspath(source)
+                seen.add(key)
+                stat = os.stat(source)
+                row = known.get(key)
+                if row and row["fingerprint"] == fingerprint:
+                    if row["size"] == stat.st_size and row["mtime"] == stat.st_mtime:
+                        report["unchanged"].append(source)
+                        continue
+                    content_hash = hash_file(source)
+                    if content_hash == row["content_hash"]:
+                        self.manifest.touch(collection, scope, key, stat.st_size, stat.st_mtime)
+                        report["unchanged"].append(source)
+                        continue
                 else:
-                    # Use MarkItDown for documents and media
-                    result = self.markdown.convert(input_path)
-                    content = result.text_content
-                    if not content:
-                        raise ValueError("No content could be extracted from file")
-                    chunks = self.chunker.chunk(content)
-                    memories = [chunk.text.strip() if hasattr(chunk, 'text') else str(chunk).strip() 
-                              for chunk in chunks if chunk]
-
-                # Set metadata for file
-                if not metadata:
-                    metadata = {}
-                metadata['file_type'] = file_ext.lstrip('.')
-                metadata['filename'] = os.path.basename(input_path)
+                    content_hash = hash_file(source)
+                files.append((source, key, content_hash, stat))
+            elif isinstance(source, str) and source.lower().endswith(SUPPORTED_EXTENSIONS):
+                raise FileNotFoundError(f"File not found: {source}")
             else:
-                # Treat as raw text content only if no file extension
-                memories = [self.normalize_content(input_path)]
-
-            # Create progress display
-            progress = Progress(
-                SpinnerColumn(),
-                TextColumn("[progress.description]{task.description}"),
-                BarColumn(),
-                TaskProgressColumn(),
-                transient=True
+                text = str(source).strip()
+                if not text:
+                    continue
+                key = f"text:{hash_text(text)}"
+                seen.add(key)
+                row = known.get(key)
+                if row and row["fingerprint"] == fingerprint:
+                    report["unchanged"].append(key)
+                else:
+                    texts[key] = text
+
+        # Drop stale vectors before re-indexing changed sources
+        for key in [k for _, k, _, _ in files] + list(texts):
+            if key in known:
+                self._delete_vectors(known[key]["memory_ids"])
+        if prune:
+            for key, row in known.items():
+                if key not in seen:
+                    self._delete_vectors(row["memory_ids"])
+                    self.manifest.remove(collection, scope, key)
+                    report["removed"].append(key)
+
+        if files:
+            result = IngestionPipeline(self, **pipeline_options).run(
+                [f[0] for f in files], user_id=user_id, agent_id=agent_id, run_id=run_id, metadata=metadata
             )
+            ids_by_source = {}
+            for item in result["results"]:
+                ids_by_source.setdefault(item.get("source"), []).append(item["id"])
+            failed = {e["source"] for e in result.get("errors", [])}
+            for source, key, content_hash, stat in files:
+                if source in failed:
+                    continue
+                self.manifest.record(collection, scope, key, content_hash, fingerprint,
+                                     ids_by_source.get(source, []), stat.st_size, stat.st_mtime)
+                report["updated" if key in known else "added"].append(source)
+            report["results"].extend(result["results"])
+            report["errors"].extend(result["errors"])
+            report["stats"] = result["stats"]
 
-            # Store memories with progress bar
-            all_results = []
-            with progress:
-                store_task = progress.add_task(f"Adding to Knowledge from {os.path.basename(input_path)}", total=len(memories))
-                for memory in memories:
-                    if memory:
-                        memory_result = self.store(memory, user_id=user_id, agent_id=agent_id, 
-                                                 run_id=run_id, metadata=metadata)
-                        if memory_result:
-                            all_results.extend(memory_result.get('results', []))
-                        progress.advance(store_task)
+        for key, text in texts.items():
+            result = self.store(self.prepare_text(text), user_id=user_id, agent_id=agent_id, run_id=run_id, metadata=metadata) or {}
+            items = result.get("results", []) if isinstance(result, dict) else []
+            if not items:
+                continue  # store() already logged the failure; retry on next sync
+            self.manifest.record(collection, scope, key, key.split(":", 1)[1], fingerprint,
+                                 [i["id"] for i in items if "id" in i])
+            report["updated" if key in known else "added"].append(key)
+            report["results"].extend(items)
 
-            return {'results': all_results, 'relations': []}
+        self._log(f"Knowledge sync: {len(report['added'])} added, {len(report['updated'])} updated, "
+                  f"{len(report['unchanged'])} unchanged, {len(report['removed'])} removed")
+        return report
 
-        except Exception as e:
-            logger.error(f"Error processing input {input_path}: {str(e)}", exc_info=True)
-            raise
\ No newline at end of file
+    def _delete_vectors(self, memory_ids):
+        """Delete vectors by id, in one call when the store supports it."""
+        if not memory_ids:
+            return
+        self.lexical.delete(memory_ids)
+        self._invalidate_cache()
+        vector_store = self.memory.vector_store
+        collection = getattr(vector_store, "collection", None)
+        if collection is not None and hasattr(collection, "delete"):
+            collection.delete(ids=list(memory_ids))
+            return
+        for memory_id in memory_ids:
+            try:
+                vector_store.delete(vector_id=memory_id)
+            except Exception as e:
+                logger.warning(f"Could not delete vector {memory_id}: {e}")
+
+    def normalize_content(self, content):
+        """Normalize content for consistent storage."""
+        # Example normalization: strip whitespace, convert to lowercase
+        return content.strip().lower()
+
+    def prepare_text(self, content):
+        """Strip content, lowercasing it only when normalization was requested."""
+        return self.normalize_content(content) if self._normalize else content.strip()
+
+    def iter_text_chunks(self, file_path, window_size=1024 * 1024, with_embeddings=False):
+        """Stream a text file through the chunker; CSV, JSON and Markdown split on their structure.
+
+        With ``with_embeddings`` yields ``(text, vector)`` pairs as :meth:`chunk_items` does.
+        """
+        items = self.chunk_items(self.chunker.iter_chunks(file_path, window_size=window_size))
+        if with_embeddings:
+            yield from items
+            return
+        for text, _ in items:
+            yield text
+
+    def add(self, file_path, user_id=None, agent_id=None, run_id=None, metadata=None, **pipeline_options):
+        """Read file content and store it in memory.
+        
+        Args:
+            file_path: Can be:
+                - A string path to local file
+                - A URL string
+                - A directory (walked recursively) or glob pattern
+                - Raw text
+                - A list containing any of the above
+            **pipeline_options: Passed to IngestionPipeline
+                (convert_workers, embed_batch_size, write_batch_size, ...)
+
+        Sources are indexed through :meth:`sync` without pruning, so they are
+        recorded in the manifest: adding a source again, or syncing it later,
+        only re-embeds it when it changed. Files go through the parallel
+        ingestion pipeline; the result carries 'results', 'errors' and the
+        per-stage 'stats' next to the sync report. A single file that cannot
+        be converted raises instead of being reported in 'errors'.
+        """
+        sources = list(file_path) if isinstance(file_path, (list, tuple)) else [file_path]
+        if any(isinstance(s, str) and s.startswith(('http://', 'https://')) for s in sources):
+            raise NotImplementedError("URL processing not yet implemented")
+        report = self.sync(sources, user_id=user_id, agent_id=agent_id, run_id=run_id, metadata=metadata,
+                           prune=False, **pipeline_options)
+        single_file = isinstance(file_path, str) and os.path.isfile(file_path)
+        if single_file and (report['errors'] or not (report['results'] or report['unchanged'])):
+            error = report['errors'][0]['error'] if report['errors'] else "No content could be extracted from file"
+            raise ValueError(f"Error processing input {file_path}: {error}")
+        report['relations'] = []
+        return report
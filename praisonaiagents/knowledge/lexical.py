@@ -0,0 +1,268 @@
+"""
+Local lexical index kept next to the Knowledge vector store.
+
+Vector search misses exact identifiers (error codes, SKUs, function names);
+a BM25 index catches them. The index uses SQLite FTS5 when available and
+falls back to an in-process inverted index otherwise. Results from both
+retrievers are merged with reciprocal rank fusion (RRF).
+"""
+
+import os
+import re
+import math
+import time
+import sqlite3
+import logging
+import threading
+from collections import defaultdict, Counter
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+SCOPE_KEYS = ("user_id", "agent_id", "run_id")
+RRF_K = 60
+
+# Identifier-friendly terms: keeps SKU-1234, ERR_42, pkg.module.func together
+_TERM = re.compile(r"[\w][\w\-\.]*[\w]|\w")
+_TOKEN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    return [t.lower() for t in _TOKEN.findall(text or "")]
+
+
+class _InvertedIndex:
+    """Minimal BM25 inverted index used when SQLite lacks FTS5."""
+
+    def __init__(self):
+        self.docs: Dict[str, Tuple[str, Dict[str, Any], Counter, int]] = {}
+        self.postings: Dict[str, set] = defaultdict(set)
+        self.total_len = 0
+
+    def add(self, memory_id, text, scope):
+        self.delete([memory_id])
+        terms = Counter(tokenize(text))
+        length = sum(terms.values())
+        self.docs[memory_id] = (text, scope, terms, length)
+        self.total_len += length
+        for term in terms:
+            self.postings[term].add(memory_id)
+
+    def delete(self, ids):
+        for memory_id in ids:
+            doc = self.docs.pop(memory_id, None)
+            if doc is None:
+                continue
+            self.total_len -= doc[3]
+            for term in doc[2]:
+                self.postings[term].discard(memory_id)
+
+    def search(self, query, limit, scope, k1=1.2, b=0.75):
+        terms = set(tokenize(query))
+        n = len(self.docs)
+        if not n or not terms:
+            return []
+        avg_len = self.total_len / n
+        scores = defaultdict(float)
+        for term in terms:
+            ids = self.postings.get(term)
+            if not ids:
+                continue
+            idf = math.log(1 + (n - len(ids) + 0.5) / (len(ids) + 0.5))
+            for memory_id in ids:
+                text, doc_scope, tf, length = self.docs[memory_id]
+                if any(v is not None and doc_scope.get(k) != v for k, v in scope.items()):
+                    continue
+                freq = tf[term]
+                scores[memory_id] += idf * freq * (k1 + 1) / (freq + k1 * (1 - b + b * length / avg_len))
+        ranked = sorted(scores.items(), key=lambda x: x[1], reverse=True)[:limit]
+        return [(memory_id, self.docs[memory_id][0], score) for memory_id, score in ranked]
+
+
+class LexicalIndex:
+    """
+    BM25 index over stored chunks, partitioned by collection and filterable
+    by user_id / agent_id / run_id.
+    """
+
+    def __init__(self, path: str, collection: str):
+        self.path = path
+        self.collection = collection
+        self._lock = threading.Lock()
+        self._memory_index: Optional[_InvertedIndex] = None
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        try:
+            self._conn.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS chunks_fts USING fts5(
+                memory_id UNINDEXED, collection UNINDEXED,
+                user_id UNINDEXED, agent_id UNINDEXED, run_id UNINDEXED,
+                text, tokenize = "unicode61 tokenchars '_'"
+            )
+            """)
+            self._conn.commit()
+        except sqlite3.OperationalError as e:
+            logger.warning(f"FTS5 unavailable, using in-process lexical index: {e}")
+            self._conn.close()
+            self._conn = None
+            self._memory_index = _InvertedIndex()
+
+    def add(self, items: Iterable[Tuple[str, str, Dict[str, Any]]]):
+        """Index ``(memory_id, text, scope)`` items; scope holds user_id/agent_id/run_id."""
+        items = [(i, t, {k: (s or {}).get(k) for k in SCOPE_KEYS}) for i, t, s in items if i and t]
+        if not items:
+            return
+        with self._lock:
+            if self._memory_index is not None:
+                for memory_id, text, scope in items:
+                    self._memory_index.add(memory_id, text, scope)
+                return
+            self._conn.executemany(
+                "DELETE FROM chunks_fts WHERE memory_id = ? AND collection = ?",
+                [(i, self.collection) for i, _, _ in items]
+            )
+            self._conn.executemany(
+                "INSERT INTO chunks_fts (memory_id, collection, user_id, agent_id, run_id, text) VALUES (?,?,?,?,?,?)",
+                [(i, self.collection, s["user_id"], s["agent_id"], s["run_id"], t) for i, t, s in items]
+            )
+            self._conn.commit()
+
+    def delete(self, ids: Iterable[str]):
+        ids = list(ids)
+        if not ids:
+            return
+        with self._lock:
+            if self._memory_index is not None:
+                self._memory_index.delete(ids)
+                return
+            self._conn.executemany(
+                "DELETE FROM chunks_fts WHERE memory_id = ? AND collection = ?",
+                [(i, self.collection) for i in ids]
+            )
+            self._conn.commit()
+
+    def update(self, memory_id: str, text: str):
+        """Replace the text of an indexed chunk, keeping its scope."""
+        with self._lock:
+            if self._memory_index is not None:
+                doc = self._memory_index.docs.get(memory_id)
+                if doc:
+                    self._memory_index.add(memory_id, text, doc[1])
+                return
+            self._conn.execute(
+                "UPDATE chunks_fts SET text = ? WHERE memory_id = ? AND collection = ?",
+                (text, memory_id, self.collection)
+            )
+            self._conn.commit()
+
+    def clear(self, scope: Optional[Dict[str, Any]] = None):
+        """Remove everything in this collection, or only rows matching ``scope``."""
+        scope = {k: v for k, v in (scope or {}).items() if k in SCOPE_KEYS and v is not None}
+        with self._lock:
+            if self._memory_index is not None:
+                ids = [i for i, d in self._memory_index.docs.items()
+                       if all(d[1].get(k) == v for k, v in scope.items())]
+                self._memory_index.delete(ids)
+                return
+            where = " AND ".join(["collection = ?"] + [f"{k} = ?" for k in scope])
+            self._conn.execute(f"DELETE FROM chunks_fts WHERE {where}", [self.collection, *scope.values()])
+            self._conn.commit()
+
+    @staticmethod
+    def match_expression(query: str) -> str:
+        """OR of quoted terms, so identifiers like SKU-1234 match as exact phrases."""
+        terms = []
+        for term in _TERM.findall(query or ""):
+            term = term.replace('"', '""')
+            if term not in terms:
+                terms.append(term)
+        return " OR ".join(f'"{t}"' for t in terms)
+
+    def search(self, query: str, limit: int = 10, **scope) -> List[Tuple[str, str, float]]:
+        """BM25 search. Returns ``(memory_id, text, score)`` with higher scores first."""
+        scope = {k: scope.get(k) for k in SCOPE_KEYS}
+        with self._lock:
+            if self._memory_index is not None:
+                return self._memory_index.search(query, limit, scope)
+            match = self.match_expression(query)
+            if not match:
+                return []
+            filters = [(k, v) for k, v in scope.items() if v is not None]
+            where = "".join(f" AND {k} = ?" for k, _ in filters)
+            try:
+                rows = self._conn.execute(
+                    f"SELECT memory_id, text, bm25(chunks_fts) FROM chunks_fts "
+                    f"WHERE chunks_fts MATCH ? AND collection = ?{where} "
+                    f"ORDER BY bm25(chunks_fts) LIMIT ?",
+                    [match, self.collection, *[v for _, v in filters], limit]
+                ).fetchall()
+            except sqlite3.OperationalError as e:
+                logger.warning(f"Lexical search failed for {query!r}: {e}")
+                return []
+        # FTS5 bm25() is lower-is-better; flip the sign for a conventional score
+        return [(r[0], r[1], -r[2]) for r in rows]
+
+
+def reciprocal_rank_fusion(
+    ranked_lists: Sequence[Sequence[str]],
+    weights: Optional[Sequence[float]] = None,
+    k: int = RRF_K
+) -> List[Tuple[str, float]]:
+    """
+    Fuse ranked id lists: score(d) = sum_i w_i / (k + rank_i(d)), rank starting at 1.
+    """
+    weights = list(weights) if weights is not None else [1.0] * len(ranked_lists)
+    scores: Dict[str, float] = defaultdict(float)
+    for ids, weight in zip(ranked_lists, weights):
+        for rank, memory_id in enumerate(ids, start=1):
+            scores[memory_id] += weight / (k + rank)
+    return sorted(scores.items(), key=lambda x: x[1], reverse=True)
+
+
+def benchmark_retrieval(
+    knowledge,
+    cases: Sequence[Dict[str, Any]],
+    k: int = 5,
+    modes: Sequence[str] = ("vector", "lexical", "hybrid"),
+    **search_kwargs
+) -> Dict[str, Dict[str, float]]:
+    """
+    Measure recall@k and latency of each search mode.
+
+    Args:
+        knowledge: Knowledge instance to query
+        cases: [{"query": str, "relevant_ids": [...]} or {"query": str, "relevant_text": [...]}]
+            relevant_text entries count as found when they occur in a returned memory
+        k: Cut-off for recall
+        modes: Search modes to compare
+        **search_kwargs: Passed to Knowledge.search (user_id, agent_id, weights, ...)
+
+    Returns:
+        {mode: {"recall@k": float, "p50_ms": float, "p95_ms": float, "mean_ms": float}}
+    """
+    report = {}
+    for mode in modes:
+        recalls, latencies = [], []
+        for case in cases:
+            started = time.perf_counter()
+            found = knowledge.search(case["query"], mode=mode, limit=k, **search_kwargs)
+            latencies.append((time.perf_counter() - started) * 1000)
+            results = found.get("results", []) if isinstance(found, dict) else (found or [])
+            results = results[:k]
+            ids = {r.get("id") for r in results}
+            texts = [r.get("memory", "") or "" for r in results]
+            targets = case.get("relevant_ids") or []
+            hits = sum(1 for t in targets if t in ids)
+            phrases = case.get("relevant_text") or []
+            hits += sum(1 for p in phrases if any(p.lower() in t.lower() for t in texts))
+            total = len(targets) + len(phrases)
+            recalls.append(hits / total if total else 0.0)
+        latencies.sort()
+        p = lambda q: latencies[min(len(latencies) - 1, int(math.ceil(q * len(latencies))) - 1)] if latencies else 0.0
+        report[mode] = {
+            f"recall@{k}": round(sum(recalls) / len(recalls), 4) if recalls else 0.0,
+            "p50_ms": round(p(0.50), 2),
+            "p95_ms": round(p(0.95), 2),
+            "mean_ms": round(sum(latencies) / len(latencies), 2) if latencies else 0.0
+        }
+    return report
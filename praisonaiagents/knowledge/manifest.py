@@ -0,0 +1,120 @@
+"""
+Persistent manifest of indexed knowledge sources.
+
+One row per (collection, scope, source) records the content hash, file size
+and mtime, the index fingerprint (chunker + embedder settings) and the vector
+ids produced for that source. ``Knowledge.sync`` uses it to skip unchanged
+sources with a single ``stat`` call, re-index changed ones and delete the
+vectors of removed ones.
+"""
+
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional
+
+
+def hash_file(path: str, block_size: int = 1024 * 1024) -> str:
+    """Content hash of a file, read in blocks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def hash_text(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class IndexManifest:
+    """SQLite-backed record of what has been indexed into which collection."""
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+        CREATE TABLE IF NOT EXISTS sources (
+            collection TEXT NOT NULL,
+            scope TEXT NOT NULL,
+            source TEXT NOT NULL,
+            content_hash TEXT,
+            size INTEGER,
+            mtime REAL,
+            fingerprint TEXT,
+            memory_ids TEXT,
+            indexed_at REAL,
+            PRIMARY KEY (collection, scope, source)
+        )
+        """)
+        self._conn.commit()
+
+    def entries(self, collection: str, scope: str) -> Dict[str, Dict[str, Any]]:
+        """All manifest rows for a collection/scope keyed by source."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT source, content_hash, size, mtime, fingerprint, memory_ids, indexed_at "
+                "FROM sources WHERE collection = ? AND scope = ?",
+                (collection, scope)
+            ).fetchall()
+        return {
+            r[0]: {
+                "content_hash": r[1],
+                "size": r[2],
+                "mtime": r[3],
+                "fingerprint": r[4],
+                "memory_ids": json.loads(r[5] or "[]"),
+                "indexed_at": r[6]
+            }
+            for r in rows
+        }
+
+    def record(
+        self,
+        collection: str,
+        scope: str,
+        source: str,
+        content_hash: str,
+        fingerprint: str,
+        memory_ids: List[str],
+        size: Optional[int] = None,
+        mtime: Optional[float] = None
+    ):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sources "
+                "(collection, scope, source, content_hash, size, mtime, fingerprint, memory_ids, indexed_at) "
+                "VALUES (?,?,?,?,?,?,?,?,?)",
+                (collection, scope, source, content_hash, size, mtime, fingerprint, json.dumps(memory_ids), time.time())
+            )
+            self._conn.commit()
+
+    def touch(self, collection: str, scope: str, source: str, size: int, mtime: float):
+        """Refresh stat info for a source whose content hash did not change."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE sources SET size = ?, mtime = ? WHERE collection = ? AND scope = ? AND source = ?",
+                (size, mtime, collection, scope, source)
+            )
+            self._conn.commit()
+
+    def remove(self, collection: str, scope: str, source: str):
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM sources WHERE collection = ? AND scope = ? AND source = ?",
+                (collection, scope, source)
+            )
+            self._conn.commit()
+
+    def clear(self, collection: Optional[str] = None):
+        with self._lock:
+            if collection is None:
+                self._conn.execute("DELETE FROM sources")
+            else:
+                self._conn.execute("DELETE FROM sources WHERE collection = ?", (collection,))
+            self._conn.commit()
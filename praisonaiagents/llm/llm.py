@@ -5,6 +5,9 @@ from typing import Any, Dict, List, Optional, Union, Literal, Callable
 from pydantic import BaseModel
 import time
 import json
+from ..retry import with_retry, provider_of
+from ..telemetry.tracing import traced, start_span, trace_stream, atrace_stream
+from ..streaming import token_stream, atoken_stream
 from ..main import (
     display_error,
     display_tool_call,
@@ -275,6 +278,7 @@ class LLM:
         
         return self.model in legacy_o1_models
 
+    @traced("llm.get_response", "llm", attributes=lambda self, *args, **kwargs: {"model": self.model, "agent": kwargs.get("agent_name")})
     def get_response(
         self,
         prompt: Union[str, List[Dict]],
@@ -444,7 +448,7 @@ class LLM:
 
                     # If reasoning_steps is True, do a single non-streaming call
                     if reasoning_steps:
-                        resp = litellm.completion(
+                        resp = self._completion(
                             **self._build_completion_params(
                                 messages=messages,
                                 temperature=temperature,
@@ -480,7 +484,7 @@ class LLM:
                         if verbose:
                             with Live(display_generating("", current_time), console=console, refresh_per_second=4) as live:
                                 response_text = ""
-                                for chunk in litellm.completion(
+                                for chunk in self._completion(
                                     **self._build_completion_params(
                                         messages=messages,
                                         tools=formatted_tools,
@@ -496,7 +500,7 @@ class LLM:
                         else:
                             # Non-verbose mode, just collect the response
                             response_text = ""
-                            for chunk in litellm.completion(
+                            for chunk in self._completion(
                                 **self._build_completion_params(
                                     messages=messages,
                                     tools=formatted_tools,
@@ -511,7 +515,7 @@ class LLM:
                         response_text = response_text.strip()
 
                         # Get final completion to check for tool calls
-                        final_response = litellm.completion(
+                        final_response = self._completion(
                             **self._build_completion_params(
                                 messages=messages,
                                 tools=formatted_tools,
@@ -629,7 +633,7 @@ class LLM:
                                     if verbose:
                                         with Live(display_generating("", start_time), console=console, refresh_per_second=4) as live:
                                             response_text = ""
-                                            for chunk in litellm.completion(
+                                            for chunk in self._completion(
                                                 **self._build_completion_params(
                                                     messages=follow_up_messages,
                                                     temperature=temperature,
@@ -642,7 +646,7 @@ class LLM:
                                                     live.update(display_generating(response_text, start_time))
                                     else:
                                         response_text = ""
-                                        for chunk in litellm.completion(
+                                        for chunk in self._completion(
                                             **self._build_completion_params(
                                                 messages=follow_up_messages,
                                                 temperature=temperature,
@@ -657,7 +661,7 @@ class LLM:
                         
                         # If reasoning_steps is True, do a single non-streaming call
                         elif reasoning_steps:
-                            resp = litellm.completion(
+                            resp = self._completion(
                                 **self._build_completion_params(
                                     messages=messages,
                                     temperature=temperature,
@@ -692,7 +696,7 @@ class LLM:
                             if verbose:
                                 with Live(display_generating("", current_time), console=console, refresh_per_second=4) as live:
                                     final_response_text = ""
-                                    for chunk in litellm.completion(
+                                    for chunk in self._completion(
                                         **self._build_completion_params(
                                             messages=messages,
                                             tools=formatted_tools,
@@ -707,7 +711,7 @@ class LLM:
                                             live.update(display_generating(final_response_text, current_time))
                             else:
                                 final_response_text = ""
-                                for chunk in litellm.completion(
+                                for chunk in self._completion(
                                     **self._build_completion_params(
                                         messages=messages,
                                         tools=formatted_tools,
@@ -791,7 +795,7 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
 
                 # If reasoning_steps is True, do a single non-streaming call to capture reasoning
                 if reasoning_steps:
-                    reflection_resp = litellm.completion(
+                    reflection_resp = self._completion(
                         **self._build_completion_params(
                             messages=reflection_messages,
                             temperature=temperature,
@@ -826,7 +830,7 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
                     if verbose:
                         with Live(display_generating("", start_time), console=console, refresh_per_second=4) as live:
                             reflection_text = ""
-                            for chunk in litellm.completion(
+                            for chunk in self._completion(
                                 **self._build_completion_params(
                                     messages=reflection_messages,
                                     temperature=temperature,
@@ -841,7 +845,7 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
                                     live.update(display_generating(reflection_text, start_time))
                     else:
                         reflection_text = ""
-                        for chunk in litellm.completion(
+                        for chunk in self._completion(
                             **self._build_completion_params(
                                 messages=reflection_messages,
                                 temperature=temperature,
@@ -887,7 +891,7 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
                     if verbose:
                         with Live(display_generating("", time.time()), console=console, refresh_per_second=4) as live:
                             response_text = ""
-                            for chunk in litellm.completion(
+                            for chunk in self._completion(
                                 **self._build_completion_params(
                                     messages=messages,
                                     temperature=temperature,
@@ -901,7 +905,7 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
                                     live.update(display_generating(response_text, time.time()))
                     else:
                         response_text = ""
-                        for chunk in litellm.completion(
+                        for chunk in self._completion(
                             **self._build_completion_params(
                                 messages=messages,
                                 temperature=temperature,
@@ -942,6 +946,7 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
             total_time = time.time() - start_time
             logging.debug(f"get_response completed in {total_time:.2f} seconds")
 
+    @traced("llm.get_response", "llm", attributes=lambda self, *args, **kwargs: {"model": self.model, "agent": kwargs.get("agent_name")})
     async def get_response_async(
         self,
         prompt: Union[str, List[Dict]],
@@ -1125,7 +1130,7 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
             response_text = ""
             if reasoning_steps:
                 # Non-streaming call to capture reasoning
-                resp = await litellm.acompletion(
+                resp = await self._acompletion(
                     **self._build_completion_params(
                         messages=messages,
                         temperature=temperature,
@@ -1157,7 +1162,7 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
                     # ----------------------------------------------------
                     # 1) Make the streaming call WITHOUT tools
                     # ----------------------------------------------------
-                    async for chunk in await litellm.acompletion(
+                    async for chunk in await self._acompletion(
                         **self._build_completion_params(
                             messages=messages,
                             temperature=temperature,
@@ -1171,7 +1176,7 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
                             print(f"Generating... {time.time() - start_time:.1f}s", end="\r")
                 else:
                     # Non-verbose streaming call, still no tools
-                    async for chunk in await litellm.acompletion(
+                    async for chunk in await self._acompletion(
                         **self._build_completion_params(
                             messages=messages,
                             temperature=temperature,
@@ -1189,7 +1194,7 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
             # ----------------------------------------------------
             if tools and execute_tool_fn:
                 # Next call with tools if needed
-                tool_response = await litellm.acompletion(
+                tool_response = await self._acompletion(
                     **self._build_completion_params(
                         messages=messages,
                         temperature=temperature,
@@ -1288,7 +1293,7 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
                                 # Get response with streaming
                                 if verbose:
                                     response_text = ""
-                                    async for chunk in await litellm.acompletion(
+                                    async for chunk in await self._acompletion(
                                         **self._build_completion_params(
                                             messages=follow_up_messages,
                                             temperature=temperature,
@@ -1302,7 +1307,7 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
                                             print(f"Processing results... {time.time() - start_time:.1f}s", end="\r")
                                 else:
                                     response_text = ""
-                                    async for chunk in await litellm.acompletion(
+                                    async for chunk in await self._acompletion(
                                         **self._build_completion_params(
                                             messages=follow_up_messages,
                                             temperature=temperature,
@@ -1318,7 +1323,7 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
                     # If no special handling was needed or if it's not an Ollama model
                     elif reasoning_steps:
                         # Non-streaming call to capture reasoning
-                        resp = await litellm.acompletion(
+                        resp = await self._acompletion(
                             **self._build_completion_params(
                                 messages=messages,
                                 temperature=temperature,
@@ -1349,7 +1354,7 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
                     else:
                         # Get response after tool calls with streaming
                         if verbose:
-                            async for chunk in await litellm.acompletion(
+                            async for chunk in await self._acompletion(
                                 **self._build_completion_params(
                                     messages=messages,
                                     temperature=temperature,
@@ -1365,7 +1370,7 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
                                     print(f"Reflecting... {time.time() - start_time:.1f}s", end="\r")
                         else:
                             response_text = ""
-                            async for chunk in await litellm.acompletion(
+                            async for chunk in await self._acompletion(
                                 **self._build_completion_params(
                                     messages=messages,
                                     temperature=temperature,
@@ -1411,7 +1416,7 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
 
             # If reasoning_steps is True, do a single non-streaming call to capture reasoning
             if reasoning_steps:
-                reflection_resp = await litellm.acompletion(
+                reflection_resp = await self._acompletion(
                     **self._build_completion_params(
                         messages=reflection_messages,
                         temperature=temperature,
@@ -1446,7 +1451,7 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
                 if verbose:
                     with Live(display_generating("", start_time), console=console, refresh_per_second=4) as live:
                         reflection_text = ""
-                        async for chunk in await litellm.acompletion(
+                        async for chunk in await self._acompletion(
                             **self._build_completion_params(
                                 messages=reflection_messages,
                                 temperature=temperature,
@@ -1461,7 +1466,7 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
                                 live.update(display_generating(reflection_text, start_time))
                 else:
                     reflection_text = ""
-                    async for chunk in await litellm.acompletion(
+                    async for chunk in await self._acompletion(
                         **self._build_completion_params(
                             messages=reflection_messages,
                             temperature=temperature,
@@ -1625,6 +1630,34 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
         
         return params
 
+    def _completion(self, **params):
+        """litellm.completion with our retries (litellm's own are off) and an ``llm.completion`` span; streams also report time to first token and token events"""
+        import litellm
+        span = start_span("llm.completion", "llm", model=params.get("model"), stream=bool(params.get("stream")), messages=len(params.get("messages") or []))
+        try:
+            result = with_retry(litellm.completion, provider_of(self.model))(**{"max_retries": 0, **params})
+        except BaseException as e:
+            span.end(e)
+            raise
+        if params.get("stream"):
+            return trace_stream(token_stream(result), span)
+        span.end()
+        return result
+
+    async def _acompletion(self, **params):
+        """Async version of _completion"""
+        import litellm
+        span = start_span("llm.completion", "llm", model=params.get("model"), stream=bool(params.get("stream")), messages=len(params.get("messages") or []))
+        try:
+            result = await with_retry(litellm.acompletion, provider_of(self.model))(**{"max_retries": 0, **params})
+        except BaseException as e:
+            span.end(e)
+            raise
+        if params.get("stream"):
+            return atrace_stream(atoken_stream(result), span)
+        span.end()
+        return result
+
     # Response without tool calls
     def response(
         self,
@@ -1684,7 +1717,7 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
                 response_text = ""
                 if verbose:
                     with Live(display_generating("", start_time), console=console or self.console, refresh_per_second=4) as live:
-                        for chunk in litellm.completion(
+                        for chunk in self._completion(
                             **self._build_completion_params(
                                 messages=messages,
                                 temperature=temperature,
@@ -1697,7 +1730,7 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
                                 response_text += content
                                 live.update(display_generating(response_text, start_time))
                 else:
-                    for chunk in litellm.completion(
+                    for chunk in self._completion(
                         **self._build_completion_params(
                             messages=messages,
                             temperature=temperature,
@@ -1708,7 +1741,7 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
                         if chunk and chunk.choices and chunk.choices[0].delta.content:
                             response_text += chunk.choices[0].delta.content
             else:
-                response = litellm.completion(
+                response = self._completion(
                     **self._build_completion_params(
                         messages=messages,
                         temperature=temperature,
@@ -1792,7 +1825,7 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
                 response_text = ""
                 if verbose:
                     with Live(display_generating("", start_time), console=console or self.console, refresh_per_second=4) as live:
-                        async for chunk in await litellm.acompletion(
+                        async for chunk in await self._acompletion(
                             **self._build_completion_params(
                                 messages=messages,
                                 temperature=temperature,
@@ -1805,7 +1838,7 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
                                 response_text += content
                                 live.update(display_generating(response_text, start_time))
                 else:
-                    async for chunk in await litellm.acompletion(
+                    async for chunk in await self._acompletion(
                         **self._build_completion_params(
                             messages=messages,
                             temperature=temperature,
@@ -1816,7 +1849,7 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
                         if chunk and chunk.choices and chunk.choices[0].delta.content:
                             response_text += chunk.choices[0].delta.content
             else:
-                response = await litellm.acompletion(
+                response = await self._acompletion(
                     **self._build_completion_params(
                         messages=messages,
                         temperature=temperature,
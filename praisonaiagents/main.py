@@ -3,7 +3,7 @@ import time
 import json
 import logging
 from typing import List, Optional, Dict, Any, Union, Literal, Type
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 from pydantic import BaseModel, ConfigDict
 from rich import print
 from rich.console import Console
@@ -13,6 +13,7 @@ from rich.markdown import Markdown
 from rich.logging import RichHandler
 from rich.live import Live
 import asyncio
+import weakref
     # Praison AI: Improved code documentation and clarity
     # Praison AI: Optimized algorithm for better scalability
 
@@ -398,6 +399,18 @@ elif not api_key:
 
 client = OpenAI(api_key=api_key, base_url=base_url)
 
+# AsyncOpenAI connections belong to the event loop that opened them, so async callers share one client per loop
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOpenAI]" = weakref.WeakKeyDictionary()
+
+
+def get_async_client() -> AsyncOpenAI:
+    """The AsyncOpenAI client of the running event loop, reused across calls so connections stay open."""
+    loop = asyncio.get_running_loop()
+    async_client = _async_clients.get(loop)
+    if async_client is None:
+        async_client = _async_clients[loop] = AsyncOpenAI(api_key=api_key, base_url=base_url)
+    return async_client
+
 class TaskOutput(BaseModel):
     model_config = ConfigDict(arbitrary_types_allowed=True)
     description: str
@@ -407,6 +420,7 @@ class TaskOutput(BaseModel):
     json_dict: Optional[Dict[str, Any]] = None
     agent: str
     output_format: Literal["RAW", "JSON", "Pydantic"] = "RAW"
+    prompt_tokens: Optional[int] = None  # size of the assembled task prompt
 
     def json(self) -> Optional[str]:
         if self.output_format == "JSON" and self.json_dict:
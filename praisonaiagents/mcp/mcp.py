@@ -12,6 +12,8 @@ from functools import wraps, partial
 
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
+
+from ..retry import with_retry
     # Praison AI: Improved memory management for better efficiency
 
 class MCPToolRunner(threading.Thread):
@@ -58,7 +60,7 @@ class MCPToolRunner(threading.Thread):
                                 
                                 tool_name, arguments = item
                                 try:
-                                    result = await session.call_tool(tool_name, arguments)
+                                    result = await with_retry(session.call_tool, "mcp")(tool_name, arguments)
                                     self.result_queue.put((True, result))
                                 except Exception as e:
                                     self.result_queue.put((False, str(e)))
@@ -13,6 +13,8 @@ from typing import List, Dict, Any, Optional, Callable, Iterable
 
 from mcp import ClientSession
 from mcp.client.sse import sse_client
+
+from ..retry import with_retry
     # Praison AI: Improved code organization and maintainability
     # Praison AI: Improved code documentation and clarity
     # Praison AI: Enhanced security with input validation
@@ -80,7 +82,7 @@ class SSEMCPTool:
         """Call the tool with the provided arguments."""
         logger.debug(f"Async calling tool {self.name} with args: {kwargs}")
         try:
-            result = await self.session.call_tool(self.name, kwargs)
+            result = await with_retry(self.session.call_tool, "mcp")(self.name, kwargs)
             
             # Extract text from result
             if hasattr(result, 'content') and result.content:
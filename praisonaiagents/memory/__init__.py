@@ -8,8 +8,10 @@ This module provides memory management capabilities including:
 - User memory for preferences/history
 - Quality-based storage decisions
 - Graph memory support via Mem0
+- Shared vector-store client pooling across instances
 """
 
 from .memory import Memory
+from .client_manager import VectorStoreManager, get_vector_store_manager
 
-__all__ = ["Memory"] 
\ No newline at end of file
+__all__ = ["Memory", "VectorStoreManager", "get_vector_store_manager"] 
\ No newline at end of file
@@ -0,0 +1,168 @@
+"""
+Process-wide pool of vector-store clients.
+
+Memory, Knowledge and Session instances used to open their own
+``chromadb.PersistentClient`` each, so a process with a thousand sessions held
+a thousand clients (SQLite handles plus HNSW indexes). The manager keeps one
+client per storage path and maps sessions/users onto collections inside it.
+
+Index memory is bounded by Chroma's own LRU segment cache
+(``memory_limit_bytes``), which unloads the HNSW indexes of idle collections
+whether or not a handle to them is still held, so memory scales with active
+sessions rather than total sessions. The manager's own LRU over collection
+handles (``max_loaded_collections``) only caps its handle cache: evicting a
+handle frees no index memory, and Memory instances that already hold it keep
+working.
+"""
+
+import os
+import re
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Default in-RAM budget for Chroma's segment cache (bytes). Override with the
+# PRAISON_VECTOR_CACHE_BYTES environment variable; 0 disables the LRU policy.
+DEFAULT_MEMORY_LIMIT_BYTES = 1024 * 1024 * 1024
+DEFAULT_MAX_LOADED_COLLECTIONS = 256
+
+_NAME_INVALID = re.compile(r"[^a-zA-Z0-9._-]+")
+
+
+class VectorStoreManager:
+    """
+    Pools Chroma clients by path and caches collection handles in an LRU.
+
+    Example:
+        manager = get_vector_store_manager()
+        col = manager.get_collection(".praison/sessions/chroma_db",
+                                     manager.namespace("session", session_id))
+    """
+
+    def __init__(
+        self,
+        max_loaded_collections: int = DEFAULT_MAX_LOADED_COLLECTIONS,
+        memory_limit_bytes: Optional[int] = None
+    ):
+        if memory_limit_bytes is None:
+            memory_limit_bytes = int(os.environ.get("PRAISON_VECTOR_CACHE_BYTES", DEFAULT_MEMORY_LIMIT_BYTES))
+        self.max_loaded_collections = max_loaded_collections
+        self.memory_limit_bytes = memory_limit_bytes
+        self._clients: Dict[str, Any] = {}
+        self._collections: "OrderedDict[Tuple[str, str], Any]" = OrderedDict()
+        self._lock = threading.RLock()
+        self.evictions = 0
+
+    @staticmethod
+    def _key(path: str) -> str:
+        return os.path.abspath(path)
+
+    def _settings(self):
+        from chromadb.config import Settings as ChromaSettings
+        settings = {"anonymized_telemetry": False, "allow_reset": True}
+        if self.memory_limit_bytes and self.memory_limit_bytes > 0:
+            settings["chroma_segment_cache_policy"] = "LRU"
+            settings["chroma_memory_limit_bytes"] = self.memory_limit_bytes
+        return ChromaSettings(**settings)
+
+    def get_client(self, path: str):
+        """Return the shared persistent client for ``path``, creating it once."""
+        key = self._key(path)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                try:
+                    import chromadb
+                except ImportError:
+                    raise ImportError(
+                        "chromadb is required for vector storage. Please install using: "
+                        'pip install "praisonaiagents[memory]"'
+                    )
+                os.makedirs(key, exist_ok=True)
+                client = chromadb.PersistentClient(path=key, settings=self._settings())
+                self._clients[key] = client
+                logger.debug(f"Opened shared vector-store client at {key}")
+            return client
+
+    def get_collection(self, path: str, name: str, metadata: Optional[Dict[str, Any]] = None):
+        """Get or create collection ``name`` in the store at ``path`` and mark it recently used."""
+        ckey = (self._key(path), name)
+        with self._lock:
+            collection = self._collections.get(ckey)
+            if collection is not None:
+                self._collections.move_to_end(ckey)
+                return collection
+            client = self.get_client(path)
+            if metadata:
+                collection = client.get_or_create_collection(name=name, metadata=metadata)
+            else:
+                collection = client.get_or_create_collection(name=name)
+            self._collections[ckey] = collection
+            self._evict()
+            return collection
+
+    def _evict(self):
+        """
+        Drop least recently used handles beyond the limit (caller holds the lock).
+        Only the cached handle goes; unloading the index is left to Chroma's
+        segment cache.
+        """
+        while len(self._collections) > self.max_loaded_collections:
+            (path, name), _ = self._collections.popitem(last=False)
+            self.evictions += 1
+            logger.debug(f"Dropped cached handle for collection {name} from {path}")
+
+    def release(self, path: str, name: str):
+        """Forget a loaded collection handle, e.g. when its session ends."""
+        with self._lock:
+            self._collections.pop((self._key(path), name), None)
+
+    def drop_collection(self, path: str, name: str):
+        """Delete a collection from the shared store without touching its neighbours."""
+        with self._lock:
+            self.release(path, name)
+            try:
+                self.get_client(path).delete_collection(name=name)
+            except Exception as e:
+                logger.debug(f"Collection {name} not deleted: {e}")
+
+    @staticmethod
+    def namespace(*parts: Any) -> str:
+        """
+        Build a valid collection name from parts such as ("session", session_id).
+        Chroma names must be 3-512 characters of [a-zA-Z0-9._-] starting and
+        ending with an alphanumeric character.
+        """
+        name = "_".join(_NAME_INVALID.sub("-", str(p)) for p in parts if p not in (None, ""))
+        name = name.strip("._-") or "default"
+        if len(name) < 3:
+            name = f"ns_{name}"
+        return name[:512].rstrip("._-")
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool occupancy for monitoring; ``evictions`` counts dropped handles."""
+        with self._lock:
+            return {
+                "clients": len(self._clients),
+                "loaded_collections": len(self._collections),
+                "max_loaded_collections": self.max_loaded_collections,
+                "memory_limit_bytes": self.memory_limit_bytes,
+                "evictions": self.evictions
+            }
+
+
+_manager: Optional[VectorStoreManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_vector_store_manager() -> VectorStoreManager:
+    """Return the process-wide VectorStoreManager."""
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = VectorStoreManager()
+    return _manager
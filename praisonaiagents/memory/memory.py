@@ -1,10 +1,15 @@
 import os
+import re
 import sqlite3
 import json
 import time
+import uuid
 import shutil
-from typing import Any, Dict, List, Optional, Union, Literal
+import threading
+from typing import Any, Dict, List, Optional, Union, Literal, Tuple
 import logging
+from ..retry import with_retry, without_sdk_retries
+from ..telemetry.tracing import traced
     # Praison AI: Enhanced error handling for better reliability
     # Praison AI: Improved code organization and maintainability
 
@@ -41,6 +46,8 @@ try:
 except ImportError:
     LITELLM_AVAILABLE = False
 
+from .client_manager import get_vector_store_manager
+from .transfer import DEFAULT_BATCH_SIZE, RecordWriter, iter_record_batches, make_record, parse_metadata
 
 
 
@@ -61,7 +68,9 @@ class Memory:
       "use_embedding": True,
       "short_db": "short_term.db",
       "long_db": "long_term.db",
+      "entity_db": "entity.db",  # structured entity/relation store
       "rag_db_path": "rag_db",   # optional path for local embedding store
+      "collection_name": "memory_store",  # collection within the shared store
       "config": {
         "api_key": "...",       # if mem0 usage
         "org_id": "...",
@@ -130,6 +139,10 @@ class Memory:
         self.long_db = self.cfg.get("long_db", ".praison/long_term.db")
         self._init_ltm()
 
+        # Structured entity DB
+        self.entity_db = self.cfg.get("entity_db", ".praison/entity.db")
+        self._init_entity_store()
+
         # Conditionally init Mem0 or local RAG
         if self.use_mem0:
             self._init_mem0()
@@ -176,6 +189,66 @@ class Memory:
         conn.commit()
         conn.close()
 
+    def _init_entity_store(self):
+        """
+        Creates or verifies the structured entity tables.
+
+        Entities are keyed by a case-folded name with a unique index, aliases
+        map onto entity ids, and relations are stored as directed edges so that
+        lookups and neighbor queries are plain index reads. A single connection
+        is kept open (guarded by a lock) to avoid per-lookup connect overhead.
+        """
+        os.makedirs(os.path.dirname(self.entity_db) or ".", exist_ok=True)
+        self._entity_lock = threading.RLock()
+        self._entity_conn = sqlite3.connect(self.entity_db, check_same_thread=False)
+        c = self._entity_conn.cursor()
+        c.execute("""
+        CREATE TABLE IF NOT EXISTS entities (
+            id TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            name_key TEXT NOT NULL UNIQUE,
+            type TEXT,
+            description TEXT,
+            meta TEXT,
+            created_at REAL,
+            updated_at REAL
+        )
+        """)
+        c.execute("CREATE INDEX IF NOT EXISTS idx_entities_type ON entities(type)")
+        c.execute("""
+        CREATE TABLE IF NOT EXISTS entity_aliases (
+            alias_key TEXT PRIMARY KEY,
+            alias TEXT NOT NULL,
+            entity_id TEXT NOT NULL
+        )
+        """)
+        c.execute("CREATE INDEX IF NOT EXISTS idx_entity_aliases_entity ON entity_aliases(entity_id)")
+        c.execute("""
+        CREATE TABLE IF NOT EXISTS entity_relations (
+            source_id TEXT NOT NULL,
+            relation TEXT NOT NULL,
+            target_id TEXT NOT NULL,
+            meta TEXT,
+            created_at REAL,
+            PRIMARY KEY (source_id, relation, target_id)
+        )
+        """)
+        c.execute("CREATE INDEX IF NOT EXISTS idx_entity_relations_target ON entity_relations(target_id)")
+
+        # Full-text index over names, aliases and descriptions (optional: not
+        # every SQLite build ships FTS5, prefix/exact lookups work without it)
+        try:
+            c.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS entities_fts USING fts5(
+                entity_id UNINDEXED, name, aliases, description
+            )
+            """)
+            self._entity_fts = True
+        except sqlite3.OperationalError as e:
+            self._log_verbose(f"FTS5 unavailable, entity full-text search disabled: {e}", logging.WARNING)
+            self._entity_fts = False
+        self._entity_conn.commit()
+
     def _init_mem0(self):
         """Initialize Mem0 client for agent or user memory with optional graph support."""
         mem_cfg = self.cfg.get("config", {})
@@ -222,32 +295,23 @@ class Memory:
             self.graph_enabled = False
 
     def _init_chroma(self):
-        """Initialize a local Chroma client for embedding-based search."""
+        """
+        Attach to a collection in the shared Chroma client for ``rag_db_path``.
+        Clients are pooled process-wide, so many Memory instances (e.g. one per
+        session) can share one store and differ only by ``collection_name``.
+        """
         try:
-            # Create directory if it doesn't exist
-            rag_path = self.cfg.get("rag_db_path", "chroma_db")
-            os.makedirs(rag_path, exist_ok=True)
-
-            # Initialize ChromaDB with persistent storage
-            self.chroma_client = chromadb.PersistentClient(
-                path=rag_path,
-                settings=ChromaSettings(
-                    anonymized_telemetry=False,
-                    allow_reset=True
-                )
+            self.rag_path = self.cfg.get("rag_db_path", "chroma_db")
+            self.collection_name = self.cfg.get("collection_name", "memory_store")
+
+            manager = get_vector_store_manager()
+            self.chroma_client = manager.get_client(self.rag_path)
+            self.chroma_col = manager.get_collection(
+                self.rag_path,
+                self.collection_name,
+                metadata={"hnsw:space": "cosine"}
             )
-
-            collection_name = "memory_store"
-            try:
-                self.chroma_col = self.chroma_client.get_collection(name=collection_name)
-                self._log_verbose("Using existing ChromaDB collection")
-            except Exception as e:
-                self._log_verbose(f"Collection '{collection_name}' not found. Creating new collection. Error: {e}")
-                self.chroma_col = self.chroma_client.create_collection(
-                    name=collection_name,
-                    metadata={"hnsw:space": "cosine"}
-                )
-                self._log_verbose("Created new ChromaDB collection")
+            self._log_verbose(f"Using ChromaDB collection '{self.collection_name}' at {self.rag_path}")
 
         except Exception as e:
             self._log_verbose(f"Failed to initialize ChromaDB: {e}", logging.ERROR)
@@ -294,6 +358,7 @@ class Memory:
     # -------------------------------------------------------------------------
     #                           Short-Term Methods
     # -------------------------------------------------------------------------
+    @traced("memory.store_short_term", "memory")
     def store_short_term(
         self,
         text: str,
@@ -330,6 +395,7 @@ class Memory:
             logger.error(f"Failed to store in short-term memory: {e}")
             raise
 
+    @traced("memory.search_short_term", "memory")
     def search_short_term(
         self, 
         query: str, 
@@ -356,9 +422,10 @@ class Memory:
                     # Use LiteLLM for consistency with the rest of the codebase
                     import litellm
                     
-                    response = litellm.embedding(
+                    response = with_retry(litellm.embedding, "openai")(
                         model="text-embedding-3-small",
-                        input=query
+                        input=query,
+                        max_retries=0
                     )
                     query_embedding = response.data[0]["embedding"]
                 elif OPENAI_AVAILABLE:
@@ -366,7 +433,7 @@ class Memory:
                     from openai import OpenAI
                     client = OpenAI()
                     
-                    response = client.embeddings.create(
+                    response = with_retry(without_sdk_retries(client).embeddings.create, "openai")(
                         input=query,
                         model="text-embedding-3-small"
                     )
@@ -446,6 +513,7 @@ class Memory:
                 sanitized[k] = str(v)
         return sanitized
 
+    @traced("memory.store_long_term", "memory")
     def store_long_term(
         self,
         text: str,
@@ -497,9 +565,10 @@ class Memory:
                     logger.info("Getting embeddings from LiteLLM...")
                     logger.debug(f"Embedding input text: {text}")
                     
-                    response = litellm.embedding(
+                    response = with_retry(litellm.embedding, "openai")(
                         model="text-embedding-3-small",
-                        input=text
+                        input=text,
+                        max_retries=0
                     )
                     embedding = response.data[0]["embedding"]
                     logger.info("Successfully got embeddings from LiteLLM")
@@ -513,7 +582,7 @@ class Memory:
                     logger.info("Getting embeddings from OpenAI...")
                     logger.debug(f"Embedding input text: {text}")
                     
-                    response = client.embeddings.create(
+                    response = with_retry(without_sdk_retries(client).embeddings.create, "openai")(
                         input=text,
                         model="text-embedding-3-small"
                     )
@@ -546,6 +615,7 @@ class Memory:
                 logger.error(f"Error storing in Mem0: {e}")
 
 
+    @traced("memory.search_long_term", "memory")
     def search_long_term(
         self, 
         query: str, 
@@ -577,9 +647,10 @@ class Memory:
                     # Use LiteLLM for consistency with the rest of the codebase
                     import litellm
                     
-                    response = litellm.embedding(
+                    response = with_retry(litellm.embedding, "openai")(
                         model="text-embedding-3-small",
-                        input=query
+                        input=query,
+                        max_retries=0
                     )
                     query_embedding = response.data[0]["embedding"]
                 elif OPENAI_AVAILABLE:
@@ -587,7 +658,7 @@ class Memory:
                     from openai import OpenAI
                     client = OpenAI()
                     
-                    response = client.embeddings.create(
+                    response = with_retry(without_sdk_retries(client).embeddings.create, "openai")(
                         input=query,
                         model="text-embedding-3-small"
                     )
@@ -675,26 +746,371 @@ class Memory:
             # Mem0 has no universal reset API. Could implement partial or no-op.
             pass
         if self.use_rag and hasattr(self, "chroma_client"):
-            self.chroma_client.reset()  # entire DB
-            self._init_chroma()         # re-init fresh
+            # The client may be shared, so only drop this memory's collection
+            get_vector_store_manager().drop_collection(self.rag_path, self.collection_name)
+            self._init_chroma()  # re-init fresh
 
     # -------------------------------------------------------------------------
     #                       Entity Memory Methods
     # -------------------------------------------------------------------------
-    def store_entity(self, name: str, type_: str, desc: str, relations: str):
+    @staticmethod
+    def _entity_key(name: str) -> str:
+        """Case-folded, whitespace-collapsed lookup key for entity names."""
+        return " ".join(str(name).split()).casefold()
+
+    def _resolve_entity_id(self, name: str) -> Optional[str]:
+        """Resolve a name or alias to an entity id via the unique indexes."""
+        key = self._entity_key(name)
+        with self._entity_lock:
+            row = self._entity_conn.execute(
+                "SELECT id FROM entities WHERE name_key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                row = self._entity_conn.execute(
+                    "SELECT entity_id FROM entity_aliases WHERE alias_key = ?", (key,)
+                ).fetchone()
+        return row[0] if row else None
+
+    def _refresh_entity_fts(self, entity_id: str):
+        """Rewrite the FTS row of an entity (caller holds the lock)."""
+        if not self._entity_fts:
+            return
+        row = self._entity_conn.execute(
+            "SELECT name, description FROM entities WHERE id = ?", (entity_id,)
+        ).fetchone()
+        self._entity_conn.execute("DELETE FROM entities_fts WHERE entity_id = ?", (entity_id,))
+        if row is None:
+            return
+        aliases = [a[0] for a in self._entity_conn.execute(
+            "SELECT alias FROM entity_aliases WHERE entity_id = ?", (entity_id,)
+        )]
+        self._entity_conn.execute(
+            "INSERT INTO entities_fts (entity_id, name, aliases, description) VALUES (?,?,?,?)",
+            (entity_id, row[0], " ".join(aliases), row[1] or "")
+        )
+
+    def upsert_entity(
+        self,
+        name: str,
+        type_: Optional[str] = None,
+        desc: Optional[str] = None,
+        aliases: Optional[List[str]] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> str:
         """
-        Save entity info in LTM (or mem0/rag). 
-        We'll label the metadata type = entity for easy filtering.
+        Insert or update an entity in the structured store and return its id.
+        Existing fields are only overwritten by non-empty values; aliases and
+        metadata are merged.
         """
-        data = f"Entity {name}({type_}): {desc} | relationships: {relations}"
-        self.store_long_term(data, metadata={"category": "entity"})
+        now = time.time()
+        with self._entity_lock:
+            conn = self._entity_conn
+            entity_id = self._resolve_entity_id(name)
+            if entity_id is None:
+                entity_id = str(uuid.uuid4())
+                conn.execute(
+                    "INSERT INTO entities (id, name, name_key, type, description, meta, created_at, updated_at) "
+                    "VALUES (?,?,?,?,?,?,?,?)",
+                    (entity_id, name, self._entity_key(name), type_, desc,
+                     json.dumps(metadata or {}), now, now)
+                )
+            else:
+                row = conn.execute(
+                    "SELECT type, description, meta FROM entities WHERE id = ?", (entity_id,)
+                ).fetchone()
+                meta = json.loads(row[2] or "{}")
+                meta.update(metadata or {})
+                conn.execute(
+                    "UPDATE entities SET type = ?, description = ?, meta = ?, updated_at = ? WHERE id = ?",
+                    (type_ or row[0], desc or row[1], json.dumps(meta), now, entity_id)
+                )
+            for alias in aliases or []:
+                alias_key = self._entity_key(alias)
+                if alias_key and alias_key != self._entity_key(name):
+                    conn.execute(
+                        "INSERT OR REPLACE INTO entity_aliases (alias_key, alias, entity_id) VALUES (?,?,?)",
+                        (alias_key, alias, entity_id)
+                    )
+            self._refresh_entity_fts(entity_id)
+            conn.commit()
+        return entity_id
+
+    def add_entity_relation(
+        self,
+        source: str,
+        relation: str,
+        target: str,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> Tuple[str, str]:
+        """
+        Add a directed edge ``source -[relation]-> target``. Unknown entities
+        are created as bare records so the edge can be traversed immediately.
+        """
+        source_id = self._resolve_entity_id(source) or self.upsert_entity(source)
+        target_id = self._resolve_entity_id(target) or self.upsert_entity(target)
+        with self._entity_lock:
+            self._entity_conn.execute(
+                "INSERT OR REPLACE INTO entity_relations (source_id, relation, target_id, meta, created_at) "
+                "VALUES (?,?,?,?,?)",
+                (source_id, relation, target_id, json.dumps(metadata or {}), time.time())
+            )
+            self._entity_conn.commit()
+        return source_id, target_id
+
+    def store_entity(
+        self,
+        name: str,
+        type_: str,
+        desc: str,
+        relations: Union[str, List[Any], None] = None,
+        aliases: Optional[List[str]] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Save entity info in the structured entity store and in LTM (or mem0/rag)
+        with metadata category = entity, so semantic search still sees it.
+
+        ``relations`` may be free text (kept as-is in the LTM record) or a list
+        of ``(relation, target)`` tuples / ``{"relation": ..., "target": ...}``
+        dicts, which become traversable edges.
+        """
+        entity_id = self.upsert_entity(name, type_, desc, aliases=aliases, metadata=metadata)
+
+        relation_text = relations if isinstance(relations, str) else ""
+        if relations and not isinstance(relations, str):
+            parts = []
+            for rel in relations:
+                if isinstance(rel, dict):
+                    rel_name, target = rel.get("relation"), rel.get("target")
+                else:
+                    rel_name, target = rel
+                self.add_entity_relation(name, rel_name, target)
+                parts.append(f"{rel_name} -> {target}")
+            relation_text = ", ".join(parts)
+
+        data = f"Entity {name}({type_}): {desc} | relationships: {relation_text}"
+        self.store_long_term(data, metadata={"category": "entity", "entity_id": entity_id})
+        return entity_id
+
+    def get_entity(self, name: str, include_relations: bool = True) -> Optional[Dict[str, Any]]:
+        """Exact (case-insensitive) lookup by entity name or alias."""
+        entity_id = self._resolve_entity_id(name)
+        if entity_id is None:
+            return None
+        return self._load_entities([entity_id], include_relations)[0]
+
+    def _load_entities(self, entity_ids: List[str], include_relations: bool = True) -> List[Dict[str, Any]]:
+        """Load full entity records, preserving the order of ``entity_ids``."""
+        if not entity_ids:
+            return []
+        marks = ",".join("?" * len(entity_ids))
+        with self._entity_lock:
+            conn = self._entity_conn
+            rows = conn.execute(
+                f"SELECT id, name, type, description, meta, created_at, updated_at "
+                f"FROM entities WHERE id IN ({marks})", entity_ids
+            ).fetchall()
+            aliases = conn.execute(
+                f"SELECT entity_id, alias FROM entity_aliases WHERE entity_id IN ({marks})", entity_ids
+            ).fetchall()
+            edges = []
+            if include_relations:
+                edges = conn.execute(
+                    f"SELECT r.source_id, r.relation, e.name FROM entity_relations r "
+                    f"JOIN entities e ON e.id = r.target_id WHERE r.source_id IN ({marks})", entity_ids
+                ).fetchall()
+
+        by_id = {}
+        for row in rows:
+            by_id[row[0]] = {
+                "id": row[0],
+                "name": row[1],
+                "type": row[2],
+                "description": row[3],
+                "metadata": json.loads(row[4] or "{}"),
+                "created_at": row[5],
+                "updated_at": row[6],
+                "aliases": [],
+                "relations": []
+            }
+        for entity_id, alias in aliases:
+            by_id[entity_id]["aliases"].append(alias)
+        for source_id, relation, target_name in edges:
+            by_id[source_id]["relations"].append({"relation": relation, "target": target_name})
+        return [by_id[i] for i in entity_ids if i in by_id]
 
+    def find_entities(
+        self,
+        query: str,
+        mode: Literal["auto", "exact", "prefix", "fts", "mentions"] = "auto",
+        limit: int = 5
+    ) -> List[Dict[str, Any]]:
+        """
+        Index-backed entity lookup.
+
+        Modes:
+            exact:    name or alias equals ``query`` (case-insensitive)
+            prefix:   name or alias starts with ``query``
+            fts:      full-text match over name, aliases and description
+            mentions: entities whose name or alias appears inside ``query``
+            auto:     exact, then prefix, then mentions, then fts until ``limit`` is filled
+        """
+        key = self._entity_key(query)
+        if not key:
+            return []
+        modes = ["exact", "prefix", "mentions", "fts"] if mode == "auto" else [mode]
+        found: List[str] = []
+
+        def extend(ids):
+            for entity_id in ids:
+                if entity_id not in found:
+                    found.append(entity_id)
+
+        with self._entity_lock:
+            conn = self._entity_conn
+            for m in modes:
+                if len(found) >= limit:
+                    break
+                if m == "exact":
+                    entity_id = self._resolve_entity_id(query)
+                    extend([entity_id] if entity_id else [])
+                elif m == "prefix":
+                    # Range scans keep the unique indexes usable for prefix matching
+                    upper = key + "\uffff"
+                    extend(r[0] for r in conn.execute(
+                        "SELECT id FROM entities WHERE name_key >= ? AND name_key < ? LIMIT ?",
+                        (key, upper, limit)
+                    ))
+                    extend(r[0] for r in conn.execute(
+                        "SELECT entity_id FROM entity_aliases WHERE alias_key >= ? AND alias_key < ? LIMIT ?",
+                        (key, upper, limit)
+                    ))
+                elif m == "mentions":
+                    extend(self._match_entity_mentions(key))
+                elif m == "fts" and self._entity_fts:
+                    terms = re.findall(r"\w+", query)
+                    if not terms:
+                        continue
+                    match = " OR ".join(f'"{t}"' for t in terms)
+                    try:
+                        extend(r[0] for r in conn.execute(
+                            "SELECT entity_id FROM entities_fts WHERE entities_fts MATCH ? "
+                            "ORDER BY bm25(entities_fts) LIMIT ?",
+                            (match, limit)
+                        ))
+                    except sqlite3.OperationalError as e:
+                        self._log_verbose(f"Entity FTS query failed: {e}", logging.WARNING)
+
+        return self._load_entities(found[:limit])
+
+    def _match_entity_mentions(self, text_key: str, max_ngram: int = 4) -> List[str]:
+        """Find entities whose name/alias equals any word n-gram of ``text_key`` (caller holds the lock)."""
+        words = re.findall(r"\w+(?:[-'.]\w+)*", text_key)
+        candidates = set()
+        for n in range(1, max_ngram + 1):
+            for i in range(len(words) - n + 1):
+                candidates.add(" ".join(words[i:i + n]))
+        if not candidates:
+            return []
+        ids = []
+        candidates = list(candidates)
+        # Stay well below SQLite's bound-parameter limit
+        for start in range(0, len(candidates), 500):
+            batch = candidates[start:start + 500]
+            marks = ",".join("?" * len(batch))
+            ids.extend(r[0] for r in self._entity_conn.execute(
+                f"SELECT id FROM entities WHERE name_key IN ({marks})", batch
+            ))
+            ids.extend(r[0] for r in self._entity_conn.execute(
+                f"SELECT entity_id FROM entity_aliases WHERE alias_key IN ({marks})", batch
+            ))
+        return ids
+
+    def get_entity_neighbors(
+        self,
+        name: str,
+        relation: Optional[str] = None,
+        direction: Literal["out", "in", "both"] = "out",
+        depth: int = 1
+    ) -> List[Dict[str, Any]]:
+        """
+        Breadth-first traversal over the relation edges starting at ``name``.
+        Returns one dict per reached entity with the edge that reached it and
+        its hop distance.
+        """
+        start_id = self._resolve_entity_id(name)
+        if start_id is None:
+            return []
+
+        queries = []
+        rel_clause = " AND relation = ?" if relation else ""
+        if direction in ("out", "both"):
+            queries.append(("out", f"SELECT relation, target_id FROM entity_relations WHERE source_id = ?{rel_clause}"))
+        if direction in ("in", "both"):
+            queries.append(("in", f"SELECT relation, source_id FROM entity_relations WHERE target_id = ?{rel_clause}"))
+
+        visited = {start_id}
+        frontier = [start_id]
+        edges = []
+        with self._entity_lock:
+            for hop in range(1, max(depth, 1) + 1):
+                next_frontier = []
+                for node in frontier:
+                    for edge_dir, sql in queries:
+                        params = (node, relation) if relation else (node,)
+                        for rel, other in self._entity_conn.execute(sql, params):
+                            if other in visited:
+                                continue
+                            visited.add(other)
+                            next_frontier.append(other)
+                            edges.append((other, rel, edge_dir, node, hop))
+                frontier = next_frontier
+                if not frontier:
+                    break
+
+        records = {e["id"]: e for e in self._load_entities([e[0] for e in edges], include_relations=False)}
+        names = {e["id"]: e["name"] for e in self._load_entities(list({e[3] for e in edges}), include_relations=False)}
+        neighbors = []
+        for other, rel, edge_dir, via, hop in edges:
+            if other in records:
+                neighbors.append({
+                    **records[other],
+                    "relation": rel,
+                    "direction": edge_dir,
+                    "via": names.get(via),
+                    "depth": hop
+                })
+        return neighbors
+
+    def _format_entity(self, entity: Dict[str, Any]) -> str:
+        """Render a structured entity the same way LTM entity records read."""
+        rels = ", ".join(f"{r['relation']} -> {r['target']}" for r in entity.get("relations", []))
+        text = f"Entity {entity['name']}({entity.get('type') or 'unknown'}): {entity.get('description') or ''}"
+        if entity.get("aliases"):
+            text += f" | aliases: {', '.join(entity['aliases'])}"
+        if rels:
+            text += f" | relationships: {rels}"
+        return text
+
+    @traced("memory.search_entity", "memory")
     def search_entity(self, query: str, limit: int = 5) -> List[Dict[str, Any]]:
         """
-        Filter to items that have metadata 'category=entity'.
+        Look entities up in the structured store first (exact, prefix, mentions
+        and FTS index reads). Only when nothing matches do we fall back to a
+        long-term search filtered to metadata 'category=entity'.
         """
-        all_hits = self.search_long_term(query, limit=20)  # gather more
         ents = []
+        for entity in self.find_entities(query, limit=limit):
+            ents.append({
+                "id": entity["id"],
+                "text": self._format_entity(entity),
+                "metadata": {"category": "entity", "source": "entity_store", "name": entity["name"]},
+                "score": 1.0
+            })
+        if ents:
+            return ents[:limit]
+
+        all_hits = self.search_long_term(query, limit=20)  # gather more
         for h in all_hits:
             meta = h.get("metadata") or {}
             if meta.get("category") == "entity":
@@ -703,11 +1119,24 @@ class Memory:
 
     def reset_entity_only(self):
         """
-        If you only want to drop entity items from LTM, you'd do a custom 
-        delete from local DB where meta LIKE '%category=entity%'. 
-        For brevity, we do a full LTM reset here.
+        Drop the structured entity tables and the entity records in the local
+        LTM DB. Vector copies in Chroma/mem0 are left untouched.
         """
-        self.reset_long_term()
+        with self._entity_lock:
+            conn = self._entity_conn
+            conn.execute("DELETE FROM entities")
+            conn.execute("DELETE FROM entity_aliases")
+            conn.execute("DELETE FROM entity_relations")
+            if self._entity_fts:
+                conn.execute("DELETE FROM entities_fts")
+            conn.commit()
+
+        conn = sqlite3.connect(self.long_db)
+        conn.execute(
+            "DELETE FROM long_mem WHERE CASE WHEN json_valid(meta) THEN json_extract(meta, '$.category') END = 'entity'"
+        )
+        conn.commit()
+        conn.close()
 
     # -------------------------------------------------------------------------
     #                       User Memory Methods
@@ -725,6 +1154,7 @@ class Memory:
         else:
             self.store_long_term(text, metadata=meta)
 
+    @traced("memory.search_user_memory", "memory")
     def search_user_memory(self, user_id: str, query: str, limit: int = 5, rerank: bool = False, **kwargs) -> List[Dict[str, Any]]:
         """
         If mem0 is used, pass user_id in. Otherwise fallback to local filter on user in metadata.
@@ -753,6 +1183,7 @@ class Memory:
     # -------------------------------------------------------------------------
     #                 Putting it all Together: Task Finalization
     # -------------------------------------------------------------------------
+    @traced("memory.finalize", "memory")
     def finalize_task_output(
         self,
         content: str,
@@ -804,6 +1235,7 @@ class Memory:
     # -------------------------------------------------------------------------
     #                 Building Context (Short, Long, Entities, User)
     # -------------------------------------------------------------------------
+    @traced("memory.build_context", "memory")
     def build_context_for_task(
         self,
         task_descr: str,
@@ -899,6 +1331,190 @@ class Memory:
 
         return "\n".join(lines) if lines else ""
 
+    # -------------------------------------------------------------------------
+    #                      Bulk Export / Import
+    # -------------------------------------------------------------------------
+    def export(
+        self,
+        path: str,
+        stores: Tuple[str, ...] = ("short", "long", "entity"),
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        format: Optional[str] = None,
+        include_embeddings: bool = True
+    ) -> Dict[str, int]:
+        """
+        Stream memory records, with their embeddings and metadata, to a
+        Parquet / Arrow IPC / JSONL file in chunks of ``batch_size``.
+
+        Args:
+            path: Destination file; the format follows the extension unless given
+            stores: Any of "short", "long", "entity"
+            batch_size: Rows read and written per chunk
+            format: "parquet", "arrow" or "jsonl" to override the extension
+            include_embeddings: Copy LTM vectors from Chroma so imports need no embedding calls
+
+        Returns:
+            Dict[str, int]: number of records written per store
+        """
+        counts = {}
+        with RecordWriter(path, format) as writer:
+            if "short" in stores:
+                counts["short"] = self._export_table(writer, self.short_db, "short_mem", "short", batch_size, False)
+            if "long" in stores:
+                counts["long"] = self._export_table(writer, self.long_db, "long_mem", "long", batch_size, include_embeddings)
+            if "entity" in stores:
+                counts.update(self._export_entities(writer, batch_size))
+        self._log_verbose(f"Exported {counts} to {path}")
+        return counts
+
+    def _export_table(self, writer, db_path, table, store, batch_size, include_embeddings) -> int:
+        """Page through a memory table with fetchmany and write each page."""
+        with_vectors = include_embeddings and self.use_rag and hasattr(self, "chroma_col")
+        conn = sqlite3.connect(db_path)
+        try:
+            cur = conn.execute(f"SELECT id, content, meta, created_at FROM {table} ORDER BY created_at")
+            total = 0
+            while True:
+                rows = cur.fetchmany(batch_size)
+                if not rows:
+                    break
+                vectors = self._fetch_embeddings([r[0] for r in rows]) if with_vectors else {}
+                writer.write([
+                    make_record(r[0], store, r[1], r[2], vectors.get(r[0]), r[3]) for r in rows
+                ])
+                total += len(rows)
+            return total
+        finally:
+            conn.close()
+
+    def _fetch_embeddings(self, ids: List[str]) -> Dict[str, List[float]]:
+        """Read stored vectors for ``ids`` from the Chroma collection in one call."""
+        try:
+            resp = self.chroma_col.get(ids=ids, include=["embeddings"])
+        except Exception as e:
+            self._log_verbose(f"Could not read embeddings from ChromaDB: {e}", logging.WARNING)
+            return {}
+        embeddings = resp.get("embeddings")
+        if embeddings is None:
+            return {}
+        return dict(zip(resp["ids"], embeddings))
+
+    def _export_entities(self, writer, batch_size) -> Dict[str, int]:
+        """Write entity, alias and relation rows; each row travels as JSON metadata."""
+        queries = [
+            ("entity", "SELECT id, name, name_key, type, description, meta, created_at, updated_at FROM entities",
+             lambda r: (r[0], r[1], r[6])),
+            ("entity_alias", "SELECT alias_key, alias, entity_id FROM entity_aliases",
+             lambda r: (r[0], r[1], None)),
+            ("entity_relation", "SELECT source_id, relation, target_id, meta, created_at FROM entity_relations",
+             lambda r: (f"{r[0]}|{r[1]}|{r[2]}", r[1], r[4])),
+        ]
+        counts = {}
+        with self._entity_lock:
+            for store, sql, key in queries:
+                cur = self._entity_conn.execute(sql)
+                columns = [d[0] for d in cur.description]
+                total = 0
+                while True:
+                    rows = cur.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    records = []
+                    for row in rows:
+                        ident, content, created = key(row)
+                        records.append(make_record(ident, store, content, dict(zip(columns, row)), None, created))
+                    writer.write(records)
+                    total += len(rows)
+                counts[store] = total
+        return counts
+
+    def import_(
+        self,
+        path: str,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        format: Optional[str] = None
+    ) -> Dict[str, int]:
+        """
+        Bulk-load a file written by :meth:`export`. Rows go straight into
+        SQLite with ``executemany`` and vectors are upserted into Chroma as-is,
+        so no embedding calls are made. Existing ids are overwritten.
+
+        Returns:
+            Dict[str, int]: number of records loaded per store
+        """
+        counts: Dict[str, int] = {}
+        with_vectors = self.use_rag and hasattr(self, "chroma_col")
+        missing_vectors = 0
+
+        for batch in iter_record_batches(path, batch_size, format):
+            groups: Dict[str, List[Dict[str, Any]]] = {}
+            for record in batch:
+                groups.setdefault(record["store"], []).append(record)
+
+            for store, table, db_path in (("short", "short_mem", self.short_db), ("long", "long_mem", self.long_db)):
+                records = groups.get(store)
+                if not records:
+                    continue
+                conn = sqlite3.connect(db_path)
+                conn.executemany(
+                    f"INSERT OR REPLACE INTO {table} (id, content, meta, created_at) VALUES (?,?,?,?)",
+                    [(r["id"], r["content"], r["metadata"], r["created_at"]) for r in records]
+                )
+                conn.commit()
+                conn.close()
+                counts[store] = counts.get(store, 0) + len(records)
+
+            if with_vectors and groups.get("long"):
+                embedded = [r for r in groups["long"] if r.get("embedding")]
+                missing_vectors += len(groups["long"]) - len(embedded)
+                if embedded:
+                    self.chroma_col.upsert(
+                        ids=[r["id"] for r in embedded],
+                        embeddings=[r["embedding"] for r in embedded],
+                        documents=[r["content"] for r in embedded],
+                        metadatas=[self._sanitize_metadata(parse_metadata(r)) or None for r in embedded]
+                    )
+
+            self._import_entity_rows(groups, counts)
+
+        if any(k.startswith("entity") for k in counts) and self._entity_fts:
+            self._rebuild_entity_fts()
+        if missing_vectors:
+            self._log_verbose(f"{missing_vectors} long-term records had no embedding and were not added to ChromaDB", logging.WARNING)
+        self._log_verbose(f"Imported {counts} from {path}")
+        return counts
+
+    def _import_entity_rows(self, groups: Dict[str, List[Dict[str, Any]]], counts: Dict[str, int]):
+        """Insert exported entity/alias/relation rows in one transaction."""
+        statements = {
+            "entity": ("INSERT OR REPLACE INTO entities (id, name, name_key, type, description, meta, created_at, updated_at) "
+                       "VALUES (:id, :name, :name_key, :type, :description, :meta, :created_at, :updated_at)"),
+            "entity_alias": "INSERT OR REPLACE INTO entity_aliases (alias_key, alias, entity_id) VALUES (:alias_key, :alias, :entity_id)",
+            "entity_relation": ("INSERT OR REPLACE INTO entity_relations (source_id, relation, target_id, meta, created_at) "
+                                "VALUES (:source_id, :relation, :target_id, :meta, :created_at)"),
+        }
+        if not any(groups.get(store) for store in statements):
+            return
+        with self._entity_lock:
+            for store, sql in statements.items():
+                records = groups.get(store)
+                if records:
+                    self._entity_conn.executemany(sql, [parse_metadata(r) for r in records])
+                    counts[store] = counts.get(store, 0) + len(records)
+            self._entity_conn.commit()
+
+    def _rebuild_entity_fts(self):
+        """Repopulate the entity FTS index from the base tables."""
+        with self._entity_lock:
+            self._entity_conn.execute("DELETE FROM entities_fts")
+            self._entity_conn.execute("""
+            INSERT INTO entities_fts (entity_id, name, aliases, description)
+            SELECT e.id, e.name, COALESCE(GROUP_CONCAT(a.alias, ' '), ''), COALESCE(e.description, '')
+            FROM entities e LEFT JOIN entity_aliases a ON a.entity_id = e.id
+            GROUP BY e.id
+            """)
+            self._entity_conn.commit()
+
     # -------------------------------------------------------------------------
     #                      Master Reset (Everything)
     # -------------------------------------------------------------------------
@@ -908,7 +1524,15 @@ class Memory:
         """
         self.reset_short_term()
         self.reset_long_term()
-        # Entities & user memory are stored in LTM or mem0, so no separate step needed.
+        # User memory lives in LTM or mem0; structured entities have their own tables.
+        self.reset_entity_only()
+
+    def close(self):
+        """Close the entity store connection; the other stores open a connection per call."""
+        with self._entity_lock:
+            if self._entity_conn is not None:
+                self._entity_conn.close()
+                self._entity_conn = None
 
     def _process_quality_metrics(
         self,
@@ -940,6 +1564,7 @@ class Memory:
         
         return metadata
 
+    @traced("quality.evaluate", "quality")
     def calculate_quality_metrics(
         self,
         output: str,
@@ -0,0 +1,180 @@
+"""
+Chunked record streaming for bulk export/import of Memory and Knowledge stores.
+
+Records are flat dicts with a fixed schema so they round-trip through Parquet,
+Arrow IPC or JSONL without loss:
+
+    id          str     record id in the source store
+    store       str     which table/collection the record belongs to
+    content     str     text content (may be empty)
+    metadata    str     JSON-encoded metadata / row payload
+    embedding   list    vector as float32 list, or None
+    created_at  float   creation timestamp, or None
+
+Parquet and Arrow IPC need ``pyarrow``; JSONL works everywhere.
+"""
+
+import os
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    import pyarrow.ipc as pa_ipc
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+DEFAULT_BATCH_SIZE = 1000
+RECORD_FIELDS = ("id", "store", "content", "metadata", "embedding", "created_at")
+
+_EXTENSIONS = {
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".arrow": "arrow",
+    ".ipc": "arrow",
+    ".feather": "arrow",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+}
+
+
+def resolve_format(path: str, format: Optional[str] = None) -> str:
+    """
+    Pick the file format: an explicit ``format`` wins, then the extension.
+    Unknown extensions default to Parquet when pyarrow is installed, else JSONL.
+    """
+    fmt = (format or _EXTENSIONS.get(os.path.splitext(path)[1].lower()) or
+           ("parquet" if PYARROW_AVAILABLE else "jsonl")).lower()
+    if fmt not in ("parquet", "arrow", "jsonl"):
+        raise ValueError(f"Unsupported export format: {fmt}. Use 'parquet', 'arrow' or 'jsonl'")
+    if fmt != "jsonl" and not PYARROW_AVAILABLE:
+        raise ImportError(
+            f"pyarrow is required for {fmt} export/import. Please install using: "
+            "pip install pyarrow (or use a .jsonl path)"
+        )
+    return fmt
+
+
+def make_record(
+    id: Any,
+    store: str,
+    content: Optional[str] = None,
+    metadata: Any = None,
+    embedding: Optional[Iterable[float]] = None,
+    created_at: Optional[float] = None
+) -> Dict[str, Any]:
+    """Build a record in the transfer schema."""
+    if metadata is not None and not isinstance(metadata, str):
+        metadata = json.dumps(metadata, default=str)
+    return {
+        "id": str(id),
+        "store": store,
+        "content": content or "",
+        "metadata": metadata or "{}",
+        "embedding": [float(x) for x in embedding] if embedding is not None else None,
+        "created_at": float(created_at) if created_at is not None else None
+    }
+
+
+def _arrow_schema():
+    return pa.schema([
+        ("id", pa.string()),
+        ("store", pa.string()),
+        ("content", pa.string()),
+        ("metadata", pa.string()),
+        ("embedding", pa.list_(pa.float32())),
+        ("created_at", pa.float64()),
+    ])
+
+
+class RecordWriter:
+    """
+    Append batches of records to a Parquet, Arrow IPC or JSONL file.
+
+    Use as a context manager; each ``write`` call becomes one row group /
+    record batch so memory stays bounded by the batch size.
+    """
+
+    def __init__(self, path: str, format: Optional[str] = None):
+        self.path = path
+        self.format = resolve_format(path, format)
+        self.count = 0
+        self._writer = None
+        self._file = None
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        if self.format == "parquet":
+            self._writer = pq.ParquetWriter(path, _arrow_schema())
+        elif self.format == "arrow":
+            self._file = pa.OSFile(path, "wb")
+            self._writer = pa_ipc.new_file(self._file, _arrow_schema())
+        else:
+            self._file = open(path, "w", encoding="utf-8")
+
+    def write(self, records: List[Dict[str, Any]]):
+        if not records:
+            return
+        if self.format == "jsonl":
+            self._file.writelines(json.dumps(r) + "\n" for r in records)
+        else:
+            self._writer.write_batch(pa.RecordBatch.from_pylist(records, schema=_arrow_schema()))
+        self.count += len(records)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def iter_record_batches(
+    path: str,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    format: Optional[str] = None
+) -> Iterator[List[Dict[str, Any]]]:
+    """Stream records back from a file written by :class:`RecordWriter` in batches."""
+    fmt = resolve_format(path, format)
+    if fmt == "parquet":
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_size):
+            yield batch.to_pylist()
+    elif fmt == "arrow":
+        with pa.memory_map(path, "r") as source:
+            reader = pa_ipc.open_file(source)
+            for i in range(reader.num_record_batches):
+                rows = reader.get_batch(i).to_pylist()
+                for start in range(0, len(rows), batch_size):
+                    yield rows[start:start + batch_size]
+    else:
+        batch = []
+        with open(path, "r", encoding="utf-8") as f:
+            for number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                record = json.loads(line)
+                missing = [name for name in RECORD_FIELDS if name not in record]
+                if missing:
+                    raise ValueError(f"{path}:{number}: record is missing {', '.join(missing)}")
+                batch.append(record)
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+        if batch:
+            yield batch
+
+
+def parse_metadata(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Decode the JSON metadata column of a record."""
+    meta = record.get("metadata")
+    if isinstance(meta, dict):
+        return meta
+    return json.loads(meta or "{}")
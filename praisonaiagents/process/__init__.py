@@ -1,3 +1,6 @@
 from .process import Process
+from .dag import DAGScheduler
+from .loop import LoopRunner, iter_loop_rows
+from .manager import BatchManager
 
-__all__ = ['Process'] 
\ No newline at end of file
+__all__ = ['Process', 'DAGScheduler', 'LoopRunner', 'iter_loop_rows', 'BatchManager']
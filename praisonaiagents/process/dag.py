@@ -0,0 +1,439 @@
+"""
+Dependency-aware scheduler for ``PraisonAIAgents(process="dag")``.
+
+Tasks become nodes of a graph whose edges come from three places:
+
+* ``context``    - a Task listed in another task's context must finish first
+* ``next_tasks`` - the named tasks run after this one
+* ``condition``  - decision branches; only the branch the decision selects is
+                   followed, the others are skipped along with everything that
+                   depends solely on them
+
+Edges that close a cycle (retry loops such as ``{"retry": ["current"]}`` or a
+decision routing back to an earlier task) are treated as back edges: they do
+not count as dependencies, and when a decision selects one the loop body is
+re-opened and runs again, at most ``max_iter`` times per loop header.
+
+Every task whose dependencies are resolved runs immediately, up to
+``max_workers`` at once, so wall time approaches the critical path instead of
+the sum of all task durations. :meth:`DAGScheduler.report` returns per-task
+timings and the critical path of the run.
+"""
+
+import re
+import time
+import asyncio
+import logging
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+SKIPPED = "skipped"
+
+
+def _as_list(value) -> List[str]:
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple)):
+        return [v for v in value if v]
+    return [value] if value else []
+
+
+class DAGScheduler:
+    """
+    Run tasks concurrently in dependency order.
+
+    Args:
+        tasks: Mapping of task id to Task, as held by PraisonAIAgents
+        max_workers: Maximum number of tasks running at once
+        max_iter: Maximum re-entries of a loop body via back edges
+        serialize_agents: Never run two tasks of the same Agent instance at
+            once (an Agent keeps one chat history)
+
+    Example:
+        scheduler = DAGScheduler(agents.tasks, max_workers=8)
+        report = scheduler.run(agents.run_task)
+        print(report["critical_path"], report["wall_seconds"])
+    """
+
+    def __init__(
+        self,
+        tasks: Dict[Any, Any],
+        max_workers: int = 4,
+        max_iter: int = 10,
+        serialize_agents: bool = True
+    ):
+        self.tasks = dict(tasks)  # snapshot: subtasks added while running are not graph nodes
+        self.max_workers = max(1, int(max_workers or 1))
+        self.max_iter = max_iter
+        self.serialize_agents = serialize_agents
+        self._build()
+
+    # ------------------------------------------------------------------ #
+    #   Graph
+    # ------------------------------------------------------------------ #
+    def _build(self):
+        by_name = {task.name: tid for tid, task in self.tasks.items() if task.name}
+        order = {tid: i for i, tid in enumerate(self.tasks)}
+        # edges[src][dst] -> conditional?
+        edges: Dict[Any, Dict[Any, bool]] = defaultdict(dict)
+
+        def add(src, dst, conditional):
+            if dst is None:
+                return
+            edges[src][dst] = edges[src].get(dst, True) and conditional
+
+        for tid, task in self.tasks.items():
+            for ctx in task.context or []:
+                ctx_id = getattr(ctx, "id", None)
+                if hasattr(ctx, "result") and ctx_id in self.tasks and ctx_id != tid:
+                    add(ctx_id, tid, False)
+            for name in self._condition_targets(tid, [n for v in (task.condition or {}).values() for n in _as_list(v)]):
+                add(tid, name, True)
+            for name in task.next_tasks or []:
+                target = by_name.get(name)
+                if target is None:
+                    logger.warning(f"Task {task.name}: next task {name!r} not found")
+                add(tid, target, bool(task.condition))
+
+        self.edges = edges
+        # Back edges: DFS from start tasks first, then in declaration order
+        roots = sorted(self.tasks, key=lambda t: (not getattr(self.tasks[t], "is_start", False), order[t]))
+        state: Dict[Any, int] = {}
+        back: Set[Tuple[Any, Any]] = set()
+        for root in roots:
+            if root in state:
+                continue
+            stack = [(root, iter(sorted(edges.get(root, {}), key=order.get)))]
+            state[root] = 1
+            while stack:
+                node, children = stack[-1]
+                child = next(children, None)
+                if child is None:
+                    state[node] = 2
+                    stack.pop()
+                elif state.get(child) == 1:
+                    back.add((node, child))
+                elif child not in state:
+                    state[child] = 1
+                    stack.append((child, iter(sorted(edges.get(child, {}), key=order.get))))
+        self.back_edges = back
+        self.successors: Dict[Any, Dict[Any, bool]] = {
+            tid: {dst: cond for dst, cond in edges.get(tid, {}).items() if (tid, dst) not in back}
+            for tid in self.tasks
+        }
+        self.predecessors: Dict[Any, List[Any]] = {tid: [] for tid in self.tasks}
+        for src, targets in self.successors.items():
+            for dst in targets:
+                self.predecessors[dst].append(src)
+        # Topological order of the forward graph
+        indegree = {tid: len(self.predecessors[tid]) for tid in self.tasks}
+        queue = deque(t for t in self.tasks if indegree[t] == 0)
+        self.topological_order = []
+        while queue:
+            tid = queue.popleft()
+            self.topological_order.append(tid)
+            for dst in self.successors[tid]:
+                indegree[dst] -= 1
+                if indegree[dst] == 0:
+                    queue.append(dst)
+
+    def _condition_targets(self, tid, names: List[str]) -> List[Any]:
+        """Map condition target names to task ids ('current' and 'next' included)."""
+        by_name = {task.name: t for t, task in self.tasks.items() if task.name}
+        targets = []
+        for name in names:
+            if name == "exit":
+                continue
+            if name == "current":
+                targets.append(tid)
+            elif name == "next":
+                targets.extend(by_name[n] for n in self.tasks[tid].next_tasks or [] if n in by_name)
+            elif name in by_name:
+                targets.append(by_name[name])
+            else:
+                logger.warning(f"Task {self.tasks[tid].name}: condition target {name!r} not found")
+        return targets
+
+    # ------------------------------------------------------------------ #
+    #   State
+    # ------------------------------------------------------------------ #
+    def _reset(self):
+        self.status: Dict[Any, str] = {tid: PENDING for tid in self.tasks}
+        self.remaining: Dict[Any, int] = {tid: len(self.predecessors[tid]) for tid in self.tasks}
+        self.live: Dict[Any, bool] = {tid: False for tid in self.tasks}
+        self.edge_state: Dict[Tuple[Any, Any], Optional[bool]] = {}
+        self.iterations: Dict[Any, int] = defaultdict(int)
+        self.timings: Dict[Any, List[Tuple[float, float]]] = defaultdict(list)
+        self.exited = False
+        self._busy_agents: Set[int] = set()
+        self._started_at = time.perf_counter()
+        self._finished_at = None
+        self._ready: Deque[Any] = deque()
+        for tid in self.topological_order or self.tasks:
+            if self.remaining[tid] == 0:
+                self.live[tid] = True
+                self._ready.append(tid)
+
+    def _resolve_edge(self, src, dst, live: bool):
+        if (src, dst) in self.edge_state:
+            # Already counted (source re-ran in a loop); only a newly live edge matters
+            self.edge_state[(src, dst)] = self.edge_state[(src, dst)] or live
+            self.live[dst] = self.live[dst] or live
+            return
+        self.edge_state[(src, dst)] = live
+        self.live[dst] = self.live[dst] or live
+        self.remaining[dst] -= 1
+        if self.remaining[dst] == 0 and self.status[dst] == PENDING:
+            if self.live[dst]:
+                self._ready.append(dst)
+            else:
+                self._skip(dst)
+
+    def _skip(self, tid):
+        self.status[tid] = SKIPPED
+        logger.debug(f"Skipping task {self.tasks[tid].name}: no live dependency")
+        for dst in self.successors[tid]:
+            self._resolve_edge(tid, dst, False)
+
+    @staticmethod
+    def decision(task) -> Optional[str]:
+        """Decision string of a finished task: pydantic ``decision`` field or raw output."""
+        result = getattr(task, "result", None)
+        if not result:
+            return None
+        if getattr(result, "pydantic", None) is not None and hasattr(result.pydantic, "decision"):
+            return str(result.pydantic.decision).strip().lower()
+        return str(result.raw or "").strip().lower()
+
+    def _route(self, tid) -> Tuple[Optional[Set[Any]], bool]:
+        """
+        Targets selected by a finished task and whether it asked to exit.
+        None means every outgoing edge is followed (no condition).
+        """
+        task = self.tasks[tid]
+        if not task.condition:
+            return None, False
+        decision = self.decision(task)
+        targets = task.condition.get(decision) if decision is not None else None
+        if targets is None and decision:
+            # Free-text answers: accept a single condition key named in the output
+            words = set(re.findall(r"\w+", decision))
+            named = [key for key in task.condition if key.lower() in words]
+            if len(named) == 1:
+                targets = task.condition[named[0]]
+        names = _as_list(targets)
+        if not names or names == ["exit"]:
+            logger.info(f"Task {task.name}: exit condition met on decision {decision!r}")
+            return set(), True
+        return set(self._condition_targets(tid, names)), False
+
+    def _reopen(self, header, decider) -> bool:
+        """Re-run the loop body from ``header`` back to ``decider``."""
+        self.iterations[header] += 1
+        if self.iterations[header] > self.max_iter:
+            logger.info(f"Loop at {self.tasks[header].name} reached max_iter={self.max_iter}")
+            return False
+        reachable = self._reachable(header)
+        reaches_decider = self._reachable(decider, reverse=True)
+        body = {t for t in reachable if t in reaches_decider} | {header, decider}
+        for edge in [e for e in self.edge_state if e[0] in body and e[1] in body]:
+            del self.edge_state[edge]
+        for tid in body:
+            if self.status[tid] == RUNNING:
+                continue
+            self.status[tid] = PENDING
+            self.tasks[tid].status = "not started"
+            inside = [p for p in self.predecessors[tid] if p in body]
+            self.remaining[tid] = len(inside)
+            self.live[tid] = tid == header or any(
+                self.edge_state.get((p, tid)) for p in self.predecessors[tid] if p not in body
+            )
+        if self.status[header] == PENDING and self.remaining[header] == 0:
+            self._ready.append(header)
+        logger.debug(f"Re-entering loop at {self.tasks[header].name} (iteration {self.iterations[header]})")
+        return True
+
+    def _reachable(self, start, reverse=False) -> Set[Any]:
+        seen = {start}
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
+            nxt = self.predecessors[node] if reverse else self.successors[node]
+            for other in nxt:
+                if other not in seen:
+                    seen.add(other)
+                    queue.append(other)
+        return seen
+
+    def _finish(self, tid, ok: bool):
+        task = self.tasks[tid]
+        self._release_agent(tid)
+        if not ok:
+            self.status[tid] = FAILED
+            logger.warning(f"Task {task.name} failed; skipping tasks that depend only on it")
+            for dst in self.successors[tid]:
+                self._resolve_edge(tid, dst, False)
+            return
+        self.status[tid] = DONE
+        selected, exit_requested = self._route(tid)
+        if exit_requested:
+            self.exited = True
+        loop_targets = [dst for dst in (selected or ()) if (tid, dst) in self.back_edges]
+        if loop_targets and self._reopen(loop_targets[0], tid):
+            return
+        for dst, conditional in self.successors[tid].items():
+            live = not conditional or (selected is not None and dst in selected)
+            self._resolve_edge(tid, dst, live and not self.exited)
+
+    def _agent_key(self, tid) -> Optional[int]:
+        agent = getattr(self.tasks[tid], "agent", None)
+        return id(agent) if self.serialize_agents and agent is not None else None
+
+    def _release_agent(self, tid):
+        key = self._agent_key(tid)
+        if key is not None:
+            self._busy_agents.discard(key)
+
+    def _next_ready(self) -> Optional[Any]:
+        """Pop the first ready task whose agent is free."""
+        for _ in range(len(self._ready)):
+            tid = self._ready.popleft()
+            if self.status[tid] != PENDING:
+                continue
+            key = self._agent_key(tid)
+            if key is not None and key in self._busy_agents:
+                self._ready.append(tid)
+                continue
+            if key is not None:
+                self._busy_agents.add(key)
+            self.status[tid] = RUNNING
+            return tid
+        return None
+
+    def _succeeded(self, tid, error: Optional[BaseException]) -> bool:
+        if error is not None:
+            logger.error(f"Task {self.tasks[tid].name} raised: {error}")
+            return False
+        return getattr(self.tasks[tid], "status", "completed") == "completed"
+
+    def _close(self):
+        self._finished_at = time.perf_counter()
+        for tid, status in self.status.items():
+            if status == PENDING:
+                self.status[tid] = SKIPPED
+
+    # ------------------------------------------------------------------ #
+    #   Execution
+    # ------------------------------------------------------------------ #
+    def _timed(self, execute: Callable[[Any], Any], tid):
+        started = time.perf_counter()
+        try:
+            return execute(tid)
+        finally:
+            self.timings[tid].append((started - self._started_at, time.perf_counter() - self._started_at))
+
+    def run(self, execute: Callable[[Any], Any]) -> Dict[str, Any]:
+        """Run every reachable task with a thread pool; returns :meth:`report`."""
+        self._reset()
+        running = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="dag") as pool:
+            while True:
+                while len(running) < self.max_workers and not self.exited:
+                    tid = self._next_ready()
+                    if tid is None:
+                        break
+                    running[pool.submit(self._timed, execute, tid)] = tid
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    tid = running.pop(future)
+                    self._finish(tid, self._succeeded(tid, future.exception()))
+        self._close()
+        return self.report()
+
+    async def _atimed(self, execute: Callable[[Any], Awaitable[Any]], tid):
+        started = time.perf_counter()
+        try:
+            return await execute(tid)
+        finally:
+            self.timings[tid].append((started - self._started_at, time.perf_counter() - self._started_at))
+
+    async def arun(self, execute: Callable[[Any], Awaitable[Any]]) -> Dict[str, Any]:
+        """Async counterpart of :meth:`run`; ``execute`` is a coroutine function."""
+        self._reset()
+        running = {}
+        while True:
+            while len(running) < self.max_workers and not self.exited:
+                tid = self._next_ready()
+                if tid is None:
+                    break
+                running[asyncio.ensure_future(self._atimed(execute, tid))] = tid
+            if not running:
+                break
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                tid = running.pop(future)
+                self._finish(tid, self._succeeded(tid, future.exception()))
+        self._close()
+        return self.report()
+
+    # ------------------------------------------------------------------ #
+    #   Reporting
+    # ------------------------------------------------------------------ #
+    def critical_path(self) -> Tuple[List[Any], float]:
+        """Longest chain of executed tasks by duration along dependency edges."""
+        duration = {tid: sum(end - start for start, end in self.timings.get(tid, [])) for tid in self.tasks}
+        best: Dict[Any, float] = {}
+        via: Dict[Any, Any] = {}
+        for tid in self.topological_order:
+            if not self.timings.get(tid):
+                continue
+            prev = max(
+                (p for p in self.predecessors[tid] if p in best),
+                key=lambda p: best[p], default=None
+            )
+            best[tid] = duration[tid] + (best[prev] if prev is not None else 0.0)
+            via[tid] = prev
+        if not best:
+            return [], 0.0
+        node = max(best, key=best.get)
+        length = best[node]
+        path = []
+        while node is not None:
+            path.append(node)
+            node = via[node]
+        return list(reversed(path)), length
+
+    def report(self) -> Dict[str, Any]:
+        end = self._finished_at if self._finished_at is not None else time.perf_counter()
+        wall = end - self._started_at
+        path, path_seconds = self.critical_path()
+        busy = sum(end_ - start for runs in self.timings.values() for start, end_ in runs)
+        name = lambda tid: self.tasks[tid].name or str(tid)
+        return {
+            "wall_seconds": round(wall, 3),
+            "total_task_seconds": round(busy, 3),
+            "critical_path": [name(tid) for tid in path],
+            "critical_path_seconds": round(path_seconds, 3),
+            "parallelism": round(busy / wall, 2) if wall > 0 else 0.0,
+            "max_workers": self.max_workers,
+            "exited_early": self.exited,
+            "tasks": {
+                name(tid): {
+                    "status": self.status.get(tid, PENDING),
+                    "runs": len(self.timings.get(tid, [])),
+                    "seconds": round(sum(e - s for s, e in self.timings.get(tid, [])), 3),
+                    "start": round(self.timings[tid][0][0], 3) if self.timings.get(tid) else None,
+                    "end": round(self.timings[tid][-1][1], 3) if self.timings.get(tid) else None
+                }
+                for tid in self.tasks
+            }
+        }
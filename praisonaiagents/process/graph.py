@@ -0,0 +1,203 @@
+"""
+Compiled index over a Process's tasks.
+
+The workflow engines route by task name. Looking names up with a linear scan
+per edge, and finding loop subtasks by prefix-matching every task, made each
+step O(tasks) and loop workflows over large input files quadratic. TaskGraph
+compiles the task dict once into:
+
+* a name -> task index
+* predecessor links (``previous_tasks``) derived from ``next_tasks``
+* loop parent / children indexes for loop subtasks
+* the start task and the set of terminal tasks
+* validation of unknown targets and cycles that no decision can break
+
+Tasks created while the workflow runs (loop rows) are registered with
+:meth:`TaskGraph.add`, so every lookup stays O(1).
+"""
+
+import logging
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set
+
+from ..task.task import Task
+
+logger = logging.getLogger(__name__)
+
+# Condition targets that are routing keywords rather than task names
+ROUTING_KEYWORDS = ("current", "next", "exit")
+
+
+def _names(value) -> List[str]:
+    if isinstance(value, (list, tuple)):
+        return [v for v in value if isinstance(v, str) and v]
+    return [value] if isinstance(value, str) and value else []
+
+
+class TaskGraph:
+    """Name, adjacency and loop indexes over ``tasks`` (a dict shared with the Process)."""
+
+    def __init__(self, tasks: Dict[str, Task]):
+        self.tasks = tasks
+        self._by_name: Dict[str, Task] = {}
+        self._loop_parent: Dict[str, Task] = {}
+        self._children: Dict[str, List[Task]] = defaultdict(list)
+        self._base_descriptions: Dict[str, str] = {}
+        self._completed_cursor = 0
+        self._order: List[Task] = []
+        self.start_task: Optional[Task] = None
+        self.terminal: Set[str] = set()  # ids of tasks that end the workflow
+        self.compile()
+
+    def compile(self):
+        """Build every index from scratch; called once per workflow run."""
+        self._by_name.clear()
+        self._loop_parent.clear()
+        self._children.clear()
+        self._order = list(self.tasks.values())
+        for task in self._order:
+            if task.name and task.name not in self._by_name:
+                self._by_name[task.name] = task
+
+        loops = {task.name: task for task in self._order if task.task_type == "loop" and task.name}
+        for task in self._order:
+            parent = self._parent_by_name(task, loops)
+            if parent is not None:
+                self._register_child(task, parent)
+
+        for task in self._order:
+            for name in task.next_tasks or []:
+                successor = self._by_name.get(name)
+                if successor is not None and task.name not in successor.previous_tasks:
+                    successor.previous_tasks.append(task.name)
+
+        self.start_task = next((t for t in self._order if t.is_start), self._order[0] if self._order else None)
+        # Only loop tasks and their rows get next_tasks at run time, and neither can be terminal
+        self.terminal = {
+            t.id for t in self._order
+            if not t.next_tasks and not t.condition and t.task_type != "loop" and t.id not in self._loop_parent
+        }
+        for problem in self.validate():
+            logger.warning(problem)
+
+    @staticmethod
+    def _parent_by_name(task: Task, loops: Dict[str, Task]) -> Optional[Task]:
+        """Loop subtasks are named ``<loop name>_<n>``."""
+        if not task.name or "_" not in task.name:
+            return None
+        prefix, _, suffix = task.name.rpartition("_")
+        parent = loops.get(prefix)
+        return parent if parent is not None and parent is not task and suffix.isdigit() else None
+
+    def _register_child(self, task: Task, parent: Task):
+        self._loop_parent[task.id] = parent
+        self._children[parent.name].append(task)
+
+    def add(self, task: Task, parent: Optional[Task] = None):
+        """Register a task created at run time (and the loop that produced it)."""
+        self.tasks[task.id] = task
+        self._order.append(task)
+        if task.name and task.name not in self._by_name:
+            self._by_name[task.name] = task
+        if parent is not None:
+            self._register_child(task, parent)
+
+    # ------------------------------------------------------------------ #
+    #   Lookups
+    # ------------------------------------------------------------------ #
+    def get(self, name: Optional[str]) -> Optional[Task]:
+        return self._by_name.get(name) if name else None
+
+    def subtasks(self, loop_task: Task) -> List[Task]:
+        return list(self._children.get(loop_task.name, ()))
+
+    def loop_parent(self, task: Task) -> Optional[Task]:
+        return self._loop_parent.get(task.id)
+
+    def is_loop_subtask(self, task: Task) -> bool:
+        return task.id in self._loop_parent
+
+    def is_terminal(self, task: Task) -> bool:
+        """Whether finishing ``task`` ends the workflow (no next task, no decision)."""
+        return task.id in self.terminal
+
+    def all_completed(self) -> bool:
+        """Whether every task is completed, in amortized O(1) per call."""
+        order = self._order
+        while self._completed_cursor < len(order) and order[self._completed_cursor].status == "completed":
+            self._completed_cursor += 1
+        if self._completed_cursor < len(order):
+            return False
+        # Statuses can be reset behind the cursor; confirm before finishing
+        for i, task in enumerate(order):
+            if task.status != "completed":
+                self._completed_cursor = i
+                return False
+        return True
+
+    # ------------------------------------------------------------------ #
+    #   Description context
+    # ------------------------------------------------------------------ #
+    def append_context(self, task: Task, context: str):
+        """Append previous-task context to a description, remembering the original."""
+        self._base_descriptions.setdefault(task.id, task.description)
+        task.description = task.description + context
+
+    def restore_descriptions(self):
+        """Undo :meth:`append_context` for the tasks that were actually changed."""
+        for task_id, description in self._base_descriptions.items():
+            task = self.tasks.get(task_id)
+            if task is not None:
+                task.description = description
+        self._base_descriptions.clear()
+
+    # ------------------------------------------------------------------ #
+    #   Validation
+    # ------------------------------------------------------------------ #
+    def validate(self) -> List[str]:
+        """Unknown targets and cycles made only of unconditional next_tasks edges."""
+        problems = []
+        for task in self._order:
+            for name in task.next_tasks or []:
+                if name not in self._by_name:
+                    problems.append(f"Task {task.name}: next task {name!r} does not exist")
+            for key, value in (task.condition or {}).items():
+                for name in _names(value):
+                    if name not in ROUTING_KEYWORDS and name not in self._by_name:
+                        problems.append(f"Task {task.name}: condition {key!r} targets unknown task {name!r}")
+        for cycle in self.unconditional_cycles():
+            problems.append(f"Tasks {' -> '.join(cycle)} form a cycle with no decision to leave it")
+        return problems
+
+    def unconditional_cycles(self) -> List[List[str]]:
+        """Cycles through tasks without conditions; these only stop at max_iter."""
+        plain = {
+            t.name: [n for n in t.next_tasks or [] if n in self._by_name]
+            for t in self._order if t.name and not t.condition
+        }
+        cycles, state = [], {}
+        for root in plain:
+            if root in state:
+                continue
+            stack = [(root, iter(plain[root]))]
+            path = [root]
+            state[root] = 1
+            while stack:
+                node, children = stack[-1]
+                child = next(children, None)
+                if child is None:
+                    state[node] = 2
+                    stack.pop()
+                    path.pop()
+                elif child not in plain:
+                    continue
+                elif state.get(child) == 1:
+                    cycles.append(path[path.index(child):] + [child])
+                elif child not in state:
+                    state[child] = 1
+                    path.append(child)
+                    stack.append((child, iter(plain[child])))
+        return cycles
+
+    def not_started(self) -> Iterable[Task]:
+        return (t for t in self._order if t.status == "not started")
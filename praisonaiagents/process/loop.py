@@ -0,0 +1,409 @@
+"""
+Streaming execution of loop tasks over large input files.
+
+The classic workflow expands a loop task into one Task per input row before
+anything runs, chains the rows through ``next_tasks`` and executes them one
+at a time. For large files that costs O(rows) memory and runs at the speed of
+a single request. :class:`LoopRunner` instead:
+
+* reads CSV, JSONL and Parquet rows lazily (:func:`iter_loop_rows`)
+* runs each row through the loop task's agent with ``workers`` threads, each
+  using its own shallow copy of the agent and a fresh chat history per row;
+  tools, LLM, memory and knowledge are shared between the threads, so the
+  agent's tools must be thread-safe (see :meth:`Agent.clone`)
+* keeps at most ``2 * workers`` rows in flight, so memory does not grow with
+  the file
+* streams one JSON record per row to an output file or callback
+* checkpoints the offset below which every row is finished, so an
+  interrupted run resumes where it stopped (rows after the offset that were
+  already done may run again: delivery is at least once)
+
+Enable it on a loop task with ``config={"loop": {...}}``:
+
+    Task(
+        task_type="loop",
+        input_file="reviews.csv",
+        description="Classify the sentiment of this review",
+        config={"loop": {"workers": 16, "output_file": "sentiment.jsonl"}}
+    )
+
+Options: ``workers`` (default 4), ``output_file`` (JSONL sink; defaults to the
+task's ``output_file``), ``checkpoint`` (path; defaults to
+``<output_file>.checkpoint.json``), ``checkpoint_every`` (rows, default 50),
+``retries`` (extra attempts per failed row, default 0) and ``resume``
+(default True).
+"""
+
+import os
+import csv
+import json
+import time
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple, Union
+
+from ..main import TaskOutput
+from ..telemetry.tracing import propagate, span
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 4
+DEFAULT_CHECKPOINT_EVERY = 50
+
+PROMPT_SUFFIX = "Please provide only the final result of your work. Do not add any conversation or extra explanation."
+
+
+def loop_config(task) -> Optional[Dict[str, Any]]:
+    """The task's streaming loop options, or None when the loop uses subtasks."""
+    if task.task_type != "loop":
+        return None
+    options = (task.config or {}).get("loop")
+    if options is None or options is False:
+        return None
+    return options if isinstance(options, dict) else {}
+
+
+def is_streaming_loop(task) -> bool:
+    return loop_config(task) is not None
+
+
+def _format_record(record: Any) -> str:
+    """Render a structured row (JSON object / Parquet row) as ``key: value`` lines."""
+    if isinstance(record, dict):
+        return "\n".join(f"{key}: {value}" for key, value in record.items() if value not in (None, ""))
+    return str(record).strip()
+
+
+def _iter_csv(f) -> Iterator[str]:
+    for row in csv.reader(f, quotechar='"', escapechar='\\'):
+        if not row:
+            continue
+        if len(row) > 1:
+            question = row[0].strip()
+            answer = ",".join(field.strip() for field in row[1:])
+            yield f"Question: {question}\nAnswer: {answer}"
+        elif row[0].strip():
+            yield row[0].strip()
+
+
+def _iter_jsonl(f) -> Iterator[str]:
+    for line_number, line in enumerate(f, start=1):
+        if not line.strip():
+            continue
+        try:
+            text = _format_record(json.loads(line))
+        except json.JSONDecodeError as e:
+            logger.warning(f"Skipping invalid JSON on line {line_number}: {e}")
+            continue
+        if text:
+            yield text
+
+
+def _iter_parquet(input_file: str, batch_size: int = 1024) -> Iterator[str]:
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError(
+            "Reading Parquet loop input requires pyarrow. Install with: pip install pyarrow"
+        )
+    parquet = pq.ParquetFile(input_file)
+    for batch in parquet.iter_batches(batch_size=batch_size):
+        for record in batch.to_pylist():
+            text = _format_record(record)
+            if text:
+                yield text
+
+
+def iter_loop_rows(input_file: str, start: int = 0) -> Iterator[Tuple[int, str]]:
+    """
+    Lazily yield ``(offset, text)`` for each non-empty row of a loop input file.
+
+    CSV rows with several columns become ``Question: .../Answer: ...`` as in the
+    classic loop expansion; ``.jsonl``/``.ndjson`` objects and Parquet rows
+    become ``key: value`` lines; any other file is read line by line. Rows
+    before ``start`` are skipped.
+    """
+    file_ext = os.path.splitext(input_file)[1].lower()
+    if file_ext == ".parquet":
+        rows = _iter_parquet(input_file)
+        f = None
+    else:
+        f = open(input_file, "r", encoding="utf-8", newline="" if file_ext == ".csv" else None)
+        if file_ext == ".csv":
+            rows = _iter_csv(f)
+        elif file_ext in (".jsonl", ".ndjson"):
+            rows = _iter_jsonl(f)
+        else:
+            rows = (line.strip() for line in f if line.strip())
+    try:
+        for offset, text in enumerate(rows):
+            if offset >= start:
+                yield offset, text
+    finally:
+        if f is not None:
+            f.close()
+
+
+class JSONLSink:
+    """Thread-safe JSONL writer that flushes each record as it arrives."""
+
+    def __init__(self, path: str, append: bool = False):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._file = open(path, "a" if append else "w", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def __call__(self, record: Dict[str, Any]):
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class LoopRunner:
+    """
+    Run a loop task's rows concurrently without creating a Task per row.
+
+    Args:
+        task: The loop task; its agent, description, expected_output, tools and
+            input_file are used for every row
+        workers: Rows processed concurrently
+        output: JSONL path or callable receiving one record per row
+            (``offset``, ``input``, ``output``, ``error``)
+        checkpoint: JSON file storing the resume offset
+        context: Text appended to every row prompt (results of context tasks)
+        checkpoint_every: Rows between checkpoint writes
+        retries: Extra attempts for a row whose agent call fails
+        resume: Start from the checkpoint offset when one exists
+    """
+
+    def __init__(
+        self,
+        task,
+        workers: int = DEFAULT_WORKERS,
+        output: Optional[Union[str, Callable[[Dict[str, Any]], None]]] = None,
+        checkpoint: Optional[str] = None,
+        context: str = "",
+        checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY,
+        retries: int = 0,
+        resume: bool = True
+    ):
+        self.task = task
+        self.workers = max(1, int(workers))
+        self.output = output
+        if checkpoint is None and isinstance(output, str):
+            checkpoint = f"{output}.checkpoint.json"
+        self.checkpoint = checkpoint
+        self.context = context
+        self.checkpoint_every = max(1, int(checkpoint_every))
+        self.retries = max(0, int(retries))
+        self.resume = resume
+        self._local = threading.local()
+
+    @classmethod
+    def from_task(cls, task, context: str = "") -> "LoopRunner":
+        """Build a runner from the task's ``config["loop"]`` options."""
+        options = loop_config(task) or {}
+        return cls(
+            task,
+            workers=options.get("workers", DEFAULT_WORKERS),
+            output=options.get("output") or options.get("output_file") or task.output_file,
+            checkpoint=options.get("checkpoint"),
+            context=context,
+            checkpoint_every=options.get("checkpoint_every", DEFAULT_CHECKPOINT_EVERY),
+            retries=options.get("retries", 0),
+            resume=options.get("resume", True)
+        )
+
+    # ------------------------------------------------------------------ #
+    #   Checkpoint
+    # ------------------------------------------------------------------ #
+    def load_offset(self) -> int:
+        """Offset to resume from: 0 unless a checkpoint for the same input exists."""
+        if not (self.resume and self.checkpoint and os.path.exists(self.checkpoint)):
+            return 0
+        try:
+            with open(self.checkpoint, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable loop checkpoint {self.checkpoint}: {e}")
+            return 0
+        if state.get("input_file") != self.task.input_file:
+            return 0
+        return int(state.get("offset", 0))
+
+    def save_offset(self, offset: int, finished: bool = False):
+        if not self.checkpoint:
+            return
+        state = {
+            "input_file": self.task.input_file,
+            "offset": offset,
+            "finished": finished,
+            "updated_at": time.time()
+        }
+        tmp_path = f"{self.checkpoint}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.checkpoint)
+
+    # ------------------------------------------------------------------ #
+    #   Rows
+    # ------------------------------------------------------------------ #
+    def build_prompt(self, row: str) -> str:
+        description = f"{self.task.description}\n{row}" if self.task.description else row
+        prompt = f"""
+You need to do the following task: {description}.
+Expected Output: {self.task.expected_output}.
+"""
+        if self.context:
+            prompt += f"""
+Context:
+
+{self.context}
+"""
+        return prompt + PROMPT_SUFFIX
+
+    def _worker_agent(self):
+        """Per-thread shallow copy of the loop agent, so rows never share chat state."""
+        agent = getattr(self._local, "agent", None)
+        if agent is None:
+            agent = self.task.agent.clone()
+            self._local.agent = agent
+        agent.chat_history = []
+        return agent
+
+    def run_row(self, offset: int, row: str, submitted: Optional[float] = None) -> Dict[str, Any]:
+        queued_ms = round((time.perf_counter() - submitted) * 1000, 2) if submitted is not None else None
+        with span("loop.row", "loop", offset=offset, queued_ms=queued_ms):
+            return self._run_row(offset, row)
+
+    def _run_row(self, offset: int, row: str) -> Dict[str, Any]:
+        prompt = self.build_prompt(row)
+        error = None
+        for attempt in range(self.retries + 1):
+            try:
+                output = self._worker_agent().chat(prompt, tools=self.task.tools or None)
+            except Exception as e:
+                output, error = None, str(e)
+            else:
+                error = None if output is not None else "Agent returned no output"
+            if error is None:
+                break
+            logger.debug(f"Loop row {offset} attempt {attempt + 1} failed: {error}")
+        return {"offset": offset, "input": row, "output": output, "error": error}
+
+    # ------------------------------------------------------------------ #
+    #   Execution
+    # ------------------------------------------------------------------ #
+    def _open_sink(self, start: int):
+        if callable(self.output):
+            return self.output, None
+        if isinstance(self.output, str):
+            sink = JSONLSink(self.output, append=start > 0)
+            return sink, sink
+        return None, None
+
+    def run(self) -> TaskOutput:
+        """Process every remaining row and return the loop task's result."""
+        if self.task.agent is None:
+            raise ValueError(f"Loop task {self.task.name} has no agent")
+        input_file = self.task.input_file or "tasks.csv"
+        self.task.input_file = input_file
+        start = self.load_offset()
+        if start:
+            logger.info(f"Resuming loop {self.task.name} at row {start}")
+        emit, sink = self._open_sink(start)
+
+        watermark, done, finished_rows, failed = start, set(), 0, 0
+        last: Optional[Dict[str, Any]] = None
+        started = time.perf_counter()
+        in_flight = {}
+        completed_run = False
+        run_row = propagate(self.run_row)
+
+        def collect(futures):
+            nonlocal watermark, finished_rows, failed, last
+            for future in futures:
+                offset = in_flight.pop(future)
+                record = future.result()
+                finished_rows += 1
+                if record["error"]:
+                    failed += 1
+                elif last is None or offset >= last["offset"]:
+                    last = record
+                if emit is not None:
+                    emit(record)
+                done.add(offset)
+            previous = watermark
+            while watermark in done:
+                done.discard(watermark)
+                watermark += 1
+            if watermark // self.checkpoint_every != previous // self.checkpoint_every:
+                self.save_offset(watermark)
+            self.task.loop_state.update({"offset": watermark, "rows": finished_rows, "failed": failed})
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="loop") as pool:
+                for offset, row in iter_loop_rows(input_file, start=start):
+                    if len(in_flight) >= self.workers * 2:
+                        completed, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                        collect(completed)
+                    in_flight[pool.submit(run_row, offset, row, time.perf_counter())] = offset
+                while in_flight:
+                    completed, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    collect(completed)
+            completed_run = True
+        finally:
+            self.save_offset(watermark, finished=completed_run)
+            if sink is not None:
+                sink.close()
+
+        seconds = time.perf_counter() - started
+        summary = {
+            "rows": finished_rows,
+            "failed": failed,
+            "resumed_from": start,
+            "offset": watermark,
+            "seconds": round(seconds, 3),
+            "rows_per_second": round(finished_rows / seconds, 2) if seconds else None,
+            "output_file": self.output if isinstance(self.output, str) else None,
+            "last_output": last["output"] if last else None
+        }
+        logger.info(
+            f"Loop {self.task.name}: {finished_rows} rows ({failed} failed) in {seconds:.1f}s "
+            f"with {self.workers} workers"
+        )
+        return self._task_output(summary)
+
+    async def arun(self) -> TaskOutput:
+        return await asyncio.to_thread(self.run)
+
+    def _task_output(self, summary: Dict[str, Any]) -> TaskOutput:
+        raw = f"Processed {summary['rows']} rows ({summary['failed']} failed)"
+        if summary["output_file"]:
+            raw += f"; results written to {summary['output_file']}"
+        if summary["last_output"]:
+            raw += f"\nLast result: {summary['last_output']}"
+        pydantic = None
+        # Loop tasks route on "done" once every row is finished
+        if self.task.output_pydantic is not None and "done" in (self.task.condition or {}):
+            try:
+                pydantic = self.task.output_pydantic(response=raw, decision="done", loop_id=self.task.name or "")
+            except Exception as e:
+                logger.debug(f"Could not build loop decision for {self.task.name}: {e}")
+        return TaskOutput(
+            description=self.task.description,
+            raw=raw,
+            pydantic=pydantic,
+            json_dict=summary,
+            agent=self.task.agent.name if self.task.agent else "",
+            output_format="RAW"
+        )
@@ -0,0 +1,194 @@
+"""
+Batch-assignment planning for the hierarchical manager.
+
+The classic hierarchical process asks the manager for one task at a time and
+re-sends every task's description and status on each call, so manager tokens
+grow with tasks squared and independent tasks never overlap. In batch mode the
+manager keeps one conversation:
+
+* the first message describes every task and agent once
+* each reply assigns a batch of ``(task_id, agent_name)`` pairs, which the
+  caller runs concurrently
+* follow-up messages only report what changed since the previous reply
+  (completed tasks with a short result excerpt, failures, and the ids that are
+  still open)
+
+``max_calls`` caps the number of manager requests; once it is reached the
+remaining tasks run in dependency order with the agents they already have.
+A task's dependencies are the other tasks in its ``context``.
+"""
+
+import logging
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel
+
+from ..task.task import Task
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 3
+RESULT_EXCERPT_CHARS = 200
+
+SYSTEM_PROMPT = (
+    "You are a project manager coordinating tasks among agents. "
+    "Assign every task that can run now to the best agent; tasks in the same batch run in parallel. "
+    "Only assign a task once the tasks it depends on are completed."
+)
+
+
+class TaskAssignment(BaseModel):
+    task_id: int
+    agent_name: str
+
+
+class ManagerBatch(BaseModel):
+    assignments: List[TaskAssignment]
+    action: str
+
+
+class BatchManager:
+    """
+    Conversation state, status deltas and batch validation for one hierarchical run.
+
+    Args:
+        tasks: The run's tasks by id
+        agents: Agents the manager may assign
+        max_calls: Maximum manager requests; None for no limit
+        max_batch: Maximum tasks per batch; None for no limit
+    """
+
+    def __init__(self, tasks: Dict[int, Task], agents: List, max_calls: Optional[int] = None, max_batch: Optional[int] = None):
+        self.tasks = tasks
+        self.agents = {agent.name: agent for agent in agents}
+        self.max_calls = max_calls
+        self.max_batch = max_batch
+        self.messages: List[Dict[str, str]] = [{"role": "system", "content": SYSTEM_PROMPT}]
+        self._reported: Dict[int, str] = {}
+        self._pending_report: Dict[int, str] = {}
+        self._attempts: Dict[int, int] = {}
+        self.calls = 0
+        self.seconds = 0.0
+        self.prompt_chars = 0
+
+    # ------------------------------------------------------------------ #
+    #   Task state
+    # ------------------------------------------------------------------ #
+    def _dependencies(self, task: Task) -> List[Task]:
+        return [c for c in task.context or [] if isinstance(c, Task) and c is not task and c.id in self.tasks]
+
+    def _runnable(self, task_id: int) -> bool:
+        task = self.tasks[task_id]
+        return task.status != "completed" and self._attempts.get(task_id, 0) < MAX_ATTEMPTS
+
+    def open_tasks(self) -> List[int]:
+        return [tid for tid in self.tasks if self._runnable(tid)]
+
+    def ready_tasks(self) -> List[int]:
+        """Open tasks whose dependencies are all completed."""
+        return [
+            tid for tid in self.open_tasks()
+            if all(dep.status == "completed" for dep in self._dependencies(self.tasks[tid]))
+        ]
+
+    def finished(self) -> bool:
+        return not self.ready_tasks()
+
+    def ready_batch(self) -> List[int]:
+        """Next batch without asking the manager: every ready task with its current agent."""
+        batch = self.ready_tasks()
+        return batch[:self.max_batch] if self.max_batch else batch
+
+    def mark_attempted(self, batch: List[int]):
+        for tid in batch:
+            self._attempts[tid] = self._attempts.get(tid, 0) + 1
+
+    # ------------------------------------------------------------------ #
+    #   Manager conversation
+    # ------------------------------------------------------------------ #
+    def calls_left(self) -> bool:
+        return self.max_calls is None or self.calls < self.max_calls
+
+    def _initial_prompt(self) -> str:
+        agent_lines = "\n".join(
+            f"- {agent.name}: {getattr(agent, 'role', '')}" for agent in self.agents.values()
+        )
+        task_lines = []
+        for tid, task in self.tasks.items():
+            deps = [dep.id for dep in self._dependencies(task)]
+            line = f"- task_id {tid} ({task.name or 'unnamed'}), agent {task.agent.name if task.agent else 'none'}"
+            if deps:
+                line += f", depends on {deps}"
+            task_lines.append(f"{line}: {task.description}")
+        return f"""Agents:
+{agent_lines}
+
+Tasks:
+{chr(10).join(task_lines)}
+
+Reply with a JSON object {{"assignments": [{{"task_id": <int>, "agent_name": "<string>"}}], "action": "<execute or stop>"}} listing every task that can run now."""
+
+    def _delta_prompt(self) -> str:
+        changes = []
+        for tid, task in self.tasks.items():
+            status = task.status or "not started"
+            if self._reported.get(tid) == status:
+                continue
+            if status == "completed":
+                excerpt = (task.result.raw if task.result else "")[:RESULT_EXCERPT_CHARS].replace("\n", " ")
+                changes.append(f"- task_id {tid} completed: {excerpt}")
+            else:
+                changes.append(f"- task_id {tid} {status}")
+        lines = "\n".join(changes) if changes else "- no changes"
+        return f"""Since your last assignment:
+{lines}
+Open tasks: {self.open_tasks()}
+Ready to run now: {self.ready_tasks()}
+Assign the next batch as JSON, or use action "stop"."""
+
+    def next_request(self) -> Optional[List[Dict[str, str]]]:
+        """Messages for the next manager call, or None when the call cap is reached."""
+        if not self.calls_left():
+            return None
+        prompt = self._initial_prompt() if len(self.messages) == 1 else self._delta_prompt()
+        self._pending_report = {tid: task.status or "not started" for tid, task in self.tasks.items()}
+        self.messages.append({"role": "user", "content": prompt})
+        self.prompt_chars += len(prompt)
+        return list(self.messages)
+
+    def apply(self, response: ManagerBatch, seconds: float = 0.0) -> Optional[List[int]]:
+        """
+        Validate a manager reply, assign agents and return the batch of task ids
+        to run now; None when the manager asks to stop.
+        """
+        self.calls += 1
+        self.seconds += seconds
+        self._reported = self._pending_report
+        self.messages.append({"role": "assistant", "content": response.model_dump_json()})
+        if response.action.lower() == "stop":
+            return None
+        ready = set(self.ready_tasks())
+        batch = []
+        for assignment in response.assignments:
+            tid = assignment.task_id
+            if tid not in ready or tid in batch:
+                logger.debug(f"Manager assigned task {tid}, which is not ready to run; skipping")
+                continue
+            agent = self.agents.get(assignment.agent_name)
+            if agent is not None:
+                self.tasks[tid].agent = agent
+            elif self.tasks[tid].agent is None and self.agents:
+                self.tasks[tid].agent = next(iter(self.agents.values()))
+            batch.append(tid)
+            if self.max_batch and len(batch) >= self.max_batch:
+                break
+        return batch
+
+    def record_failure(self, seconds: float = 0.0):
+        """Count a manager call whose reply could not be parsed."""
+        self.calls += 1
+        self.seconds += seconds
+        self.messages.pop()
+
+    def stats(self) -> Dict[str, float]:
+        return {"calls": self.calls, "seconds": round(self.seconds, 3), "prompt_chars": self.prompt_chars}
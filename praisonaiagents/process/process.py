@@ -5,10 +5,16 @@ from typing import Dict, Optional, List, Any, AsyncGenerator
 from pydantic import BaseModel, ConfigDict
 from ..agent.agent import Agent
 from ..task.task import Task
-from ..main import display_error, client
+from .graph import TaskGraph
+from .loop import iter_loop_rows, is_streaming_loop
+from .manager import BatchManager, ManagerBatch
+from ..main import display_error, client, get_async_client
+from ..retry import with_retry, without_sdk_retries
+from ..telemetry.tracing import traced
 import csv
 import os
-from openai import AsyncOpenAI
+import time
+from collections import Counter
     # Praison AI: Optimized algorithm for better scalability
     # Praison AI: Improved code documentation and clarity
 
@@ -19,7 +25,7 @@ class LoopItems(BaseModel):
 class Process:
     DEFAULT_RETRY_LIMIT = 3  # Predefined retry limit in a common place
 
-    def __init__(self, tasks: Dict[str, Task], agents: List[Agent], manager_llm: Optional[str] = None, verbose: bool = False, max_iter: int = 10):
+    def __init__(self, tasks: Dict[str, Task], agents: List[Agent], manager_llm: Optional[str] = None, verbose: bool = False, max_iter: int = 10, manager_batch: bool = False, max_manager_calls: Optional[int] = None):
         logging.debug(f"=== Initializing Process ===")
         logging.debug(f"Number of tasks: {len(tasks)}")
         logging.debug(f"Number of agents: {len(agents)}")
@@ -34,6 +40,73 @@ class Process:
         self.max_iter = max_iter
         self.task_retry_counter: Dict[str, int] = {} # Initialize retry counter
         self.workflow_finished = False # ADDED: Workflow finished flag
+        self._graph: Optional[TaskGraph] = None
+        self.manager_batch = manager_batch  # hierarchical: manager assigns batches that run concurrently
+        self.max_manager_calls = max_manager_calls
+        self.manager_stats: Optional[Dict[str, Any]] = None
+
+    @property
+    def graph(self) -> TaskGraph:
+        """Compiled task indexes; the workflow engines recompile at start."""
+        if self._graph is None:
+            self._graph = TaskGraph(self.tasks)
+        return self._graph
+
+    @graph.setter
+    def graph(self, value: TaskGraph):
+        self._graph = value
+
+    def _log_summary(self, title: str, iterations: Optional[int] = None):
+        """Task status/type counts, computed only when debug logging is enabled."""
+        if not logging.getLogger().isEnabledFor(logging.DEBUG):
+            return
+        status = Counter(t.status for t in self.tasks.values())
+        types = Counter(t.task_type if t.task_type in ("loop", "decision") else "regular" for t in self.tasks.values())
+        summary = f"""
+=== {title} ===
+Total tasks: {len(self.tasks)}
+Outstanding tasks: {len(self.tasks) - status["completed"]}
+Completed tasks: {status["completed"]}
+Tasks by status:
+- Not started: {status["not started"]}
+- In progress: {status["in_progress"]}
+- Completed: {status["completed"]}
+- Failed: {status["failed"]}
+Tasks by type:
+- Loop tasks: {types["loop"]}
+- Decision tasks: {types["decision"]}
+- Regular tasks: {types["regular"]}"""
+        if iterations is not None:
+            summary += f"\nTotal iterations: {iterations}\nWorkflow Finished: {self.workflow_finished}"
+        logging.debug(summary)
+
+    def _create_loop_subtasks(self, loop_task: Task):
+        """Expand a loop task into one chained subtask per input row."""
+        previous_task = None
+        first_task = None
+        for i, (_, row) in enumerate(iter_loop_rows(loop_task.input_file), start=1):
+            row_task = Task(
+                description=f"{loop_task.description}\n{row}" if loop_task.description else row,
+                agent=loop_task.agent,
+                name=f"{loop_task.name}_{i}" if loop_task.name else row,
+                expected_output=getattr(loop_task, 'expected_output', None),
+                is_start=(i == 1),
+                task_type="task",
+                condition={
+                    "complete": ["next"],
+                    "retry": ["current"]
+                }
+            )
+            self.graph.add(row_task, parent=loop_task)
+            if previous_task:
+                previous_task.next_tasks = [row_task.name]
+                previous_task.condition["complete"] = [row_task.name]
+            else:
+                first_task = row_task
+            previous_task = row_task
+        if first_task:
+            loop_task.next_tasks = [first_task.name]
+            logging.info(f"Created {len(self.graph.subtasks(loop_task))} tasks from: {loop_task.input_file} for loop task {loop_task.name}")
 
     def _build_task_context(self, current_task: Task) -> str:
         """Build context for a task based on its retain_full_context setting"""
@@ -45,7 +118,7 @@ class Process:
         if current_task.retain_full_context:
             # Original behavior: include all previous tasks
             for prev_name in current_task.previous_tasks:
-                prev_task = next((t for t in self.tasks.values() if t.name == prev_name), None)
+                prev_task = self.graph.get(prev_name)
                 if prev_task and prev_task.result:
                     context += f"\n{prev_name}: {prev_task.result.raw}"
                     
@@ -59,7 +132,7 @@ class Process:
             if current_task.previous_tasks:
                 # Get the most recent previous task (last in the list)
                 prev_name = current_task.previous_tasks[-1]
-                prev_task = next((t for t in self.tasks.values() if t.name == prev_name), None)
+                prev_task = self.graph.get(prev_name)
                 if prev_task and prev_task.result:
                     context += f"\n{prev_name}: {prev_task.result.raw}"
                     
@@ -78,15 +151,13 @@ class Process:
         fallback_attempts = 0
         temp_current_task = None
         
-        # Clear previous task context before finding next task
-        for task in self.tasks.values():
-            if hasattr(task, 'description') and 'Input data from previous tasks:' in task.description:
-                task.description = task.description.split('Input data from previous tasks:')[0].strip()
+        # Clear previous task context before finding next task (only tasks that received it)
+        self.graph.restore_descriptions()
         
         while fallback_attempts < Process.DEFAULT_RETRY_LIMIT and not temp_current_task:
             fallback_attempts += 1
             logging.debug(f"Fallback attempt {fallback_attempts}: Trying to find next 'not started' task.")
-            for task_candidate in self.tasks.values():
+            for task_candidate in self.graph.not_started():
                 if task_candidate.status == "not started":
                     # Check if there's a condition path to this task
                     current_conditions = task_candidate.condition or {}
@@ -110,6 +181,7 @@ class Process:
                 logging.debug(f"Fallback attempt {fallback_attempts}: No 'not started' task found within retry limit.")
         return None # Return None if no task found after all attempts
 
+    @traced("manager.call", "process", attributes=lambda self, *args, **kwargs: {"model": self.manager_llm})
     async def _get_manager_instructions_with_fallback_async(self, manager_task, manager_prompt, ManagerInstructions):
         """Async version of getting manager instructions with fallback"""
         try:
@@ -140,12 +212,13 @@ class Process:
                 logging.error(error_msg, exc_info=True)
                 raise Exception(error_msg) from fallback_error
 
+    @traced("manager.call", "process", attributes=lambda self, *args, **kwargs: {"model": self.manager_llm})
     def _get_manager_instructions_with_fallback(self, manager_task, manager_prompt, ManagerInstructions):
         """Sync version of getting manager instructions with fallback"""
         try:
             # First try structured output (OpenAI compatible)
             logging.info("Attempting structured output...")
-            manager_response = client.beta.chat.completions.parse(
+            manager_response = with_retry(without_sdk_retries(client).beta.chat.completions.parse, "openai")(
                 model=self.manager_llm,
                 messages=[
                     {"role": "system", "content": manager_task.description},
@@ -173,7 +246,7 @@ class Process:
                     # Fallback to hardcoded prompt if schema generation fails
                     enhanced_prompt = manager_prompt + "\n\nIMPORTANT: Respond with valid JSON only, using this exact structure: {\"task_id\": <int>, \"agent_name\": \"<string>\", \"action\": \"<execute or stop>\"}"
                 
-                manager_response = client.chat.completions.create(
+                manager_response = with_retry(without_sdk_retries(client).chat.completions.create, "openai")(
                     model=self.manager_llm,
                     messages=[
                         {"role": "system", "content": manager_task.description},
@@ -197,9 +270,8 @@ class Process:
 
     async def _get_structured_response_async(self, manager_task, manager_prompt, ManagerInstructions):
         """Async version of structured response"""
-        # Create an async client instance for this async method
-        async_client = AsyncOpenAI()
-        manager_response = await async_client.beta.chat.completions.parse(
+        async_client = get_async_client()
+        manager_response = await with_retry(without_sdk_retries(async_client).beta.chat.completions.parse, "openai")(
             model=self.manager_llm,
             messages=[
                 {"role": "system", "content": manager_task.description},
@@ -212,9 +284,8 @@ class Process:
 
     async def _get_json_response_async(self, manager_task, enhanced_prompt, ManagerInstructions):
         """Async version of JSON fallback response"""
-        # Create an async client instance for this async method
-        async_client = AsyncOpenAI()
-        manager_response = await async_client.chat.completions.create(
+        async_client = get_async_client()
+        manager_response = await with_retry(without_sdk_retries(async_client).chat.completions.create, "openai")(
             model=self.manager_llm,
             messages=[
                 {"role": "system", "content": manager_task.description},
@@ -233,31 +304,118 @@ class Process:
             raise Exception(f"Failed to parse JSON response: {json_content}") from e
 
 
+    @traced("manager.call", "process", attributes=lambda self, *args, **kwargs: {"model": self.manager_llm})
+    def _call_manager(self, messages: List[Dict[str, str]], response_model):
+        """Manager completion over a full message list: structured output, then JSON mode."""
+        try:
+            manager_response = with_retry(without_sdk_retries(client).beta.chat.completions.parse, "openai")(
+                model=self.manager_llm,
+                messages=messages,
+                temperature=0.7,
+                response_format=response_model
+            )
+            return manager_response.choices[0].message.parsed
+        except Exception as e:
+            logging.info(f"Structured output failed: {e}, falling back to JSON mode...")
+        manager_response = with_retry(without_sdk_retries(client).chat.completions.create, "openai")(
+            model=self.manager_llm,
+            messages=messages,
+            temperature=0.7,
+            response_format={"type": "json_object"}
+        )
+        return response_model(**json.loads(manager_response.choices[0].message.content))
+
+    @traced("manager.call", "process", attributes=lambda self, *args, **kwargs: {"model": self.manager_llm})
+    async def _acall_manager(self, messages: List[Dict[str, str]], response_model):
+        """Async version of _call_manager"""
+        async_client = get_async_client()
+        try:
+            manager_response = await with_retry(without_sdk_retries(async_client).beta.chat.completions.parse, "openai")(
+                model=self.manager_llm,
+                messages=messages,
+                temperature=0.7,
+                response_format=response_model
+            )
+            return manager_response.choices[0].message.parsed
+        except Exception as e:
+            logging.info(f"Structured output failed: {e}, falling back to JSON mode...")
+        manager_response = await with_retry(without_sdk_retries(async_client).chat.completions.create, "openai")(
+            model=self.manager_llm,
+            messages=messages,
+            temperature=0.7,
+            response_format={"type": "json_object"}
+        )
+        return response_model(**json.loads(manager_response.choices[0].message.content))
+
+    def _next_batch(self, manager: BatchManager, response, seconds: float) -> Optional[List[int]]:
+        """Turn a manager reply (or a failed call) into the next batch; None means stop."""
+        if isinstance(response, Exception):
+            display_error(f"Manager parse error: {response}")
+            logging.error(f"Manager parse error: {response}")
+            manager.record_failure(seconds)
+            return manager.ready_batch()
+        batch = manager.apply(response, seconds)
+        if batch is None:
+            logging.info("Manager decided to stop task execution")
+            return None
+        return batch or manager.ready_batch()
+
+    def _hierarchical_batches(self):
+        """Hierarchical execution in batch mode; yields lists of task ids to run concurrently."""
+        manager = BatchManager(self.tasks, self.agents, max_calls=self.max_manager_calls)
+        while not manager.finished():
+            messages = manager.next_request()
+            if messages is None:
+                batch = manager.ready_batch()
+            else:
+                started = time.perf_counter()
+                try:
+                    response = self._call_manager(messages, ManagerBatch)
+                except Exception as e:
+                    response = e
+                batch = self._next_batch(manager, response, time.perf_counter() - started)
+                if batch is None:
+                    break
+            logging.info(f"Running batch of {len(batch)} tasks: {batch}")
+            manager.mark_attempted(batch)
+            yield batch
+        self.manager_stats = manager.stats()
+        logging.info(f"Hierarchical batch execution finished; manager: {self.manager_stats}")
+
+    async def _ahierarchical_batches(self) -> AsyncGenerator[List[int], None]:
+        """Async version of _hierarchical_batches"""
+        manager = BatchManager(self.tasks, self.agents, max_calls=self.max_manager_calls)
+        while not manager.finished():
+            messages = manager.next_request()
+            if messages is None:
+                batch = manager.ready_batch()
+            else:
+                started = time.perf_counter()
+                try:
+                    response = await self._acall_manager(messages, ManagerBatch)
+                except Exception as e:
+                    response = e
+                batch = self._next_batch(manager, response, time.perf_counter() - started)
+                if batch is None:
+                    break
+            logging.info(f"Running batch of {len(batch)} tasks: {batch}")
+            manager.mark_attempted(batch)
+            yield batch
+        self.manager_stats = manager.stats()
+        logging.info(f"Hierarchical batch execution finished; manager: {self.manager_stats}")
+
     async def aworkflow(self) -> AsyncGenerator[str, None]:
         """Async version of workflow method"""
         logging.debug("=== Starting Async Workflow ===")
         current_iter = 0  # Track how many times we've looped
-        # Build workflow relationships first
+        # Compile name/loop indexes and previous_tasks links once
         logging.debug("Building workflow relationships...")
-        for task in self.tasks.values():
-            if task.next_tasks:
-                for next_task_name in task.next_tasks:
-                    next_task = next((t for t in self.tasks.values() if t.name == next_task_name), None)
-                    if next_task:
-                        next_task.previous_tasks.append(task.name)
-                        logging.debug(f"Added {task.name} as previous task for {next_task_name}")
-
-        # Find start task
-        logging.debug("Finding start task...")
-        start_task = None
-        for task_id, task in self.tasks.items():
-            if task.is_start:
-                start_task = task
-                logging.debug(f"Found marked start task: {task.name} (id: {task_id})")
-                break
+        self.graph = TaskGraph(self.tasks)
 
-        if not start_task:
-            start_task = list(self.tasks.values())[0]
+        start_task = self.graph.start_task
+        if start_task.is_start:
+            logging.debug(f"Found marked start task: {start_task.name} (id: {start_task.id})")
+        else:
             logging.debug(f"No start task marked, using first task: {start_task.name}")
 
         current_task = start_task
@@ -277,23 +435,10 @@ class Process:
                 break
 
             # Add task summary at start of each cycle
-            logging.debug(f"""
-=== Workflow Cycle {current_iter} Summary ===
-Total tasks: {len(self.tasks)}
-Outstanding tasks: {sum(1 for t in self.tasks.values() if t.status != "completed")}
-Completed tasks: {sum(1 for t in self.tasks.values() if t.status == "completed")}
-Tasks by status:
-- Not started: {sum(1 for t in self.tasks.values() if t.status == "not started")}
-- In progress: {sum(1 for t in self.tasks.values() if t.status == "in_progress")}
-- Completed: {sum(1 for t in self.tasks.values() if t.status == "completed")}
-Tasks by type:
-- Loop tasks: {sum(1 for t in self.tasks.values() if t.task_type == "loop")}
-- Decision tasks: {sum(1 for t in self.tasks.values() if t.task_type == "decision")}
-- Regular tasks: {sum(1 for t in self.tasks.values() if t.task_type not in ["loop", "decision"])}
-            """)
+            self._log_summary(f"Workflow Cycle {current_iter} Summary")
 
             # ADDED: Check if all tasks are completed and set workflow_finished flag
-            if all(task.status == "completed" for task in self.tasks.values()):
+            if self.graph.all_completed():
                 logging.info("All tasks are completed.")
                 self.workflow_finished = True
                 # The next iteration loop check will break the workflow
@@ -314,10 +459,11 @@ Description length: {len(current_task.description)}
             context = self._build_task_context(current_task)
             if context:
                 # Update task description with context
-                current_task.description = current_task.description + context
+                self.graph.append_context(current_task, context)
 
-            # Skip execution for loop tasks, only process their subtasks
-            if current_task.task_type == "loop":
+            # Skip execution for loop tasks, only process their subtasks;
+            # streaming loops run their rows themselves and execute as one task
+            if current_task.task_type == "loop" and not is_streaming_loop(current_task):
                 logging.debug(f"""
 === Loop Task Details ===
 Name: {current_task.name}
@@ -331,25 +477,23 @@ Input file: {getattr(current_task, 'input_file', None)}
 
                 # Check if subtasks are created and completed
                 if getattr(current_task, "_subtasks_created", False):
-                    subtasks = [
-                        t for t in self.tasks.values()
-                        if t.name.startswith(current_task.name + "_")
-                    ]
-                    logging.debug(f"""
+                    subtasks = self.graph.subtasks(current_task)
+                    if logging.getLogger().isEnabledFor(logging.DEBUG):
+                        logging.debug(f"""
 === Subtask Status Check ===
 Total subtasks: {len(subtasks)}
 Completed: {sum(1 for st in subtasks if st.status == "completed")}
 Pending: {sum(1 for st in subtasks if st.status != "completed")}
-                    """)
+                        """)
 
-                    # Log detailed subtask info
-                    for st in subtasks:
-                        logging.debug(f"""
+                        # Log detailed subtask info
+                        for st in subtasks:
+                            logging.debug(f"""
 Subtask: {st.name}
 - Status: {st.status}
 - Next tasks: {st.next_tasks}
 - Condition: {st.condition}
-                        """)
+                            """)
 
                     if subtasks and all(st.status == "completed" for st in subtasks):
                         logging.debug(f"=== All {len(subtasks)} subtasks completed for {current_task.name} ===")
@@ -381,7 +525,7 @@ Subtask: {st.name}
                             
                             target_tasks = current_task.condition.get(decision_str, []) if decision_str else []
                             task_value = target_tasks[0] if isinstance(target_tasks, list) else target_tasks
-                            next_task = next((t for t in self.tasks.values() if t.name == task_value), None)
+                            next_task = self.graph.get(task_value)
                             if next_task:
                                 next_task.status = "not started"  # Reset status to allow execution
                                 logging.debug(f"Routing to {next_task.name} based on decision: {decision_str}")
@@ -410,7 +554,7 @@ Subtask: {st.name}
                         logging.debug(f"No input file, marking {current_task.name} as completed")
                         if current_task.next_tasks:
                             next_task_name = current_task.next_tasks[0]
-                            next_task = next((t for t in self.tasks.values() if t.name == next_task_name), None)
+                            next_task = self.graph.get(next_task_name)
                             current_task = next_task
                         else:
                             current_task = None
@@ -423,10 +567,7 @@ Subtask: {st.name}
                 visited_tasks.add(task_id)
 
                 # Only end workflow if no next_tasks AND no conditions
-                if not current_task.next_tasks and not current_task.condition and not any(
-                    t.task_type == "loop" and current_task.name.startswith(t.name + "_")
-                    for t in self.tasks.values()
-                ):
+                if self.graph.is_terminal(current_task):
                     logging.info(f"Task {current_task.name} has no next tasks, ending workflow")
                     self.workflow_finished = True
                     current_task = None
@@ -444,8 +585,7 @@ Subtask: {st.name}
 
                 if (getattr(task_to_check, 'rerun', True) and # Corrected condition - reset only if rerun is True (or default True)
                     task_to_check.task_type != "loop" and # Removed "decision" from exclusion
-                    not any(t.task_type == "loop" and subtask_name.startswith(t.name + "_")
-                           for t in self.tasks.values())):
+                    not self.graph.is_loop_subtask(task_to_check)):
                     logging.debug(f"=== Resetting non-loop, non-decision task {subtask_name} to 'not started' ===")
                     self.tasks[task_id].status = "not started"
                     logging.debug(f"Task status after reset: {self.tasks[task_id].status}")
@@ -492,7 +632,7 @@ Subtask: {st.name}
                         else:
                             # Find the target task by name
                             task_value = target_tasks[0] if isinstance(target_tasks, list) else target_tasks
-                            next_task = next((t for t in self.tasks.values() if t.name == task_value), None)
+                            next_task = self.graph.get(task_value)
                             if next_task:
                                 next_task.status = "not started"  # Reset status to allow execution
                                 logging.debug(f"Routing to {next_task.name} based on decision: {decision_str}")
@@ -502,7 +642,7 @@ Subtask: {st.name}
             # If no condition-based routing, use next_tasks
             if not next_task and current_task and current_task.next_tasks:
                 next_task_name = current_task.next_tasks[0]
-                next_task = next((t for t in self.tasks.values() if t.name == next_task_name), None)
+                next_task = self.graph.get(next_task_name)
                 if next_task:
                     # Reset the next task to allow re-execution
                     next_task.status = "not started"
@@ -521,24 +661,7 @@ Subtask: {st.name}
 
             if not current_task:
                 # Add final workflow summary
-                logging.debug(f"""
-=== Final Workflow Summary ===
-Total tasks processed: {len(self.tasks)}
-Final status:
-- Completed tasks: {sum(1 for t in self.tasks.values() if t.status == "completed")}
-- Outstanding tasks: {sum(1 for t in self.tasks.values() if t.status != "completed")}
-Tasks by status:
-- Not started: {sum(1 for t in self.tasks.values() if t.status == "not started")}
-- In progress: {sum(1 for t in self.tasks.values() if t.status == "in_progress")}
-- Completed: {sum(1 for t in self.tasks.values() if t.status == "completed")}
-- Failed: {sum(1 for t in self.tasks.values() if t.status == "failed")}
-Tasks by type:
-- Loop tasks: {sum(1 for t in self.tasks.values() if t.task_type == "loop")}
-- Decision tasks: {sum(1 for t in self.tasks.values() if t.task_type == "decision")}
-- Regular tasks: {sum(1 for t in self.tasks.values() if t.task_type not in ["loop", "decision"])}
-Total iterations: {current_iter}
-Workflow Finished: {self.workflow_finished} # ADDED: Workflow Finished Status
-                """)
+                self._log_summary("Final Workflow Summary", current_iter)
 
                 logging.info("Workflow execution completed")
                 break
@@ -561,6 +684,10 @@ Workflow Finished: {self.workflow_finished} # ADDED: Workflow Finished Status
 
     async def ahierarchical(self) -> AsyncGenerator[str, None]:
         """Async version of hierarchical method"""
+        if self.manager_batch:
+            async for batch in self._ahierarchical_batches():
+                yield batch
+            return
         logging.debug(f"Starting hierarchical task execution with {len(self.tasks)} tasks")
         manager_agent = Agent(
             name="Manager",
@@ -674,23 +801,11 @@ Provide a JSON with the structure:
     def workflow(self):
         """Synchronous version of workflow method"""
         current_iter = 0  # Track how many times we've looped
-        # Build workflow relationships first
-        for task in self.tasks.values():
-            if task.next_tasks:
-                for next_task_name in task.next_tasks:
-                    next_task = next((t for t in self.tasks.values() if t.name == next_task_name), None)
-                    if next_task:
-                        next_task.previous_tasks.append(task.name)
-
-        # Find start task
-        start_task = None
-        for task_id, task in self.tasks.items():
-            if task.is_start:
-                start_task = task
-                break
+        # Compile name/loop indexes and previous_tasks links once
+        self.graph = TaskGraph(self.tasks)
 
-        if not start_task:
-            start_task = list(self.tasks.values())[0]
+        start_task = self.graph.start_task
+        if not start_task.is_start:
             logging.info("No start task marked, using first task")
 
         # If loop type and no input_file, default to tasks.csv
@@ -698,7 +813,7 @@ Provide a JSON with the structure:
             start_task.input_file = "tasks.csv"
 
         # --- If loop + input_file, read file & create tasks
-        if start_task and start_task.task_type == "loop" and getattr(start_task, "input_file", None):
+        if start_task and start_task.task_type == "loop" and getattr(start_task, "input_file", None) and not is_streaming_loop(start_task):
             try:
                 file_ext = os.path.splitext(start_task.input_file)[1].lower()
                 new_tasks = []
@@ -744,7 +859,7 @@ Provide a JSON with the structure:
                                     "exit": []  # Empty list for exit condition
                                 }
                             )
-                            self.tasks[row_task.id] = row_task
+                            self.graph.add(row_task, parent=start_task)
                             new_tasks.append(row_task)
 
                             if previous_task:
@@ -775,7 +890,7 @@ Provide a JSON with the structure:
                                     "retry": ["current"]
                                 }
                             )
-                            self.tasks[row_task.id] = row_task
+                            self.graph.add(row_task, parent=start_task)
                             new_tasks.append(row_task)
 
                             if previous_task:
@@ -806,23 +921,10 @@ Provide a JSON with the structure:
                 break
 
             # Add task summary at start of each cycle
-            logging.debug(f"""
-=== Workflow Cycle {current_iter} Summary ===
-Total tasks: {len(self.tasks)}
-Outstanding tasks: {sum(1 for t in self.tasks.values() if t.status != "completed")}
-Completed tasks: {sum(1 for t in self.tasks.values() if t.status == "completed")}
-Tasks by status:
-- Not started: {sum(1 for t in self.tasks.values() if t.status == "not started")}
-- In progress: {sum(1 for t in self.tasks.values() if t.status == "in_progress")}
-- Completed: {sum(1 for t in self.tasks.values() if t.status == "completed")}
-Tasks by type:
-- Loop tasks: {sum(1 for t in self.tasks.values() if t.task_type == "loop")}
-- Decision tasks: {sum(1 for t in self.tasks.values() if t.task_type == "decision")}
-- Regular tasks: {sum(1 for t in self.tasks.values() if t.task_type not in ["loop", "decision"])}
-            """)
+            self._log_summary(f"Workflow Cycle {current_iter} Summary")
 
             # ADDED: Check if all tasks are completed and set workflow_finished flag
-            if all(task.status == "completed" for task in self.tasks.values()):
+            if self.graph.all_completed():
                 logging.info("All tasks are completed.")
                 self.workflow_finished = True
                 # The next iteration loop check will break the workflow
@@ -830,6 +932,7 @@ Tasks by type:
 
             # Handle loop task file reading at runtime
             if (current_task.task_type == "loop" and
+                not is_streaming_loop(current_task) and
                 current_task is not start_task and
                 getattr(current_task, "_subtasks_created", False) is not True):
 
@@ -860,7 +963,7 @@ Tasks by type:
                                                 "retry": ["current"]
                                             }
                                         )
-                                        self.tasks[row_task.id] = row_task
+                                        self.graph.add(row_task, parent=current_task)
                                         new_tasks.append(row_task)
 
                                         if previous_task:
@@ -884,7 +987,7 @@ Tasks by type:
                                             "retry": ["current"]
                                         }
                                     )
-                                    self.tasks[row_task.id] = row_task
+                                    self.graph.add(row_task, parent=current_task)
                                     new_tasks.append(row_task)
 
                                     if previous_task:
@@ -915,10 +1018,11 @@ Description length: {len(current_task.description)}
             context = self._build_task_context(current_task)
             if context:
                 # Update task description with context
-                current_task.description = current_task.description + context
+                self.graph.append_context(current_task, context)
 
-            # Skip execution for loop tasks, only process their subtasks
-            if current_task.task_type == "loop":
+            # Skip execution for loop tasks, only process their subtasks;
+            # streaming loops run their rows themselves and execute as one task
+            if current_task.task_type == "loop" and not is_streaming_loop(current_task):
                 logging.debug(f"""
 === Loop Task Details ===
 Name: {current_task.name}
@@ -932,25 +1036,23 @@ Input file: {getattr(current_task, 'input_file', None)}
 
                 # Check if subtasks are created and completed
                 if getattr(current_task, "_subtasks_created", False):
-                    subtasks = [
-                        t for t in self.tasks.values()
-                        if t.name.startswith(current_task.name + "_")
-                    ]
+                    subtasks = self.graph.subtasks(current_task)
 
-                    logging.debug(f"""
+                    if logging.getLogger().isEnabledFor(logging.DEBUG):
+                        logging.debug(f"""
 === Subtask Status Check ===
 Total subtasks: {len(subtasks)}
 Completed: {sum(1 for st in subtasks if st.status == "completed")}
 Pending: {sum(1 for st in subtasks if st.status != "completed")}
-                    """)
+                        """)
 
-                    for st in subtasks:
-                        logging.debug(f"""
+                        for st in subtasks:
+                            logging.debug(f"""
 Subtask: {st.name}
 - Status: {st.status}
 - Next tasks: {st.next_tasks}
 - Condition: {st.condition}
-                        """)
+                            """)
 
                     if subtasks and all(st.status == "completed" for st in subtasks):
                         logging.debug(f"=== All {len(subtasks)} subtasks completed for {current_task.name} ===")
@@ -982,7 +1084,7 @@ Subtask: {st.name}
                             
                             target_tasks = current_task.condition.get(decision_str, []) if decision_str else []
                             task_value = target_tasks[0] if isinstance(target_tasks, list) else target_tasks
-                            next_task = next((t for t in self.tasks.values() if t.name == task_value), None)
+                            next_task = self.graph.get(task_value)
                             if next_task:
                                 next_task.status = "not started"  # Reset status to allow execution
                                 logging.debug(f"Routing to {next_task.name} based on decision: {decision_str}")
@@ -1011,7 +1113,7 @@ Subtask: {st.name}
                         logging.debug(f"No input file, marking {current_task.name} as completed")
                         if current_task.next_tasks:
                             next_task_name = current_task.next_tasks[0]
-                            next_task = next((t for t in self.tasks.values() if t.name == next_task_name), None)
+                            next_task = self.graph.get(next_task_name)
                             current_task = next_task
                         else:
                             current_task = None
@@ -1024,10 +1126,7 @@ Subtask: {st.name}
                 visited_tasks.add(task_id)
 
                 # Only end workflow if no next_tasks AND no conditions
-                if not current_task.next_tasks and not current_task.condition and not any(
-                    t.task_type == "loop" and current_task.name.startswith(t.name + "_")
-                    for t in self.tasks.values()
-                ):
+                if self.graph.is_terminal(current_task):
                     logging.info(f"Task {current_task.name} has no next tasks, ending workflow")
                     self.workflow_finished = True
                     current_task = None
@@ -1045,8 +1144,7 @@ Subtask: {st.name}
 
                 if (getattr(task_to_check, 'rerun', True) and # Corrected condition - reset only if rerun is True (or default True)
                     task_to_check.task_type != "loop" and # Removed "decision" from exclusion
-                    not any(t.task_type == "loop" and subtask_name.startswith(t.name + "_")
-                           for t in self.tasks.values())):
+                    not self.graph.is_loop_subtask(task_to_check)):
                     logging.debug(f"=== Resetting non-loop, non-decision task {subtask_name} to 'not started' ===")
                     self.tasks[task_id].status = "not started"
                     logging.debug(f"Task status after reset: {self.tasks[task_id].status}")
@@ -1094,7 +1192,7 @@ Subtask: {st.name}
                         else:
                             # Find the target task by name
                             task_value = target_tasks[0] if isinstance(target_tasks, list) else target_tasks
-                            next_task = next((t for t in self.tasks.values() if t.name == task_value), None)
+                            next_task = self.graph.get(task_value)
                             if next_task:
                                 next_task.status = "not started"  # Reset status to allow execution
                                 logging.debug(f"Routing to {next_task.name} based on decision: {decision_str}")
@@ -1104,7 +1202,7 @@ Subtask: {st.name}
             # If no condition-based routing, use next_tasks
             if not next_task and current_task and current_task.next_tasks:
                 next_task_name = current_task.next_tasks[0]
-                next_task = next((t for t in self.tasks.values() if t.name == next_task_name), None)
+                next_task = self.graph.get(next_task_name)
                 if next_task:
                     # Reset the next task to allow re-execution
                     next_task.status = "not started"
@@ -1123,24 +1221,7 @@ Subtask: {st.name}
 
             if not current_task:
                 # Add final workflow summary
-                logging.debug(f"""
-=== Final Workflow Summary ===
-Total tasks processed: {len(self.tasks)}
-Final status:
-- Completed tasks: {sum(1 for t in self.tasks.values() if t.status == "completed")}
-- Outstanding tasks: {sum(1 for t in self.tasks.values() if t.status != "completed")}
-Tasks by status:
-- Not started: {sum(1 for t in self.tasks.values() if t.status == "not started")}
-- In progress: {sum(1 for t in self.tasks.values() if t.status == "in_progress")}
-- Completed: {sum(1 for t in self.tasks.values() if t.status == "completed")}
-- Failed: {sum(1 for t in self.tasks.values() if t.status == "failed")}
-Tasks by type:
-- Loop tasks: {sum(1 for t in self.tasks.values() if t.task_type == "loop")}
-- Decision tasks: {sum(1 for t in self.tasks.values() if t.task_type == "decision")}
-- Regular tasks: {sum(1 for t in self.tasks.values() if t.task_type not in ["loop", "decision"])}
-Total iterations: {current_iter}
-Workflow Finished: {self.workflow_finished} # ADDED: Workflow Finished Status
-                """)
+                self._log_summary("Final Workflow Summary", current_iter)
 
                 logging.info("Workflow execution completed")
                 break
@@ -1163,6 +1244,9 @@ Workflow Finished: {self.workflow_finished} # ADDED: Workflow Finished Status
 
     def hierarchical(self):
         """Synchronous version of hierarchical method"""
+        if self.manager_batch:
+            yield from self._hierarchical_batches()
+            return
         logging.debug(f"Starting hierarchical task execution with {len(self.tasks)} tasks")
         manager_agent = Agent(
             name="Manager",
@@ -0,0 +1,414 @@
+"""
+Shared retry policy for LLM, embedding, MCP and task retries.
+
+Errors are classified before deciding whether to retry:
+
+* ``RETRYABLE`` - rate limits, timeouts, connection errors and 5xx responses
+* ``NON_RETRYABLE`` - authentication, bad requests, unknown models and
+  programming errors; raised at once
+* ``SHRINK_CONTEXT`` - the prompt exceeded the model's context window; retrying
+  the same request cannot help, so it is raised unless an ``on_error`` hook
+  shrinks the input and asks for another attempt
+* ``REFORMAT`` - the response could not be parsed (bad JSON, failed
+  validation); handled the same way as ``SHRINK_CONTEXT``
+
+Retryable failures wait with exponential backoff and full jitter, or for the
+server's ``Retry-After`` when it is longer, so concurrent workers spread out
+instead of retrying in lockstep. SDK clients retry on their own as well, so
+wrapped OpenAI calls go through :func:`without_sdk_retries` and litellm calls
+pass ``max_retries=0``; otherwise every attempt here would be up to three
+requests. Each provider has a circuit breaker: after
+``failure_threshold`` consecutive retryable failures calls fail fast with
+:class:`CircuitOpenError` for ``reset_timeout`` seconds, then one trial call
+is let through. A process-wide retry budget allows retries only up to a
+fraction of recent first attempts, so a provider brownout is not amplified.
+
+Usage:
+    response = with_retry(litellm.completion, "openai")(model=..., messages=..., max_retries=0)
+    response = with_retry(without_sdk_retries(client).chat.completions.create, "openai")(...)
+
+    set_retry_policy(RetryPolicy(max_attempts=5, max_delay=60))
+"""
+
+import time
+import random
+import asyncio
+import inspect
+import logging
+import threading
+import functools
+import weakref
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE = "retryable"
+NON_RETRYABLE = "non_retryable"
+SHRINK_CONTEXT = "shrink_context"
+REFORMAT = "reformat"
+
+_CONTEXT_PHRASES = (
+    "maximum context length",
+    "context window",
+    "context length exceeded",
+    "context_length_exceeded",
+    "too many tokens",
+    "prompt is too long",
+)
+_RETRYABLE_PHRASES = (
+    "rate limit",
+    "rate_limit",
+    "too many requests",
+    "timed out",
+    "timeout",
+    "temporarily unavailable",
+    "service unavailable",
+    "overloaded",
+    "connection reset",
+    "connection error",
+    "bad gateway",
+)
+_RETRYABLE_TYPES = (
+    "RateLimitError",
+    "APITimeoutError",
+    "Timeout",
+    "TimeoutError",
+    "ReadTimeout",
+    "ConnectTimeout",
+    "APIConnectionError",
+    "ConnectionError",
+    "ServiceUnavailableError",
+    "InternalServerError",
+    "BadGatewayError",
+)
+_REFORMAT_TYPES = ("JSONDecodeError", "ValidationError", "OutputParserException")
+_CONTEXT_TYPES = ("ContextWindowExceededError", "LLMContextLengthExceededException")
+# Errors from provider SDKs and HTTP stacks; only their messages are matched against the phrases above
+_API_TYPES = (
+    "APIError",
+    "OpenAIError",
+    "HTTPError",
+    "HTTPStatusError",
+    "TransportError",
+    "RequestException",
+    "ClientError",
+    "McpError",
+)
+
+
+class CircuitOpenError(Exception):
+    """Raised without calling the provider while its circuit breaker is open."""
+
+    def __init__(self, key: str, retry_in: float):
+        self.key = key
+        self.retry_in = retry_in
+        super().__init__(f"Circuit for {key} is open; retry in {retry_in:.1f}s")
+
+
+def _status_code(error: BaseException) -> Optional[int]:
+    for source in (error, getattr(error, "response", None)):
+        code = getattr(source, "status_code", None) if source is not None else None
+        if isinstance(code, int):
+            return code
+    return None
+
+
+def classify_error(error: BaseException) -> str:
+    """Map an exception to RETRYABLE, NON_RETRYABLE, SHRINK_CONTEXT or REFORMAT."""
+    if isinstance(error, CircuitOpenError):
+        return NON_RETRYABLE
+    names = {cls.__name__ for cls in type(error).__mro__}
+    # A ValueError from our own code that mentions a timeout is still a bug, not a provider hiccup
+    message = str(error).lower() if names.intersection(_API_TYPES) else ""
+    if names.intersection(_CONTEXT_TYPES) or any(p in message for p in _CONTEXT_PHRASES):
+        return SHRINK_CONTEXT
+    if names.intersection(_REFORMAT_TYPES):
+        return REFORMAT
+    status = _status_code(error)
+    if status is not None:
+        if status in (408, 409, 425, 429) or status >= 500:
+            return RETRYABLE
+        return NON_RETRYABLE
+    if names.intersection(_RETRYABLE_TYPES) or isinstance(error, (TimeoutError, ConnectionError, asyncio.TimeoutError)):
+        return RETRYABLE
+    if any(p in message for p in _RETRYABLE_PHRASES):
+        return RETRYABLE
+    return NON_RETRYABLE
+
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """Seconds requested by the server (``Retry-After`` header or attribute), if any."""
+    value = getattr(error, "retry_after", None)
+    if value is None:
+        headers = getattr(getattr(error, "response", None), "headers", None)
+        if headers is not None:
+            try:
+                value = headers.get("retry-after-ms")
+                if value is not None:
+                    return float(value) / 1000
+                value = headers.get("retry-after")
+            except Exception:
+                value = None
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(str(value)).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def provider_of(model: Optional[str]) -> str:
+    """Circuit key for a model name: its ``provider/`` prefix, else openai."""
+    if model and "/" in model:
+        return model.split("/", 1)[0]
+    return "openai"
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker (closed -> open -> half open)."""
+
+    def __init__(self, key: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.key = key
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "half_open" if time.monotonic() - self.opened_at >= self.reset_timeout else "open"
+
+    def before_call(self):
+        """Raise CircuitOpenError while open; in half-open state admit a single trial call."""
+        with self._lock:
+            if self.opened_at is None:
+                return
+            waited = time.monotonic() - self.opened_at
+            if waited < self.reset_timeout:
+                raise CircuitOpenError(self.key, self.reset_timeout - waited)
+            if self._trial:
+                raise CircuitOpenError(self.key, 0.0)
+            self._trial = True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial = False
+            if self.opened_at is not None or self.failures >= self.failure_threshold:
+                if self.opened_at is None:
+                    logger.warning(f"Opening circuit for {self.key} after {self.failures} failures")
+                self.opened_at = time.monotonic()
+
+
+class RetryBudget:
+    """
+    Token bucket limiting retries to ``ratio`` of first attempts.
+
+    Every first attempt deposits ``ratio`` tokens (up to ``max_tokens``) and
+    every retry withdraws one, so under a sustained outage retries settle at
+    ``ratio`` times the request rate.
+    """
+
+    def __init__(self, ratio: float = 0.2, max_tokens: float = 20.0):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens
+        self._lock = threading.Lock()
+
+    def deposit(self):
+        with self._lock:
+            self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        with self._lock:
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with jitter, error classification, circuit breakers and a retry budget.
+
+    Args:
+        max_attempts: Attempts per call, including the first
+        base_delay: Backoff before the first retry, in seconds
+        max_delay: Upper bound for a single wait
+        multiplier: Backoff growth per attempt
+        failure_threshold: Consecutive failures that open a provider's circuit
+        reset_timeout: Seconds a circuit stays open before a trial call
+        budget: Shared RetryBudget; None disables the budget
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 4,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+        multiplier: float = 2.0,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        budget: Optional[RetryBudget] = None
+    ):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.budget = budget
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def breaker(self, key: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(key)
+            if breaker is None:
+                breaker = self._breakers[key] = CircuitBreaker(key, self.failure_threshold, self.reset_timeout)
+            return breaker
+
+    def backoff(self, attempt: int, error: Optional[BaseException] = None) -> float:
+        """Full-jitter exponential delay before retry ``attempt`` (1-based), honoring Retry-After."""
+        ceiling = min(self.max_delay, self.base_delay * self.multiplier ** max(0, attempt - 1))
+        delay = random.uniform(0, ceiling)
+        requested = retry_after(error) if error is not None else None
+        if requested is not None:
+            delay = max(delay, min(requested, self.max_delay))
+        return delay
+
+    def _should_retry(self, error: BaseException, attempt: int, on_error: Optional[Callable]) -> Optional[str]:
+        """The error class when another attempt should be made, else None."""
+        error_class = classify_error(error)
+        if attempt >= self.max_attempts:
+            return None
+        if error_class in (SHRINK_CONTEXT, REFORMAT):
+            return error_class if on_error is not None and on_error(error_class, error) else None
+        if error_class != RETRYABLE:
+            return None
+        if self.budget is not None and not self.budget.withdraw():
+            logger.warning(f"Retry budget exhausted; not retrying {type(error).__name__}")
+            return None
+        return error_class
+
+    def call(self, fn: Callable, *args, circuit: Optional[str] = None, on_error: Optional[Callable] = None, **kwargs):
+        """
+        Call ``fn`` with retries. ``circuit`` names the provider breaker; ``on_error``
+        is called as ``on_error(error_class, error)`` for SHRINK_CONTEXT/REFORMAT
+        errors and returns True after adjusting the input to try again.
+        """
+        breaker = self.breaker(circuit) if circuit else None
+        if self.budget is not None:
+            self.budget.deposit()
+        attempt = 0
+        while True:
+            attempt += 1
+            if breaker is not None:
+                breaker.before_call()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                if breaker is not None:
+                    # Any answer other than a retryable failure shows the provider is up
+                    if classify_error(e) == RETRYABLE:
+                        breaker.record_failure()
+                    else:
+                        breaker.record_success()
+                error_class = self._should_retry(e, attempt, on_error)
+                if error_class is None:
+                    raise
+                delay = self.backoff(attempt, e) if error_class == RETRYABLE else 0.0
+                logger.info(f"{getattr(fn, '__name__', 'call')} failed ({error_class}: {e}); attempt {attempt + 1} in {delay:.2f}s")
+                time.sleep(delay)
+                continue
+            if breaker is not None:
+                breaker.record_success()
+            return result
+
+    async def acall(self, fn: Callable, *args, circuit: Optional[str] = None, on_error: Optional[Callable] = None, **kwargs):
+        """Async version of call for coroutine functions."""
+        breaker = self.breaker(circuit) if circuit else None
+        if self.budget is not None:
+            self.budget.deposit()
+        attempt = 0
+        while True:
+            attempt += 1
+            if breaker is not None:
+                breaker.before_call()
+            try:
+                result = await fn(*args, **kwargs)
+            except Exception as e:
+                if breaker is not None:
+                    # Any answer other than a retryable failure shows the provider is up
+                    if classify_error(e) == RETRYABLE:
+                        breaker.record_failure()
+                    else:
+                        breaker.record_success()
+                error_class = self._should_retry(e, attempt, on_error)
+                if error_class is None:
+                    raise
+                delay = self.backoff(attempt, e) if error_class == RETRYABLE else 0.0
+                logger.info(f"{getattr(fn, '__name__', 'call')} failed ({error_class}: {e}); attempt {attempt + 1} in {delay:.2f}s")
+                await asyncio.sleep(delay)
+                continue
+            if breaker is not None:
+                breaker.record_success()
+            return result
+
+
+_default_policy = RetryPolicy(budget=RetryBudget())
+
+
+def get_retry_policy() -> RetryPolicy:
+    return _default_policy
+
+
+def set_retry_policy(policy: RetryPolicy):
+    """Replace the process-wide policy used by with_retry and task retries."""
+    global _default_policy
+    _default_policy = policy
+
+
+_sdk_clients = weakref.WeakKeyDictionary()
+_sdk_clients_lock = threading.Lock()
+
+
+def without_sdk_retries(client):
+    """``client.with_options(max_retries=0)``, built once per client; other objects are returned as is."""
+    if not hasattr(client, "with_options"):
+        return client
+    with _sdk_clients_lock:
+        quiet = _sdk_clients.get(client)
+        if quiet is None:
+            quiet = _sdk_clients[client] = client.with_options(max_retries=0)
+        return quiet
+
+
+def with_retry(fn: Callable, circuit: Optional[str] = None, policy: Optional[RetryPolicy] = None) -> Callable:
+    """Wrap ``fn`` (sync or async) so calls go through the retry policy."""
+    # SDK methods are often sync-looking decorators around a coroutine function
+    if inspect.iscoroutinefunction(fn) or inspect.iscoroutinefunction(inspect.unwrap(fn)):
+        @functools.wraps(fn)
+        async def async_wrapper(*args, **kwargs):
+            return await (policy or _default_policy).acall(fn, *args, circuit=circuit, **kwargs)
+        return async_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        return (policy or _default_policy).call(fn, *args, circuit=circuit, **kwargs)
+    return wrapper
@@ -0,0 +1,11 @@
+"""Serving layer for launched agents: request isolation, sessions, fair scheduling and streaming."""
+
+from .admission import AdmissionController, Overloaded
+from .scheduler import FairScheduler
+from .sessions import SessionStore, InMemorySessionStore, SQLiteSessionStore, RedisSessionStore, session_store_from_url
+from .service import AgentService, ChainService
+
+__all__ = [
+    'AgentService', 'ChainService', 'AdmissionController', 'FairScheduler', 'Overloaded',
+    'SessionStore', 'InMemorySessionStore', 'SQLiteSessionStore', 'RedisSessionStore', 'session_store_from_url'
+]
@@ -0,0 +1,45 @@
+"""Command line entry point: ``python -m praisonaiagents.serve package.module:factory --workers 4``."""
+
+import json
+import argparse
+
+from .app import serve
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m praisonaiagents.serve", description="Serve agents from an importable factory")
+    parser.add_argument("factory", help="Agent factory as package.module:name")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes")
+    parser.add_argument("--threads", type=int, default=None, help="Agent threads per worker process")
+    parser.add_argument("--session-store", default=None, help="memory://, sqlite:///path or redis://host:port/db")
+    parser.add_argument("--max-in-flight", type=int, default=32, help="Concurrent requests per worker process")
+    parser.add_argument("--max-queue", type=int, default=64, help="Queued requests per tenant and worker process")
+    parser.add_argument("--queue-timeout", type=float, default=30.0)
+    parser.add_argument("--tenant-weights", type=json.loads, default=None, help='Fair-share weights as JSON, e.g. \'{"acme": 2}\'')
+    parser.add_argument("--tenant-max-in-flight", type=int, default=None, help="Concurrent requests per tenant and worker process")
+    parser.add_argument("--batch-share", type=float, default=0.75, help="Fraction of slots batch requests may hold")
+    parser.add_argument("--no-prewarm", dest="prewarm", action="store_false", help="Report ready without warming agents first")
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args(argv)
+    serve(
+        args.factory,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        session_store=args.session_store,
+        log_level=args.log_level,
+        threads=args.threads,
+        max_in_flight=args.max_in_flight,
+        max_queue=args.max_queue,
+        queue_timeout=args.queue_timeout,
+        tenant_weights=args.tenant_weights,
+        tenant_max_in_flight=args.tenant_max_in_flight,
+        batch_share=args.batch_share,
+        prewarm=args.prewarm
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Admission control for served agents.
+
+A launched endpoint accepts requests faster than the model can answer them.
+:class:`AdmissionController` bounds the work a process takes on:
+
+* at most ``max_in_flight`` requests run at once
+* up to ``max_queue`` more wait for a slot; further requests are rejected
+  immediately with 429 so a load balancer can retry elsewhere
+* a queued request that has not started after ``queue_timeout`` seconds is
+  rejected with 503
+"""
+
+import time
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class Overloaded(Exception):
+    """The server cannot take the request now; ``status_code`` is 429 or 503."""
+
+    def __init__(self, message: str, status_code: int = 503, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class _AdmissionCounters:
+    """Limits and counters shared by the admission policies, and their :meth:`stats`."""
+
+    def __init__(self, max_in_flight: int, max_queue: Optional[int], queue_timeout: Optional[float]):
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "max_in_flight": self.max_in_flight,
+            "max_queue": self.max_queue,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out
+        }
+
+
+class AdmissionController(_AdmissionCounters):
+    """
+    Bound concurrent and queued requests.
+
+    Args:
+        max_in_flight: Requests allowed to run at once
+        max_queue: Requests allowed to wait for a slot; None for no limit
+        queue_timeout: Seconds a request may wait before it is rejected; None to wait forever
+    """
+
+    def __init__(self, max_in_flight: int = 32, max_queue: Optional[int] = 64, queue_timeout: Optional[float] = 30.0):
+        super().__init__(max_in_flight, max_queue, queue_timeout)
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _slots(self) -> asyncio.Semaphore:
+        # Created lazily so the semaphore belongs to the server's event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        return self._semaphore
+
+    @asynccontextmanager
+    async def admit(self):
+        """Hold a slot for the duration of the block, or raise :class:`Overloaded`."""
+        slots = self._slots()
+        if not slots.locked():
+            await slots.acquire()  # a free slot is taken without suspending
+        else:
+            await self._wait_for_slot(slots)
+        self.in_flight += 1
+        self.admitted += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            slots.release()
+
+    async def _wait_for_slot(self, slots: asyncio.Semaphore):
+        if self.max_queue is not None and self.waiting >= self.max_queue:
+            self.rejected += 1
+            raise Overloaded(
+                f"Too many requests: {self.in_flight} running, {self.waiting} queued",
+                status_code=429,
+                retry_after=1
+            )
+        self.waiting += 1
+        started = time.perf_counter()
+        try:
+            if self.queue_timeout is None:
+                await slots.acquire()
+            else:
+                await asyncio.wait_for(slots.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            raise Overloaded(
+                f"Request waited {time.perf_counter() - started:.1f}s without a free slot",
+                status_code=503,
+                retry_after=self.queue_timeout
+            )
+        finally:
+            self.waiting -= 1
@@ -0,0 +1,198 @@
+"""
+FastAPI app construction and multi-process serving (requires ``praisonaiagents[api]``).
+
+``launch()`` runs one uvicorn worker in a background thread, so JSON,
+Rich rendering and tokenization of every request share one GIL. :func:`serve`
+builds the same app from an importable agent factory and runs it in several
+worker processes; each worker calls the factory itself. Point
+``session_store`` at a shared store (``sqlite:///...`` or ``redis://...``) so
+any worker can serve any session.
+
+The factory (``"package.module:name"``) is a callable returning, or a module
+attribute holding, one of:
+
+* an ``Agent`` - served at ``/``
+* a list of agents or a ``PraisonAIAgents`` - served as a chain at ``/agents``
+* a dict mapping paths to either of the above
+
+From the command line::
+
+    python -m praisonaiagents.serve myapp.agents:build --workers 4 --session-store sqlite:///.praison/sessions.db
+
+or under gunicorn, with the same environment variables :func:`serve` sets::
+
+    PRAISONAI_SERVE_FACTORY=myapp.agents:build gunicorn -w 4 -k uvicorn.workers.UvicornWorker \\
+        'praisonaiagents.serve.app:create_app_from_env()'
+"""
+
+import os
+import json
+import logging
+import importlib
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, Optional, Union
+
+from fastapi import FastAPI, HTTPException, Request
+
+from .http import readiness, respond
+from .service import AgentService, ChainService, prewarm_in_background
+from .sessions import SessionStore, session_store_from_url
+
+logger = logging.getLogger(__name__)
+
+FACTORY_ENV = "PRAISONAI_SERVE_FACTORY"
+STORE_ENV = "PRAISONAI_SERVE_SESSION_STORE"
+OPTIONS_ENV = "PRAISONAI_SERVE_OPTIONS"
+
+
+async def _request_data(request: Request) -> Dict[str, Any]:
+    try:
+        data = await request.json()
+    except Exception:
+        # Fallback to form data
+        data = dict(await request.form())
+    if not isinstance(data, dict) or "query" not in data:
+        raise HTTPException(status_code=400, detail="Missing 'query' field in request")
+    return data
+
+
+def add_endpoint(app: FastAPI, path: str, service: AgentService):
+    """Register ``POST path`` answering through ``service`` (JSON, SSE or JSON lines)."""
+
+    @app.post(path)
+    async def handle_query(request: Request):
+        return await respond(service, await _request_data(request), request)
+
+    return handle_query
+
+
+def load_factory(spec: str) -> Callable[[], Any]:
+    """Resolve ``"module:attribute"``; a non-callable attribute is returned by the loader."""
+    module_name, _, attribute = spec.partition(":")
+    if not module_name or not attribute:
+        raise ValueError(f"Agent factory must look like 'package.module:name', got {spec!r}")
+    target = getattr(importlib.import_module(module_name), attribute)
+    return target if callable(target) and not hasattr(target, "chat") else (lambda: target)
+
+
+def build_services(target: Any, store: Optional[SessionStore] = None, **options) -> Dict[str, AgentService]:
+    """Services per path for what an agent factory returned."""
+    if isinstance(target, dict):
+        services = {}
+        for path, value in target.items():
+            path = path if path.startswith("/") else f"/{path}"
+            services[path] = next(iter(build_services(value, store, **options).values()))
+        return services
+    agents = getattr(target, "agents", None)
+    if isinstance(agents, list) and not hasattr(target, "chat"):
+        target = agents
+    if isinstance(target, (list, tuple)):
+        return {"/agents": ChainService(list(target), store=store, **options)}
+    if hasattr(target, "chat"):
+        return {"/": AgentService(target, store=store, **options)}
+    raise TypeError(f"Cannot serve {type(target).__name__}; expected an Agent, a list of agents or PraisonAIAgents")
+
+
+def create_app(
+    target: Any,
+    session_store: Union[SessionStore, str, None] = None,
+    title: str = "PraisonAI Agents API",
+    prewarm: bool = True,
+    **options
+) -> FastAPI:
+    """
+    Build the FastAPI app serving ``target`` (see the module docstring). Extra
+    options (``workers``, ``max_in_flight``, ``max_queue``, ...) go to each service.
+    With ``prewarm``, agents are warmed in the background at startup and
+    ``/ready`` answers 503 until they are; ``/health`` answers as soon as the
+    process is up.
+    """
+    store = session_store if isinstance(session_store, SessionStore) else session_store_from_url(session_store)
+    services = build_services(target, store, **options)
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        if prewarm:
+            prewarm_in_background(services.values())
+        else:
+            for service in services.values():
+                service.mark_ready()
+        yield
+        for service in services.values():
+            service.close()
+        store.close()
+
+    app = FastAPI(title=title, description="API for interacting with PraisonAI Agents", lifespan=lifespan)
+
+    @app.get("/")
+    async def root():
+        return {"message": f"Welcome to {title}. See /docs for usage.", "endpoints": list(services)}
+
+    @app.get("/health")
+    async def healthcheck():
+        return {"status": "ok", "pid": os.getpid(), "endpoints": list(services), "load": {p: s.stats() for p, s in services.items()}}
+
+    @app.get("/ready")
+    async def ready():
+        return readiness(services.values())
+
+    for path, service in services.items():
+        add_endpoint(app, path, service)
+
+    app.state.services = services
+    return app
+
+
+def create_app_from_env() -> FastAPI:
+    """App for one worker process, configured by the environment :func:`serve` sets."""
+    spec = os.environ.get(FACTORY_ENV)
+    if not spec:
+        raise RuntimeError(f"{FACTORY_ENV} is not set; expected 'package.module:name'")
+    options = json.loads(os.environ.get(OPTIONS_ENV) or "{}")
+    return create_app(load_factory(spec)(), session_store=os.environ.get(STORE_ENV) or None, **options)
+
+
+def serve(
+    factory: str,
+    host: str = "0.0.0.0",
+    port: int = 8000,
+    workers: int = 1,
+    session_store: Optional[str] = None,
+    log_level: str = "info",
+    **options
+):
+    """
+    Serve the agents returned by ``factory`` with ``workers`` uvicorn processes.
+    Workers are spawned, so call this under ``if __name__ == "__main__":``.
+
+    Args:
+        factory: ``"package.module:name"`` of the agent factory, importable by every worker
+        host: Bind address
+        port: Bind port
+        workers: Worker processes; use about one per core
+        session_store: Shared session store URL (``sqlite:///path`` or ``redis://...``);
+            with several workers a memory store only sees the sessions of its own process
+        log_level: uvicorn log level
+        **options: AgentService options (``workers`` is named ``threads`` here, ``max_in_flight``, ...)
+    """
+    import uvicorn
+
+    if "threads" in options:
+        options["workers"] = options.pop("threads")
+    load_factory(factory)  # fail fast on a bad spec before starting workers
+    if workers > 1 and not session_store:
+        logger.warning("Serving with several workers and an in-memory session store; sessions will not be shared")
+    os.environ[FACTORY_ENV] = factory
+    os.environ[OPTIONS_ENV] = json.dumps(options)
+    if session_store:
+        os.environ[STORE_ENV] = session_store
+    else:
+        os.environ.pop(STORE_ENV, None)
+    uvicorn.run(
+        "praisonaiagents.serve.app:create_app_from_env",
+        factory=True,
+        host=host,
+        port=port,
+        workers=workers,
+        log_level=log_level
+    )
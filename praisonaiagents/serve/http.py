@@ -0,0 +1,79 @@
+"""
+FastAPI glue for served agents (requires ``praisonaiagents[api]``).
+
+:func:`respond` turns a request body into the endpoint's response: JSON by
+default, or a stream of events when the body has ``"stream": true`` or the
+client sends ``Accept: text/event-stream`` (SSE) / ``application/x-ndjson``
+(one JSON object per line). Overload maps to 429/503 with ``Retry-After``.
+
+``/health`` is liveness (the process answers); :func:`readiness` backs
+``/ready``, which returns 503 until every service has been prewarmed.
+"""
+
+import logging
+from typing import Any, Dict, Iterable, Optional
+
+from fastapi import Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from ..streaming import format_ndjson, format_sse
+from .admission import Overloaded
+
+logger = logging.getLogger(__name__)
+
+SSE = "text/event-stream"
+NDJSON = "application/x-ndjson"
+
+
+def stream_format(request: Request, payload: Dict[str, Any]) -> Optional[str]:
+    """Media type of the streamed response the client asked for, or None for plain JSON."""
+    accept = request.headers.get("accept", "")
+    if NDJSON in accept or payload.get("format") == "ndjson":
+        return NDJSON
+    if SSE in accept or payload.get("stream"):
+        return SSE
+    return None
+
+
+def overloaded_response(error: Overloaded) -> JSONResponse:
+    headers = {"Retry-After": str(int(error.retry_after))} if error.retry_after else None
+    return JSONResponse(status_code=error.status_code, content={"error": str(error)}, headers=headers)
+
+
+def readiness(services: Iterable) -> JSONResponse:
+    """200 once every service is ready, else 503 listing the ones still warming."""
+    warming = [service.namespace for service in services if not service.ready]
+    if warming:
+        return JSONResponse(status_code=503, content={"status": "warming", "warming": warming}, headers={"Retry-After": "1"})
+    return JSONResponse(content={"status": "ready"})
+
+
+async def respond(service, payload: Dict[str, Any], request: Request):
+    """Run one request through ``service`` and build the HTTP response."""
+    media_type = stream_format(request, payload)
+    try:
+        if media_type is None:
+            return await service.handle(payload, request)
+        query, session_id = service.parse(payload)
+        events = service.stream(query, session_id, **service.ticket(payload, request))
+        # Wait for admission before committing to a 200 streaming response
+        first = await events.__anext__()
+    except Overloaded as e:
+        return overloaded_response(e)
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
+    except Exception as e:
+        logger.error(f"Error processing query: {str(e)}", exc_info=True)
+        return JSONResponse(status_code=500, content={"error": f"Error processing query: {str(e)}"})
+
+    encode = format_sse if media_type == SSE else format_ndjson
+
+    async def body():
+        yield encode(first)
+        try:
+            async for event in events:
+                yield encode(event)
+        finally:
+            await events.aclose()
+
+    return StreamingResponse(body(), media_type=media_type, headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
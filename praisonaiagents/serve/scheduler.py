@@ -0,0 +1,230 @@
+"""
+Fair scheduling of served requests across tenants.
+
+:class:`AdmissionController` admits requests first come, first served, so a
+tenant that submits a large batch delays everyone queued behind it.
+:class:`FairScheduler` keeps one queue per tenant (the request's ``tenant``
+or ``user_id``) and priority class, and hands out free slots:
+
+* ``interactive`` requests before ``batch`` ones; batch work may hold at most
+  ``batch_share`` of the slots, so interactive requests always find capacity
+  within one request's run time
+* within a class, across tenants by weighted fair share (stride scheduling:
+  a tenant with weight 2 gets twice the slots of a tenant with weight 1
+  while both have work queued)
+* never more than ``tenant_max_in_flight`` running requests per tenant
+
+``max_queue`` bounds each tenant's queue, so one tenant's backlog cannot
+fill the queue for others.
+"""
+
+import time
+import asyncio
+import logging
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from .admission import Overloaded, _AdmissionCounters
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = "interactive"
+BATCH = "batch"
+PRIORITIES = (INTERACTIVE, BATCH)
+DEFAULT_TENANT = "default"
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class _Tenant:
+    __slots__ = ("name", "weight", "queues", "in_flight", "pass_value")
+
+    def __init__(self, name: str, weight: float, pass_value: float):
+        self.name = name
+        self.weight = weight
+        self.queues: Dict[str, Deque[Tuple[asyncio.Future, float]]] = {p: deque() for p in PRIORITIES}
+        self.in_flight = 0
+        self.pass_value = pass_value
+
+    def waiting(self) -> int:
+        return sum(len(q) for q in self.queues.values())
+
+
+class FairScheduler(_AdmissionCounters):
+    """
+    Admission control with per-tenant queues, weighted fair share and priority classes.
+
+    Args:
+        max_in_flight: Requests allowed to run at once
+        max_queue: Requests allowed to wait per tenant; None for no limit
+        queue_timeout: Seconds a request may wait before it is rejected; None to wait forever
+        tenant_weights: Share weight per tenant; others get ``default_weight``
+        default_weight: Weight of tenants missing from ``tenant_weights``
+        tenant_max_in_flight: Running requests allowed per tenant; None for no cap
+        batch_share: Fraction of ``max_in_flight`` batch requests may hold
+        window: Recent admissions kept per class for wait-time percentiles
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = 32,
+        max_queue: Optional[int] = 64,
+        queue_timeout: Optional[float] = 30.0,
+        tenant_weights: Optional[Dict[str, float]] = None,
+        default_weight: float = 1.0,
+        tenant_max_in_flight: Optional[int] = None,
+        batch_share: float = 0.75,
+        window: int = 1000
+    ):
+        super().__init__(max_in_flight, max_queue, queue_timeout)
+        self.tenant_weights = dict(tenant_weights or {})
+        self.default_weight = default_weight
+        self.tenant_max_in_flight = tenant_max_in_flight
+        self.batch_limit = max(1, int(max_in_flight * batch_share))
+        self.batch_in_flight = 0
+        self._tenants: Dict[str, _Tenant] = {}  # tenants with queued or running requests
+        self._clock = 0.0  # pass value of the latest admission
+        self._waits: Dict[str, Deque[float]] = {p: deque(maxlen=window) for p in PRIORITIES}
+        self._admitted: Dict[str, int] = {p: 0 for p in PRIORITIES}
+
+    # ------------------------------------------------------------------ #
+    #   Admission
+    # ------------------------------------------------------------------ #
+    @asynccontextmanager
+    async def admit(self, tenant: Optional[str] = None, priority: Optional[str] = None):
+        """Hold a slot for the duration of the block, or raise :class:`Overloaded`."""
+        priority = priority or INTERACTIVE
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority {priority!r}; expected one of {', '.join(PRIORITIES)}")
+        state = self._tenant(tenant or DEFAULT_TENANT)
+        if self._can_start(state, priority):
+            self._start(state, priority, 0.0)
+        else:
+            await self._wait_for_turn(state, priority)
+        try:
+            yield
+        finally:
+            self._finish(state, priority)
+
+    def _tenant(self, name: str) -> _Tenant:
+        state = self._tenants.get(name)
+        if state is None:
+            # A tenant returning from idle starts at the current clock, without credit for its idle time
+            weight = self.tenant_weights.get(name, self.default_weight)
+            state = self._tenants[name] = _Tenant(name, weight, self._clock)
+        return state
+
+    def _can_start(self, state: _Tenant, priority: str) -> bool:
+        if self.in_flight >= self.max_in_flight:
+            return False
+        if priority == BATCH and self.batch_in_flight >= self.batch_limit:
+            return False
+        return self.tenant_max_in_flight is None or state.in_flight < self.tenant_max_in_flight
+
+    def _start(self, state: _Tenant, priority: str, waited: float):
+        self.in_flight += 1
+        self.admitted += 1
+        state.in_flight += 1
+        if priority == BATCH:
+            self.batch_in_flight += 1
+        self._clock = max(self._clock, state.pass_value)
+        state.pass_value += 1.0 / state.weight
+        self._admitted[priority] += 1
+        self._waits[priority].append(waited)
+
+    def _finish(self, state: _Tenant, priority: str):
+        self.in_flight -= 1
+        state.in_flight -= 1
+        if priority == BATCH:
+            self.batch_in_flight -= 1
+        self._forget_if_idle(state)
+        self._dispatch()
+
+    def _forget_if_idle(self, state: _Tenant):
+        if not state.in_flight and not state.waiting():
+            self._tenants.pop(state.name, None)
+
+    async def _wait_for_turn(self, state: _Tenant, priority: str):
+        queue = state.queues[priority]
+        if self.max_queue is not None and state.waiting() >= self.max_queue:
+            self.rejected += 1
+            self._forget_if_idle(state)
+            raise Overloaded(
+                f"Too many requests for tenant {state.name!r}: {state.in_flight} running, {state.waiting()} queued",
+                status_code=429,
+                retry_after=1
+            )
+        entry = (asyncio.get_running_loop().create_future(), time.perf_counter())
+        queue.append(entry)
+        self.waiting += 1
+        try:
+            if self.queue_timeout is None:
+                await entry[0]
+            else:
+                await asyncio.wait_for(entry[0], self.queue_timeout)
+        except BaseException as e:
+            if entry[0].done() and not entry[0].cancelled():
+                # The slot was granted as the wait was abandoned; hand it on
+                self._finish(state, priority)
+            else:
+                queue.remove(entry)
+                self._forget_if_idle(state)
+            if isinstance(e, asyncio.TimeoutError):
+                self.timed_out += 1
+                raise Overloaded(
+                    f"Request waited {time.perf_counter() - entry[1]:.1f}s without a free slot",
+                    status_code=503,
+                    retry_after=self.queue_timeout
+                )
+            raise
+        finally:
+            self.waiting -= 1
+
+    def _dispatch(self):
+        """Grant free slots to waiting requests: interactive first, then by lowest pass value."""
+        while self.in_flight < self.max_in_flight:
+            picked = self._pick(INTERACTIVE) or self._pick(BATCH)
+            if picked is None:
+                return
+            state, priority = picked
+            future, enqueued = state.queues[priority].popleft()
+            self._start(state, priority, time.perf_counter() - enqueued)
+            future.set_result(None)
+
+    def _pick(self, priority: str) -> Optional[Tuple[_Tenant, str]]:
+        best = None
+        for state in self._tenants.values():
+            if state.queues[priority] and self._can_start(state, priority):
+                if best is None or state.pass_value < best.pass_value:
+                    best = state
+        return (best, priority) if best is not None else None
+
+    # ------------------------------------------------------------------ #
+    #   Metrics
+    # ------------------------------------------------------------------ #
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        stats["batch_in_flight"] = self.batch_in_flight
+        stats["wait_ms"] = {
+            priority: {
+                "admitted": self._admitted[priority],
+                "p50": round(_percentile(list(waits), 0.5) * 1000, 1),
+                "p99": round(_percentile(list(waits), 0.99) * 1000, 1),
+                "max": round(max(waits, default=0.0) * 1000, 1)
+            }
+            for priority, waits in self._waits.items()
+        }
+        stats["tenants"] = {
+            name: {
+                "in_flight": state.in_flight,
+                **{f"queued_{priority}": len(queue) for priority, queue in state.queues.items()}
+            }
+            for name, state in self._tenants.items()
+        }
+        return stats
@@ -0,0 +1,292 @@
+"""
+Request handling for a served agent.
+
+:class:`AgentService` is what an HTTP endpoint calls for each request. It
+isolates conversations (every request runs on its own shallow copy of the
+agent, with the history of its ``session_id`` or an empty one), serializes
+requests of the same session, runs sync ``chat`` on a dedicated worker pool
+(or, with ``use_async``, ``achat`` on the event loop), and schedules requests fairly across
+tenants (see :mod:`.scheduler`).
+
+The tenant of a request picks its fair-share queue and its response-cache
+partition. By default it is read from the ``tenant`` (or ``user_id``) field of
+the request body, which the caller controls: expose the service behind a
+trusted proxy that sets that field, or pass ``tenant_resolver`` to derive the
+tenant from the request itself (e.g. an authenticated header). The
+``"default_user"`` placeholder of a Session without a user_id never counts as
+a tenant.
+"""
+
+import time
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import aclosing, asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Optional, Tuple
+
+from ..agent.response_cache import UNSCOPED
+from ..streaming import Event, aiter_events, emit
+from .scheduler import FairScheduler
+from .sessions import InMemorySessionStore, SessionStore
+
+logger = logging.getLogger(__name__)
+
+# user_id a Session sends when none was given; it identifies no caller
+ANONYMOUS_USER_ID = "default_user"
+
+
+class AgentService:
+    """
+    Serve one agent to concurrent callers.
+
+    Args:
+        agent: The agent to serve; it is never mutated by requests
+        store: Conversation store for requests with a ``session_id``
+        workers: Threads for sync ``chat`` calls (defaults to ``max_in_flight``)
+        max_in_flight: Requests running at once
+        max_queue: Requests per tenant waiting for a slot before new ones get 429
+        queue_timeout: Seconds a request may wait before it gets 503
+        use_async: Call ``achat`` on the event loop instead of ``chat`` in a thread.
+            Off by default: the OpenAI path of ``Agent.achat`` neither records chat
+            history (so sessions lose turns) nor applies guardrails
+        tenant_weights: Fair-share weight per tenant (default 1 each)
+        tenant_max_in_flight: Requests running at once per tenant; None for no cap
+        batch_share: Fraction of ``max_in_flight`` requests with ``"priority": "batch"`` may hold
+        tenant_resolver: ``(payload, request) -> tenant`` used instead of the body's
+            ``tenant``/``user_id`` fields; ``request`` is the HTTP request, or None
+            when :meth:`handle` is called directly
+    """
+
+    def __init__(
+        self,
+        agent,
+        store: Optional[SessionStore] = None,
+        workers: Optional[int] = None,
+        max_in_flight: int = 32,
+        max_queue: Optional[int] = 64,
+        queue_timeout: Optional[float] = 30.0,
+        use_async: bool = False,
+        tenant_weights: Optional[Dict[str, float]] = None,
+        tenant_max_in_flight: Optional[int] = None,
+        batch_share: float = 0.75,
+        tenant_resolver: Optional[Callable[[Dict[str, Any], Any], Optional[str]]] = None
+    ):
+        self.agent = agent
+        self.agents = [agent]
+        self.namespace = agent.name
+        self.ready = False  # set by prewarm(), or mark_ready() when skipping it
+        self.prewarm_report: Dict[str, Any] = {}
+        self.store = store or InMemorySessionStore()
+        self.admission = FairScheduler(
+            max_in_flight,
+            max_queue,
+            queue_timeout,
+            tenant_weights=tenant_weights,
+            tenant_max_in_flight=tenant_max_in_flight,
+            batch_share=batch_share
+        )
+        self.executor = ThreadPoolExecutor(max_workers=workers or max_in_flight, thread_name_prefix="serve")
+        self.use_async = use_async
+        self.tenant_resolver = tenant_resolver
+        self._session_locks: Dict[str, asyncio.Lock] = {}
+        self._session_users: Dict[str, int] = {}
+
+    def isolated_agent(self, history):
+        """A shallow copy of the agent with its own chat history."""
+        return self.agent.clone(history)
+
+    def run(self, agent, query: str) -> Any:
+        """Answer ``query`` synchronously with an isolated agent."""
+        return agent.chat(query)
+
+    async def _call(self, agent, query: str) -> Any:
+        if self.use_async:
+            return await agent.achat(query)
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self.executor, self.run, agent, query)
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            # The thread cannot be stopped; keep the admission slot until it ends
+            await asyncio.wait({future})
+            raise
+
+    async def _lock_session(self, session_id: str) -> asyncio.Lock:
+        lock = self._session_locks.setdefault(session_id, asyncio.Lock())
+        self._session_users[session_id] = self._session_users.get(session_id, 0) + 1
+        try:
+            await lock.acquire()
+        except BaseException:
+            self._release_session(session_id)
+            raise
+        return lock
+
+    def _unlock_session(self, session_id: str, lock: asyncio.Lock):
+        lock.release()
+        self._release_session(session_id)
+
+    def _release_session(self, session_id: str):
+        self._session_users[session_id] -= 1
+        if not self._session_users[session_id]:
+            del self._session_users[session_id]
+            del self._session_locks[session_id]
+
+    @asynccontextmanager
+    async def conversation(self, session_id: Optional[str] = None, tenant: Optional[str] = None, priority: Optional[str] = None):
+        """
+        Admit a request and yield its isolated agent; the session's history is
+        saved when the block finishes without error.
+        """
+        async with self.admission.admit(tenant, priority):
+            if session_id is None:
+                yield self._scoped(self.isolated_agent([]), tenant)
+                return
+            loop = asyncio.get_running_loop()
+            lock = await self._lock_session(session_id)
+            try:
+                history = await loop.run_in_executor(self.executor, self.store.load, self.namespace, session_id)
+                agent = self._scoped(self.isolated_agent(history), tenant)
+                yield agent
+                await loop.run_in_executor(self.executor, self.store.save, self.namespace, session_id, agent.chat_history)
+            finally:
+                self._unlock_session(session_id, lock)
+
+    @staticmethod
+    def _scoped(agent, tenant: Optional[str]):
+        """Partition response caches by tenant; without one nothing is cached, as callers cannot be told apart."""
+        for member in agent if isinstance(agent, list) else [agent]:
+            member.cache_scope = tenant or UNSCOPED
+        return agent
+
+    async def chat(self, query: str, session_id: Optional[str] = None, tenant: Optional[str] = None, priority: Optional[str] = None) -> Any:
+        """Answer ``query`` within the conversation of ``session_id`` (a fresh one when None)."""
+        async with self.conversation(session_id, tenant, priority) as agent:
+            return await self._call(agent, query)
+
+    async def stream(self, query: str, session_id: Optional[str] = None, tenant: Optional[str] = None, priority: Optional[str] = None) -> AsyncIterator[Event]:
+        """
+        Yield the events of answering ``query`` (see praisonaiagents.streaming).
+        A ``start`` event is sent as soon as the request is admitted. Streaming
+        always runs the sync ``chat``, which streams for every provider.
+        """
+        async with self.conversation(session_id, tenant, priority) as agent:
+            yield {"type": "start", "agent": self.namespace, "session_id": session_id}
+            # aclosing: a disconnect waits for the worker before the slot is released
+            async with aclosing(aiter_events(self.run, agent, query, executor=self.executor)) as events:
+                async for event in events:
+                    yield event
+
+    @staticmethod
+    def parse(payload: Dict[str, Any]) -> Tuple[str, Optional[str]]:
+        """``query`` and optional ``session_id`` of a request body."""
+        query = payload.get("query")
+        if not query:
+            raise ValueError("Missing 'query' field in request")
+        session_id = payload.get("session_id")
+        return query, str(session_id) if session_id is not None else None
+
+    def ticket(self, payload: Dict[str, Any], request: Any = None) -> Dict[str, Optional[str]]:
+        """
+        Scheduling fields of a request: the tenant (from ``tenant_resolver``,
+        else the body's ``tenant`` or ``user_id``) and the body's ``priority``.
+        """
+        if self.tenant_resolver is not None:
+            tenant = self.tenant_resolver(payload, request)
+        else:
+            tenant = payload.get("tenant") or payload.get("user_id")
+        if tenant == ANONYMOUS_USER_ID:
+            tenant = None
+        return {"tenant": str(tenant) if tenant is not None else None, "priority": payload.get("priority")}
+
+    async def handle(self, payload: Dict[str, Any], request: Any = None) -> Dict[str, Any]:
+        """Handle a request body with ``query`` and optional ``session_id``, ``tenant`` and ``priority``."""
+        query, session_id = self.parse(payload)
+        response = await self.chat(query, session_id, **self.ticket(payload, request))
+        result = {"response": response}
+        if session_id is not None:
+            result["session_id"] = session_id
+        return result
+
+    def prewarm(self, connect: bool = True) -> Dict[str, Any]:
+        """
+        Run ``prewarm()`` of every served agent (blocking) and mark the service
+        ready. Failures are reported, not raised: a cold agent still answers.
+        """
+        started = time.perf_counter()
+        for agent in self.agents:
+            warm = getattr(agent, "prewarm", None)
+            if warm is not None:
+                self.prewarm_report[agent.name] = warm(connect=connect)
+        self.prewarm_report["total_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        logger.info(f"Prewarmed {self.namespace} in {self.prewarm_report['total_ms']}ms: {self.prewarm_report}")
+        self.mark_ready()
+        return self.prewarm_report
+
+    def mark_ready(self):
+        self.ready = True
+
+    def stats(self) -> Dict[str, Any]:
+        caches = {agent.name: agent.response_cache.stats() for agent in self.agents if getattr(agent, "response_cache", None)}
+        return {"agent": self.namespace, "async": self.use_async, "ready": self.ready, "response_cache": caches, "sessions_active": len(self._session_locks), **self.admission.stats()}
+
+    def close(self):
+        self.executor.shutdown(wait=False)
+        self.store.close()
+
+
+class ChainService(AgentService):
+    """
+    Serve agents that answer in turn, each given the previous agent's response
+    (the multi-agent ``launch`` endpoint). Every request runs on fresh copies
+    of the agents; ``session_id`` is not used.
+    """
+
+    def __init__(self, agents, **options):
+        super().__init__(agents[0], **options)
+        self.agents = agents
+        self.namespace = ",".join(agent.name for agent in agents)
+
+    def isolated_agent(self, history):
+        return [agent.clone() for agent in self.agents]
+
+    def run(self, agents, query: str) -> Dict[str, Any]:
+        current_input = query
+        results = []
+        for agent in agents:
+            try:
+                response = agent.chat(current_input)
+            except Exception as e:
+                logger.error(f"Error with agent {agent.name}: {str(e)}", exc_info=True)
+                results.append({"agent": agent.name, "error": str(e)})
+                emit("agent_completed", agent=agent.name, error=str(e))
+                continue
+            results.append({"agent": agent.name, "response": response})
+            emit("agent_completed", agent=agent.name, output=response)
+            # Use this response as input to the next agent
+            current_input = response
+        return {"query": query, "results": results, "final_response": current_input}
+
+    @staticmethod
+    def parse(payload: Dict[str, Any]) -> Tuple[str, Optional[str]]:
+        query, _ = AgentService.parse(payload)
+        return query, None
+
+    async def handle(self, payload: Dict[str, Any], request: Any = None) -> Dict[str, Any]:
+        query, _ = self.parse(payload)
+        return await self.chat(query, **self.ticket(payload, request))
+
+
+def prewarm_in_background(services: Iterable[AgentService], connect: bool = True) -> threading.Thread:
+    """Prewarm ``services`` one after another in a daemon thread, so the server is live while it warms."""
+    def run():
+        for service in list(services):
+            try:
+                service.prewarm(connect=connect)
+            except Exception as e:
+                logger.error(f"Prewarm of {service.namespace} failed: {e}", exc_info=True)
+                service.mark_ready()
+
+    thread = threading.Thread(target=run, daemon=True, name="prewarm")
+    thread.start()
+    return thread
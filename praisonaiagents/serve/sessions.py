@@ -0,0 +1,223 @@
+"""
+Conversation state for served agents.
+
+A served agent must not keep one ``chat_history`` for every caller. Each
+request runs on a shallow copy of the agent whose history is either empty
+(no ``session_id``) or loaded from a :class:`SessionStore` and saved back
+when the request finishes. Stores only hold message lists, so any store can
+back any agent:
+
+* :class:`InMemorySessionStore` - one process (the ``launch`` default)
+* :class:`SQLiteSessionStore` - shared by every worker process on one machine
+* :class:`RedisSessionStore` - shared across machines; any client with the
+  redis-py ``get``/``set``/``delete`` interface works
+
+With a shared store any worker can serve any session. Requests of one
+session are serialized within a process; across processes the last save wins.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import threading
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+Messages = List[Dict[str, Any]]
+
+
+class SessionStore:
+    """Interface for conversation stores, keyed by ``(namespace, session_id)``."""
+
+    def load(self, namespace: str, session_id: str) -> Messages:
+        """The session's messages; an empty list for unknown sessions."""
+        raise NotImplementedError
+
+    def save(self, namespace: str, session_id: str, messages: Messages):
+        raise NotImplementedError
+
+    def delete(self, namespace: str, session_id: str):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+def _trim(messages: Messages, max_messages: Optional[int]) -> Messages:
+    return messages[-max_messages:] if max_messages is not None else messages
+
+
+class InMemorySessionStore(SessionStore):
+    """
+    Process-local store with LRU eviction and idle expiry.
+
+    Args:
+        max_sessions: Sessions kept; the least recently used is evicted first
+        ttl: Seconds a session may stay idle before it expires; None to keep it
+        max_messages: Messages kept per session (oldest dropped); None for all
+    """
+
+    def __init__(self, max_sessions: int = 10_000, ttl: Optional[float] = 3600.0, max_messages: Optional[int] = 200):
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.max_messages = max_messages
+        self._sessions: "OrderedDict[Tuple[str, str], Tuple[float, Messages]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def load(self, namespace: str, session_id: str) -> Messages:
+        key = (namespace, session_id)
+        with self._lock:
+            entry = self._sessions.get(key)
+            if entry is None:
+                return []
+            touched, messages = entry
+            if self.ttl is not None and time.time() - touched > self.ttl:
+                del self._sessions[key]
+                return []
+            self._sessions.move_to_end(key)
+            return list(messages)
+
+    def save(self, namespace: str, session_id: str, messages: Messages):
+        messages = _trim(messages, self.max_messages)
+        key = (namespace, session_id)
+        with self._lock:
+            self._sessions[key] = (time.time(), list(messages))
+            self._sessions.move_to_end(key)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+
+    def delete(self, namespace: str, session_id: str):
+        with self._lock:
+            self._sessions.pop((namespace, session_id), None)
+
+    def __len__(self):
+        return len(self._sessions)
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    Store sessions in one SQLite file (WAL mode), shared by every process that opens it.
+
+    Args:
+        path: Database file
+        ttl: Seconds a session may stay idle before it expires; None to keep it
+        max_messages: Messages kept per session (oldest dropped); None for all
+    """
+
+    PURGE_EVERY = 500  # saves between sweeps of expired sessions
+
+    def __init__(self, path: str = os.path.join(".praison", "sessions.db"), ttl: Optional[float] = 3600.0, max_messages: Optional[int] = 200):
+        self.path = path
+        self.ttl = ttl
+        self.max_messages = max_messages
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._saves = 0
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+        CREATE TABLE IF NOT EXISTS sessions (
+            namespace TEXT NOT NULL,
+            session_id TEXT NOT NULL,
+            messages TEXT NOT NULL,
+            updated_at REAL NOT NULL,
+            PRIMARY KEY (namespace, session_id)
+        )
+        """)
+        self._conn.commit()
+
+    def load(self, namespace: str, session_id: str) -> Messages:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT messages, updated_at FROM sessions WHERE namespace = ? AND session_id = ?",
+                (namespace, session_id)
+            ).fetchone()
+        if row is None or (self.ttl is not None and time.time() - row[1] > self.ttl):
+            return []
+        return json.loads(row[0])
+
+    def save(self, namespace: str, session_id: str, messages: Messages):
+        data = json.dumps(_trim(messages, self.max_messages), ensure_ascii=False, default=str)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sessions (namespace, session_id, messages, updated_at) VALUES (?, ?, ?, ?)",
+                (namespace, session_id, data, time.time())
+            )
+            self._saves += 1
+            if self.ttl is not None and self._saves % self.PURGE_EVERY == 0:
+                self._conn.execute("DELETE FROM sessions WHERE updated_at < ?", (time.time() - self.ttl,))
+            self._conn.commit()
+
+    def delete(self, namespace: str, session_id: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM sessions WHERE namespace = ? AND session_id = ?", (namespace, session_id))
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class RedisSessionStore(SessionStore):
+    """
+    Store sessions in Redis (or any server speaking its protocol) with expiry.
+
+    Args:
+        client: A client with redis-py's ``get``/``set(ex=)``/``delete``; created from ``url`` when None
+        url: Server URL used when no client is given
+        prefix: Key prefix; keys are ``<prefix><namespace>:<session_id>``
+        ttl: Seconds a session may stay idle before it expires; None to keep it
+        max_messages: Messages kept per session (oldest dropped); None for all
+    """
+
+    def __init__(self, client=None, url: str = "redis://localhost:6379/0", prefix: str = "praison:session:", ttl: Optional[float] = 3600.0, max_messages: Optional[int] = 200):
+        if client is None:
+            try:
+                import redis
+            except ImportError:
+                raise ImportError(
+                    "Redis session store requires the redis package. "
+                    "Please install with: pip install redis"
+                )
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.prefix = prefix
+        self.ttl = ttl
+        self.max_messages = max_messages
+
+    def _key(self, namespace: str, session_id: str) -> str:
+        return f"{self.prefix}{namespace}:{session_id}"
+
+    def load(self, namespace: str, session_id: str) -> Messages:
+        data = self.client.get(self._key(namespace, session_id))
+        return json.loads(data) if data else []
+
+    def save(self, namespace: str, session_id: str, messages: Messages):
+        data = json.dumps(_trim(messages, self.max_messages), ensure_ascii=False, default=str)
+        self.client.set(self._key(namespace, session_id), data, ex=int(self.ttl) if self.ttl else None)
+
+    def delete(self, namespace: str, session_id: str):
+        self.client.delete(self._key(namespace, session_id))
+
+    def close(self):
+        close = getattr(self.client, "close", None)
+        if close is not None:
+            close()
+
+
+def session_store_from_url(url: Optional[str], **options) -> SessionStore:
+    """
+    Build a store from a URL: ``memory://``, ``sqlite:///path/to/sessions.db``
+    or ``redis://host:port/db`` (also ``rediss://``). None gives a memory store.
+    """
+    if not url or url.startswith("memory:"):
+        return InMemorySessionStore(**options)
+    if url.startswith("sqlite:///"):
+        return SQLiteSessionStore(url[len("sqlite:///"):], **options)
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisSessionStore(url=url, **options)
+    raise ValueError(f"Unsupported session store URL: {url}")
@@ -7,17 +7,75 @@ session API for developers building stateful agent applications.
 
 import os
 import uuid
-import requests
 import json
 import time
-from typing import Any, Dict, List, Optional
+import atexit
+import asyncio
+import weakref
+import threading
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+import httpx
 from .agent import Agent
 from .memory import Memory
+from .memory.client_manager import VectorStoreManager
 from .knowledge import Knowledge
     # Praison AI: Enhanced security with input validation
     # Praison AI: Enhanced user experience with better error messages
     # Praison AI: Enhanced security with input validation
 
+NDJSON = "application/x-ndjson"
+
+# Remote sessions share keep-alive connection pools per host: one sync client
+# per process and one async client per event loop
+_clients_lock = threading.Lock()
+_sync_clients: Dict[Tuple[str, float, int], httpx.Client] = {}
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple[str, float, int], httpx.AsyncClient]]" = weakref.WeakKeyDictionary()
+_health_checks: Dict[str, float] = {}  # agent_url -> time of the last successful probe
+
+
+def _client_options(timeout: float, max_connections: int) -> Dict[str, Any]:
+    return {
+        "timeout": httpx.Timeout(timeout),
+        "limits": httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections, keepalive_expiry=60),
+        "headers": {"Content-Type": "application/json"}
+    }
+
+
+def _pool_key(url: str, timeout: float, max_connections: int) -> Tuple[str, float, int]:
+    parsed = httpx.URL(url)
+    return (f"{parsed.scheme}://{parsed.host}:{parsed.port}", timeout, max_connections)
+
+
+def _sync_client(url: str, timeout: float, max_connections: int) -> httpx.Client:
+    key = _pool_key(url, timeout, max_connections)
+    client = _sync_clients.get(key)
+    if client is None:
+        with _clients_lock:
+            client = _sync_clients.get(key)
+            if client is None:
+                client = _sync_clients[key] = httpx.Client(**_client_options(timeout, max_connections))
+    return client
+
+
+def _async_client(url: str, timeout: float, max_connections: int) -> httpx.AsyncClient:
+    # Async connections belong to the loop that opened them
+    clients = _async_clients.setdefault(asyncio.get_running_loop(), {})
+    key = _pool_key(url, timeout, max_connections)
+    client = clients.get(key)
+    if client is None:
+        client = clients[key] = httpx.AsyncClient(**_client_options(timeout, max_connections))
+    return client
+
+
+@atexit.register
+def close_remote_clients():
+    """Close the pooled connections to remote agents."""
+    with _clients_lock:
+        for client in _sync_clients.values():
+            client.close()
+        _sync_clients.clear()
+
 
 class Session:
     """
@@ -38,11 +96,15 @@ class Session:
         # Remote agent session (similar to Google ADK)
         session = Session(agent_url="192.168.1.10:8000/agent")
         response = session.chat("Hello from remote client!")
+        for event in session.stream("Tell me more"):
+            print(event.get("delta", ""), end="")
         
         # Save session state
         session.save_state({"conversation_topic": "AI research"})
     """
 
+    HEALTH_TTL = 30.0  # seconds a successful check_connection() is cached
+
     def __init__(
         self, 
         session_id: Optional[str] = None,
@@ -50,7 +112,8 @@ class Session:
         agent_url: Optional[str] = None,
         memory_config: Optional[Dict[str, Any]] = None,
         knowledge_config: Optional[Dict[str, Any]] = None,
-        timeout: int = 30
+        timeout: int = 30,
+        max_connections: int = 100
     ):
         """
         Initialize a new session with optional persistence or remote agent connectivity.
@@ -62,11 +125,15 @@ class Session:
             memory_config: Configuration for memory system (defaults to RAG)
             knowledge_config: Configuration for knowledge base system  
             timeout: HTTP timeout for remote agent calls (default: 30 seconds)
+            max_connections: Keep-alive connections per remote host, shared by
+                all sessions with the same timeout and limit (default: 100)
         """
         self.session_id = session_id or str(uuid.uuid4())[:8]
         self.user_id = user_id or "default_user"
+        self._user_id_given = bool(user_id)
         self.agent_url = agent_url
         self.timeout = timeout
+        self.max_connections = max_connections
         self.is_remote = agent_url is not None
 
         # Validate agent_url format
@@ -74,22 +141,39 @@ class Session:
             if not self.agent_url.startswith(('http://', 'https://')):
                 # Assume http if no protocol specified
                 self.agent_url = f"http://{self.agent_url}"
-            # Test connectivity to remote agent
-            self._test_remote_connection()
+            # Connectivity is not probed here; see check_connection()
 
         # Initialize memory with sensible defaults (only for local sessions)
         if not self.is_remote:
-            default_memory_config = {
-                "provider": "rag",
-                "use_embedding": True,
-                "rag_db_path": f".praison/sessions/{self.session_id}/chroma_db"
-            }
+            # Sessions share one pooled vector store and get their own collection.
+            # A session created before pooling keeps its own store so its memory
+            # is not orphaned.
+            collection_name = VectorStoreManager.namespace("session", self.session_id)
+            legacy_path = f".praison/sessions/{self.session_id}/chroma_db"
+            if os.path.isdir(legacy_path):
+                default_memory_config = {
+                    "provider": "rag",
+                    "use_embedding": True,
+                    "rag_db_path": legacy_path
+                }
+            else:
+                default_memory_config = {
+                    "provider": "rag",
+                    "use_embedding": True,
+                    "rag_db_path": ".praison/sessions/chroma_db",
+                    "collection_name": collection_name
+                }
             if memory_config:
                 default_memory_config.update(memory_config)
             self.memory_config = default_memory_config
 
             # Initialize knowledge with session-specific config
-            default_knowledge_config = knowledge_config or {}
+            default_knowledge_config = dict(knowledge_config or {})
+            vector_store = dict(default_knowledge_config.get("vector_store", {}))
+            vector_store_config = dict(vector_store.get("config", {}))
+            vector_store_config.setdefault("collection_name", f"{collection_name}_knowledge")
+            vector_store["config"] = vector_store_config
+            default_knowledge_config["vector_store"] = vector_store
             self.knowledge_config = default_knowledge_config
 
             # Create session directory
@@ -330,33 +414,82 @@ class Session:
             max_items=max_items
         )
 
-    def _test_remote_connection(self) -> None:
+    # ------------------------------------------------------------------ #
+    #   Remote agent calls
+    # ------------------------------------------------------------------ #
+    def check_connection(self, force: bool = False) -> bool:
         """
-        Test connectivity to the remote agent.
-        
+        Probe the remote agent's /health endpoint. The result is cached for
+        ``HEALTH_TTL`` seconds; sessions never probe on their own.
+
         Raises:
-            ConnectionError: If unable to connect to the remote agent
+            ConnectionError: If the remote agent is unreachable or unhealthy
         """
+        if not self.is_remote:
+            raise ValueError("check_connection() is only available for remote agent sessions")
+        checked = _health_checks.get(self.agent_url)
+        if not force and checked is not None and time.time() - checked < self.HEALTH_TTL:
+            return True
+        client = _sync_client(self.agent_url, self.timeout, self.max_connections)
         try:
             # Try a simple GET request to check if the server is responding
             test_url = self.agent_url.rstrip('/') + '/health' if '/health' not in self.agent_url else self.agent_url
-            response = requests.get(test_url, timeout=self.timeout)
+            response = client.get(test_url)
             if response.status_code != 200:
                 # If health endpoint fails, try the main endpoint
-                response = requests.head(self.agent_url, timeout=self.timeout)
+                response = client.head(self.agent_url)
                 if response.status_code not in [200, 405]:  # 405 = Method Not Allowed is OK
                     raise ConnectionError(f"Remote agent returned status code: {response.status_code}")
-            print(f"✅ Successfully connected to remote agent at {self.agent_url}")
-        except requests.exceptions.Timeout:
+        except httpx.TimeoutException:
             raise ConnectionError(f"Timeout connecting to remote agent at {self.agent_url}")
-        except requests.exceptions.ConnectionError:
+        except httpx.TransportError:
             raise ConnectionError(f"Failed to connect to remote agent at {self.agent_url}")
+        except ConnectionError:
+            raise
         except Exception as e:
             raise ConnectionError(f"Error connecting to remote agent: {str(e)}")
+        _health_checks[self.agent_url] = time.time()
+        return True
+
+    # Backward compatibility
+    def _test_remote_connection(self) -> None:
+        self.check_connection(force=True)
+        print(f"✅ Successfully connected to remote agent at {self.agent_url}")
+
+    def _payload(self, message: str, **kwargs) -> Dict[str, Any]:
+        if not self.is_remote:
+            raise ValueError("chat() method is only available for remote agent sessions. Use Agent.chat() for local agents.")
+        payload = {"query": message, "session_id": self.session_id}
+        if self._user_id_given:
+            # The server schedules and caches per user_id; the placeholder would merge callers
+            payload["user_id"] = self.user_id
+        payload.update(kwargs)
+        return payload
+
+    def _remote_error(self, error: Exception) -> ConnectionError:
+        if isinstance(error, httpx.TimeoutException):
+            return ConnectionError(f"Timeout communicating with remote agent at {self.agent_url}")
+        if isinstance(error, httpx.HTTPStatusError):
+            return ConnectionError(f"HTTP error from remote agent: {error}")
+        if isinstance(error, httpx.TransportError):
+            return ConnectionError(f"Failed to communicate with remote agent at {self.agent_url}")
+        return ConnectionError(f"Error communicating with remote agent: {str(error)}")
+
+    @staticmethod
+    def _response_text(response: httpx.Response) -> str:
+        try:
+            result = response.json()
+        except json.JSONDecodeError:
+            # If response is not JSON, return the raw text
+            return response.text
+        # Extract the agent's response
+        if isinstance(result, dict):
+            return result.get("response", str(result))
+        return str(result)
 
     def chat(self, message: str, **kwargs) -> str:
         """
-        Send a message to the remote agent or handle local session.
+        Send a message to the remote agent over the pooled keep-alive connection.
         
         Args:
             message: The message to send to the agent
@@ -369,49 +502,66 @@ class Session:
             ValueError: If this is not a remote session
             ConnectionError: If unable to communicate with remote agent
         """
-        if not self.is_remote:
-            raise ValueError("chat() method is only available for remote agent sessions. Use Agent.chat() for local agents.")
-        
+        payload = self._payload(message, **kwargs)
         try:
-            # Prepare the request payload
-            payload = {
-                "query": message,
-                "session_id": self.session_id,
-                "user_id": self.user_id,
-                **kwargs
-            }
-            
-            # Send POST request to the remote agent
-            response = requests.post(
-                self.agent_url,
-                json=payload,
-                headers={"Content-Type": "application/json"},
-                timeout=self.timeout
-            )
-            
-            # Check if request was successful
+            response = _sync_client(self.agent_url, self.timeout, self.max_connections).post(self.agent_url, json=payload)
+            response.raise_for_status()
+        except Exception as e:
+            raise self._remote_error(e)
+        return self._response_text(response)
+
+    async def achat(self, message: str, **kwargs) -> str:
+        """
+        Async version of chat(). Sessions on the same host share one connection
+        pool per event loop, so messages for different sessions can be sent
+        concurrently with ``asyncio.gather``.
+        """
+        payload = self._payload(message, **kwargs)
+        try:
+            response = await _async_client(self.agent_url, self.timeout, self.max_connections).post(self.agent_url, json=payload)
             response.raise_for_status()
-            
-            # Parse the response
-            result = response.json()
-            
-            # Extract the agent's response
-            if isinstance(result, dict):
-                return result.get("response", str(result))
-            else:
-                return str(result)
-                
-        except requests.exceptions.Timeout:
-            raise ConnectionError(f"Timeout communicating with remote agent at {self.agent_url}")
-        except requests.exceptions.ConnectionError:
-            raise ConnectionError(f"Failed to communicate with remote agent at {self.agent_url}")
-        except requests.exceptions.HTTPError as e:
-            raise ConnectionError(f"HTTP error from remote agent: {e}")
-        except json.JSONDecodeError:
-            # If response is not JSON, return the raw text
-            return response.text
         except Exception as e:
-            raise ConnectionError(f"Error communicating with remote agent: {str(e)}")
+            raise self._remote_error(e)
+        return self._response_text(response)
+
+    def stream(self, message: str, **kwargs) -> Iterator[Dict[str, Any]]:
+        """
+        Send a message and yield the remote agent's events as they arrive
+        (``token``, ``tool_call``, ``tool_result``, ... ending with ``done`` or
+        ``error``; see ``praisonaiagents.streaming``). A server without
+        streaming support yields a single ``done`` event.
+        """
+        payload = self._payload(message, **kwargs)
+        client = _sync_client(self.agent_url, self.timeout, self.max_connections)
+        try:
+            with client.stream("POST", self.agent_url, json=payload, headers={"Accept": NDJSON}) as response:
+                response.raise_for_status()
+                if NDJSON not in response.headers.get("content-type", ""):
+                    response.read()
+                    yield {"type": "done", "response": self._response_text(response)}
+                    return
+                for line in response.iter_lines():
+                    if line.strip():
+                        yield json.loads(line)
+        except (httpx.HTTPError, json.JSONDecodeError) as e:
+            raise self._remote_error(e)
+
+    async def astream(self, message: str, **kwargs) -> AsyncIterator[Dict[str, Any]]:
+        """Async version of stream()"""
+        payload = self._payload(message, **kwargs)
+        client = _async_client(self.agent_url, self.timeout, self.max_connections)
+        try:
+            async with client.stream("POST", self.agent_url, json=payload, headers={"Accept": NDJSON}) as response:
+                response.raise_for_status()
+                if NDJSON not in response.headers.get("content-type", ""):
+                    await response.aread()
+                    yield {"type": "done", "response": self._response_text(response)}
+                    return
+                async for line in response.aiter_lines():
+                    if line.strip():
+                        yield json.loads(line)
+        except (httpx.HTTPError, json.JSONDecodeError) as e:
+            raise self._remote_error(e)
 
     def send_message(self, message: str, **kwargs) -> str:
         """
@@ -426,6 +576,10 @@ class Session:
         """
         return self.chat(message, **kwargs)
 
+    async def asend_message(self, message: str, **kwargs) -> str:
+        """Async alias for achat()"""
+        return await self.achat(message, **kwargs)
+
     def __str__(self) -> str:
         if self.is_remote:
             return f"Session(id='{self.session_id}', user='{self.user_id}', remote_agent='{self.agent_url}')"
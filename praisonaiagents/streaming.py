@@ -0,0 +1,236 @@
+"""
+Incremental events from agent runs.
+
+Agents and LLM calls report what they produce while they run through
+:func:`emit`; nothing is recorded unless a caller listens. :func:`iter_events`
+(sync) and :func:`aiter_events` (async) run a call and yield its events as
+they happen, ending with a ``done`` or ``error`` event. The HTTP streaming
+endpoints send exactly these dicts, as SSE or JSON lines.
+
+Event shapes (every event has ``type``; ``agent`` is set inside an agent call):
+
+* ``{"type": "token", "agent", "delta"}`` - generated text
+* ``{"type": "tool_call", "agent", "name", "arguments"}``
+* ``{"type": "tool_result", "agent", "name", "result"}``
+* ``{"type": "agent_completed", "agent", "task", "output"}`` - one agent or task finished
+* ``{"type": "done", "response"}`` / ``{"type": "error", "error"}`` - end of the stream
+
+Listeners are per call (a ``contextvars`` variable), so concurrent requests
+each receive only their own events.
+"""
+
+import json
+import queue
+import asyncio
+import inspect
+import logging
+import threading
+import functools
+import contextvars
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+Event = Dict[str, Any]
+
+_sink: contextvars.ContextVar[Optional[Callable[[Event], None]]] = contextvars.ContextVar("praison_event_sink", default=None)
+_agent: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("praison_event_agent", default=None)
+
+
+def listening() -> bool:
+    """Whether events emitted now reach a listener."""
+    return _sink.get() is not None
+
+
+def emit(event_type: str, **fields):
+    """Send an event to the current listener, if any."""
+    sink = _sink.get()
+    if sink is None:
+        return
+    event = {"type": event_type, **fields}
+    if "agent" not in event:
+        event["agent"] = _agent.get()
+    try:
+        sink(event)
+    except Exception as e:
+        logger.debug(f"Event listener failed: {e}")
+
+
+def _jsonable(value: Any) -> Any:
+    try:
+        json.dumps(value)
+        return value
+    except (TypeError, ValueError):
+        return str(value)
+
+
+# ---------------------------------------------------------------------- #
+#   Instrumentation helpers
+# ---------------------------------------------------------------------- #
+def agent_events(fn):
+    """Decorator for agent methods: events emitted inside carry the agent's name."""
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def async_wrapper(self, *args, **kwargs):
+            if _sink.get() is None:
+                return await fn(self, *args, **kwargs)
+            token = _agent.set(self.name)
+            try:
+                return await fn(self, *args, **kwargs)
+            finally:
+                _agent.reset(token)
+        return async_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(self, *args, **kwargs):
+        if _sink.get() is None:
+            return fn(self, *args, **kwargs)
+        token = _agent.set(self.name)
+        try:
+            return fn(self, *args, **kwargs)
+        finally:
+            _agent.reset(token)
+    return wrapper
+
+
+def tool_events(fn):
+    """Decorator for ``execute_tool(function_name, arguments)``: emits tool_call and tool_result."""
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def async_wrapper(self, function_name, arguments, *args, **kwargs):
+            emit("tool_call", agent=self.name, name=function_name, arguments=_jsonable(arguments))
+            result = await fn(self, function_name, arguments, *args, **kwargs)
+            emit("tool_result", agent=self.name, name=function_name, result=_jsonable(result))
+            return result
+        return async_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(self, function_name, arguments, *args, **kwargs):
+        emit("tool_call", agent=self.name, name=function_name, arguments=_jsonable(arguments))
+        result = fn(self, function_name, arguments, *args, **kwargs)
+        emit("tool_result", agent=self.name, name=function_name, result=_jsonable(result))
+        return result
+    return wrapper
+
+
+def _delta(chunk) -> Optional[str]:
+    try:
+        return chunk.choices[0].delta.content
+    except (AttributeError, IndexError, TypeError):
+        return None
+
+
+def token_stream(stream):
+    """Pass through an OpenAI-style chunk stream, emitting each text delta."""
+    for chunk in stream:
+        delta = _delta(chunk)
+        if delta:
+            emit("token", delta=delta)
+        yield chunk
+
+
+async def atoken_stream(stream):
+    """Async version of token_stream"""
+    async for chunk in stream:
+        delta = _delta(chunk)
+        if delta:
+            emit("token", delta=delta)
+        yield chunk
+
+
+# ---------------------------------------------------------------------- #
+#   Consuming events
+# ---------------------------------------------------------------------- #
+_DONE = object()
+
+
+def iter_events(fn: Callable, *args, **kwargs) -> Iterator[Event]:
+    """Run ``fn(*args, **kwargs)`` in a thread and yield its events, then ``done`` or ``error``."""
+    events: "queue.Queue" = queue.Queue()
+    outcome: Dict[str, Any] = {}
+    context = contextvars.copy_context()
+
+    def run():
+        _sink.set(events.put)
+        try:
+            outcome["response"] = fn(*args, **kwargs)
+        except Exception as e:
+            outcome["error"] = e
+        finally:
+            events.put(_DONE)
+
+    threading.Thread(target=context.run, args=(run,), daemon=True, name="events").start()
+    while True:
+        event = events.get()
+        if event is _DONE:
+            break
+        yield event
+    if "error" in outcome:
+        yield {"type": "error", "error": str(outcome["error"])}
+    else:
+        yield {"type": "done", "response": _jsonable(outcome.get("response"))}
+
+
+async def aiter_events(fn: Callable, *args, executor=None, **kwargs) -> AsyncIterator[Event]:
+    """
+    Async version of iter_events. Coroutine functions run as a task on the
+    current loop, others on ``executor`` (the loop's default when None).
+    Closing the iterator early cancels a coroutine and waits for a thread to
+    finish, so it only returns once the work has stopped.
+    """
+    loop = asyncio.get_running_loop()
+    events: asyncio.Queue = asyncio.Queue()
+
+    def sink(event: Event):
+        loop.call_soon_threadsafe(events.put_nowait, event)
+
+    if inspect.iscoroutinefunction(fn):
+        async def run_async():
+            _sink.set(sink)  # the task runs in its own copy of the context
+            return await fn(*args, **kwargs)
+        future = asyncio.ensure_future(run_async())
+    else:
+        context = contextvars.copy_context()
+
+        def run():
+            _sink.set(sink)
+            return fn(*args, **kwargs)
+        future = loop.run_in_executor(executor, context.run, run)
+
+    getter = None
+    try:
+        while True:
+            getter = asyncio.ensure_future(events.get())
+            done, _ = await asyncio.wait({getter, future}, return_when=asyncio.FIRST_COMPLETED)
+            if getter not in done:
+                break
+            yield getter.result()
+        getter.cancel()
+        getter = None
+        while not events.empty():
+            yield events.get_nowait()
+    finally:
+        if getter is not None:
+            getter.cancel()
+        if not future.done():
+            # Closed early (client gone): stop a coroutine, but never return while
+            # the work still runs, so callers keep its slot until it really ends
+            if isinstance(future, asyncio.Task):
+                future.cancel()
+            await asyncio.wait({future})
+    try:
+        response = future.result()
+    except Exception as e:
+        yield {"type": "error", "error": str(e)}
+    else:
+        yield {"type": "done", "response": _jsonable(response)}
+
+
+def format_sse(event: Event) -> str:
+    """An event as a server-sent-events message."""
+    return f"event: {event['type']}\ndata: {json.dumps(event, ensure_ascii=False, default=str)}\n\n"
+
+
+def format_ndjson(event: Event) -> str:
+    """An event as one JSON line."""
+    return json.dumps(event, ensure_ascii=False, default=str) + "\n"
@@ -16,6 +16,7 @@ from typing import Optional, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from .telemetry import MinimalTelemetry, TelemetryCollector
+from .tracing import Tracer, span, traced, get_tracer
 
 # Import the classes for real (not just type checking)
 from .telemetry import MinimalTelemetry, TelemetryCollector
@@ -26,6 +27,10 @@ __all__ = [
     'disable_telemetry',
     'MinimalTelemetry',
     'TelemetryCollector',  # For backward compatibility
+    'Tracer',
+    'span',
+    'traced',
+    'get_tracer',
 ]
 
 
@@ -0,0 +1,429 @@
+"""
+Per-run execution timeline tracing.
+
+The usage telemetry in this package only counts calls. Tracing records where
+the time of a run goes: tasks, agent chats, LLM requests (with time to first
+token for streams), tool calls, memory and knowledge searches, guardrails and
+quality evaluation.
+
+The active tracer and the current span live in ``contextvars`` variables, so
+parent links follow the call stack across ``await`` and ``asyncio.to_thread``
+and overlapping runs (two ``start()`` calls on different threads or tasks)
+each record into their own tracer; :func:`propagate` carries both into thread
+pools. While no tracer is active, ``span()`` returns a shared no-op object and
+``traced`` functions add one context variable lookup per call.
+
+Usage:
+    with Tracer() as tracer:
+        agents.start()
+    tracer.export_chrome("run.trace.json")   # open in https://ui.perfetto.dev
+    tracer.export_otlp("run.otlp.json")
+    print(tracer.summary(top_n=10))
+
+or ``PraisonAIAgents(..., trace=True)``, which writes both files to
+``.praison/traces`` for every run.
+"""
+
+import os
+import json
+import time
+import uuid
+import inspect
+import logging
+import threading
+import functools
+import contextvars
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TRACE_DIR = os.path.join(".praison", "traces")
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("praison_span", default=None)
+_active_tracer: contextvars.ContextVar[Optional["Tracer"]] = contextvars.ContextVar("praison_tracer", default=None)
+
+
+class Span:
+    """One timed operation; use as a context manager or call :meth:`end`."""
+
+    __slots__ = ("tracer", "name", "category", "span_id", "parent_id", "thread_id",
+                 "start_ns", "end_ns", "attributes", "events", "status", "_token")
+
+    def __init__(self, tracer: "Tracer", name: str, category: str, parent: Optional["Span"], attributes: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent.span_id if parent is not None else None
+        self.thread_id = threading.get_ident()
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = attributes
+        self.events: List[tuple] = []
+        self.status = "ok"
+        self._token = None
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end - self.start_ns) / 1e6
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def add_event(self, name: str, **attributes):
+        self.events.append((name, time.time_ns(), attributes))
+
+    def end(self, error: Optional[BaseException] = None):
+        if self.end_ns is not None:
+            return
+        self.end_ns = time.time_ns()
+        if error is not None:
+            self.status = "error"
+            self.attributes["error"] = type(error).__name__
+        self.tracer._finish(self)
+
+    def __enter__(self):
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._token is not None:
+            _current_span.reset(self._token)
+            self._token = None
+        self.end(exc)
+        return False
+
+
+class _NoopSpan:
+    """Returned while tracing is off; every method does nothing."""
+
+    __slots__ = ()
+
+    def set(self, **attributes):
+        pass
+
+    def add_event(self, name: str, **attributes):
+        pass
+
+    def end(self, error: Optional[BaseException] = None):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Tracer:
+    """
+    Collects the spans of one run.
+
+    Args:
+        run_id: Id recorded on exports; random when omitted
+        max_spans: Spans kept; later spans are counted but dropped
+    """
+
+    def __init__(self, run_id: Optional[str] = None, max_spans: int = 100_000):
+        self.run_id = run_id or uuid.uuid4().hex
+        self.trace_id = uuid.uuid4().hex
+        self.max_spans = max_spans
+        self.spans: List[Span] = []
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._token: Optional[contextvars.Token] = None
+
+    # ------------------------------------------------------------------ #
+    #   Activation
+    # ------------------------------------------------------------------ #
+    def start(self) -> "Tracer":
+        """Make this the active tracer of the current context (and threads run through :func:`propagate`)."""
+        self._token = _active_tracer.set(self)
+        return self
+
+    def stop(self):
+        """Restore the tracer that was active before :meth:`start`; call it from the same context."""
+        token, self._token = self._token, None
+        if token is None:
+            return
+        try:
+            _active_tracer.reset(token)
+        except ValueError:  # stopped from another context; only undo this tracer
+            if _active_tracer.get() is self:
+                _active_tracer.set(None)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+    def span(self, name: str, category: str = "", /, **attributes) -> Span:
+        return Span(self, name, category, _current_span.get(), attributes)
+
+    def _finish(self, span: Span):
+        with self._lock:
+            if len(self.spans) < self.max_spans:
+                self.spans.append(span)
+            else:
+                self.dropped += 1
+
+    # ------------------------------------------------------------------ #
+    #   Summary
+    # ------------------------------------------------------------------ #
+    def summary(self, top_n: int = 10) -> Dict[str, Any]:
+        """Totals per span name and the ``top_n`` slowest spans."""
+        with self._lock:
+            spans = list(self.spans)
+        by_name: Dict[str, Dict[str, Any]] = defaultdict(lambda: {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "errors": 0})
+        for span in spans:
+            entry = by_name[span.name]
+            entry["count"] += 1
+            entry["total_ms"] += span.duration_ms
+            entry["max_ms"] = max(entry["max_ms"], span.duration_ms)
+            entry["errors"] += span.status == "error"
+        totals = {
+            name: {**entry, "total_ms": round(entry["total_ms"], 2), "max_ms": round(entry["max_ms"], 2)}
+            for name, entry in sorted(by_name.items(), key=lambda item: -item[1]["total_ms"])
+        }
+        slowest = sorted(spans, key=lambda s: -s.duration_ms)[:top_n]
+        wall = (max(s.end_ns for s in spans) - min(s.start_ns for s in spans)) / 1e6 if spans else 0.0
+        return {
+            "run_id": self.run_id,
+            "spans": len(spans),
+            "dropped": self.dropped,
+            "wall_ms": round(wall, 2),
+            "by_name": totals,
+            "slowest": [
+                {"name": s.name, "category": s.category, "duration_ms": round(s.duration_ms, 2), "attributes": s.attributes}
+                for s in slowest
+            ]
+        }
+
+    def format_summary(self, top_n: int = 10) -> str:
+        summary = self.summary(top_n)
+        lines = [f"Trace {summary['run_id']}: {summary['spans']} spans over {summary['wall_ms']:.0f} ms"]
+        lines.append("Slowest spans:")
+        for s in summary["slowest"]:
+            label = s["attributes"].get("name") or s["attributes"].get("agent") or ""
+            lines.append(f"  {s['duration_ms']:>10.1f} ms  {s['name']} {label}".rstrip())
+        lines.append("Time by span name:")
+        for name, entry in summary["by_name"].items():
+            lines.append(f"  {entry['total_ms']:>10.1f} ms  {name} x{entry['count']}")
+        return "\n".join(lines)
+
+    # ------------------------------------------------------------------ #
+    #   Export
+    # ------------------------------------------------------------------ #
+    def to_chrome(self) -> Dict[str, Any]:
+        """Chrome trace event format (complete events plus instant events for span events)."""
+        with self._lock:
+            spans = list(self.spans)
+        pid = os.getpid()
+        events = []
+        for span in spans:
+            args = {k: _jsonable(v) for k, v in span.attributes.items()}
+            args["span_id"] = span.span_id
+            if span.parent_id:
+                args["parent_id"] = span.parent_id
+            events.append({
+                "name": span.name,
+                "cat": span.category or "praison",
+                "ph": "X",
+                "ts": span.start_ns / 1000,
+                "dur": (span.end_ns - span.start_ns) / 1000,
+                "pid": pid,
+                "tid": span.thread_id,
+                "args": args
+            })
+            for name, ts, attributes in span.events:
+                events.append({
+                    "name": name,
+                    "cat": span.category or "praison",
+                    "ph": "i",
+                    "s": "t",
+                    "ts": ts / 1000,
+                    "pid": pid,
+                    "tid": span.thread_id,
+                    "args": {k: _jsonable(v) for k, v in attributes.items()}
+                })
+        return {"traceEvents": events, "displayTimeUnit": "ms", "otherData": {"run_id": self.run_id}}
+
+    def to_otlp(self, service_name: str = "praisonaiagents") -> Dict[str, Any]:
+        """OTLP/JSON ``ExportTraceServiceRequest`` as written by the OpenTelemetry file exporter."""
+        with self._lock:
+            spans = list(self.spans)
+        otlp_spans = []
+        for span in spans:
+            entry = {
+                "traceId": self.trace_id,
+                "spanId": span.span_id,
+                "name": span.name,
+                "kind": 1,
+                "startTimeUnixNano": str(span.start_ns),
+                "endTimeUnixNano": str(span.end_ns),
+                "attributes": _otlp_attributes({"category": span.category, "thread.id": span.thread_id, **span.attributes}),
+                "events": [
+                    {"name": name, "timeUnixNano": str(ts), "attributes": _otlp_attributes(attributes)}
+                    for name, ts, attributes in span.events
+                ],
+                "status": {"code": 2 if span.status == "error" else 1}
+            }
+            if span.parent_id:
+                entry["parentSpanId"] = span.parent_id
+            otlp_spans.append(entry)
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": _otlp_attributes({"service.name": service_name, "run.id": self.run_id})},
+                "scopeSpans": [{"scope": {"name": "praisonaiagents.tracing"}, "spans": otlp_spans}]
+            }]
+        }
+
+    def export_chrome(self, path: str) -> str:
+        return _write_json(path, self.to_chrome())
+
+    def export_otlp(self, path: str, service_name: str = "praisonaiagents") -> str:
+        return _write_json(path, self.to_otlp(service_name))
+
+
+def _jsonable(value: Any) -> Any:
+    return value if isinstance(value, (str, int, float, bool)) or value is None else str(value)
+
+
+def _otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    result = []
+    for key, value in attributes.items():
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            typed = {"boolValue": value}
+        elif isinstance(value, int):
+            typed = {"intValue": str(value)}
+        elif isinstance(value, float):
+            typed = {"doubleValue": value}
+        else:
+            typed = {"stringValue": str(value)}
+        result.append({"key": key, "value": typed})
+    return result
+
+
+def _write_json(path: str, data: Dict[str, Any]) -> str:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    return path
+
+
+# ---------------------------------------------------------------------- #
+#   Instrumentation helpers
+# ---------------------------------------------------------------------- #
+def get_tracer() -> Optional[Tracer]:
+    return _active_tracer.get()
+
+
+def span(name: str, category: str = "", /, **attributes):
+    """Context manager timing a block; a no-op while no tracer is active."""
+    tracer = _active_tracer.get()
+    if tracer is None:
+        return NOOP_SPAN
+    return tracer.span(name, category, **attributes)
+
+
+def start_span(name: str, category: str = "", /, **attributes):
+    """A span ended explicitly with ``.end()`` (for streams); it does not become the current span."""
+    tracer = _active_tracer.get()
+    if tracer is None:
+        return NOOP_SPAN
+    return tracer.span(name, category, **attributes)
+
+
+def current_span():
+    tracer = _active_tracer.get()
+    return (_current_span.get() or NOOP_SPAN) if tracer is not None else NOOP_SPAN
+
+
+def traced(name: str, category: str = "", attributes: Optional[Callable[..., Dict[str, Any]]] = None):
+    """
+    Decorator recording a span per call. ``attributes`` receives the call's
+    arguments and returns span attributes.
+    """
+    def decorator(fn):
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                tracer = _active_tracer.get()
+                if tracer is None:
+                    return await fn(*args, **kwargs)
+                with tracer.span(name, category, **(attributes(*args, **kwargs) if attributes else {})):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            tracer = _active_tracer.get()
+            if tracer is None:
+                return fn(*args, **kwargs)
+            with tracer.span(name, category, **(attributes(*args, **kwargs) if attributes else {})):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def trace_stream(stream, span):
+    """Yield from ``stream``, marking the first chunk on ``span`` and ending it when done."""
+    first = True
+    try:
+        for chunk in stream:
+            if first:
+                span.add_event("first_token")
+                span.set(ttft_ms=round(span.duration_ms, 2))
+                first = False
+            yield chunk
+    except GeneratorExit:
+        span.set(closed_early=True)
+        span.end()
+        raise
+    except BaseException as e:
+        span.end(e)
+        raise
+    span.end()
+
+
+async def atrace_stream(stream, span):
+    """Async version of trace_stream"""
+    first = True
+    try:
+        async for chunk in stream:
+            if first:
+                span.add_event("first_token")
+                span.set(ttft_ms=round(span.duration_ms, 2))
+                first = False
+            yield chunk
+    except GeneratorExit:
+        span.set(closed_early=True)
+        span.end()
+        raise
+    except BaseException as e:
+        span.end(e)
+        raise
+    span.end()
+
+
+def propagate(fn: Callable) -> Callable:
+    """Run ``fn`` in worker threads under the caller's tracer and current span."""
+    if _active_tracer.get() is None:
+        return fn
+    parent = contextvars.copy_context()
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        return parent.copy().run(fn, *args, **kwargs)
+    return wrapper
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Tests for the DAG scheduler: independent tasks overlap, decisions route to
+one branch only, loops re-run up to max_iter, and tasks of a shared Agent
+run in turn unless serialize_agents is off.
+"""
+
+import sys
+import time
+import logging
+import threading
+from types import SimpleNamespace
+
+from praisonaiagents import Agent, PraisonAIAgents, Task
+from praisonaiagents.process.dag import DAGScheduler
+
+STEP = 0.2
+
+
+def make_tasks(*specs):
+    """Build fake tasks from (name, agent, context names, next_tasks, condition) tuples."""
+    tasks = {}
+    by_name = {}
+    for i, (name, agent, context, next_tasks, condition) in enumerate(specs):
+        task = SimpleNamespace(
+            id=i, name=name, agent=agent, context=[by_name[c] for c in context],
+            next_tasks=next_tasks, condition=condition, is_start=i == 0,
+            result=None, status="not started"
+        )
+        tasks[i] = by_name[name] = task
+    return tasks
+
+
+def executor(tasks, decisions=None, seconds=STEP):
+    """Return an execute(task_id) that sleeps, records the run and sets the decision."""
+    runs = []
+    lock = threading.Lock()
+
+    def execute(tid):
+        task = tasks[tid]
+        time.sleep(seconds)
+        with lock:
+            runs.append(task.name)
+        decision = (decisions or {}).get(task.name)
+        raw = decision() if callable(decision) else decision or "done"
+        task.result = SimpleNamespace(raw=raw, pydantic=None)
+        task.status = "completed"
+
+    return execute, runs
+
+
+def test_fan_out_runs_concurrently():
+    """Test that independent tasks overlap and the report shows the critical path."""
+    print("Testing concurrent fan-out...")
+
+    tasks = make_tasks(
+        ("plan", object(), [], [], None),
+        ("a", object(), ["plan"], [], None),
+        ("b", object(), ["plan"], [], None),
+        ("c", object(), ["plan"], [], None),
+        ("merge", object(), ["a", "b", "c"], [], None),
+    )
+    execute, runs = executor(tasks)
+    report = DAGScheduler(tasks, max_workers=4).run(execute)
+
+    assert runs[0] == "plan" and runs[-1] == "merge" and sorted(runs[1:4]) == ["a", "b", "c"], runs
+    assert report["wall_seconds"] < 4 * STEP, report
+    assert report["total_task_seconds"] >= 5 * STEP * 0.9, report
+    print(f"✓ Five {STEP}s tasks finished in {report['wall_seconds']}s")
+
+    path = report["critical_path"]
+    assert len(path) == 3 and path[0] == "plan" and path[-1] == "merge", path
+    assert all(t["status"] == "done" and t["runs"] == 1 for t in report["tasks"].values())
+    print(f"✓ Critical path: {' -> '.join(path)}")
+
+    print("Concurrent fan-out test passed!\n")
+
+
+def test_condition_routing():
+    """Test that only the selected branch runs and the other one is skipped."""
+    print("Testing decision routing...")
+
+    tasks = make_tasks(
+        ("review", object(), [], [], {"approve": ["publish"], "reject": ["archive"]}),
+        ("publish", object(), [], ["notify"], None),
+        ("archive", object(), [], [], None),
+        ("notify", object(), [], [], None),
+    )
+    execute, runs = executor(tasks, {"review": "The draft is fine, approve it."}, seconds=0)
+    report = DAGScheduler(tasks).run(execute)
+
+    assert runs == ["review", "publish", "notify"], runs
+    assert report["tasks"]["archive"]["status"] == "skipped"
+    print("✓ Free-text decision selects one branch; the other is skipped")
+
+    answers = iter(["retry", "retry", "ok"])
+    tasks = make_tasks(
+        ("draft", object(), [], ["check"], None),
+        ("check", object(), ["draft"], [], {"retry": ["draft"], "ok": ["exit"]}),
+    )
+    execute, runs = executor(tasks, {"check": lambda: next(answers)}, seconds=0)
+    report = DAGScheduler(tasks).run(execute)
+    assert runs == ["draft", "check"] * 3, runs
+    assert report["tasks"]["draft"]["runs"] == 3 and report["exited_early"]
+    print("✓ A back edge re-runs the loop until the exit decision")
+
+    tasks = make_tasks(
+        ("draft", object(), [], ["check"], None),
+        ("check", object(), ["draft"], [], {"retry": ["draft"]}),
+    )
+    execute, runs = executor(tasks, {"check": "retry"}, seconds=0)
+    DAGScheduler(tasks, max_iter=2).run(execute)
+    assert runs.count("draft") == 3, runs
+    print("✓ Loops stop after max_iter re-entries")
+
+    print("Decision routing test passed!\n")
+
+
+def test_shared_agent():
+    """Test that tasks of one Agent run in turn unless serialize_agents is off."""
+    print("Testing tasks sharing an Agent...")
+
+    agent = object()
+
+    def fan_out():
+        return make_tasks(*[(name, agent, [], [], None) for name in ["a", "b", "c"]])
+
+    tasks = fan_out()
+    execute, _ = executor(tasks)
+    serial = DAGScheduler(tasks, max_workers=3).run(execute)
+    assert serial["wall_seconds"] >= 3 * STEP * 0.9, serial
+    print(f"✓ Serialized: {serial['wall_seconds']}s")
+
+    tasks = fan_out()
+    execute, _ = executor(tasks)
+    parallel = DAGScheduler(tasks, max_workers=3, serialize_agents=False).run(execute)
+    assert parallel["wall_seconds"] < 2 * STEP, parallel
+    print(f"✓ serialize_agents=False: {parallel['wall_seconds']}s")
+
+    writer = Agent(name="Writer", role="Writer", goal="Write", backstory="Writes", verbose=False)
+    writer.chat_history = [{"role": "user", "content": "Use British spelling."}]
+    shared = [Task(description=f"Write section {i}", expected_output="A paragraph", agent=writer) for i in range(2)]
+    team = PraisonAIAgents(agents=[writer], tasks=shared, process="dag", verbose=0, serialize_agents=False)
+    task_id = next(iter(team.tasks))
+    with team._own_agent(task_id):
+        clone = team.tasks[task_id].agent
+        assert clone is not writer and clone.chat_history == writer.chat_history
+        clone.chat_history.append({"role": "assistant", "content": "Noted."})
+    assert team.tasks[task_id].agent is writer and len(writer.chat_history) == 1
+    print("✓ PraisonAIAgents runs each task on a clone of the shared Agent")
+
+    print("Shared agent test passed!\n")
+
+
+def main():
+    """Run all tests."""
+    print("Running PraisonAI Agents DAG Scheduler Tests...\n")
+
+    try:
+        test_fan_out_runs_concurrently()
+        test_condition_routing()
+        test_shared_agent()
+
+        print("🎉 All DAG scheduler tests passed!")
+
+    except Exception as e:
+        print(f"❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+    return True
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+
+    success = main()
+    sys.exit(0 if success else 1)
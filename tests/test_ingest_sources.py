@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Tests for knowledge source expansion: directories and globs become files,
+raw text (even with ?, [ or *) is passed through unchanged.
+"""
+
+import os
+import sys
+import logging
+import tempfile
+
+from praisonaiagents.knowledge.ingest import expand_sources, is_glob
+
+RAW_TEXTS = [
+    "Questions? Email us.",
+    "See [1] for details",
+    "Rated 5* by customers",
+    "plain text",
+    "Is *this* a pattern?\nNo, it is two lines of text.",
+]
+
+
+def test_is_glob():
+    """Test which strings are treated as file patterns."""
+    print("Testing is_glob...")
+
+    for pattern in ["docs/*.md", "reports/**/*.pdf", "*.txt", "notes.*", "report?.md", os.path.join("a", "[ab].md")]:
+        assert is_glob(pattern), pattern
+    print("✓ Path-like patterns are globs")
+
+    for text in RAW_TEXTS + ["docs/readme.md", None, 42]:
+        assert not is_glob(text), text
+    print("✓ Raw text and plain paths are not globs")
+
+    print("is_glob test passed!\n")
+
+
+def test_expand_sources():
+    """Test expansion of directories and globs, and pass-through of raw text."""
+    print("Testing expand_sources...")
+
+    with tempfile.TemporaryDirectory() as root:
+        for name in ["a.md", "b.txt", "image.xyz", os.path.join("sub", "c.md")]:
+            path = os.path.join(root, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as f:
+                f.write("content")
+
+        expanded = expand_sources([root])
+        assert expanded == [os.path.join(root, "a.md"), os.path.join(root, "b.txt"), os.path.join(root, "sub", "c.md")], expanded
+        print("✓ Directories expand to supported files, recursively")
+
+        expanded = expand_sources([os.path.join(root, "**", "*.md")])
+        assert sorted(expanded) == [os.path.join(root, "a.md"), os.path.join(root, "sub", "c.md")], expanded
+        print("✓ Globs expand to matching files")
+
+        expanded = expand_sources([root, os.path.join(root, "*.md")])
+        assert expanded.count(os.path.join(root, "a.md")) == 1
+        print("✓ A file reached twice is listed once")
+
+        missing = os.path.join(root, "nothing", "*.md")
+        assert expand_sources([missing]) == [missing]
+        print("✓ A glob matching no file is passed through")
+
+    assert expand_sources(RAW_TEXTS) == RAW_TEXTS
+    print("✓ Raw text with ?, [ or * is kept unchanged")
+
+    print("expand_sources test passed!\n")
+
+
+def main():
+    """Run all tests."""
+    print("Running PraisonAI Agents Knowledge Source Tests...\n")
+
+    try:
+        test_is_glob()
+        test_expand_sources()
+
+        print("🎉 All knowledge source tests passed!")
+
+    except Exception as e:
+        print(f"❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+    return True
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+
+    success = main()
+    sys.exit(0 if success else 1)
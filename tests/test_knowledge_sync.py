@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Tests for incremental knowledge indexing: Knowledge.sync adds, updates,
+skips and prunes sources, and Knowledge.add records them in the manifest.
+"""
+
+import os
+import sys
+import uuid
+import hashlib
+import logging
+import tempfile
+
+from mem0.vector_stores.chroma import ChromaDB
+
+from praisonaiagents.knowledge import Knowledge
+
+
+class CountingEmbedder:
+    """Deterministic embedder that counts the texts it embeds."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def embed(self, text, memory_action=None):
+        self.calls += 1
+        return [b / 255.0 for b in hashlib.sha256(text.encode()).digest()[:8]]
+
+
+class LocalMemory:
+    """Stands in for mem0 Memory: the real Chroma store, no LLM or embedding API."""
+
+    def __init__(self, path):
+        self.embedding_model = CountingEmbedder()
+        self.vector_store = ChromaDB("sync_test", path=path)
+
+    def add(self, messages, user_id=None, agent_id=None, run_id=None, metadata=None):
+        text = messages[0]["content"]
+        memory_id = str(uuid.uuid4())
+        self.vector_store.insert([self.embedding_model.embed(text)], [dict(metadata or {}, data=text)], [memory_id])
+        return {"results": [{"id": memory_id, "memory": text, "event": "ADD"}]}
+
+
+def make_knowledge(root):
+    path = os.path.join(root, "db")
+    knowledge = Knowledge(config={
+        "vector_store": {"provider": "chroma", "config": {"collection_name": "sync_test", "path": path}},
+        "chunker": {"tokenizer_or_token_counter": "character"}
+    })
+    knowledge.__dict__["memory"] = LocalMemory(path)
+    return knowledge
+
+
+def write(path, text):
+    with open(path, "w") as f:
+        f.write(text)
+
+
+def vector_count(knowledge):
+    return knowledge.memory.vector_store.collection.count()
+
+
+def test_sync():
+    """Test add, unchanged, update and prune across successive syncs."""
+    print("Testing Knowledge.sync...")
+
+    with tempfile.TemporaryDirectory() as root:
+        docs = os.path.join(root, "docs")
+        os.makedirs(docs)
+        write(os.path.join(docs, "a.md"), "Solar panels convert sunlight into electricity.")
+        write(os.path.join(docs, "b.txt"), "Wind turbines convert wind into electricity.")
+        knowledge = make_knowledge(root)
+        embedder = knowledge.memory.embedding_model
+
+        report = knowledge.sync([docs], agent_id="researcher")
+        assert len(report["added"]) == 2 and not report["updated"] and not report["unchanged"], report
+        assert vector_count(knowledge) == 2
+        print("✓ New sources are embedded")
+
+        calls = embedder.calls
+        report = knowledge.sync([docs], agent_id="researcher")
+        assert len(report["unchanged"]) == 2 and not report["added"] and not report["updated"], report
+        assert embedder.calls == calls and vector_count(knowledge) == 2
+        print("✓ Unchanged sources are skipped without embedding")
+
+        write(os.path.join(docs, "a.md"), "Solar panels now convert more sunlight into electricity.")
+        report = knowledge.sync([docs], agent_id="researcher")
+        assert report["updated"] == [os.path.join(docs, "a.md")] and len(report["unchanged"]) == 1, report
+        assert vector_count(knowledge) == 2
+        print("✓ A changed source replaces its old vectors")
+
+        report = knowledge.sync([os.path.join(docs, "b.txt")], agent_id="researcher", prune=False)
+        assert not report["removed"] and vector_count(knowledge) == 2
+        report = knowledge.sync([os.path.join(docs, "b.txt")], agent_id="researcher")
+        assert report["removed"] == [os.path.abspath(os.path.join(docs, "a.md"))], report
+        assert vector_count(knowledge) == 1
+        print("✓ Sources no longer listed are pruned only when asked")
+
+        report = knowledge.sync([docs], agent_id="writer")
+        assert len(report["added"]) == 2 and vector_count(knowledge) == 3
+        print("✓ Scopes are indexed independently")
+
+    print("Knowledge.sync test passed!\n")
+
+
+def test_add_records_manifest():
+    """Test that add() and a later sync() of the same sources embed once."""
+    print("Testing Knowledge.add with the manifest...")
+
+    with tempfile.TemporaryDirectory() as root:
+        docs = os.path.join(root, "docs")
+        os.makedirs(docs)
+        for name in ["a.md", "b.md", "c.txt"]:
+            write(os.path.join(docs, name), f"Notes stored in {name}.")
+        knowledge = make_knowledge(root)
+
+        result = knowledge.add(docs)
+        assert len(result["results"]) == 3 and not result["errors"] and result["relations"] == []
+        assert vector_count(knowledge) == 3
+        print("✓ add() indexes a directory")
+
+        knowledge.add(docs)
+        report = knowledge.sync([docs])
+        assert len(report["unchanged"]) == 3, report
+        assert vector_count(knowledge) == 3
+        print("✓ Adding again or syncing later does not duplicate vectors")
+
+        knowledge.add("Raw text is indexed once too.")
+        knowledge.add("Raw text is indexed once too.")
+        assert vector_count(knowledge) == 4
+        print("✓ Raw text is recorded by content hash")
+
+        empty = os.path.join(root, "empty.txt")
+        write(empty, "")
+        try:
+            knowledge.add(empty)
+            assert False, "An empty file should raise"
+        except ValueError:
+            pass
+        try:
+            knowledge.add(os.path.join(root, "missing.pdf"))
+            assert False, "A missing file should raise"
+        except FileNotFoundError:
+            pass
+        print("✓ A single file without content or missing raises")
+
+    print("Knowledge.add test passed!\n")
+
+
+def main():
+    """Run all tests."""
+    print("Running PraisonAI Agents Knowledge Sync Tests...\n")
+
+    try:
+        test_sync()
+        test_add_records_manifest()
+
+        print("🎉 All knowledge sync tests passed!")
+
+    except Exception as e:
+        print(f"❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+    return True
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Tests for streaming loop tasks: LoopRunner checkpoints the finished row
+offset, and an interrupted run resumes from it without redoing those rows.
+"""
+
+import os
+import sys
+import json
+import logging
+import tempfile
+import threading
+from types import SimpleNamespace
+
+from praisonaiagents.process.loop import LoopRunner
+
+ROWS = 40
+
+
+class Interrupted(BaseException):
+    """Stands in for a crash or Ctrl+C in the middle of a run."""
+
+
+class RowAgent:
+    """Minimal agent: answers with the row it was given and can stop at one row."""
+
+    name = "classifier"
+
+    def __init__(self, seen, stop_at=None):
+        self.seen = seen
+        self.stop_at = stop_at
+        self.chat_history = []
+        self._lock = threading.Lock()
+
+    def clone(self):
+        return self
+
+    def chat(self, prompt, tools=None):
+        row = next(line for line in prompt.splitlines() if line.startswith("review ")).rstrip(".")
+        if row == self.stop_at:
+            raise Interrupted(row)
+        with self._lock:
+            self.seen.append(row)
+        return f"label for {row}"
+
+
+def make_task(input_file, agent):
+    return SimpleNamespace(
+        name="classify", description="Classify this review", expected_output="A label",
+        input_file=input_file, agent=agent, tools=None, loop_state={},
+        output_pydantic=None, condition=None
+    )
+
+
+def read_records(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_resume_from_checkpoint():
+    """Test that an interrupted loop resumes at its checkpoint offset."""
+    print("Testing loop resume...")
+
+    with tempfile.TemporaryDirectory() as root:
+        input_file = os.path.join(root, "reviews.txt")
+        with open(input_file, "w") as f:
+            f.write("\n".join(f"review {i}" for i in range(ROWS)))
+        output = os.path.join(root, "labels.jsonl")
+
+        seen = []
+        task = make_task(input_file, RowAgent(seen, stop_at="review 23"))
+        runner = LoopRunner(task, workers=1, output=output, checkpoint_every=5)
+        try:
+            runner.run()
+            assert False, "The run should have been interrupted"
+        except Interrupted:
+            pass
+        with open(runner.checkpoint) as f:
+            state = json.load(f)
+        offset = state["offset"]
+        emitted = {r["offset"] for r in read_records(output)}
+        assert 20 <= offset <= 23 and not state["finished"], state
+        assert set(range(offset)) <= emitted and 23 not in emitted, emitted
+        print(f"✓ Checkpoint offset {offset}: only rows before the interrupted one, not finished")
+
+        resumed = []
+        task.agent = RowAgent(resumed)
+        result = LoopRunner(task, workers=4, output=output, checkpoint_every=5).run()
+        assert result.json_dict["resumed_from"] == offset and result.json_dict["rows"] == ROWS - offset, result.json_dict
+        assert sorted(resumed, key=lambda r: int(r.split()[1])) == [f"review {i}" for i in range(offset, ROWS)], resumed
+        print("✓ The resumed run starts at the checkpoint and skips finished rows")
+
+        records = read_records(output)
+        offsets = [r["offset"] for r in records]
+        assert set(offsets) == set(range(ROWS)) and all(offsets.count(i) == 1 for i in range(offset)), offsets
+        assert all(r["output"] == f"label for {r['input']}" and r["error"] is None for r in records)
+        with open(runner.checkpoint) as f:
+            state = json.load(f)
+        assert state["offset"] == ROWS and state["finished"], state
+        print("✓ Every row is in the output; rows below the checkpoint appear once")
+
+        again = []
+        task.agent = RowAgent(again)
+        LoopRunner(task, output=output, resume=False).run()
+        assert len(again) == ROWS and len(read_records(output)) == ROWS
+        print("✓ resume=False starts over and rewrites the output")
+
+        other = os.path.join(root, "other.txt")
+        with open(other, "w") as f:
+            f.write("review 0\nreview 1")
+        task.input_file = other
+        assert LoopRunner(task, output=output).load_offset() == 0
+        print("✓ A checkpoint for another input file is ignored")
+
+    print("Loop resume test passed!\n")
+
+
+def main():
+    """Run all tests."""
+    print("Running PraisonAI Agents Loop Runner Tests...\n")
+
+    try:
+        test_resume_from_checkpoint()
+
+        print("🎉 All loop runner tests passed!")
+
+    except Exception as e:
+        print(f"❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+    return True
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+
+    success = main()
+    sys.exit(0 if success else 1)
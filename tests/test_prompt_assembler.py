@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Tests for token-budgeted task prompt assembly and tool merging.
+"""
+
+import sys
+import logging
+
+from praisonaiagents.agents.prompt import PROMPT_SUFFIX, PromptAssembler, estimate_tokens, merge_tools
+
+DESCRIPTION = "Summarize the quarterly revenue growth of the solar panel business"
+RELEVANT = "Solar panel revenue grew 40% this quarter. The growth came from new utility contracts."
+FILLER = " ".join(f"Unrelated note {i} about office furniture and parking rules." for i in range(200))
+
+
+def test_no_budget():
+    """Test that without a budget every context item is kept once, in order."""
+    print("Testing prompt without budget...")
+
+    prompt, stats = PromptAssembler().assemble(DESCRIPTION, "A short summary", ["first", "second", "first"])
+    assert DESCRIPTION in prompt
+    assert "Expected Output: A short summary." in prompt
+    assert prompt.endswith(PROMPT_SUFFIX)
+    assert prompt.index("first") < prompt.index("second")
+    assert prompt.count("first") == 1
+    assert stats["context_items"] == 2 and stats["truncated"] == 0 and stats["dropped"] == 0
+    print("✓ Duplicates removed, order kept, nothing truncated")
+
+    print("No budget test passed!\n")
+
+
+def test_budget():
+    """Test that a budget shrinks the least relevant context first."""
+    print("Testing prompt budget...")
+
+    assembler = PromptAssembler(max_tokens=300)
+    prompt, stats = assembler.assemble(
+        DESCRIPTION, "A short summary", [FILLER, RELEVANT], memory_context="User prefers bullet points"
+    )
+    assert estimate_tokens(FILLER) > 300
+    assert stats["prompt_tokens"] <= 300, stats
+    assert RELEVANT in prompt
+    print("✓ Relevant context kept whole within the budget")
+
+    assert stats["truncated"] + stats["dropped"] == 1, stats
+    assert FILLER not in prompt
+    print("✓ Oversized irrelevant context truncated or dropped")
+
+    assert DESCRIPTION in prompt and "User prefers bullet points" in prompt and prompt.endswith(PROMPT_SUFFIX)
+    print("✓ Description, memory context and closing instruction always kept")
+
+    tiny, tiny_stats = PromptAssembler(max_tokens=60).assemble(DESCRIPTION, "A short summary", [FILLER, RELEVANT])
+    assert DESCRIPTION in tiny and tiny_stats["dropped"] >= 1
+    print("✓ Context that cannot fit at all is dropped")
+
+    print("Budget test passed!\n")
+
+
+def test_merge_tools():
+    """Test name-level tool dedup without mutating the inputs."""
+    print("Testing merge_tools...")
+
+    def search():
+        pass
+
+    def fetch():
+        pass
+
+    schema = {"type": "function", "function": {"name": "search"}}
+    task_tools = [search]
+    agent_tools = [schema, fetch]
+    merged = merge_tools(task_tools, agent_tools, None)
+    assert merged == [search, fetch]
+    assert task_tools == [search] and agent_tools == [schema, fetch]
+    print("✓ First tool of each name kept; inputs untouched")
+
+    print("merge_tools test passed!\n")
+
+
+def main():
+    """Run all tests."""
+    print("Running PraisonAI Agents Prompt Assembly Tests...\n")
+
+    try:
+        test_no_budget()
+        test_budget()
+        test_merge_tools()
+
+        print("🎉 All prompt assembly tests passed!")
+
+    except Exception as e:
+        print(f"❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+    return True
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+
+    success = main()
+    sys.exit(0 if success else 1)
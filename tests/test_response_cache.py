@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Tests for the agent response cache: answers are partitioned by tenant,
+requests without a tenant are never cached, and a missed question is
+embedded only once.
+"""
+
+import sys
+import asyncio
+import logging
+from types import SimpleNamespace
+
+from praisonaiagents.agent.response_cache import ResponseCache, cached_response
+from praisonaiagents.serve import AgentService
+from praisonaiagents.session import Session
+
+
+class EchoAgent:
+    """Minimal agent: counts the questions that reach the model."""
+
+    name = "echo"
+    role = "Assistant"
+    goal = "Answer"
+    backstory = ""
+    instructions = None
+    llm = "test-model"
+    tools = []
+    knowledge = None
+    user_id = None
+
+    def __init__(self, response_cache, calls=None):
+        self.response_cache = response_cache
+        self.cache_scope = None
+        self.chat_history = []
+        self.calls = [] if calls is None else calls
+
+    def clone(self, history=None):
+        copy = EchoAgent(self.response_cache, self.calls)
+        copy.chat_history = list(history or [])
+        return copy
+
+    @cached_response
+    def chat(self, prompt, temperature=0.2, tools=None, output_json=None, output_pydantic=None, reasoning_steps=False):
+        self.calls.append((self.cache_scope, prompt))
+        self.chat_history.append({"role": "user", "content": prompt})
+        return f"answer {len(self.calls)}"
+
+    @cached_response
+    async def achat(self, prompt, temperature=0.2, tools=None, output_json=None, output_pydantic=None, reasoning_steps=False):
+        self.calls.append((self.cache_scope, prompt))
+        return f"answer {len(self.calls)}"
+
+
+def test_tenant_isolation():
+    """Test that served answers are only reused within the same tenant."""
+    print("Testing tenant isolation...")
+
+    agent = EchoAgent(ResponseCache())
+    service = AgentService(agent)
+
+    async def ask(**fields):
+        return (await service.handle({"query": "What is the refund policy?", **fields}))["response"]
+
+    async def scenario():
+        first = await ask(tenant="acme")
+        again = await ask(tenant="acme")
+        other = await ask(tenant="globex")
+        by_user = [await ask(user_id=42), await ask(user_id=42)]
+        anonymous = [await ask(), await ask(), await ask(user_id="default_user")]
+        return first, again, other, by_user, anonymous
+
+    try:
+        first, again, other, by_user, anonymous = asyncio.run(scenario())
+    finally:
+        service.close()
+    assert again == first, (first, again)
+    assert other != first
+    print("✓ A tenant's answer is reused for that tenant only")
+
+    assert by_user[0] == by_user[1]
+    print("✓ user_id partitions the cache when no tenant is given")
+
+    assert len(set(anonymous)) == 3, anonymous
+    assert agent.calls.count(("42", "What is the refund policy?")) == 1
+    print("✓ Requests without a tenant, or with the default_user placeholder, are never cached")
+
+    print("Tenant isolation test passed!\n")
+
+
+def test_tickets():
+    """Test how the tenant of a request is resolved."""
+    print("Testing request tickets...")
+
+    service = AgentService(EchoAgent(ResponseCache()))
+    try:
+        assert service.ticket({"tenant": "acme", "priority": "batch"}) == {"tenant": "acme", "priority": "batch"}
+        assert service.ticket({"user_id": 7})["tenant"] == "7"
+        assert service.ticket({"user_id": "default_user"})["tenant"] is None
+    finally:
+        service.close()
+    print("✓ Tenant comes from the body, without the Session placeholder")
+
+    resolved = AgentService(
+        EchoAgent(ResponseCache()),
+        tenant_resolver=lambda payload, request: request.headers.get("x-tenant") if request else None
+    )
+    try:
+        request = SimpleNamespace(headers={"x-tenant": "acme"})
+        assert resolved.ticket({"tenant": "globex"}, request)["tenant"] == "acme"
+        assert resolved.ticket({"tenant": "globex"})["tenant"] is None
+    finally:
+        resolved.close()
+    print("✓ tenant_resolver replaces the body fields")
+
+    assert "user_id" not in Session(agent_url="127.0.0.1:9/agent")._payload("hi")
+    assert Session(agent_url="127.0.0.1:9/agent", user_id="u1")._payload("hi")["user_id"] == "u1"
+    print("✓ Remote sessions only send a user_id they were given")
+
+    print("Request tickets test passed!\n")
+
+
+def test_semantic_embeds_once():
+    """Test that a miss embeds the question once and near-duplicates hit."""
+    print("Testing semantic lookups...")
+
+    embedded = []
+    vectors = {
+        "what is the refund policy?": [1.0, 0.0, 0.0],
+        "what's the refund policy?": [0.99, 0.1, 0.0],
+        "where is the office?": [0.0, 1.0, 0.0],
+    }
+
+    def embed(text):
+        embedded.append(text)
+        return vectors[text]
+
+    agent = EchoAgent(ResponseCache(semantic_threshold=0.95, embed=embed))
+    agent.cache_scope = "acme"
+
+    async def scenario():
+        first = await agent.clone().achat("What is the refund policy?")
+        near = await agent.clone().achat("What's the refund policy?")
+        other = await agent.clone().achat("Where is the office?")
+        return first, near, other
+
+    first, near, other = asyncio.run(scenario())
+    assert near == first and other != first
+    assert embedded == ["what is the refund policy?", "what's the refund policy?", "where is the office?"], embedded
+    print("✓ Each question is embedded once; a near-duplicate is served from the cache")
+
+    stats = agent.response_cache.stats()
+    assert stats["semantic_hits"] == 1 and stats["misses"] == 2, stats
+    print(f"✓ Stats: {stats}")
+
+    print("Semantic lookup test passed!\n")
+
+
+def main():
+    """Run all tests."""
+    print("Running PraisonAI Agents Response Cache Tests...\n")
+
+    try:
+        test_tenant_isolation()
+        test_tickets()
+        test_semantic_embeds_once()
+
+        print("🎉 All response cache tests passed!")
+
+    except Exception as e:
+        print(f"❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+    return True
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared retry policy: error classification, backoff,
+circuit breakers and SDK retry suppression.
+"""
+
+import sys
+import json
+import time
+import random
+import logging
+from types import SimpleNamespace
+
+import httpx
+import openai
+
+from praisonaiagents.retry import (
+    NON_RETRYABLE,
+    REFORMAT,
+    RETRYABLE,
+    SHRINK_CONTEXT,
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryPolicy,
+    classify_error,
+    retry_after,
+    without_sdk_retries,
+)
+
+REQUEST = httpx.Request("POST", "https://api.example.com/v1/chat/completions")
+
+
+def status_error(cls, status, message="error", headers=None):
+    response = httpx.Response(status, request=REQUEST, headers=headers)
+    return cls(message, response=response, body=None)
+
+
+def test_classify_error():
+    """Test classification of SDK, transport and programming errors."""
+    print("Testing classify_error...")
+
+    assert classify_error(status_error(openai.RateLimitError, 429)) == RETRYABLE
+    assert classify_error(status_error(openai.InternalServerError, 503)) == RETRYABLE
+    assert classify_error(status_error(openai.AuthenticationError, 401)) == NON_RETRYABLE
+    assert classify_error(status_error(openai.BadRequestError, 400)) == NON_RETRYABLE
+    print("✓ Status codes decide for API errors")
+
+    too_long = status_error(openai.BadRequestError, 400, "This model's maximum context length is 8192 tokens")
+    assert classify_error(too_long) == SHRINK_CONTEXT
+    print("✓ Context overflow asks for a smaller prompt")
+
+    assert classify_error(openai.APIConnectionError(request=REQUEST)) == RETRYABLE
+    assert classify_error(TimeoutError()) == RETRYABLE
+    assert classify_error(ConnectionResetError()) == RETRYABLE
+    print("✓ Transport errors are retried")
+
+    try:
+        json.loads("{not json")
+    except json.JSONDecodeError as e:
+        assert classify_error(e) == REFORMAT
+    print("✓ Unparseable output asks for a reformat")
+
+    # Phrases only count on API errors; our own bugs are never retried
+    assert classify_error(ValueError("request timed out")) == NON_RETRYABLE
+    assert classify_error(KeyError("rate limit")) == NON_RETRYABLE
+    assert classify_error(openai.OpenAIError("Rate limit reached, try again")) == RETRYABLE
+    assert classify_error(CircuitOpenError("openai", 1.0)) == NON_RETRYABLE
+    print("✓ Message phrases are matched on API errors only")
+
+    print("classify_error test passed!\n")
+
+
+def test_backoff():
+    """Test full-jitter exponential backoff and Retry-After handling."""
+    print("Testing backoff...")
+
+    random.seed(7)
+    policy = RetryPolicy(base_delay=1.0, multiplier=2.0, max_delay=5.0)
+    for attempt in range(1, 8):
+        ceiling = min(5.0, 2.0 ** (attempt - 1))
+        for _ in range(50):
+            assert 0.0 <= policy.backoff(attempt) <= ceiling
+    print("✓ Delays stay within the exponential ceiling and max_delay")
+
+    limited = status_error(openai.RateLimitError, 429, headers={"retry-after": "3"})
+    assert retry_after(limited) == 3.0
+    assert policy.backoff(1, limited) >= 3.0
+    assert retry_after(status_error(openai.RateLimitError, 429, headers={"retry-after-ms": "1500"})) == 1.5
+    assert policy.backoff(1, status_error(openai.RateLimitError, 429, headers={"retry-after": "600"})) <= 5.0
+    print("✓ Retry-After is honored up to max_delay")
+
+    print("Backoff test passed!\n")
+
+
+def test_retry_call():
+    """Test that only retryable failures are retried."""
+    print("Testing RetryPolicy.call...")
+
+    policy = RetryPolicy(max_attempts=4, base_delay=0.0)
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise TimeoutError("slow upstream")
+        return "ok"
+
+    assert policy.call(flaky) == "ok"
+    assert len(attempts) == 3
+    print("✓ Retryable failures are retried until success")
+
+    attempts.clear()
+
+    def broken():
+        attempts.append(1)
+        raise ValueError("bad argument")
+
+    try:
+        policy.call(broken)
+        assert False, "ValueError should propagate"
+    except ValueError:
+        pass
+    assert len(attempts) == 1
+    print("✓ Non-retryable failures are raised at once")
+
+    print("RetryPolicy.call test passed!\n")
+
+
+def test_circuit_breaker():
+    """Test closed -> open -> half open -> closed transitions."""
+    print("Testing CircuitBreaker...")
+
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=0.05)
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open"
+    try:
+        breaker.before_call()
+        assert False, "Open circuit should fail fast"
+    except CircuitOpenError as e:
+        assert e.retry_in > 0
+    print("✓ Circuit opens after failure_threshold failures")
+
+    time.sleep(0.06)
+    assert breaker.state == "half_open"
+    breaker.before_call()  # the single trial call
+    try:
+        breaker.before_call()
+        assert False, "Only one trial call is let through"
+    except CircuitOpenError:
+        pass
+    breaker.record_success()
+    assert breaker.state == "closed"
+    breaker.before_call()
+    print("✓ One trial call closes the circuit again")
+
+    print("CircuitBreaker test passed!\n")
+
+
+def test_without_sdk_retries():
+    """Test that wrapped SDK clients do not retry on their own."""
+    print("Testing without_sdk_retries...")
+
+    client = openai.OpenAI(api_key="test", base_url="http://127.0.0.1:9/v1")
+    quiet = without_sdk_retries(client)
+    assert quiet.max_retries == 0
+    assert client.max_retries > 0
+    assert without_sdk_retries(client) is quiet
+    fake = SimpleNamespace(chat=None)
+    assert without_sdk_retries(fake) is fake
+    print("✓ OpenAI clients get max_retries=0, once per client")
+
+    print("without_sdk_retries test passed!\n")
+
+
+def main():
+    """Run all tests."""
+    print("Running PraisonAI Agents Retry Tests...\n")
+
+    try:
+        test_classify_error()
+        test_backoff()
+        test_retry_call()
+        test_circuit_breaker()
+        test_without_sdk_retries()
+
+        print("🎉 All retry tests passed!")
+
+    except Exception as e:
+        print(f"❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+    return True
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Tests for the run journal: records survive a torn last line, and
+PraisonAIAgents.start(resume=run_id) replays the tasks a crashed run
+completed instead of running them again.
+"""
+
+import os
+import sys
+import json
+import logging
+import tempfile
+
+from praisonaiagents import Agent, PraisonAIAgents, Task
+from praisonaiagents.agents.journal import RunJournal
+from praisonaiagents.main import TaskOutput
+
+
+class Crash(Exception):
+    """Stands in for the process dying in the middle of a task."""
+
+
+def make_team(journal_dir, calls, crash_at=None):
+    """Three sequential tasks whose execution is recorded instead of calling a model."""
+    writer = Agent(name="Writer", role="Writer", goal="Write", backstory="Writes", verbose=False)
+    tasks = [
+        Task(name=name, description=f"Write the {name}", expected_output="A paragraph", agent=writer)
+        for name in ["outline", "draft", "edit"]
+    ]
+    team = PraisonAIAgents(agents=[writer], tasks=tasks, process="sequential", verbose=0, journal=journal_dir)
+
+    def execute_task(task_id):
+        task = team.tasks[task_id]
+        if task.name == crash_at:
+            raise Crash(task.name)
+        calls.append(task.name)
+        task.result = TaskOutput(description=task.description, raw=f"{task.name} v{len(calls)}", agent="Writer")
+        return task.result
+
+    team.execute_task = execute_task
+    return team
+
+
+def test_journal_records():
+    """Test loading state and repeated task outputs, skipping a torn line."""
+    print("Testing journal records...")
+
+    with tempfile.TemporaryDirectory() as root:
+        journal = RunJournal("run-1", root)
+        journal.record("state", key="topic", value="solar")
+        journal.record("state", key="draft_count", value=1)
+        journal.record("state_delete", key="draft_count")
+        journal.task_started("draft")
+        journal.task_completed("draft", TaskOutput(description="d", raw="first", agent="Writer"))
+        journal.task_completed("draft", TaskOutput(description="d", raw="second", agent="Writer"))
+        journal.task_failed("review")
+        journal.close()
+        with open(journal.path, "a") as f:
+            f.write('{"event": "task", "task": "review", "sta')
+
+        loaded = RunJournal("run-1", root)
+        assert loaded.load() == 2
+        assert loaded.state == {"topic": "solar"}, loaded.state
+        print("✓ State changes are replayed; a torn final line is ignored")
+
+        task = Task(name="draft", description="d", expected_output="e")
+        assert [loaded.replay("draft", task).raw for _ in range(2)] == ["first", "second"]
+        assert loaded.replay("draft", task) is None and loaded.replay("review", task) is None
+        assert loaded.replayed == 2 and loaded.pending_replays() == 0
+        print("✓ A task's outputs replay in order, once each; failures are not replayed")
+
+    print("Journal records test passed!\n")
+
+
+def test_resume_replays_completed_tasks():
+    """Test that a resumed run replays finished tasks and runs the rest."""
+    print("Testing resume from the journal...")
+
+    with tempfile.TemporaryDirectory() as root:
+        calls = []
+        team = make_team(root, calls, crash_at="edit")
+        try:
+            team.start()
+            assert False, "The run should have crashed"
+        except Crash:
+            pass
+        run_id = team.run_id
+        assert calls == ["outline", "draft"]
+        print(f"✓ Run {run_id} crashed after two tasks")
+
+        resumed_calls = []
+        resumed = make_team(root, resumed_calls)
+        result = resumed.start(resume=run_id, return_dict=True)
+        assert resumed_calls == ["edit"], resumed_calls
+        assert resumed.journal.replayed == 2
+        outputs = {resumed.tasks[tid].name: output.raw for tid, output in result["task_results"].items()}
+        assert outputs == {"outline": "outline v1", "draft": "draft v2", "edit": "edit v1"}, outputs
+        print("✓ Completed tasks keep their recorded outputs; only the remaining task runs")
+
+        with open(os.path.join(root, run_id, "journal.jsonl")) as f:
+            events = [json.loads(line)["event"] for line in f]
+        assert events[0] == "run" and "resume" in events and events[-1] == "finished", events
+        print("✓ The journal records the run, the resume and the finish")
+
+    print("Resume test passed!\n")
+
+
+def main():
+    """Run all tests."""
+    print("Running PraisonAI Agents Run Journal Tests...\n")
+
+    try:
+        test_journal_records()
+        test_resume_replays_completed_tasks()
+
+        print("🎉 All run journal tests passed!")
+
+    except Exception as e:
+        print(f"❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+    return True
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Tests for FairScheduler: priority ordering, weighted fair share, caps and
+queue timeouts of served requests.
+"""
+
+import sys
+import asyncio
+import logging
+
+from praisonaiagents.serve.admission import Overloaded
+from praisonaiagents.serve.scheduler import BATCH, INTERACTIVE, FairScheduler
+
+
+async def hold(scheduler, release, order, label, tenant=None, priority=None):
+    """Take a slot, note the admission order and keep the slot until ``release`` is set."""
+    async with scheduler.admit(tenant, priority):
+        order.append(label)
+        await release.wait()
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_interactive_before_batch():
+    """Test that a freed slot goes to interactive requests first."""
+    print("Testing priority ordering...")
+
+    async def scenario():
+        scheduler = FairScheduler(max_in_flight=1, batch_share=1.0)
+        order, release = [], asyncio.Event()
+        first = asyncio.create_task(hold(scheduler, asyncio.Event(), order, "first"))
+        await settle()
+        waiting = [
+            asyncio.create_task(hold(scheduler, release, order, "batch", "a", BATCH)),
+            asyncio.create_task(hold(scheduler, release, order, "interactive", "b", INTERACTIVE)),
+        ]
+        await settle()
+        assert order == ["first"]
+        first.cancel()
+        await settle()
+        release.set()
+        await asyncio.gather(*waiting)
+        return order
+
+    order = asyncio.run(scenario())
+    assert order == ["first", "interactive", "batch"], order
+    print("✓ Interactive request admitted before the earlier batch request")
+
+    print("Priority ordering test passed!\n")
+
+
+def test_weighted_fair_share():
+    """Test that tenants get slots in proportion to their weights."""
+    print("Testing weighted fair share...")
+
+    async def scenario():
+        scheduler = FairScheduler(max_in_flight=1, max_queue=None, tenant_weights={"a": 2.0, "b": 1.0})
+        order = []
+
+        async def one(tenant):
+            async with scheduler.admit(tenant):
+                order.append(tenant)
+                await asyncio.sleep(0)
+
+        await asyncio.gather(*[one(t) for t in ["a"] * 6 + ["b"] * 6])
+        return order
+
+    order = asyncio.run(scenario())
+    window = order[:9]
+    assert window.count("a") == 6 and window.count("b") == 3, order
+    print(f"✓ Admission order with weights 2:1: {''.join(order)}")
+
+    print("Weighted fair share test passed!\n")
+
+
+def test_caps():
+    """Test the per-tenant cap and the batch share."""
+    print("Testing tenant and batch caps...")
+
+    async def scenario():
+        scheduler = FairScheduler(max_in_flight=4, tenant_max_in_flight=1, batch_share=0.5)
+        order, release = [], asyncio.Event()
+        tasks = [
+            asyncio.create_task(hold(scheduler, release, order, "a1", "a")),
+            asyncio.create_task(hold(scheduler, release, order, "a2", "a")),
+            asyncio.create_task(hold(scheduler, release, order, "b1", "b", BATCH)),
+            asyncio.create_task(hold(scheduler, release, order, "c1", "c", BATCH)),
+            asyncio.create_task(hold(scheduler, release, order, "d1", "d", BATCH)),
+        ]
+        await settle()
+        running = list(order)
+        stats = scheduler.stats()
+        release.set()
+        await asyncio.gather(*tasks)
+        return running, stats, scheduler.stats()
+
+    running, stats, after = asyncio.run(scenario())
+    assert running == ["a1", "b1", "c1"], running
+    assert stats["batch_in_flight"] == 2
+    assert stats["tenants"]["a"]["queued_interactive"] == 1
+    assert stats["tenants"]["d"]["queued_batch"] == 1
+    print("✓ Second request of a capped tenant waits; batch holds at most half the slots")
+    assert after["in_flight"] == 0 and after["tenants"] == {}
+    print("✓ Slots and tenant state are released afterwards")
+
+    print("Caps test passed!\n")
+
+
+def test_queue_limits():
+    """Test 429 on a full tenant queue and 503 after the queue timeout."""
+    print("Testing queue limits...")
+
+    async def scenario():
+        scheduler = FairScheduler(max_in_flight=1, max_queue=1, queue_timeout=0.05)
+        release = asyncio.Event()
+        holder = asyncio.create_task(hold(scheduler, release, [], "holder", "a"))
+        await settle()
+        queued = asyncio.create_task(hold(scheduler, release, [], "queued", "a"))
+        await settle()
+
+        try:
+            async with scheduler.admit("a"):
+                pass
+            assert False, "Full tenant queue should reject"
+        except Overloaded as e:
+            assert e.status_code == 429
+        print("✓ Full tenant queue answers 429")
+
+        try:
+            await queued
+            assert False, "Queued request should time out"
+        except Overloaded as e:
+            assert e.status_code == 503
+        print("✓ Queue timeout answers 503")
+
+        release.set()
+        await holder
+        return scheduler.stats()
+
+    stats = asyncio.run(scenario())
+    assert stats["in_flight"] == 0 and stats["waiting"] == 0, stats
+    assert stats["rejected"] == 1 and stats["timed_out"] == 1, stats
+    print("✓ Rejections are counted and leave no state behind")
+
+    print("Queue limits test passed!\n")
+
+
+def main():
+    """Run all tests."""
+    print("Running PraisonAI Agents Scheduler Tests...\n")
+
+    try:
+        test_interactive_before_batch()
+        test_weighted_fair_share()
+        test_caps()
+        test_queue_limits()
+
+        print("🎉 All scheduler tests passed!")
+
+    except Exception as e:
+        print(f"❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+    return True
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+
+    success = main()
+    sys.exit(0 if success else 1)